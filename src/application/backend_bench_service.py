@@ -0,0 +1,118 @@
+"""
+Docker backend benchmark - `status` and `start` latency with Engine API vs CLI
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+from ..core.constants import DOCKER_BACKEND_ENV
+from ..core.stats import summarize
+from ..infrastructure.docker_engine import find_docker_socket
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+BACKENDS = ("cli", "engine")
+
+# Commands run in a fresh interpreter per iteration (includes import and
+# connection setup, like a real invocation)
+STATUS_SNIPPET = (
+    "import sys; from pathlib import Path\n"
+    "from src.application.status_service import StatusService\n"
+    "StatusService(Path(sys.argv[1])).show_status()\n"
+)
+START_SNIPPET = (
+    "import sys; from pathlib import Path\n"
+    "from src.application.start_service import StartService\n"
+    "sys.exit(0 if StartService(Path(sys.argv[1])).start_containers(wait_for_healthy=True) else 1)\n"
+)
+
+
+class BackendBenchService:
+    """Service for comparing Docker backends on real commands"""
+    
+    def __init__(self, project_root: Path):
+        """
+        Initialize backend benchmark service
+        
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.utils = self._import_utils()
+    
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import print_header, print_info, print_success, print_warning, print_error
+        return SimpleNamespace(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+        )
+    
+    def _time_command(self, snippet: str, backend: str) -> float:
+        """Run snippet once with the given backend, return wall time in ms"""
+        env = dict(os.environ)
+        env[DOCKER_BACKEND_ENV] = backend
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", snippet, str(self.project_root)],
+            cwd=str(self.project_root),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+            timeout=600,
+        )
+        return (time.perf_counter() - start) * 1000.0
+    
+    def run(self, runs: int = 10, include_start: bool = False) -> int:
+        """
+        Benchmark commands for each backend
+        
+        Args:
+            runs: Iterations per command and backend
+            include_start: Also time `start` (stack must already be running -
+                measures compose up no-op plus readiness wait)
+        
+        Returns:
+            Exit code (0 on success)
+        """
+        self.utils.print_header("⏱️  Docker Backend Benchmark")
+        print()
+        if find_docker_socket() is None:
+            self.utils.print_error("Docker socket not found - only the CLI backend is available")
+            return 1
+        
+        commands = {"status": STATUS_SNIPPET}
+        if include_start:
+            commands["start"] = START_SNIPPET
+        
+        results: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for name, snippet in commands.items():
+            for backend in BACKENDS:
+                self.utils.print_info(f"{name} via {backend}: {runs} run(s)...")
+                # One warmup run (page cache, daemon state)
+                self._time_command(snippet, backend)
+                timings: List[float] = [self._time_command(snippet, backend) for _ in range(runs)]
+                results.setdefault(name, {})[backend] = summarize(timings)
+        
+        print()
+        print(f"{'command':<8} {'backend':<8} {'mean ms':>9} {'p50 ms':>9} {'p90 ms':>9} {'min ms':>9}")
+        for name, by_backend in results.items():
+            for backend, s in by_backend.items():
+                print(f"{name:<8} {backend:<8} {s['mean']:>9.1f} {s['p50']:>9.1f} {s['p90']:>9.1f} {s['min']:>9.1f}")
+        print()
+        for name, by_backend in results.items():
+            cli, engine = by_backend["cli"]["p50"], by_backend["engine"]["p50"]
+            if engine > 0:
+                self.utils.print_success(
+                    f"{name}: p50 CLI {cli:.0f}ms vs engine API {engine:.0f}ms (speedup {cli / engine:.1f}x)"
+                )
+        return 0
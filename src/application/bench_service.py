@@ -0,0 +1,580 @@
+"""
+Load generator - RPS, time-to-first-token and inter-token latency of the API
+"""
+
+import asyncio
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from ..core.constants import (
+    BENCH_DURATION_S, BENCH_WARMUP_S, BENCH_CONCURRENCY, BENCH_REQUEST_TIMEOUT_S,
+    BENCH_PROMPT_TOKENS, BENCH_MAX_TOKENS, BENCH_MAX_IN_FLIGHT, BENCH_PERCENTILES
+)
+from ..core.stats import summarize
+from ..infrastructure.async_http import AsyncHTTPClient, HTTPProtocolError, SSEParser
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+WORKLOADS = ("chat", "stream", "embeddings")
+TARGETS = ("auto", "nginx", "litellm")
+REPORT_VERSION = 1
+
+# Filler for synthetic prompts - about one token per word
+PROMPT_WORDS = (
+    "gateway", "latency", "request", "stream", "token", "proxy", "model", "budget",
+    "router", "worker", "upstream", "header", "buffer", "socket", "cache", "queue",
+)
+
+# (label, report key, percentile key or None) - rows of `--compare`
+COMPARE_ROWS = (
+    ("req/s", "rps", None),
+    ("tokens/s", "tokens_per_s", None),
+    ("error rate %", "error_rate", None),
+    ("latency p50 ms", "latency_ms", "p50"),
+    ("latency p99 ms", "latency_ms", "p99"),
+    ("ttft p50 ms", "ttft_ms", "p50"),
+    ("ttft p99 ms", "ttft_ms", "p99"),
+    ("itl p50 ms", "itl_ms", "p50"),
+    ("itl p99 ms", "itl_ms", "p99"),
+)
+
+
+@dataclass
+class RequestSample:
+    """One request as seen by the client (times relative to the end of warmup)"""
+    started: float
+    finished: float
+    latency_ms: float
+    error: Optional[str] = None
+    ttft_ms: Optional[float] = None
+    itl_ms: List[float] = field(default_factory=list)
+    tokens: int = 0
+    decode_tokens_per_s: Optional[float] = None
+
+
+def build_payload(workload: str, model: str, prompt_tokens: int, max_tokens: int, nonce: int) -> Dict[str, Any]:
+    """
+    Request body for a workload
+
+    The nonce at the start of the prompt keeps response caches (LiteLLM
+    cache, provider prompt caching) from short-circuiting requests.
+    """
+    words = [PROMPT_WORDS[(nonce + i) % len(PROMPT_WORDS)] for i in range(max(1, prompt_tokens - 8))]
+    text = f"Request {nonce}. " + " ".join(words)
+    if workload == "embeddings":
+        return {"model": model, "input": text}
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": f"{text}\nWrite a long story about the words above."}],
+        "max_tokens": max_tokens,
+    }
+    if workload == "stream":
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+    return payload
+
+
+def classify_error(error: BaseException) -> str:
+    """Short error kind for the error breakdown"""
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(error, HTTPProtocolError):
+        return "protocol"
+    if isinstance(error, ConnectionRefusedError):
+        return "refused"
+    if isinstance(error, OSError):
+        return "connection"
+    return type(error).__name__
+
+
+def build_report(samples: List[RequestSample], duration: float, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summarize the samples of the measured window (warmup requests excluded)
+
+    Returns:
+        JSON-serializable report
+    """
+    measured = [s for s in samples if s.started >= 0]
+    ok = [s for s in measured if s.error is None]
+    errors: Dict[str, int] = {}
+    for sample in measured:
+        if sample.error:
+            errors[sample.error] = errors.get(sample.error, 0) + 1
+    # Requests started in the window may finish after it
+    elapsed = max([duration] + [s.finished for s in ok])
+
+    return {
+        "version": REPORT_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": config,
+        "elapsed_s": round(elapsed, 3),
+        "requests": len(measured),
+        "ok": len(ok),
+        "failed": len(measured) - len(ok),
+        "rps": len(ok) / elapsed if elapsed else 0.0,
+        "tokens_per_s": sum(s.tokens for s in ok) / elapsed if elapsed else 0.0,
+        "error_rate": 100.0 * (len(measured) - len(ok)) / len(measured) if measured else 0.0,
+        "errors": dict(sorted(errors.items(), key=lambda item: -item[1])),
+        "latency_ms": summarize([s.latency_ms for s in ok], BENCH_PERCENTILES),
+        "ttft_ms": summarize([s.ttft_ms for s in ok if s.ttft_ms is not None], BENCH_PERCENTILES),
+        "itl_ms": summarize([gap for s in ok for gap in s.itl_ms], BENCH_PERCENTILES),
+        "request_tokens_per_s": summarize(
+            [s.decode_tokens_per_s for s in ok if s.decode_tokens_per_s is not None], BENCH_PERCENTILES
+        ),
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Tuple[str, float, float]]:
+    """
+    Rows of a run-to-run comparison
+
+    Returns:
+        (label, baseline value, current value) for every metric both runs have
+    """
+    rows = []
+    for label, key, sub in COMPARE_ROWS:
+        before, after = baseline.get(key), current.get(key)
+        if sub:
+            if not before or not after or not before.get("count") or not after.get("count"):
+                continue
+            before, after = before.get(sub), after.get(sub)
+        if isinstance(before, (int, float)) and isinstance(after, (int, float)):
+            rows.append((label, float(before), float(after)))
+    return rows
+
+
+class BenchService:
+    """Service for load testing the gateway API"""
+    
+    def __init__(self, project_root: Path):
+        """
+        Initialize load benchmark service
+        
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.utils = self._import_utils()
+    
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import print_header, print_info, print_success, print_warning, print_error, read_env_file
+        return SimpleNamespace(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+            read_env_file=read_env_file,
+        )
+    
+    def resolve_endpoint(self, target: str = "auto") -> Tuple[Optional[str], Optional[str]]:
+        """
+        API base URL and key from .env
+        
+        Args:
+            target: "nginx" (/api/litellm/v1 path), "litellm" (LiteLLM port
+                directly, bypassing nginx) or "auto" (what clients use)
+        
+        Returns:
+            Tuple of (api_base, api_key); api_base is None if the target is not available
+        """
+        from .continue_dev_service import ContinueDevService
+        
+        api_base, virtual_key, use_nginx = ContinueDevService(self.project_root).get_api_config_from_env()
+        env_vars = self.utils.read_env_file(self.project_root / ".env")
+        api_key = virtual_key or env_vars.get("LITELLM_MASTER_KEY")
+        if target == "nginx" and not use_nginx:
+            return None, api_key
+        if target == "litellm" and use_nginx:
+            port = env_vars.get("LITELLM_EXTERNAL_PORT", "").strip() or "4000"
+            return f"http://localhost:{port}/v1", api_key
+        return api_base, api_key
+    
+    async def discover_model(self, client: AsyncHTTPClient, workload: str) -> Optional[str]:
+        """First model from /models that fits the workload (embedding model or not)"""
+        try:
+            status, _, body = await client.request("GET", "/models")
+        except (asyncio.TimeoutError, HTTPProtocolError, OSError) as e:
+            self.utils.print_error(
+                f"GET /models failed ({classify_error(e)}: {e or 'no response'}) - is the stack running?"
+            )
+            return None
+        if status != 200:
+            logger.warning(f"GET /models returned {status}")
+            return None
+        try:
+            models = [item["id"] for item in json.loads(body).get("data", [])]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+        wants_embedding = workload == "embeddings"
+        for model in models:
+            if ("embed" in model.lower()) == wants_embedding:
+                return model
+        return None
+    
+    async def send(
+        self,
+        client: AsyncHTTPClient,
+        workload: str,
+        body: Optional[bytes],
+        scheduled: float,
+        window_start: float,
+        path: Optional[str] = None,
+        method: str = "POST",
+    ) -> RequestSample:
+        """
+        Send one request and time it
+        
+        Args:
+            client: HTTP client
+            workload: "chat", "stream" or "embeddings" (how the response is read)
+            body: Encoded request body
+            scheduled: Event loop time the request was due (open loop: its
+                arrival time, so client-side queueing counts as latency)
+            window_start: Event loop time the measured window opens
+            path: Path relative to the API base (default: from the workload)
+            method: HTTP method
+        
+        Returns:
+            RequestSample (never raises for request failures)
+        """
+        loop = asyncio.get_running_loop()
+        content_times: List[float] = []
+        stream_state: Dict[str, Any] = {"usage": 0, "error": None}
+        parser = SSEParser()
+        
+        def on_chunk(data: bytes, at: float) -> None:
+            for event in parser.feed(data):
+                if event == "[DONE]":
+                    continue
+                try:
+                    chunk = json.loads(event)
+                except ValueError:
+                    continue
+                if not isinstance(chunk, dict):
+                    continue
+                if chunk.get("error"):
+                    stream_state["error"] = "stream_error"
+                # OpenAI usage chunk, or Anthropic message_delta
+                usage = chunk.get("usage") or {}
+                if usage.get("completion_tokens") or usage.get("output_tokens"):
+                    stream_state["usage"] = usage.get("completion_tokens") or usage["output_tokens"]
+                if chunk.get("type") == "content_block_delta":
+                    content_times.append(at)
+                elif any((choice.get("delta") or {}).get("content") for choice in chunk.get("choices") or []):
+                    content_times.append(at)
+        
+        if path is None:
+            path = "/embeddings" if workload == "embeddings" else "/chat/completions"
+        error = None
+        status, raw = 0, b""
+        try:
+            status, _, raw = await client.request(
+                method, path, body, {"Content-Type": "application/json"} if body is not None else {},
+                on_chunk if workload == "stream" else None,
+            )
+        except (asyncio.TimeoutError, HTTPProtocolError, OSError) as e:
+            error = classify_error(e)
+        end = loop.time()
+        
+        sample = RequestSample(
+            started=scheduled - window_start,
+            finished=end - window_start,
+            latency_ms=(end - scheduled) * 1000.0,
+            error=error,
+        )
+        if error:
+            return sample
+        if status != 200:
+            sample.error = f"http_{status}"
+            return sample
+        
+        if workload == "stream":
+            sample.error = stream_state["error"]
+            if content_times:
+                sample.ttft_ms = (content_times[0] - scheduled) * 1000.0
+                sample.itl_ms = [(b - a) * 1000.0 for a, b in zip(content_times, content_times[1:])]
+            sample.tokens = stream_state["usage"] or len(content_times)
+            decode_s = content_times[-1] - content_times[0] if len(content_times) > 1 else 0.0
+            if decode_s > 0:
+                sample.decode_tokens_per_s = (sample.tokens - 1) / decode_s
+            return sample
+        
+        try:
+            usage = json.loads(raw).get("usage") or {}
+        except (ValueError, AttributeError):
+            sample.error = "bad_json"
+            return sample
+        # Embeddings have only input tokens; Anthropic reports output_tokens
+        if workload == "embeddings":
+            sample.tokens = int(usage.get("prompt_tokens") or 0)
+        else:
+            sample.tokens = int(usage.get("completion_tokens") or usage.get("output_tokens") or 0)
+        if workload == "chat" and sample.latency_ms > 0:
+            sample.decode_tokens_per_s = sample.tokens / (sample.latency_ms / 1000.0)
+        return sample
+    
+    async def closed_loop(
+        self,
+        send: Callable[[float], Awaitable[RequestSample]],
+        concurrency: int,
+        deadline: float,
+    ) -> List[RequestSample]:
+        """Each of `concurrency` clients sends its next request when the previous one finished"""
+        loop = asyncio.get_running_loop()
+        samples: List[RequestSample] = []
+        
+        async def client() -> None:
+            while loop.time() < deadline:
+                samples.append(await send(loop.time()))
+        
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return samples
+    
+    async def open_loop(
+        self,
+        send: Callable[[float], Awaitable[RequestSample]],
+        rate: float,
+        deadline: float,
+        window_start: float,
+        max_in_flight: int,
+        seed: int,
+    ) -> List[RequestSample]:
+        """
+        Poisson arrivals at `rate` per second, independent of response times
+        
+        Latency is measured from the arrival time, so a slow gateway cannot
+        hide behind a client that waits for it (coordinated omission).
+        """
+        loop = asyncio.get_running_loop()
+        rng = random.Random(seed)
+        samples: List[RequestSample] = []
+        in_flight: set = set()
+        
+        def done(task: "asyncio.Future") -> None:
+            in_flight.discard(task)
+            if not task.cancelled():
+                samples.append(task.result())
+        
+        arrival = loop.time()
+        while arrival < deadline:
+            delay = arrival - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= max_in_flight:
+                offset = arrival - window_start
+                samples.append(RequestSample(started=offset, finished=offset, latency_ms=0.0, error="dropped"))
+            else:
+                task = asyncio.ensure_future(send(arrival))
+                in_flight.add(task)
+                task.add_done_callback(done)
+            arrival += rng.expovariate(rate)
+        if in_flight:
+            await asyncio.wait(list(in_flight))
+        return samples
+    
+    async def _run_load(
+        self,
+        api_base: str,
+        api_key: str,
+        workload: str,
+        model: Optional[str],
+        duration: float,
+        warmup: float,
+        concurrency: int,
+        rate: Optional[float],
+        prompt_tokens: int,
+        max_tokens: int,
+        timeout: float,
+        seed: int,
+    ) -> Tuple[Optional[str], List[RequestSample], int]:
+        """
+        Run the load on one event loop
+        
+        Returns:
+            Tuple of (model, samples, connections opened); model is None if
+            no model could be chosen
+        """
+        client = AsyncHTTPClient(api_base, timeout=timeout, headers={"Authorization": f"Bearer {api_key}"})
+        try:
+            if not model:
+                model = await self.discover_model(client, workload)
+                if not model:
+                    return None, [], 0
+            
+            loop = asyncio.get_running_loop()
+            window_start = loop.time() + warmup
+            deadline = window_start + duration
+            counter = [0]
+            
+            async def send(scheduled: float) -> RequestSample:
+                counter[0] += 1
+                payload = build_payload(workload, model, prompt_tokens, max_tokens, seed * 1000003 + counter[0])
+                body = json.dumps(payload).encode("utf-8")
+                return await self.send(client, workload, body, scheduled, window_start)
+            
+            if rate:
+                samples = await self.open_loop(send, rate, deadline, window_start, BENCH_MAX_IN_FLIGHT, seed)
+            else:
+                samples = await self.closed_loop(send, concurrency, deadline)
+            return model, samples, client.connections_opened
+        finally:
+            client.close()
+    
+    def print_report(self, report: Dict[str, Any]) -> None:
+        """Print the summary table"""
+        config = report["config"]
+        tokens_label = "input tokens/s" if config["workload"] == "embeddings" else "output tokens/s"
+        print(
+            f"{report['ok']} ok, {report['failed']} failed in {report['elapsed_s']:.1f}s: "
+            f"{report['rps']:.1f} req/s, {report['tokens_per_s']:.0f} {tokens_label}"
+        )
+        print()
+        columns = ["count", "mean"] + [f"p{p:g}" for p in BENCH_PERCENTILES] + ["max"]
+        print(f"{'metric':<16}" + "".join(f"{name:>9}" for name in columns))
+        for label, key in (
+            ("latency ms", "latency_ms"),
+            ("ttft ms", "ttft_ms"),
+            ("itl ms", "itl_ms"),
+            ("tok/s/request", "request_tokens_per_s"),
+        ):
+            summary = report[key]
+            if not summary["count"]:
+                continue
+            print(f"{label:<16}" + "".join(
+                f"{summary[name]:>9.0f}" if name == "count" else f"{summary[name]:>9.1f}" for name in columns
+            ))
+        print()
+        if report["errors"]:
+            self.utils.print_warning(
+                "Errors: " + ", ".join(f"{kind} {count}" for kind, count in report["errors"].items())
+            )
+    
+    def print_comparison(self, baseline: Dict[str, Any], report: Dict[str, Any]) -> None:
+        """Print current vs. baseline run"""
+        settings = ("workload", "mode", "concurrency", "rate", "target", "model", "max_tokens")
+        differs = [
+            name for name in settings
+            if baseline.get("config", {}).get(name) != report["config"].get(name)
+        ]
+        if differs:
+            self.utils.print_warning(f"Runs differ in: {', '.join(differs)}")
+        print(f"{'metric':<16} {'baseline':>10} {'current':>10} {'change':>8}")
+        for label, before, after in compare_reports(baseline, report):
+            change = f"{(after - before) / before * 100.0:+.1f}%" if before else "-"
+            print(f"{label:<16} {before:>10.1f} {after:>10.1f} {change:>8}")
+        print()
+    
+    def run(
+        self,
+        workload: str = "chat",
+        target: str = "auto",
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        duration: float = BENCH_DURATION_S,
+        warmup: float = BENCH_WARMUP_S,
+        concurrency: int = BENCH_CONCURRENCY,
+        rate: Optional[float] = None,
+        prompt_tokens: int = BENCH_PROMPT_TOKENS,
+        max_tokens: int = BENCH_MAX_TOKENS,
+        timeout: float = BENCH_REQUEST_TIMEOUT_S,
+        seed: int = 1,
+        json_path: Optional[Path] = None,
+        compare_path: Optional[Path] = None,
+    ) -> int:
+        """
+        Run the load and report
+        
+        Args:
+            workload: "chat", "stream" (SSE, measures TTFT and inter-token
+                latency) or "embeddings"
+            target: "auto", "nginx" or "litellm" (see resolve_endpoint)
+            base_url: API base URL instead of the one from .env
+            api_key: API key instead of the one from .env
+            model: Model name (default: first suitable model from /models)
+            duration: Measured seconds
+            warmup: Seconds of load before measuring
+            concurrency: Closed loop clients
+            rate: Open loop arrivals per second (replaces concurrency)
+            prompt_tokens: Approximate prompt size
+            max_tokens: max_tokens of chat requests
+            timeout: Per-request deadline in seconds
+            seed: Seed for arrivals and prompts (repeatable runs)
+            json_path: Write the report here
+            compare_path: Report of an earlier run to compare with
+        
+        Returns:
+            Exit code (0 if any request succeeded)
+        """
+        self.utils.print_header("🏋️  API Load Benchmark")
+        print()
+        
+        baseline = None
+        if compare_path:
+            try:
+                baseline = json.loads(Path(compare_path).read_text(encoding="utf-8"))
+            except (IOError, OSError, ValueError) as e:
+                self.utils.print_error(f"Cannot read {compare_path}: {e}")
+                return 1
+        
+        if not (base_url and api_key):
+            env_base, env_key = self.resolve_endpoint(target)
+            base_url = base_url or env_base
+            api_key = api_key or env_key
+        api_base = base_url
+        if not api_base:
+            self.utils.print_error(f"No {target} endpoint in .env (run ./ai-gateway setup or pass --base-url)")
+            return 1
+        if not api_key:
+            self.utils.print_error("API key not found in .env (pass --key)")
+            return 1
+        
+        mode = f"open loop, {rate:g} req/s" if rate else f"closed loop, {concurrency} client(s)"
+        self.utils.print_info(f"Target: {api_base}")
+        self.utils.print_info(f"Workload: {workload}, {mode}, {warmup:g}s warmup + {duration:g}s")
+        
+        model, samples, connections = asyncio.run(self._run_load(
+            api_base, api_key, workload, model, duration, warmup, concurrency, rate,
+            prompt_tokens, max_tokens, timeout, seed,
+        ))
+        if not model:
+            self.utils.print_error(f"No {workload} model found via {api_base}/models (pass --model)")
+            return 1
+        self.utils.print_info(f"Model: {model}, {connections} connection(s) opened")
+        print()
+        
+        config = {
+            "workload": workload,
+            "mode": "open" if rate else "closed",
+            "concurrency": None if rate else concurrency,
+            "rate": rate,
+            "target": target,
+            "api_base": api_base,
+            "model": model,
+            "duration_s": duration,
+            "warmup_s": warmup,
+            "prompt_tokens": prompt_tokens,
+            "max_tokens": max_tokens,
+            "seed": seed,
+        }
+        report = build_report(samples, duration, config)
+        self.print_report(report)
+        if baseline:
+            self.print_comparison(baseline, report)
+        
+        if json_path:
+            Path(json_path).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+            self.utils.print_info(f"Report written to {json_path}")
+        
+        if not report["ok"]:
+            self.utils.print_error("No successful requests - is the stack running?")
+            return 1
+        self.utils.print_success(f"{report['rps']:.1f} req/s sustained")
+        return 0
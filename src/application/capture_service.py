@@ -0,0 +1,282 @@
+"""
+Traffic capture - record API requests at nginx in a replayable format
+
+Capture format (JSON Lines, one request per line, in arrival order):
+
+    {"v": 1, "ts": 1760000000.125, "route": "/v1/chat/completions",
+     "method": "POST", "key_hash": "9f2c0e1ab3d47c55", "model": "gpt-5-mini",
+     "body_bytes": 1834, "stream": true, "status": 200, "duration_s": 3.412,
+     "body": {...}}
+
+ts is the arrival time (Unix seconds), route is relative to the API base,
+key_hash identifies the API key without revealing it, status and duration_s
+are what the gateway answered at capture time. body is present only when
+captured with bodies: "redacted" keeps the structure, numbers, flags and
+model but replaces text with filler of the same length, "full" keeps it as
+sent.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from ..core.constants import (
+    NGINX_CONTAINER_NAME, NGINX_VHOST_FILE, CAPTURE_FLAG_FILE, CAPTURE_FLAG_CONTAINER_PATH,
+    CAPTURE_LOG_FILE, CAPTURE_LOG_CONTAINER_PATH, CAPTURE_OUTPUT_FILE, CAPTURE_FORMAT_VERSION
+)
+from ..core.exceptions import DockerError
+from ..core.key_accounting import key_hash
+from ..infrastructure.docker_client import DockerClient
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+BODY_MODES = ("none", "redacted", "full")
+API_PREFIX = "/api/litellm"
+
+# String fields kept as-is in redacted bodies (everything else is filler)
+REDACT_KEEP_KEYS = frozenset((
+    "model", "role", "type", "encoding_format", "tool_choice", "reasoning_effort", "service_tier",
+))
+
+
+def redact(value: Any, key: Optional[str] = None) -> Any:
+    """Replace text in a request body with filler of the same length"""
+    if isinstance(value, dict):
+        return {k: redact(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(item, key) for item in value]
+    if isinstance(value, str) and key not in REDACT_KEEP_KEYS:
+        return "x" * len(value)
+    return value
+
+
+def parse_log_line(line: str, body_mode: str = "redacted") -> Optional[Dict[str, Any]]:
+    """
+    Convert one line of the nginx capture log to a capture record
+
+    Args:
+        line: Line in the `capture` log_format of the generated nginx config
+        body_mode: "none", "redacted" or "full"
+
+    Returns:
+        Capture record, or None for lines that cannot be parsed
+    """
+    try:
+        raw = json.loads(line)
+        finished = float(raw["msec"])
+        duration = float(raw.get("request_time") or 0.0)
+        uri = raw["uri"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+    path, _, query = uri.partition("?")
+    route = path[len(API_PREFIX):] if path.startswith(API_PREFIX) else path
+    text = raw.get("body") or ""
+    body = None
+    if text:
+        try:
+            body = json.loads(text)
+        except ValueError:
+            body = None
+    fields = body if isinstance(body, dict) else {}
+    try:
+        body_bytes = len(text.encode("utf-8")) if text else int(raw.get("content_length") or 0)
+    except ValueError:
+        body_bytes = 0
+
+    record = {
+        "v": CAPTURE_FORMAT_VERSION,
+        "ts": round(finished - duration, 3),
+        "route": route,
+        "method": raw.get("method") or "POST",
+        "key_hash": key_hash(raw.get("key") or ""),
+        "model": fields.get("model"),
+        "body_bytes": body_bytes,
+        "stream": fields.get("stream") is True or "stream=true" in query,
+        "status": int(raw["status"]) if str(raw.get("status", "")).isdigit() else None,
+        "duration_s": duration,
+    }
+    if body is not None and body_mode == "full":
+        record["body"] = body
+    elif body is not None and body_mode == "redacted":
+        record["body"] = redact(body)
+    return record
+
+
+def convert_log(lines: Iterable[str], body_mode: str = "redacted") -> Iterator[Dict[str, Any]]:
+    """Capture records from nginx capture log lines, in arrival order"""
+    records = [record for record in (parse_log_line(line, body_mode) for line in lines if line.strip()) if record]
+    # nginx logs when a request finishes; long streams are logged after later short requests
+    records.sort(key=lambda record: record["ts"])
+    return iter(records)
+
+
+class CaptureService:
+    """Service for switching the nginx traffic capture and exporting it"""
+    
+    def __init__(self, project_root: Path):
+        """
+        Initialize capture service
+        
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.docker_client = DockerClient()
+        self.utils = self._import_utils()
+        self.flag_path = self.project_root / CAPTURE_FLAG_FILE
+        self.log_path = self.project_root / CAPTURE_LOG_FILE
+    
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import print_header, print_info, print_success, print_warning, print_error
+        return SimpleNamespace(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+        )
+    
+    def _hook_in_config(self) -> bool:
+        """Whether the generated nginx config has the capture log"""
+        try:
+            return CAPTURE_FLAG_CONTAINER_PATH in (self.project_root / NGINX_VHOST_FILE).read_text(encoding="utf-8")
+        except (IOError, OSError):
+            return False
+    
+    def is_active(self) -> bool:
+        """Whether nginx is capturing right now"""
+        return self.flag_path.exists()
+    
+    def _read_log(self) -> Tuple[Optional[str], str]:
+        """
+        Contents of the capture log
+        
+        Read on the host; through the container when the file is not
+        readable here (created by nginx as another user).
+        
+        Returns:
+            Tuple of (text or None, where it was read from)
+        """
+        try:
+            return self.log_path.read_text(encoding="utf-8", errors="replace"), str(self.log_path)
+        except FileNotFoundError:
+            return "", str(self.log_path)
+        except (IOError, OSError):
+            pass
+        try:
+            return self.docker_client.exec_in_container(
+                NGINX_CONTAINER_NAME, ["cat", CAPTURE_LOG_CONTAINER_PATH], timeout=300
+            ), NGINX_CONTAINER_NAME
+        except DockerError as e:
+            logger.debug(f"Cannot read capture log in container: {e}")
+            return None, NGINX_CONTAINER_NAME
+    
+    def _truncate_log(self) -> None:
+        """Empty the capture log (nginx keeps it open, so truncate instead of delete)"""
+        try:
+            with open(self.log_path, "w", encoding="utf-8"):
+                pass
+            return
+        except FileNotFoundError:
+            return
+        except (IOError, OSError):
+            pass
+        try:
+            self.docker_client.exec_in_container(
+                NGINX_CONTAINER_NAME, ["sh", "-c", f": > {CAPTURE_LOG_CONTAINER_PATH}"], timeout=30
+            )
+        except DockerError as e:
+            self.utils.print_warning(f"Could not empty {CAPTURE_LOG_FILE} ({e}) - it still holds raw request bodies")
+    
+    def start(self) -> int:
+        """
+        Start capturing (new API requests are logged by nginx)
+        
+        Returns:
+            Exit code (0 on success)
+        """
+        self.utils.print_header("🎥 Traffic Capture")
+        print()
+        if not self._hook_in_config():
+            self.utils.print_error(
+                "nginx config has no capture log (generated before capture support, or nginx "
+                "is not in use) - re-run ./setup.sh to regenerate it"
+            )
+            return 1
+        if self.is_active():
+            self.utils.print_info("Capture is already running")
+            return 0
+        self.flag_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flag_path.write_text(f"{time.time()}\n", encoding="utf-8")
+        self.utils.print_success("Capturing API requests at nginx")
+        self.utils.print_warning(
+            f"Until `capture stop`, {CAPTURE_LOG_FILE} holds request bodies and the last "
+            "characters of API keys"
+        )
+        return 0
+    
+    def stop(self, output: Optional[Path] = None, body_mode: str = "redacted") -> int:
+        """
+        Stop capturing and convert the nginx log to the capture format
+        
+        The raw log is emptied afterwards. Records are appended to output, so
+        several capture sessions can go into one file.
+        
+        Args:
+            output: Capture file (default CAPTURE_OUTPUT_FILE)
+            body_mode: "none", "redacted" or "full"
+        
+        Returns:
+            Exit code (0 on success)
+        """
+        self.utils.print_header("🎥 Traffic Capture")
+        print()
+        was_active = self.is_active()
+        try:
+            self.flag_path.unlink()
+        except FileNotFoundError:
+            pass
+        if was_active:
+            # Requests checked the flag on arrival; give running ones a moment to be logged
+            time.sleep(1.0)
+        
+        text, source = self._read_log()
+        if text is None:
+            self.utils.print_error(f"Cannot read the capture log ({source})")
+            return 1
+        records = list(convert_log(text.splitlines(), body_mode))
+        if not records:
+            self.utils.print_info("No captured requests")
+            self._truncate_log()
+            return 0
+        
+        output = Path(output) if output else self.project_root / CAPTURE_OUTPUT_FILE
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        if body_mode != "none":
+            output.chmod(0o600)
+        self._truncate_log()
+        
+        span = records[-1]["ts"] - records[0]["ts"]
+        keys = len({record["key_hash"] for record in records if record["key_hash"]})
+        self.utils.print_success(
+            f"{len(records)} request(s) over {span:.0f}s from {keys} key(s) written to {output}"
+        )
+        self.utils.print_info(f"Replay: ./ai-gateway replay {output}")
+        return 0
+    
+    def status(self) -> int:
+        """Print whether capture is running and how much is buffered"""
+        try:
+            size = self.log_path.stat().st_size
+        except (IOError, OSError):
+            size = 0
+        state = "running" if self.is_active() else "stopped"
+        self.utils.print_info(f"Capture {state}, {size / 1024:.0f} KB in {CAPTURE_LOG_FILE}")
+        return 0
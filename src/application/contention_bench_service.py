@@ -0,0 +1,272 @@
+"""
+Contention benchmark service - API latency with and without Open WebUI ingestion load
+"""
+
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ..core.constants import (
+    LITELLM_CONTAINER_NAME, OPEN_WEBUI_CONTAINER_NAME, DOCKER_UP_TIMEOUT
+)
+from ..core.exceptions import DockerError
+from ..core.stats import summarize
+from ..infrastructure.docker_client import DockerClient
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Runs inside the Open WebUI container: N processes of hashing, chunking and
+# float math - the CPU profile of embedding documents, without needing a model
+SYNTHETIC_INGEST_SCRIPT = (
+    "import hashlib,multiprocessing,os,sys,time\n"
+    "def burn(deadline):\n"
+    "    data=os.urandom(1<<20)\n"
+    "    while time.time()<deadline:\n"
+    "        chunks=[data[i:i+4096] for i in range(0,len(data),4096)]\n"
+    "        vec=[sum(hashlib.sha256(c).digest())/8160.0 for c in chunks]\n"
+    "        sum(v*v for v in vec)\n"
+    "if __name__=='__main__':\n"
+    "    deadline=time.time()+float(sys.argv[1])\n"
+    "    procs=[multiprocessing.Process(target=burn,args=(deadline,)) for _ in range(int(sys.argv[2]))]\n"
+    "    [p.start() for p in procs]\n"
+    "    [p.join() for p in procs]\n"
+)
+
+
+class ContentionBenchService:
+    """Service for measuring API tail latency under Open WebUI ingestion load"""
+
+    def __init__(self, project_root: Path):
+        """
+        Initialize contention benchmark service
+
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.docker_client = DockerClient()
+        self.utils = self._import_utils()
+
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import (
+            print_header, print_info, print_success, print_warning, print_error, Colors,
+            read_env_file
+        )
+        return SimpleNamespace(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+            Colors=Colors,
+            read_env_file=read_env_file,
+        )
+
+    def get_endpoints(self) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Get API base, virtual key and Open WebUI URL from .env
+
+        Returns:
+            Tuple of (api_base, virtual_key, webui_url)
+        """
+        from .continue_dev_service import ContinueDevService
+
+        api_base, virtual_key, use_nginx = ContinueDevService(self.project_root).get_api_config_from_env()
+        env_vars = self.utils.read_env_file(self.project_root / ".env")
+        if use_nginx:
+            port = env_vars.get("NGINX_HTTP_PORT", "").strip() or env_vars.get("NGINX_PORT", "").strip()
+        else:
+            port = env_vars.get("WEBUI_EXTERNAL_PORT", "").strip()
+        webui_url = f"http://localhost:{port}" if port else None
+        return api_base, virtual_key or env_vars.get("LITELLM_MASTER_KEY"), webui_url
+
+    def _api_request(self, url: str, api_key: str) -> Optional[float]:
+        """Send one API request, return latency in ms (None on error)"""
+        request = urllib.request.Request(url, headers={"Authorization": f"Bearer {api_key}"})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                if response.status != 200:
+                    return None
+        except (urllib.error.URLError, ConnectionError, OSError):
+            return None
+        return (time.perf_counter() - start) * 1000.0
+
+    def drive_api_load(self, api_base: str, api_key: str, duration: float, concurrency: int) -> Tuple[List[float], int]:
+        """
+        Closed-loop API load for a fixed duration
+
+        Each client sends GET /models (auth, key lookup and routing in
+        LiteLLM workers, no upstream cost) back to back.
+
+        Returns:
+            Tuple of (latencies_ms, error_count)
+        """
+        url = f"{api_base.rstrip('/')}/models"
+        deadline = time.monotonic() + duration
+        latencies: List[float] = []
+        errors = [0]
+        lock = threading.Lock()
+
+        def client() -> None:
+            while time.monotonic() < deadline:
+                latency = self._api_request(url, api_key)
+                with lock:
+                    if latency is None:
+                        errors[0] += 1
+                    else:
+                        latencies.append(latency)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(client)
+        return latencies, errors[0]
+
+    def _synthetic_ingest(self, duration: float, processes: int) -> None:
+        """Run the synthetic ingestion job inside the Open WebUI container"""
+        self.docker_client.exec_in_container(
+            OPEN_WEBUI_CONTAINER_NAME,
+            ["python", "-c", SYNTHETIC_INGEST_SCRIPT, str(duration), str(processes)],
+            timeout=int(duration) + DOCKER_UP_TIMEOUT,
+        )
+
+    def _document_ingest(self, webui_url: str, token: str, document: Path, duration: float) -> int:
+        """
+        Upload a document to Open WebUI repeatedly (parsing, chunking, embedding)
+
+        Returns:
+            Number of completed uploads
+        """
+        content = document.read_bytes()
+        deadline = time.monotonic() + duration
+        uploads = 0
+        while time.monotonic() < deadline:
+            boundary = uuid.uuid4().hex
+            body = (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="file"; filename="{document.name}"\r\n'
+                "Content-Type: application/octet-stream\r\n\r\n"
+            ).encode("utf-8") + content + f"\r\n--{boundary}--\r\n".encode("utf-8")
+            request = urllib.request.Request(
+                f"{webui_url.rstrip('/')}/api/v1/files/",
+                data=body,
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": f"multipart/form-data; boundary={boundary}",
+                },
+                method="POST",
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=300) as response:
+                    response.read()
+                uploads += 1
+            except (urllib.error.URLError, ConnectionError, OSError) as e:
+                logger.warning(f"Document upload failed: {e}")
+                time.sleep(1)
+        return uploads
+
+    def describe_cpu_settings(self) -> Dict[str, str]:
+        """Current cpuset/cpus/cpu_shares of LiteLLM and Open WebUI containers"""
+        settings = {}
+        for name in (LITELLM_CONTAINER_NAME, OPEN_WEBUI_CONTAINER_NAME):
+            details = self.docker_client.inspect_container(name)
+            if details is None:
+                settings[name] = "not running"
+                continue
+            host_config = details.get("HostConfig") or {}
+            settings[name] = (
+                f"cpuset={host_config.get('CpusetCpus') or '-'} "
+                f"cpus={(host_config.get('NanoCpus') or 0) / 1e9:g} "
+                f"shares={host_config.get('CpuShares') or '-'}"
+            )
+        return settings
+
+    def run(
+        self,
+        duration: float = 30.0,
+        concurrency: int = 8,
+        ingest_processes: int = 2,
+        webui_token: Optional[str] = None,
+        document: Optional[Path] = None,
+    ) -> int:
+        """
+        Measure API latency alone, then alongside the ingestion job
+
+        Returns:
+            Exit code (0 on success)
+        """
+        self.utils.print_header("📊 API Latency under Ingestion Load")
+        print()
+
+        api_base, api_key, webui_url = self.get_endpoints()
+        if not api_base or not api_key:
+            self.utils.print_error("API base URL or key not found in .env (run ./ai-gateway setup)")
+            return 1
+        if document and not (webui_token and webui_url):
+            self.utils.print_error("--document needs --webui-token and Open WebUI port in .env")
+            return 1
+
+        for name, value in self.describe_cpu_settings().items():
+            self.utils.print_info(f"{name}: {value}")
+        ingest_kind = f"upload of {document.name}" if document else f"synthetic, {ingest_processes} process(es)"
+        self.utils.print_info(f"API: {api_base}, {concurrency} clients, {duration:.0f}s per phase")
+        self.utils.print_info(f"Ingestion: {ingest_kind}")
+        print()
+
+        self.utils.print_info("Phase 1: API only...")
+        baseline, baseline_errors = self.drive_api_load(api_base, api_key, duration, concurrency)
+
+        self.utils.print_info("Phase 2: API + ingestion...")
+        ingest_error: List[Exception] = []
+
+        def ingest() -> None:
+            try:
+                if document:
+                    uploads = self._document_ingest(webui_url, webui_token, document, duration)
+                    logger.info(f"Completed {uploads} document upload(s)")
+                else:
+                    self._synthetic_ingest(duration, ingest_processes)
+            except (DockerError, IOError, OSError) as e:
+                ingest_error.append(e)
+
+        ingest_thread = threading.Thread(target=ingest, daemon=True)
+        ingest_thread.start()
+        # Let ingestion ramp up before measuring
+        time.sleep(2)
+        loaded, loaded_errors = self.drive_api_load(api_base, api_key, duration, concurrency)
+        ingest_thread.join(timeout=duration + DOCKER_UP_TIMEOUT)
+
+        if ingest_error:
+            self.utils.print_error(f"Ingestion job failed: {ingest_error[0]}")
+            return 1
+        if not baseline or not loaded:
+            self.utils.print_error("No successful API requests - is the stack running?")
+            return 1
+
+        base = summarize(baseline)
+        load = summarize(loaded)
+        print()
+        print(f"{'phase':<12} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for label, summary, errors in (("api only", base, baseline_errors), ("+ ingest", load, loaded_errors)):
+            print(
+                f"{label:<12} {summary['count'] / duration:>8.1f} {summary['p50']:>8.1f} "
+                f"{summary['p90']:>8.1f} {summary['p99']:>8.1f} {errors:>7}"
+            )
+        print()
+
+        ratio = load["p99"] / base["p99"] if base["p99"] else 0.0
+        message = f"p99 under ingestion: {ratio:.2f}x of baseline"
+        if ratio > 2.0:
+            self.utils.print_warning(f"{message} - API path is not isolated from Open WebUI")
+            self.utils.print_info("Re-run ./ai-gateway setup to apply cpuset allocation, or set cpuset in resource-profile.json overrides")
+        else:
+            self.utils.print_success(message)
+        return 0
@@ -0,0 +1,293 @@
+"""
+Graceful drain - stop new API requests at nginx and wait for in-flight ones
+"""
+
+import ipaddress
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence, Set, Tuple
+from ..core.constants import (
+    DEFAULT_LITELLM_PORT, NGINX_CONTAINER_NAME, NGINX_VHOST_FILE, DRAIN_FLAG_FILE,
+    DRAIN_FLAG_CONTAINER_PATH, DRAIN_TIMEOUT_S, DRAIN_POLL_INTERVAL_S
+)
+from ..core.exceptions import DockerError
+from ..infrastructure.docker_client import DockerClient
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+# /proc/net/tcp state of an established connection
+TCP_ESTABLISHED = "01"
+
+
+def decode_proc_address(address: str) -> Tuple[str, int]:
+    """
+    Decode an address from /proc/net/tcp{,6} ("0100007F:0FA0")
+
+    The hex address is stored as 32-bit words in host (little-endian) byte
+    order; IPv4-mapped IPv6 addresses are returned as plain IPv4.
+
+    Returns:
+        (ip, port)
+    """
+    host, port = address.rsplit(":", 1)
+    raw = b"".join(bytes.fromhex(host[i:i + 8])[::-1] for i in range(0, len(host), 8))
+    if len(raw) == 16 and raw[:12] == b"\x00" * 10 + b"\xff\xff":
+        raw = raw[12:]
+    return str(ipaddress.ip_address(raw)), int(port, 16)
+
+
+def parse_proc_net_tcp(text: str, remote_port: int, remote_ip: Optional[str] = None) -> Set[str]:
+    """
+    Established connections to remote_port from /proc/net/tcp and tcp6
+
+    nginx does not keep upstream connections alive here, so every
+    established connection to LiteLLM is one request in flight.
+
+    Args:
+        text: Contents of /proc/net/tcp and /proc/net/tcp6
+        remote_port: Upstream port
+        remote_ip: Only count connections to this upstream address
+
+    Returns:
+        Set of "local remote" address pairs (hex, as in /proc)
+    """
+    connections = set()
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) < 4 or ":" not in parts[2]:
+            # Header line ("sl local_address rem_address st ...")
+            continue
+        local, remote, state = parts[1], parts[2], parts[3]
+        if state != TCP_ESTABLISHED:
+            continue
+        try:
+            ip, port = decode_proc_address(remote)
+        except ValueError:
+            continue
+        if port == remote_port and (remote_ip is None or ip == remote_ip):
+            connections.add(f"{local} {remote}")
+    return connections
+
+
+@dataclass
+class DrainResult:
+    """Outcome of a drain"""
+    in_flight: int
+    drained: int
+    cut: int
+    waited_s: float
+    gated: bool = True
+
+
+class DrainService:
+    """Service for draining in-flight LiteLLM requests before stop"""
+    
+    def __init__(self, project_root: Path):
+        """
+        Initialize drain service
+        
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.docker_client = DockerClient()
+        self.utils = self._import_utils()
+        self.flag_path = self.project_root / DRAIN_FLAG_FILE
+    
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import print_header, print_info, print_success, print_warning, print_error, read_env_file
+        return SimpleNamespace(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+            read_env_file=read_env_file,
+        )
+    
+    def litellm_port(self, env_vars: dict) -> int:
+        """LiteLLM port inside the Docker network (nginx upstream port)"""
+        try:
+            return int(env_vars.get("LITELLM_INTERNAL_PORT", str(DEFAULT_LITELLM_PORT)))
+        except ValueError:
+            return DEFAULT_LITELLM_PORT
+    
+    def _gate_in_config(self) -> bool:
+        """Whether the generated nginx config checks the maintenance flag"""
+        try:
+            return DRAIN_FLAG_CONTAINER_PATH in (self.project_root / NGINX_VHOST_FILE).read_text(encoding="utf-8")
+        except (IOError, OSError):
+            return False
+    
+    def enable_maintenance(self) -> None:
+        """Create the maintenance flag (nginx answers new API requests with 503)"""
+        self.flag_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flag_path.write_text(f"{time.time()}\n", encoding="utf-8")
+    
+    def clear_maintenance(self) -> None:
+        """Remove the maintenance flag"""
+        try:
+            self.flag_path.unlink()
+        except FileNotFoundError:
+            pass
+    
+    def active_connections(
+        self,
+        litellm_port: int,
+        remote_ip: Optional[str] = None,
+        container: str = NGINX_CONTAINER_NAME,
+    ) -> Optional[Set[str]]:
+        """
+        Connections from a container (nginx by default) to LiteLLM that are open right now
+        
+        Args:
+            litellm_port: LiteLLM port inside the Docker network
+            remote_ip: Only count connections to this LiteLLM container
+            container: Client container whose connections are read
+        
+        Returns:
+            Set of connection IDs, or None if the container is not running
+        """
+        try:
+            text = self.docker_client.exec_in_container(
+                container, ["cat", "/proc/net/tcp", "/proc/net/tcp6"], timeout=10
+            )
+        except DockerError as e:
+            logger.debug(f"Cannot read {container} connections: {e}")
+            return None
+        return parse_proc_net_tcp(text, litellm_port, remote_ip)
+    
+    def _poll(self, litellm_port: int, remote_ip: Optional[str], also_from: Sequence[str]) -> Optional[Set[str]]:
+        """nginx connections plus those of also_from containers that are running (None without nginx)"""
+        connections = self.active_connections(litellm_port, remote_ip)
+        if connections is None:
+            return None
+        for container in also_from:
+            found = self.active_connections(litellm_port, remote_ip, container)
+            connections |= {f"{container} {connection}" for connection in found or ()}
+        return connections
+    
+    def drain(self, timeout: float = DRAIN_TIMEOUT_S) -> Optional[DrainResult]:
+        """
+        Block new API requests and wait until in-flight requests finish
+        
+        See wait_idle for how requests are counted. The maintenance flag stays
+        in place (stop.sh removes it after compose down); it is removed if the
+        drain is interrupted.
+        
+        Args:
+            timeout: Deadline in seconds
+        
+        Returns:
+            DrainResult, or None if nginx is not in use or not running
+        """
+        env_vars = self.utils.read_env_file(self.project_root / ".env")
+        if env_vars.get("USE_NGINX", "no").lower() not in ("yes", "true", "1"):
+            self.utils.print_warning("nginx is not in use - nothing can hold back new requests, skipping drain")
+            return None
+        litellm_port = self.litellm_port(env_vars)
+        
+        gated = self._gate_in_config()
+        if not gated:
+            self.utils.print_warning(
+                "nginx config has no maintenance gate (generated before drain support) - "
+                "new requests are not blocked; re-run ./setup.sh to regenerate it"
+            )
+        
+        self.enable_maintenance()
+        try:
+            result = self.wait_idle(litellm_port, timeout)
+        except BaseException:
+            self.clear_maintenance()
+            raise
+        if result is None:
+            self.utils.print_info("nginx is not running - nothing to drain")
+            self.clear_maintenance()
+            return None
+        result.gated = gated
+        return result
+    
+    def wait_idle(
+        self,
+        litellm_port: int,
+        timeout: float = DRAIN_TIMEOUT_S,
+        remote_ip: Optional[str] = None,
+        also_from: Sequence[str] = (),
+    ) -> Optional[DrainResult]:
+        """
+        Wait until no request from nginx to LiteLLM is in flight
+        
+        A request counts as drained when its upstream connection closed before
+        the deadline, and as cut when it is still open at the deadline.
+        Connections of also_from containers (clients that reach LiteLLM
+        directly, e.g. Open WebUI) are waited for too; they may be idle
+        keep-alive connections, which close on the client's idle timeout.
+        
+        Args:
+            litellm_port: LiteLLM port inside the Docker network
+            timeout: Deadline in seconds
+            remote_ip: Only wait for connections to this LiteLLM container
+            also_from: More client containers (skipped when not running)
+        
+        Returns:
+            DrainResult, or None if nginx is not running
+        """
+        current = self._poll(litellm_port, remote_ip, also_from)
+        if current is None:
+            return None
+        
+        started = time.monotonic()
+        deadline = started + timeout
+        in_flight = len(current)
+        seen = set(current)
+        self.utils.print_info(f"Draining {in_flight} in-flight request(s) (deadline {timeout:.0f}s)...")
+        while current and time.monotonic() < deadline:
+            time.sleep(DRAIN_POLL_INTERVAL_S)
+            polled = self._poll(litellm_port, remote_ip, also_from)
+            if polled is None:
+                # nginx went away - whatever was still open is lost
+                logger.warning("nginx stopped during drain")
+                break
+            if len(polled) != len(current):
+                self.utils.print_info(f"{len(polled)} request(s) in flight")
+            current = polled
+            # Without the gate (old config) new requests keep arriving
+            seen |= current
+        
+        return DrainResult(
+            in_flight=in_flight,
+            drained=len(seen - current),
+            cut=len(current),
+            waited_s=round(time.monotonic() - started, 1),
+        )
+    
+    def run(self, timeout: float = DRAIN_TIMEOUT_S) -> int:
+        """
+        Drain and report
+        
+        Args:
+            timeout: Deadline in seconds
+        
+        Returns:
+            Exit code (0 on success, including requests cut at the deadline)
+        """
+        self.utils.print_header("🚦 Draining AI Gateway")
+        print()
+        result = self.drain(timeout)
+        if result is None:
+            return 0
+        
+        print()
+        message = (
+            f"Drained {result.drained} request(s) in {result.waited_s:.1f}s "
+            f"({result.in_flight} in flight at start)"
+        )
+        if result.cut:
+            self.utils.print_warning(f"{message}; {result.cut} still running at the deadline will be cut")
+        else:
+            self.utils.print_success(message)
+        return 0
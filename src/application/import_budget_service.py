@@ -0,0 +1,175 @@
+"""
+Import-time budget - `python -X importtime` cost of cheap CLI commands
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from ..core.constants import IMPORT_BUDGET_RATIO, IMPORT_BUDGET_REFERENCE, IMPORT_BUDGET_RUNS, IMPORT_BUDGET_TOP
+from ..core.stats import percentile
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Command line (relative to the project root) per budget target. `stop` is the
+# Python side of `ai-gateway stop`: the CLI only spawns stop.sh, which runs
+# the dependency checks. All targets are read-only.
+IMPORT_TARGETS = {
+    "--help": ("src/cli.py", "--help"),
+    "status": ("src/cli.py", "status"),
+    "stop": ("src/check_dependencies.py", "stop"),
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse `-X importtime` output
+
+    Returns:
+        (module, depth, cumulative us) per import, in output order
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            # Header line ("self [us] | cumulative | imported package")
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(parts[1])))
+    return rows
+
+
+class ImportBudgetService:
+    """Service for checking CLI startup import time against a budget"""
+    
+    def __init__(self, project_root: Path):
+        """
+        Initialize import budget service
+        
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.utils = self._import_utils()
+    
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import print_header, print_info, print_success, print_warning, print_error
+        return SimpleNamespace(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+        )
+    
+    def _importtime(self, argv: Tuple[str, ...]) -> List[Tuple[str, int, int]]:
+        """Run argv under `python -X importtime`, return the parsed imports"""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime"] + list(argv),
+            cwd=str(self.project_root),
+            env=dict(os.environ, PYTHONIOENCODING="utf-8"),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False,
+            timeout=120,
+        )
+        return parse_importtime(result.stderr)
+    
+    def _interpreter_modules(self) -> Set[str]:
+        """Modules every interpreter imports at startup (encodings, site, ...)"""
+        return {name for name, depth, _ in self._importtime(("-c", "pass")) if depth == 0}
+    
+    def measure(self, argv: Tuple[str, ...], baseline: Set[str]) -> Tuple[float, List[Tuple[str, float]]]:
+        """
+        Import time of one run of a command
+        
+        Returns:
+            (total ms, [(top-level module, cumulative ms), ...]) - interpreter
+            startup imports are not counted
+        """
+        top = [
+            (name, cumulative / 1000.0) for name, depth, cumulative in self._importtime(argv)
+            if depth == 0 and name not in baseline
+        ]
+        return sum(ms for _, ms in top), top
+    
+    def measure_median(
+        self, argv: Tuple[str, ...], baseline: Set[str], runs: int
+    ) -> Tuple[float, List[Tuple[str, float]]]:
+        """
+        Median import time of a command (after one warmup run that writes bytecode caches)
+        
+        Returns:
+            (median ms, top-level imports of the run closest to the median)
+        """
+        self.measure(argv, baseline)
+        samples = [self.measure(argv, baseline) for _ in range(max(1, runs))]
+        median = percentile([total for total, _ in samples], 50)
+        _, top = min(samples, key=lambda sample: abs(sample[0] - median))
+        return median, top
+    
+    def run(self, runs: int = IMPORT_BUDGET_RUNS, budgets: Optional[Dict[str, float]] = None) -> int:
+        """
+        Measure every target and compare the median with its budget
+        
+        Budgets are multiples of the reference import (IMPORT_BUDGET_REFERENCE)
+        measured in the same run, so a slow or busy machine raises them too.
+        
+        Args:
+            runs: Runs per target
+            budgets: Target -> budget as a multiple of the reference (default IMPORT_BUDGET_RATIO)
+        
+        Returns:
+            Exit code (0 if all targets are within budget, 1 otherwise)
+        """
+        budgets = dict(IMPORT_BUDGET_RATIO, **(budgets or {}))
+        self.utils.print_header("⏱️  CLI Import-Time Budget")
+        print()
+        baseline = self._interpreter_modules()
+        
+        self.utils.print_info(f"reference ({IMPORT_BUDGET_REFERENCE}): {runs} run(s)...")
+        reference_ms, _ = self.measure_median(("-c", IMPORT_BUDGET_REFERENCE), baseline, runs)
+        if reference_ms <= 0:
+            self.utils.print_error("Reference import time could not be measured (python -X importtime)")
+            return 1
+        
+        results: Dict[str, Tuple[float, List[Tuple[str, float]]]] = {}
+        for target, argv in IMPORT_TARGETS.items():
+            self.utils.print_info(f"{target}: {runs} run(s)...")
+            results[target] = self.measure_median(argv, baseline, runs)
+        
+        print()
+        self.utils.print_info(f"Reference import: {reference_ms:.1f}ms (budgets scale with it)")
+        print(f"{'command':<8} {'imports ms':>11} {'x ref':>6} {'budget ms':>10}  result")
+        over = []
+        for target, (median, _) in results.items():
+            budget = budgets[target] * reference_ms
+            ok = median <= budget
+            if not ok:
+                over.append(target)
+            ratio = median / reference_ms
+            print(f"{target:<8} {median:>11.1f} {ratio:>6.2f} {budget:>10.0f}  {'ok' if ok else 'OVER'}")
+        print()
+        
+        for target, (_, top) in results.items():
+            heaviest = sorted(top, key=lambda item: item[1], reverse=True)[:IMPORT_BUDGET_TOP]
+            print(f"{target}: " + ", ".join(f"{name} {ms:.1f}ms" for name, ms in heaviest))
+        print()
+        
+        if over:
+            self.utils.print_error(
+                f"Over budget: {', '.join(over)} - move the heavy imports into the "
+                f"function that needs them (python -X importtime shows the chain)"
+            )
+            return 1
+        self.utils.print_success("All commands are within their import-time budget")
+        return 0
@@ -0,0 +1,529 @@
+"""
+nginx overhead benchmark - what the generated proxy config adds per request
+
+The generated vhost (and variants of it and of nginx/nginx.conf) runs in a
+throwaway nginx container in front of the local mock upstream. Every location
+class is driven once directly against the mock and once through nginx; the
+difference is the latency nginx adds, the container's cgroup CPU time divided
+by the requests is its CPU cost per request.
+"""
+
+import asyncio
+import json
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..core.constants import (
+    BENCH_PROMPT_TOKENS, BENCH_REQUEST_TIMEOUT_S, NGINX_BENCH_IMAGE, NGINX_BENCH_CONTAINER_NAME,
+    NGINX_BENCH_PORT, NGINX_BENCH_REQUESTS, NGINX_BENCH_WARMUP_REQUESTS, NGINX_BENCH_CONCURRENCY,
+    NGINX_BENCH_COMPLETION_TOKENS
+)
+from ..core.exceptions import DockerError
+from ..core.stats import percentile
+from ..infrastructure.async_http import AsyncHTTPClient, HTTPProtocolError
+from ..infrastructure.docker_client import DockerClient
+from ..infrastructure.mock_upstream import (
+    MockSettings, MockUpstream, MOCK_MODEL_NAME, MOCK_ANTHROPIC_MODEL_NAME, MOCK_EMBEDDING_MODEL_NAME
+)
+from ..infrastructure.logger import get_logger
+from .bench_service import build_payload
+
+logger = get_logger(__name__)
+
+REPORT_VERSION = 1
+BENCH_API_KEY = "sk-bench-nginx"
+# Distinct request bodies per location (cycled; built once, outside the timing)
+BODY_POOL = 64
+
+# Location class -> (path through nginx, path on the upstream, workload)
+LOCATIONS: Dict[str, Tuple[str, str, str]] = {
+    "chat": ("/api/litellm/v1/chat/completions", "/v1/chat/completions", "chat"),
+    "stream": ("/api/litellm/v1/chat/completions", "/v1/chat/completions", "stream"),
+    "deployments": (
+        f"/api/litellm/v1/openai/deployments/{MOCK_MODEL_NAME}/chat/completions", "/v1/chat/completions", "chat"
+    ),
+    "messages": ("/api/litellm/v1/messages", "/v1/messages", "messages"),
+    "embeddings": ("/api/litellm/v1/embeddings", "/v1/embeddings", "embeddings"),
+}
+
+# Variant -> (description, [(file, text, replacement)]); file is "vhost" or "main"
+VARIANTS: Dict[str, Tuple[str, List[Tuple[str, str, str]]]] = {
+    "generated": ("config as generated by setup", []),
+    "minimal": ("bare proxy_pass, no regex locations, flag checks or extra headers", []),
+    "gzip-off": ("gzip off", [("main", "    gzip on;", "    gzip off;")]),
+    "gzip-1": ("gzip_comp_level 1", [("main", "gzip_comp_level 6;", "gzip_comp_level 1;")]),
+    "buffering-on": (
+        "proxy_buffering on (responses buffered)",
+        [("vhost", "proxy_buffering off;", "proxy_buffering on;")],
+    ),
+    "request-buffering-off": (
+        "proxy_request_buffering off (request bodies streamed upstream)",
+        [("vhost", "proxy_buffering off;", "proxy_buffering off;\n        proxy_request_buffering off;")],
+    ),
+    "keepalive": (
+        "keepalive connections to the upstream",
+        [
+            ("vhost", "upstream litellm_backend {\n", "upstream litellm_backend {\n    keepalive 32;\n"),
+            ("vhost", 'proxy_set_header Connection "upgrade";', 'proxy_set_header Connection "";'),
+        ],
+    ),
+}
+
+# Baseline for the "minimal" variant: what any reverse proxy costs
+MINIMAL_VHOST = """upstream litellm_backend {{
+    server {server};
+}}
+
+server {{
+    listen 80;
+    server_name _;
+    client_max_body_size 100M;
+
+    location /health {{
+        access_log off;
+        return 200 "healthy\\n";
+    }}
+
+    location /api/litellm/ {{
+        proxy_pass http://litellm_backend/;
+        proxy_http_version 1.1;
+        proxy_buffering off;
+    }}
+}}
+"""
+
+
+@dataclass
+class LocationResult:
+    """One location class measured with one variant ("direct" = without nginx)"""
+    variant: str
+    location: str
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p99_ms: float
+    bytes_per_response: float
+    added_p50_ms: Optional[float] = None
+    added_p99_ms: Optional[float] = None
+    cpu_us_per_request: Optional[float] = None
+
+
+def apply_variant(variant: str, vhost: str, main: str, litellm_server: str) -> Tuple[str, str]:
+    """
+    Variant of the generated vhost and nginx.conf
+
+    Returns:
+        Tuple of (vhost, nginx.conf)
+
+    Raises:
+        ValueError: Unknown variant, or the config no longer contains the text
+            the variant changes (the generated config has changed)
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant: {variant}")
+    if variant == "minimal":
+        return MINIMAL_VHOST.format(server=litellm_server), main
+    files = {"vhost": vhost, "main": main}
+    for name, text, replacement in VARIANTS[variant][1]:
+        if text not in files[name]:
+            raise ValueError(f"Variant {variant}: {text.strip()!r} not found in the {name} config")
+        files[name] = files[name].replace(text, replacement)
+    return files["vhost"], files["main"]
+
+
+def parse_cpu_usage_usec(text: str) -> Optional[int]:
+    """CPU time in microseconds from cgroup v2 cpu.stat or cgroup v1 cpuacct.usage (ns)"""
+    for line in text.splitlines():
+        name, _, value = line.partition(" ")
+        if name == "usage_usec" and value.strip().isdigit():
+            return int(value)
+    value = text.strip()
+    return int(value) // 1000 if value.isdigit() else None
+
+
+def request_bodies(workload: str) -> List[bytes]:
+    """Encoded request bodies for a workload"""
+    if workload == "messages":
+        kind, model = "chat", MOCK_ANTHROPIC_MODEL_NAME
+    elif workload == "embeddings":
+        kind, model = workload, MOCK_EMBEDDING_MODEL_NAME
+    else:
+        kind, model = workload, MOCK_MODEL_NAME
+    bodies = []
+    for nonce in range(BODY_POOL):
+        payload = build_payload(kind, model, BENCH_PROMPT_TOKENS, NGINX_BENCH_COMPLETION_TOKENS, nonce)
+        bodies.append(json.dumps(payload).encode("utf-8"))
+    return bodies
+
+
+class NginxBenchService:
+    """Service for measuring the per-request cost of the nginx config"""
+    
+    def __init__(self, project_root: Path):
+        """
+        Initialize nginx benchmark service
+        
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.docker_client = DockerClient()
+        self.utils = self._import_utils()
+    
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import print_header, print_info, print_success, print_warning, print_error
+        return SimpleNamespace(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+        )
+    
+    def render(self, variant: str, litellm_server: str) -> Tuple[str, str]:
+        """
+        vhost and nginx.conf of a variant, with the upstream at litellm_server
+        
+        Raises:
+            ValueError: See apply_variant
+            IOError: nginx/nginx.conf cannot be read
+        """
+        from ..nginx import render_nginx_config
+        
+        # With the metrics log: the config as deployed with the metrics exporter
+        vhost = render_nginx_config({"metrics_log": True}, litellm_server=litellm_server, webui_server=litellm_server)
+        main = (self.project_root / "nginx" / "nginx.conf").read_text(encoding="utf-8")
+        return apply_variant(variant, vhost, main, litellm_server)
+    
+    def _cpu_usec(self) -> Optional[int]:
+        """CPU time the benchmark nginx container has used"""
+        # The exec'd cat runs in the container's cgroup too; noise against thousands of requests
+        for path in ("/sys/fs/cgroup/cpu.stat", "/sys/fs/cgroup/cpuacct/cpuacct.usage"):
+            try:
+                usage = parse_cpu_usage_usec(
+                    self.docker_client.exec_in_container(NGINX_BENCH_CONTAINER_NAME, ["cat", path], timeout=30)
+                )
+            except DockerError as e:
+                logger.debug(f"Cannot read {path}: {e}")
+                continue
+            if usage is not None:
+                return usage
+        return None
+    
+    async def _drive(
+        self,
+        base_url: str,
+        path: str,
+        bodies: List[bytes],
+        requests: int,
+        warmup: int,
+        concurrency: int,
+        cpu_reader: Optional[Callable[[], Optional[int]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Closed loop: `concurrency` keep-alive clients send back to back
+        
+        Returns:
+            Dict with latencies_ms, errors, bytes, elapsed_s and cpu_usec
+            (None without cpu_reader or when the cgroup cannot be read)
+        """
+        loop = asyncio.get_running_loop()
+        client = AsyncHTTPClient(
+            base_url,
+            timeout=BENCH_REQUEST_TIMEOUT_S,
+            # What SDK clients send: gzip applies to JSON responses
+            headers={"Authorization": f"Bearer {BENCH_API_KEY}", "Accept-Encoding": "gzip"},
+        )
+        result: Dict[str, Any] = {"latencies_ms": [], "errors": 0, "bytes": 0}
+        
+        async def worker(pending, measured: bool) -> None:
+            for n in pending:
+                started = loop.time()
+                try:
+                    status, _, raw = await client.request(
+                        "POST", path, bodies[n % len(bodies)], {"Content-Type": "application/json"}
+                    )
+                except (asyncio.TimeoutError, HTTPProtocolError, OSError):
+                    status, raw = 0, b""
+                if not measured:
+                    continue
+                if status != 200:
+                    result["errors"] += 1
+                    continue
+                result["latencies_ms"].append((loop.time() - started) * 1000.0)
+                result["bytes"] += len(raw)
+        
+        async def phase(count: int, measured: bool) -> None:
+            pending = iter(range(count))
+            await asyncio.gather(*(worker(pending, measured) for _ in range(concurrency)))
+        
+        try:
+            await phase(warmup, False)
+            before = await loop.run_in_executor(None, cpu_reader) if cpu_reader else None
+            start = loop.time()
+            await phase(requests, True)
+            result["elapsed_s"] = loop.time() - start
+            after = await loop.run_in_executor(None, cpu_reader) if cpu_reader else None
+        finally:
+            client.close()
+        result["cpu_usec"] = after - before if before is not None and after is not None else None
+        return result
+    
+    def measure(
+        self,
+        variant: str,
+        base_url: str,
+        location: str,
+        requests: int,
+        warmup: int,
+        concurrency: int,
+        direct: bool = False,
+    ) -> LocationResult:
+        """Drive one location class and summarize it"""
+        nginx_path, upstream_path, workload = LOCATIONS[location]
+        result = asyncio.run(self._drive(
+            base_url,
+            upstream_path if direct else nginx_path,
+            request_bodies(workload),
+            requests,
+            warmup,
+            concurrency,
+            None if direct else self._cpu_usec,
+        ))
+        latencies = result["latencies_ms"]
+        ok = len(latencies)
+        cpu = result["cpu_usec"]
+        return LocationResult(
+            variant=variant,
+            location=location,
+            requests=requests,
+            errors=result["errors"],
+            rps=round(ok / result["elapsed_s"], 1) if result["elapsed_s"] > 0 else 0.0,
+            p50_ms=round(percentile(latencies, 50), 3),
+            p99_ms=round(percentile(latencies, 99), 3),
+            bytes_per_response=round(result["bytes"] / ok, 1) if ok else 0.0,
+            cpu_us_per_request=round(cpu / requests, 1) if cpu is not None else None,
+        )
+    
+    def _wait_for_nginx(self, base_url: str, timeout: int = 30) -> bool:
+        """Poll the nginx health location until it answers"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                with urllib.request.urlopen(f"{base_url}/health", timeout=2) as response:
+                    if response.status == 200:
+                        return True
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.5)
+        return False
+    
+    def run_variant(
+        self,
+        variant: str,
+        work_dir: Path,
+        mock_port: int,
+        host_port: int,
+        image: str,
+        locations: List[str],
+        requests: int,
+        warmup: int,
+        concurrency: int,
+        direct: Dict[str, LocationResult],
+    ) -> List[LocationResult]:
+        """
+        Start nginx with a variant of the config and measure every location class
+        
+        Raises:
+            DockerError: If nginx cannot be started or doesn't become ready
+            ValueError: See apply_variant
+        """
+        vhost, main = self.render(variant, f"host.docker.internal:{mock_port}")
+        conf_dir = work_dir / variant / "conf.d"
+        capture_dir = work_dir / variant / "capture"
+        metrics_dir = work_dir / variant / "metrics"
+        conf_dir.mkdir(parents=True)
+        capture_dir.mkdir()
+        metrics_dir.mkdir()
+        (conf_dir / "litellm.conf").write_text(vhost, encoding="utf-8")
+        (work_dir / variant / "nginx.conf").write_text(main, encoding="utf-8")
+        for path in (work_dir / variant, conf_dir, capture_dir, metrics_dir):
+            path.chmod(0o755)
+        
+        base_url = f"http://127.0.0.1:{host_port}"
+        self.docker_client.remove_container(NGINX_BENCH_CONTAINER_NAME)
+        self.docker_client.run_container(
+            image=image,
+            name=NGINX_BENCH_CONTAINER_NAME,
+            ports=[f"127.0.0.1:{host_port}:80"],
+            volumes=[
+                f"{work_dir / variant / 'nginx.conf'}:/etc/nginx/nginx.conf:ro",
+                f"{conf_dir}:/etc/nginx/conf.d:ro",
+                f"{capture_dir}:/var/log/nginx/capture",
+                f"{metrics_dir}:/var/log/nginx/metrics",
+            ],
+            extra_hosts=["host.docker.internal:host-gateway"],
+        )
+        try:
+            if not self._wait_for_nginx(base_url):
+                raise DockerError(f"nginx with the {variant} config did not become ready")
+            results = []
+            for location in locations:
+                result = self.measure(variant, base_url, location, requests, warmup, concurrency)
+                baseline = direct[location]
+                result.added_p50_ms = round(result.p50_ms - baseline.p50_ms, 3)
+                result.added_p99_ms = round(result.p99_ms - baseline.p99_ms, 3)
+                results.append(result)
+            return results
+        finally:
+            self.docker_client.remove_container(NGINX_BENCH_CONTAINER_NAME)
+    
+    def print_results(self, direct: List[LocationResult], results: List[LocationResult]) -> None:
+        """Print one row per variant and location class"""
+        print(
+            f"{'variant':<22} {'location':<12} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+            f"{'+p50 ms':>8} {'+p99 ms':>8} {'cpu µs':>8} {'bytes':>8} {'errors':>7}"
+        )
+        for r in direct + results:
+            added_p50 = f"{r.added_p50_ms:.3f}" if r.added_p50_ms is not None else "-"
+            added_p99 = f"{r.added_p99_ms:.3f}" if r.added_p99_ms is not None else "-"
+            cpu = f"{r.cpu_us_per_request:.1f}" if r.cpu_us_per_request is not None else "-"
+            print(
+                f"{r.variant:<22} {r.location:<12} {r.rps:>8.1f} {r.p50_ms:>8.3f} {r.p99_ms:>8.3f} "
+                f"{added_p50:>8} {added_p99:>8} {cpu:>8} {r.bytes_per_response:>8.0f} {r.errors:>7}"
+            )
+        print()
+    
+    def print_comparison(self, baseline: Dict[str, Any], results: List[LocationResult]) -> None:
+        """Print added latency and CPU against an earlier report"""
+        before = {(r["variant"], r["location"]): r for r in baseline.get("results", [])}
+        rows = [(before[(r.variant, r.location)], r) for r in results if (r.variant, r.location) in before]
+        if not rows:
+            self.utils.print_warning("Baseline has no results for these variants and locations")
+            return
+        print(f"{'variant':<22} {'location':<12} {'+p50 before':>12} {'+p50 now':>10} {'cpu before':>11} {'cpu now':>9}")
+        for old, r in rows:
+            old_cpu = f"{old['cpu_us_per_request']:.1f}" if old.get("cpu_us_per_request") is not None else "-"
+            cpu = f"{r.cpu_us_per_request:.1f}" if r.cpu_us_per_request is not None else "-"
+            print(
+                f"{r.variant:<22} {r.location:<12} {old['added_p50_ms']:>12.3f} {r.added_p50_ms:>10.3f} "
+                f"{old_cpu:>11} {cpu:>9}"
+            )
+        print()
+    
+    def run(
+        self,
+        variants: Optional[List[str]] = None,
+        locations: Optional[List[str]] = None,
+        requests: int = NGINX_BENCH_REQUESTS,
+        warmup: int = NGINX_BENCH_WARMUP_REQUESTS,
+        concurrency: int = NGINX_BENCH_CONCURRENCY,
+        host_port: int = NGINX_BENCH_PORT,
+        image: str = NGINX_BENCH_IMAGE,
+        json_path: Optional[Path] = None,
+        compare_path: Optional[Path] = None,
+    ) -> int:
+        """
+        Measure every variant and location class and report
+        
+        Args:
+            variants: Variants to run (default: all, see VARIANTS)
+            locations: Location classes to drive (default: all, see LOCATIONS)
+            requests: Measured requests per location class
+            warmup: Unmeasured requests before each location class
+            concurrency: Keep-alive clients sending back to back
+            host_port: Local port nginx is published on
+            image: nginx image
+            json_path: Write the report here
+            compare_path: Earlier report to compare against
+        
+        Returns:
+            Exit code (0 on success)
+        """
+        variants = variants or list(VARIANTS)
+        locations = locations or list(LOCATIONS)
+        self.utils.print_header("📐 nginx Overhead Benchmark")
+        print()
+        self.utils.print_info(f"Variants: {', '.join(variants)}")
+        self.utils.print_info(f"Locations: {', '.join(locations)}")
+        self.utils.print_info(f"Load: {requests} requests per location, concurrency {concurrency}")
+        print()
+        
+        baseline = None
+        if compare_path:
+            try:
+                baseline = json.loads(Path(compare_path).read_text(encoding="utf-8"))
+            except (IOError, OSError, ValueError) as e:
+                self.utils.print_error(f"Cannot read baseline {compare_path}: {e}")
+                return 1
+        if not self.docker_client.check_daemon_running():
+            self.utils.print_error("Docker daemon is not running")
+            return 1
+        
+        settings = MockSettings(ttft_ms=0.0, completion_tokens=NGINX_BENCH_COMPLETION_TOKENS)
+        results: List[LocationResult] = []
+        with MockUpstream(settings=settings) as mock, tempfile.TemporaryDirectory(prefix="ai-gateway-bench-nginx-") as tmp:
+            Path(tmp).chmod(0o755)
+            # Same client, same mock, no proxy: what every nginx number is compared with
+            self.utils.print_info("Measuring the upstream directly...")
+            direct = {
+                location: self.measure(
+                    "direct", f"http://127.0.0.1:{mock.port}", location, requests, warmup, concurrency, direct=True
+                )
+                for location in locations
+            }
+            for variant in variants:
+                self.utils.print_info(f"Running {variant} ({VARIANTS[variant][0]})...")
+                try:
+                    variant_results = self.run_variant(
+                        variant, Path(tmp), mock.port, host_port, image,
+                        locations, requests, warmup, concurrency, direct,
+                    )
+                except (DockerError, ValueError, IOError, OSError) as e:
+                    self.utils.print_error(str(e))
+                    continue
+                results.extend(variant_results)
+        
+        if not results:
+            self.utils.print_error("No variant could be measured")
+            return 1
+        
+        print()
+        self.print_results(list(direct.values()), results)
+        self.utils.print_info("+p50/+p99: latency added over the direct run (includes Docker port forwarding)")
+        self.utils.print_info("cpu µs: nginx container CPU time per request")
+        print()
+        if baseline:
+            self.print_comparison(baseline, results)
+        
+        if json_path:
+            report = {
+                "version": REPORT_VERSION,
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "config": {
+                    "variants": variants,
+                    "locations": locations,
+                    "requests": requests,
+                    "warmup": warmup,
+                    "concurrency": concurrency,
+                    "image": image,
+                },
+                "direct": [asdict(r) for r in direct.values()],
+                "results": [asdict(r) for r in results],
+            }
+            Path(json_path).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+            self.utils.print_info(f"Report written to {json_path}")
+        
+        failed = sum(r.errors for r in results)
+        if failed:
+            self.utils.print_warning(f"{failed} request(s) failed through nginx")
+        self.utils.print_success(f"Measured {len(results)} variant/location combination(s)")
+        return 0
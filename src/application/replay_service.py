@@ -0,0 +1,345 @@
+"""
+Traffic replay - send a capture back to the gateway with its original timing
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from ..core.constants import BENCH_MAX_TOKENS, BENCH_MAX_IN_FLIGHT, BENCH_PERCENTILES, BENCH_REQUEST_TIMEOUT_S
+from ..core.stats import summarize
+from ..infrastructure.async_http import AsyncHTTPClient
+from ..infrastructure.logger import get_logger
+from .bench_service import BenchService, RequestSample, build_payload, build_report
+
+logger = get_logger(__name__)
+
+# Synthetic prompts: captured body size / this = prompt tokens
+BYTES_PER_TOKEN = 4
+
+
+def load_capture(path: Path) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Read a capture file
+
+    Returns:
+        Tuple of (records in arrival order, number of lines skipped)
+    """
+    records, skipped = [], 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                record["ts"] = float(record["ts"])
+                if not isinstance(record["route"], str):
+                    raise TypeError(record["route"])
+            except (ValueError, KeyError, TypeError):
+                skipped += 1
+                continue
+            records.append(record)
+    records.sort(key=lambda record: record["ts"])
+    return records, skipped
+
+
+def peak_concurrency(intervals: List[Tuple[float, float]]) -> int:
+    """Most requests in flight at once, from (start, end) pairs"""
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    peak = current = 0
+    for _, change in events:
+        current += change
+        peak = max(peak, current)
+    return peak
+
+
+def captured_intervals(records: List[Dict[str, Any]]) -> List[Tuple[float, float]]:
+    """(start, end) of each captured request"""
+    return [(r["ts"], r["ts"] + float(r.get("duration_s") or 0.0)) for r in records]
+
+
+def workload_of(record: Dict[str, Any]) -> str:
+    """How the response of a captured request is read (bench workload)"""
+    if record.get("stream"):
+        return "stream"
+    if record["route"].rstrip("/").endswith("/embeddings"):
+        return "embeddings"
+    return "chat"
+
+
+def request_body(record: Dict[str, Any], model: Optional[str], nonce: int) -> Optional[Dict[str, Any]]:
+    """
+    Body to replay: the captured one, or a synthetic body of the same size
+    and shape when the capture has no bodies
+
+    Returns:
+        Body, or None for requests without one (GET)
+    """
+    body = record.get("body")
+    if isinstance(body, dict):
+        body = dict(body)
+        if model:
+            body["model"] = model
+        return body
+    if (record.get("method") or "POST") != "POST":
+        return None
+
+    model = model or record.get("model") or ""
+    prompt_tokens = max(1, int(record.get("body_bytes") or 0) // BYTES_PER_TOKEN)
+    workload = workload_of(record)
+    payload = build_payload(workload, model, prompt_tokens, BENCH_MAX_TOKENS, nonce)
+    if record["route"].rstrip("/").endswith("/messages"):
+        # Anthropic Messages API
+        payload.pop("stream_options", None)
+    return payload
+
+
+class ReplayService:
+    """Service for replaying captured traffic"""
+    
+    def __init__(self, project_root: Path):
+        """
+        Initialize replay service
+        
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.bench = BenchService(self.project_root)
+        self.utils = self.bench.utils
+    
+    async def _replay(
+        self,
+        api_base: str,
+        records: List[Dict[str, Any]],
+        keys: Dict[Optional[str], str],
+        models: Dict[str, str],
+        speed: float,
+        max_rate: bool,
+        concurrency: int,
+        timeout: float,
+    ) -> Tuple[List[RequestSample], List[Tuple[float, float]]]:
+        """
+        Send the records on one event loop
+        
+        Open loop (speed): each request is sent at its captured offset / speed
+        whether or not earlier ones finished, so the recorded burstiness and
+        overlap are reproduced and latency counts from the due time. Closed
+        loop (max_rate): `concurrency` clients send back to back.
+        
+        Returns:
+            Tuple of (samples, (start, end) of each sent request)
+        """
+        # Captured routes include the /v1 prefix of the API
+        root = api_base.rstrip("/")
+        if root.endswith("/v1"):
+            root = root[:-3]
+        clients = {
+            key: AsyncHTTPClient(root, timeout=timeout, headers={"Authorization": f"Bearer {key}"})
+            for key in set(keys.values())
+        }
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        samples: List[RequestSample] = []
+        intervals: List[Tuple[float, float]] = []
+        
+        async def send(record: Dict[str, Any], scheduled: float, nonce: int) -> RequestSample:
+            model = models.get(record.get("model") or "", models.get("*"))
+            body = request_body(record, model, nonce)
+            sample = await self.bench.send(
+                clients[keys[record.get("key_hash")]],
+                workload_of(record),
+                json.dumps(body).encode("utf-8") if body is not None else None,
+                scheduled,
+                start,
+                path=record["route"],
+                method=record.get("method") or "POST",
+            )
+            intervals.append((sample.finished - sample.latency_ms / 1000.0, sample.finished))
+            logger.debug("replayed", extra={
+                "phase": "replay", "request": nonce, "route": record["route"],
+                "latency_ms": round(sample.latency_ms, 1), "error": sample.error,
+            })
+            return sample
+        
+        try:
+            if max_rate:
+                pending = iter(enumerate(records))
+                
+                async def worker() -> None:
+                    for nonce, record in pending:
+                        samples.append(await send(record, loop.time(), nonce))
+                
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+                return samples, intervals
+            
+            ts0 = records[0]["ts"]
+            in_flight: set = set()
+            
+            def done(task: "asyncio.Future") -> None:
+                in_flight.discard(task)
+                if not task.cancelled():
+                    samples.append(task.result())
+            
+            for nonce, record in enumerate(records):
+                arrival = start + (record["ts"] - ts0) / speed
+                delay = arrival - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if len(in_flight) >= concurrency:
+                    offset = arrival - start
+                    samples.append(RequestSample(started=offset, finished=offset, latency_ms=0.0, error="dropped"))
+                    continue
+                task = asyncio.ensure_future(send(record, arrival, nonce))
+                in_flight.add(task)
+                task.add_done_callback(done)
+            if in_flight:
+                await asyncio.wait(list(in_flight))
+            return samples, intervals
+        finally:
+            for client in clients.values():
+                client.close()
+    
+    def print_fidelity(self, records: List[Dict[str, Any]], report: Dict[str, Any], replay_peak: int) -> None:
+        """Print captured vs. replayed behaviour"""
+        captured_ok = [r for r in records if r.get("status") == 200]
+        with_status = [r for r in records if r.get("status") is not None]
+        captured_latency = summarize([float(r.get("duration_s") or 0.0) * 1000.0 for r in captured_ok], BENCH_PERCENTILES)
+        captured_errors = 100.0 * (len(with_status) - len(captured_ok)) / len(with_status) if with_status else 0.0
+        span = records[-1]["ts"] - records[0]["ts"]
+        
+        rows = [
+            ("duration s", span, report["elapsed_s"]),
+            ("req/s", len(records) / span if span else 0.0, report["rps"]),
+            ("peak in flight", peak_concurrency(captured_intervals(records)), replay_peak),
+            ("error rate %", captured_errors, report["error_rate"]),
+        ]
+        if captured_latency["count"] and report["latency_ms"]["count"]:
+            for name in ("p50", "p99"):
+                rows.append((f"latency {name} ms", captured_latency[name], report["latency_ms"][name]))
+        print(f"{'metric':<16} {'captured':>10} {'replay':>10}")
+        for label, captured, replayed in rows:
+            print(f"{label:<16} {captured:>10.1f} {replayed:>10.1f}")
+        print()
+    
+    def run(
+        self,
+        capture_path: Path,
+        speed: float = 1.0,
+        max_rate: bool = False,
+        concurrency: Optional[int] = None,
+        target: str = "auto",
+        base_url: Optional[str] = None,
+        api_keys: Optional[List[str]] = None,
+        model: Optional[str] = None,
+        model_map: Optional[Dict[str, str]] = None,
+        limit: Optional[int] = None,
+        timeout: float = BENCH_REQUEST_TIMEOUT_S,
+        json_path: Optional[Path] = None,
+    ) -> int:
+        """
+        Replay a capture and report
+        
+        Args:
+            capture_path: Capture file (see capture_service)
+            speed: Time scale of the arrivals (1 = as captured, 2 = twice as fast)
+            max_rate: Ignore timing and send as fast as `concurrency` clients can
+            concurrency: Clients for max_rate (default: captured peak); cap on
+                requests in flight otherwise (excess arrivals are dropped)
+            target: "auto", "nginx" or "litellm" (see BenchService.resolve_endpoint)
+            base_url: API base URL instead of the one from .env
+            api_keys: Keys to send with; captured keys are mapped to them
+                round-robin so per-key limits see the same spread (default: key from .env)
+            model: Send every request to this model
+            model_map: Captured model name -> model to send instead
+            limit: Replay only the first N requests
+            timeout: Per-request deadline in seconds
+            json_path: Write the report here
+        
+        Returns:
+            Exit code (0 if any request succeeded)
+        """
+        self.utils.print_header("⏯️  Traffic Replay")
+        print()
+        
+        try:
+            records, skipped = load_capture(Path(capture_path))
+        except (IOError, OSError) as e:
+            self.utils.print_error(f"Cannot read {capture_path}: {e}")
+            return 1
+        if skipped:
+            self.utils.print_warning(f"Skipped {skipped} line(s) that are not capture records")
+        if limit:
+            records = records[:limit]
+        if not records:
+            self.utils.print_error(f"No capture records in {capture_path} (record with ./ai-gateway capture)")
+            return 1
+        
+        if not (base_url and api_keys):
+            env_base, env_key = self.bench.resolve_endpoint(target)
+            base_url = base_url or env_base
+            api_keys = api_keys or ([env_key] if env_key else [])
+        if not base_url:
+            self.utils.print_error(f"No {target} endpoint in .env (run ./ai-gateway setup or pass --base-url)")
+            return 1
+        if not api_keys:
+            self.utils.print_error("API key not found in .env (pass --key)")
+            return 1
+        
+        # Captured key hashes in order of first use -> replay keys
+        keys: Dict[Optional[str], str] = {}
+        for record in records:
+            if record.get("key_hash") not in keys:
+                keys[record.get("key_hash")] = api_keys[len(keys) % len(api_keys)]
+        models = dict(model_map or {})
+        if model:
+            models["*"] = model
+        
+        captured_peak = peak_concurrency(captured_intervals(records))
+        span = records[-1]["ts"] - records[0]["ts"]
+        if max_rate:
+            concurrency = concurrency or max(1, captured_peak)
+            mode = f"max rate, {concurrency} client(s)"
+        else:
+            concurrency = concurrency or BENCH_MAX_IN_FLIGHT
+            mode = f"{speed:g}x, {span / speed:.1f}s"
+        self.utils.print_info(f"Target: {base_url}")
+        self.utils.print_info(
+            f"{len(records)} request(s) from {len([k for k in keys if k])} key(s), {mode}"
+        )
+        if not any("body" in record for record in records):
+            self.utils.print_info("Capture has no bodies - sending synthetic requests of the captured size")
+        
+        samples, intervals = asyncio.run(self._replay(
+            base_url, records, keys, models, speed, max_rate, concurrency, timeout,
+        ))
+        replay_peak = peak_concurrency(intervals)
+        print()
+        
+        config = {
+            "workload": "replay",
+            "mode": "closed" if max_rate else "open",
+            "concurrency": concurrency if max_rate else None,
+            "rate": None,
+            "speed": None if max_rate else speed,
+            "target": target,
+            "api_base": base_url,
+            "model": model,
+            "capture": str(capture_path),
+            "requests": len(records),
+        }
+        duration = 0.0 if max_rate else span / speed
+        report = build_report(samples, duration, config)
+        report["peak_in_flight"] = replay_peak
+        self.bench.print_report(report)
+        self.print_fidelity(records, report, replay_peak)
+        
+        if json_path:
+            Path(json_path).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+            self.utils.print_info(f"Report written to {json_path}")
+        
+        if not report["ok"]:
+            self.utils.print_error("No successful requests - is the stack running?")
+            return 1
+        self.utils.print_success(f"Replayed {report['ok']}/{report['requests']} request(s)")
+        return 0
@@ -0,0 +1,370 @@
+"""
+Rolling restart of LiteLLM - apply config changes without dropping API traffic
+"""
+
+import copy
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from ..core.constants import (
+    LITELLM_CONTAINER_NAME, LITELLM_SERVICE_NAME, NGINX_CONTAINER_NAME, NGINX_VHOST_FILE, OPEN_WEBUI_CONTAINER_NAME,
+    DRAIN_TIMEOUT_S, ROLLOUT_SERVICE_NAME, ROLLOUT_CONTAINER_NAME, ROLLOUT_PROJECT_SUFFIX,
+    ROLLOUT_COMPOSE_FILE, ROLLOUT_HEALTH_TIMEOUT_S, ROLLOUT_POLL_INTERVAL_S
+)
+from ..core.exceptions import DockerError
+from ..infrastructure.docker_client import DockerClient, compose_project_name
+from ..infrastructure.logger import get_logger
+from .drain_service import DrainService, DrainResult
+
+logger = get_logger(__name__)
+
+# `server host:port;` of the LiteLLM upstream in the generated vhost
+UPSTREAM_RE = re.compile(r"(upstream litellm_backend \{\s*server )([^;\s]+)(;)")
+
+# Runs inside a LiteLLM container (python is in the image): GET url with the
+# master key from the container environment (keeps the key out of exec args)
+SMOKE_SNIPPET = (
+    "import os,sys,urllib.request\n"
+    "req=urllib.request.Request(sys.argv[1],headers={'Authorization':'Bearer '+os.environ.get('LITELLM_MASTER_KEY','')})\n"
+    "urllib.request.urlopen(req,timeout=30).read()\n"
+)
+
+
+class RolloutError(Exception):
+    """A rollout step failed (message says what was rolled back)"""
+
+
+def build_next_project(config: Dict[str, Any], project: str) -> Dict[str, Any]:
+    """
+    Compose model of the second LiteLLM instance
+
+    The resolved `litellm` service (image, command, environment, volumes,
+    limits, healthcheck of the current config) under another container
+    name, without host ports (they belong to the running instance) and
+    dependencies, attached to the stack's networks and volumes as external.
+
+    Args:
+        config: Output of `docker compose config --format json`
+        project: Compose project name of the rollout
+
+    Returns:
+        Compose model (JSON-serializable)
+    """
+    service = copy.deepcopy(config["services"][LITELLM_SERVICE_NAME])
+    for key in ("ports", "depends_on", "container_name"):
+        service.pop(key, None)
+    service["container_name"] = ROLLOUT_CONTAINER_NAME
+
+    networks = {
+        name: {"name": (config.get("networks", {}).get(name) or {}).get("name", name), "external": True}
+        for name in (service.get("networks") or {})
+    }
+    volumes = {}
+    for volume in service.get("volumes") or []:
+        if isinstance(volume, dict) and volume.get("type") == "volume" and volume.get("source"):
+            source = volume["source"]
+            volumes[source] = {
+                "name": (config.get("volumes", {}).get(source) or {}).get("name", source),
+                "external": True,
+            }
+
+    model: Dict[str, Any] = {"name": project, "services": {ROLLOUT_SERVICE_NAME: service}}
+    if networks:
+        model["networks"] = networks
+    if volumes:
+        model["volumes"] = volumes
+    return model
+
+
+class RolloutService:
+    """Service for replacing the LiteLLM container while nginx keeps serving"""
+    
+    def __init__(self, project_root: Path):
+        """
+        Initialize rollout service
+        
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.docker_client = DockerClient()
+        self.drain_service = DrainService(self.project_root)
+        self.utils = self._import_utils()
+        self.work_dir = str(self.project_root)
+        self.vhost_path = self.project_root / NGINX_VHOST_FILE
+        self.rollout_file = self.project_root / ROLLOUT_COMPOSE_FILE
+        self.rollout_project = compose_project_name(self.work_dir) + ROLLOUT_PROJECT_SUFFIX
+    
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import print_header, print_info, print_success, print_warning, print_error, read_env_file
+        return SimpleNamespace(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+            read_env_file=read_env_file,
+        )
+    
+    def current_upstream(self) -> Optional[str]:
+        """`host:port` of the LiteLLM upstream in the vhost (None if not found)"""
+        try:
+            match = UPSTREAM_RE.search(self.vhost_path.read_text(encoding="utf-8"))
+        except (IOError, OSError):
+            return None
+        return match.group(2) if match else None
+    
+    def switch_upstream(self, target: str) -> None:
+        """
+        Point the LiteLLM upstream at target and reload nginx
+        
+        nginx -s reload starts new workers with the new upstream; old workers
+        finish their in-flight requests to the previous upstream first.
+        
+        Raises:
+            RolloutError: If the config test or reload fails (vhost restored)
+        """
+        original = self.vhost_path.read_text(encoding="utf-8")
+        updated = UPSTREAM_RE.sub(lambda m: f"{m.group(1)}{target}{m.group(3)}", original, count=1)
+        self.vhost_path.write_text(updated, encoding="utf-8")
+        try:
+            self.docker_client.exec_in_container(NGINX_CONTAINER_NAME, ["nginx", "-t"])
+            self.docker_client.exec_in_container(NGINX_CONTAINER_NAME, ["nginx", "-s", "reload"])
+        except DockerError as e:
+            self.vhost_path.write_text(original, encoding="utf-8")
+            raise RolloutError(f"nginx reload with upstream {target} failed: {e}") from e
+        logger.info(f"nginx upstream switched to {target}")
+    
+    def wait_healthy(self, container: str, timeout: float = ROLLOUT_HEALTH_TIMEOUT_S) -> None:
+        """
+        Wait until a container's healthcheck reports healthy
+        
+        Raises:
+            RolloutError: If it exits, turns unhealthy or times out
+        """
+        deadline = time.monotonic() + timeout
+        status = "missing"
+        while time.monotonic() < deadline:
+            info = self.docker_client.inspect_container(container) or {}
+            state = info.get("State") or {}
+            status = (state.get("Health") or {}).get("Status") or state.get("Status") or "missing"
+            if status == "healthy":
+                return
+            if status in ("unhealthy", "exited", "dead"):
+                break
+            time.sleep(ROLLOUT_POLL_INTERVAL_S)
+        logs = self.docker_client.get_container_logs(self.work_dir, container, tail=20)
+        detail = f"\n{logs.strip()}" if logs and logs.strip() else ""
+        raise RolloutError(f"{container} did not become healthy (status: {status}){detail}")
+    
+    def smoke(self, container: str, url: str) -> None:
+        """
+        Send an authenticated GET from inside a LiteLLM container
+        
+        Raises:
+            RolloutError: If the request fails
+        """
+        try:
+            self.docker_client.exec_in_container(container, ["python", "-c", SMOKE_SNIPPET, url], timeout=60)
+        except DockerError as e:
+            raise RolloutError(f"Smoke request {url} from {container} failed: {e}") from e
+    
+    def container_ip(self, container: str) -> Optional[str]:
+        """First network address of a container (None if not running)"""
+        info = self.docker_client.inspect_container(container) or {}
+        networks = (info.get("NetworkSettings") or {}).get("Networks") or {}
+        for network in networks.values():
+            if network.get("IPAddress"):
+                return network["IPAddress"]
+        return None
+    
+    def start_next(self, config: Dict[str, Any]) -> None:
+        """Start the second instance from the resolved compose config"""
+        model = build_next_project(config, self.rollout_project)
+        # The resolved config contains secrets from .env
+        fd = os.open(self.rollout_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(model, f, indent=2)
+        self.docker_client.compose_up_service(
+            self.work_dir, ROLLOUT_SERVICE_NAME, files=[str(self.rollout_file)], project=self.rollout_project
+        )
+    
+    def remove_next(self) -> None:
+        """Remove the second instance and its compose file"""
+        if self.rollout_file.exists():
+            try:
+                self.docker_client.compose_project_down(
+                    self.work_dir, self.rollout_project, [str(self.rollout_file)]
+                )
+            finally:
+                self.rollout_file.unlink()
+        elif self.docker_client.inspect_container(ROLLOUT_CONTAINER_NAME):
+            self.docker_client.remove_container(ROLLOUT_CONTAINER_NAME)
+    
+    def _report_drain(self, label: str, result: Optional[DrainResult]) -> Tuple[int, int]:
+        if result is None:
+            self.utils.print_warning(f"{label}: nginx is not running, nothing drained")
+            return 0, 0
+        message = f"{label}: drained {result.drained} request(s) in {result.waited_s:.1f}s"
+        if result.cut:
+            self.utils.print_warning(f"{message}, {result.cut} cut at the deadline")
+        else:
+            self.utils.print_success(message)
+        return result.drained, result.cut
+    
+    def abort(self) -> int:
+        """
+        Undo an interrupted rollout: point nginx back at the compose service
+        and remove the second instance
+        
+        Returns:
+            Exit code
+        """
+        env_vars = self.utils.read_env_file(self.project_root / ".env")
+        original = f"{LITELLM_SERVICE_NAME}:{self.drain_service.litellm_port(env_vars)}"
+        try:
+            if self.current_upstream() not in (None, original):
+                self.switch_upstream(original)
+                self.utils.print_success(f"nginx upstream restored to {original}")
+            self.remove_next()
+        except (RolloutError, DockerError) as e:
+            self.utils.print_error(str(e))
+            return 1
+        self.utils.print_success("Rollout leftovers removed")
+        return 0
+    
+    def run(
+        self,
+        health_timeout: float = ROLLOUT_HEALTH_TIMEOUT_S,
+        drain_timeout: float = DRAIN_TIMEOUT_S,
+    ) -> int:
+        """
+        Replace the LiteLLM container with one running the current config
+        
+        1. start a second instance, wait for health, smoke request
+        2. switch nginx to it (reload), smoke request through nginx
+        3. drain and recreate the compose service, wait for health, smoke
+        4. switch nginx back, drain and remove the second instance
+        
+        Failures in 1-2 roll back to the old instance, which kept serving.
+        A failure in 3 leaves traffic on the healthy second instance.
+        
+        Drains also wait for Open WebUI's direct connections (it talks to
+        the `litellm` alias, not nginx), so its streams finish too. The
+        alias resolves to both instances during a drain, so Open WebUI may
+        start new requests on the draining one; what is open at the
+        deadline is cut.
+        
+        Args:
+            health_timeout: Seconds to wait for a new instance to become healthy
+            drain_timeout: Seconds to wait for in-flight requests per drain
+        
+        Returns:
+            Exit code (0 on success, 1 on failure)
+        """
+        self.utils.print_header("🔄 LiteLLM Rolling Restart")
+        print()
+        started = time.monotonic()
+        
+        env_vars = self.utils.read_env_file(self.project_root / ".env")
+        if env_vars.get("USE_NGINX", "no").lower() not in ("yes", "true", "1"):
+            self.utils.print_error("Rollout switches traffic in nginx - enable nginx in setup or use ./start.sh")
+            return 1
+        port = self.drain_service.litellm_port(env_vars)
+        original = f"{LITELLM_SERVICE_NAME}:{port}"
+        if self.current_upstream() != original:
+            self.utils.print_error(
+                f"Unexpected LiteLLM upstream in {NGINX_VHOST_FILE}: {self.current_upstream()} "
+                f"(expected {original}) - run `./ai-gateway rollout --abort` after an interrupted rollout"
+            )
+            return 1
+        if self.docker_client.inspect_container(ROLLOUT_CONTAINER_NAME):
+            self.utils.print_error(
+                f"{ROLLOUT_CONTAINER_NAME} is still running - run `./ai-gateway rollout --abort` first"
+            )
+            return 1
+        
+        direct_url = f"http://localhost:{port}/v1/models"
+        nginx_url = "http://nginx/api/litellm/v1/models"
+        drained = cut = 0
+        
+        # 1-2: second instance takes over; any failure rolls back to the old one
+        try:
+            self.utils.print_info(f"Starting {ROLLOUT_CONTAINER_NAME} with the current config...")
+            config = self.docker_client.compose_config(self.work_dir)
+            self.start_next(config)
+            self.wait_healthy(ROLLOUT_CONTAINER_NAME, health_timeout)
+            self.smoke(ROLLOUT_CONTAINER_NAME, direct_url)
+            self.utils.print_success(f"{ROLLOUT_CONTAINER_NAME} is healthy")
+            
+            # Open WebUI talks to `litellm` directly: the alias keeps it served
+            # while the compose container is recreated
+            for network in (config["services"][LITELLM_SERVICE_NAME].get("networks") or {}):
+                network_name = (config.get("networks", {}).get(network) or {}).get("name", network)
+                self.docker_client.connect_network(network_name, ROLLOUT_CONTAINER_NAME, aliases=[LITELLM_SERVICE_NAME])
+            
+            self.switch_upstream(f"{ROLLOUT_CONTAINER_NAME}:{port}")
+            self.smoke(ROLLOUT_CONTAINER_NAME, nginx_url)
+            self.utils.print_success(f"nginx sends new requests to {ROLLOUT_CONTAINER_NAME}")
+        except (RolloutError, DockerError) as e:
+            self.utils.print_error(str(e))
+            self.utils.print_info("Rolling back - the running LiteLLM instance keeps serving")
+            try:
+                if self.current_upstream() != original:
+                    self.switch_upstream(original)
+                self.remove_next()
+            except (RolloutError, DockerError) as cleanup_error:
+                self.utils.print_error(f"Rollback incomplete: {cleanup_error} - run `./ai-gateway rollout --abort`")
+            return 1
+        
+        # 3: old instance finishes its requests, compose recreates the service
+        old_ip = self.container_ip(LITELLM_CONTAINER_NAME)
+        counts = self._report_drain(
+            LITELLM_CONTAINER_NAME,
+            self.drain_service.wait_idle(
+                port, drain_timeout, remote_ip=old_ip, also_from=(OPEN_WEBUI_CONTAINER_NAME,)
+            ) if old_ip else None,
+        )
+        drained, cut = drained + counts[0], cut + counts[1]
+        try:
+            self.utils.print_info(f"Recreating {LITELLM_CONTAINER_NAME}...")
+            self.docker_client.compose_up_service(self.work_dir, LITELLM_SERVICE_NAME, force_recreate=True)
+            self.wait_healthy(LITELLM_CONTAINER_NAME, health_timeout)
+            self.smoke(LITELLM_CONTAINER_NAME, direct_url)
+        except (RolloutError, DockerError) as e:
+            self.utils.print_error(str(e))
+            self.utils.print_warning(
+                f"Traffic stays on {ROLLOUT_CONTAINER_NAME} (healthy, current config). Fix the problem and "
+                f"re-run `./ai-gateway rollout --abort` followed by `./ai-gateway rollout`"
+            )
+            return 1
+        
+        # 4: back to the compose service, second instance drains and goes away
+        try:
+            # Container name, not `litellm`: the alias still resolves to both instances
+            self.switch_upstream(f"{LITELLM_CONTAINER_NAME}:{port}")
+            next_ip = self.container_ip(ROLLOUT_CONTAINER_NAME)
+            counts = self._report_drain(
+                ROLLOUT_CONTAINER_NAME,
+                self.drain_service.wait_idle(
+                    port, drain_timeout, remote_ip=next_ip, also_from=(OPEN_WEBUI_CONTAINER_NAME,)
+                ) if next_ip else None,
+            )
+            drained, cut = drained + counts[0], cut + counts[1]
+            self.remove_next()
+            self.switch_upstream(original)
+        except (RolloutError, DockerError) as e:
+            self.utils.print_error(f"{e} - run `./ai-gateway rollout --abort` to finish the cleanup")
+            return 1
+        
+        print()
+        self.utils.print_success(
+            f"Rollout finished in {time.monotonic() - started:.0f}s: "
+            f"{drained} request(s) drained, {cut} cut"
+        )
+        return 0
@@ -7,7 +7,7 @@ from typing import Dict, Optional, Tuple
 from ..core.config import ResourceProfile, BudgetProfile, PortConfig, AppConfig
 from ..core.constants import (
     DEFAULT_UI_USERNAME, DEFAULT_POSTGRES_USER, DEFAULT_POSTGRES_DB,
-    BUDGET_PROFILE_TEST, YES_VALUES, NO_VALUES
+    BUDGET_PROFILE_TEST, YES_VALUES, NO_VALUES, MOCK_PROVIDER_PROFILE, TRACING_PROFILE
 )
 from ..core.exceptions import ConfigurationError, FileOperationError, DockerError
 from ..infrastructure.file_repository import FileRepository
@@ -31,7 +31,7 @@ class InteractiveSetup:
         from types import SimpleNamespace
         from ..utils import (
             print_header, print_info, print_warning, print_error,
-            print_success, Colors, read_env_file
+            print_success, Colors, read_env_file, compose_profiles
         )
         return SimpleNamespace(
             print_header=print_header,
@@ -41,6 +41,7 @@ class InteractiveSetup:
             print_success=print_success,
             Colors=Colors,
             read_env_file=read_env_file,
+            compose_profiles=compose_profiles,
         )
     
     def ask_env_mode(self) -> Tuple[bool, bool, Dict[str, str]]:
@@ -150,6 +151,82 @@ class InteractiveSetup:
             else:
                 self.utils.print_error("Select 1, 2, or 3")
     
+    def ask_mock_provider(self, reuse_env: bool, existing_env: Dict[str, str]) -> bool:
+        """Ask user whether to add the mock LLM provider for offline benchmarks"""
+        if reuse_env:
+            enabled = existing_env.get("MOCK_PROVIDER", "no").lower() in YES_VALUES
+            if enabled and MOCK_PROVIDER_PROFILE not in self.utils.compose_profiles(existing_env):
+                self.utils.print_warning(
+                    f"MOCK_PROVIDER=yes but COMPOSE_PROFILES in .env does not include "
+                    f"'{MOCK_PROVIDER_PROFILE}' - the mock-llm container will not start"
+                )
+            return enabled
+        
+        print()
+        self.utils.print_header("🧪 Mock LLM Provider")
+        self.utils.print_info("A local mock provider (OpenAI and Anthropic APIs) for benchmarks without")
+        self.utils.print_info("provider keys: ./ai-gateway bench --model mock-gpt")
+        self.utils.print_info("Adds the mock-llm container and the mock-gpt, mock-claude, mock-embedding models.")
+        
+        while True:
+            choice = input("Add mock provider? [y/N]: ").strip().lower()
+            if not choice or choice in NO_VALUES:
+                return False
+            elif choice in YES_VALUES:
+                self.utils.print_success("Mock provider will be added")
+                return True
+            else:
+                self.utils.print_error("Please answer y or N")
+    
+    def ask_tracing(self, reuse_env: bool, existing_env: Dict[str, str]) -> bool:
+        """Ask user whether to add the OpenTelemetry collector and trace requests"""
+        if reuse_env:
+            enabled = existing_env.get("TRACING", "no").lower() in YES_VALUES
+            if enabled and TRACING_PROFILE not in self.utils.compose_profiles(existing_env):
+                self.utils.print_warning(
+                    f"TRACING=yes but COMPOSE_PROFILES in .env does not include "
+                    f"'{TRACING_PROFILE}' - the otel-collector container will not start"
+                )
+            return enabled
+        
+        print()
+        self.utils.print_header("🔭 Request Tracing")
+        self.utils.print_info("Per-request timing of LiteLLM hooks, routing, retries and provider calls,")
+        self.utils.print_info("for a sample of requests (share depends on the resource profile).")
+        self.utils.print_info("Adds the otel-collector container; the trace id is in the X-Trace-Id response header.")
+        
+        while True:
+            choice = input("Enable tracing? [y/N]: ").strip().lower()
+            if not choice or choice in NO_VALUES:
+                return False
+            elif choice in YES_VALUES:
+                self.utils.print_success("Tracing will be enabled")
+                return True
+            else:
+                self.utils.print_error("Please answer y or N")
+    
+    def ask_metrics(self, reuse_env: bool, existing_env: Dict[str, str]) -> bool:
+        """Ask user whether to add the metrics exporter (it gets the Docker socket)"""
+        if reuse_env:
+            return existing_env.get("METRICS", "no").lower() in YES_VALUES
+        
+        print()
+        self.utils.print_header("📈 Metrics Exporter")
+        self.utils.print_info("Prometheus metrics on 127.0.0.1:9464: request latency by route, nginx")
+        self.utils.print_info("connections, container CPU/memory, PostgreSQL connections; ./ai-gateway top-keys.")
+        self.utils.print_warning("Adds the metrics-exporter container with the Docker socket mounted,")
+        self.utils.print_warning("which gives it root-equivalent access to this host.")
+        
+        while True:
+            choice = input("Add metrics exporter? [y/N]: ").strip().lower()
+            if not choice or choice in NO_VALUES:
+                return False
+            elif choice in YES_VALUES:
+                self.utils.print_success("Metrics exporter will be added")
+                return True
+            else:
+                self.utils.print_error("Please answer y or N")
+    
     def ask_systemd_installation(self) -> bool:
         """Ask user if they want to install systemd service"""
         from ..platform_utils import detect_platform, PlatformType
@@ -390,11 +467,13 @@ class SetupService:
         """Run complete setup process"""
         from ..script_init import init_script, ScriptType
         from ..platform_utils import detect_platform, PlatformType
-        from ..config import select_resource_profile, ResourceProfile
+        from ..config import select_resource_profile, installed_resource_profile, ResourceProfile
         from ..ports import configure_ports
         from ..env_generator import generate_env_file
         from ..config_generator import generate_config_yaml
-        from ..docker_compose import generate_docker_compose_override
+        from ..docker_compose import (
+            generate_docker_compose_override, get_profile_template, get_trace_sample_ratio, metrics_log_enabled
+        )
         from ..nginx import generate_nginx_config
         import os
         
@@ -423,7 +502,14 @@ class SetupService:
         # Resource profile
         if reuse_env:
             self.utils.print_info("Update mode: skipping resource profile selection")
-            profile = ResourceProfile.MEDIUM_VPS
+            # Keep the profile selected at setup instead of falling back to Medium VPS
+            known, profile = installed_resource_profile(existing_env)
+            if not known:
+                profile = ResourceProfile.MEDIUM_VPS
+                self.utils.print_warning(
+                    "Resource profile of this install is unknown - using Medium VPS "
+                    "(set RESOURCE_PROFILE=desktop|small|medium|large|auto|none in .env to keep another)"
+                )
         else:
             profile = select_resource_profile()
             # Only set profile if it's not None (None means "don't configure workers")
@@ -434,6 +520,15 @@ class SetupService:
         budget_profile = self.interactive.ask_budget_profile(reuse_env, existing_env)
         self.config_service.set_budget_profile(BudgetProfile(budget_profile))
         
+        # Mock provider for offline benchmarks
+        mock_provider = self.interactive.ask_mock_provider(reuse_env, existing_env)
+        
+        # Request tracing (otel-collector)
+        tracing = self.interactive.ask_tracing(reuse_env, existing_env)
+        
+        # Metrics exporter (Docker socket access)
+        metrics = self.interactive.ask_metrics(reuse_env, existing_env)
+        
         # Port configuration
         if reuse_env:
             self.config_service.load_from_env()
@@ -445,6 +540,16 @@ class SetupService:
             # Create PortConfig without budget_profile (it's not part of PortConfig)
             port_config_for_obj = {k: v for k, v in port_config.items() if k != 'budget_profile'}
             self.config_service.set_port_config(PortConfig.from_dict(port_config_for_obj))
+            port_config['mock_provider'] = mock_provider  # Keep for generate_env_file
+            port_config['resource_profile'] = profile.value if profile else None  # Keep for generate_env_file
+        port_config['tracing'] = tracing  # Keep for generate_env_file, override and nginx
+        if tracing:
+            # Sampling is decided per request at nginx
+            port_config['trace_sample_ratio'] = get_trace_sample_ratio(get_profile_template(profile))
+        port_config['metrics'] = metrics  # Keep for generate_env_file, override and nginx
+        port_config['metrics_log'] = metrics_log_enabled(get_profile_template(profile), port_config)
+        # Key tails in the nginx metrics log (per-key accounting) only on explicit opt-in
+        port_config['metrics_log_keys'] = bool(get_profile_template(profile).get("metrics", {}).get("log_keys"))
         
         # Generate secrets
         self.config_service.generate_secrets(reuse_existing=reuse_env)
@@ -455,7 +560,7 @@ class SetupService:
             self.utils.print_header("📝 Updating config.yaml")
             print()  # Empty line after header
             os.environ["BUDGET_PROFILE"] = budget_profile
-            generate_config_yaml(budget_profile)
+            generate_config_yaml(budget_profile, mock_provider, tracing)
             
             # Also regenerate docker-compose.override.yml to ensure port mappings are correct
             # This is important when LITELLM_EXTERNAL_PORT is set in .env
@@ -477,7 +582,7 @@ class SetupService:
             self.utils.print_header("📝 Generating config.yaml")
             print()  # Empty line after header
             os.environ["BUDGET_PROFILE"] = budget_profile
-            generate_config_yaml(budget_profile)
+            generate_config_yaml(budget_profile, mock_provider, tracing)
             
             self.utils.print_header("📝 Creating .env file")
             print()  # Empty line after header
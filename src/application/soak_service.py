@@ -0,0 +1,437 @@
+"""
+Soak test - hours of steady API load while tracking memory of every worker
+"""
+
+import asyncio
+import json
+import signal
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from ..core.constants import (
+    LITELLM_CONTAINER_NAME, BENCH_MAX_TOKENS, BENCH_PERCENTILES, BENCH_PROMPT_TOKENS,
+    BENCH_REQUEST_TIMEOUT_S, SOAK_DURATION_S, SOAK_SAMPLE_INTERVAL_S, SOAK_WARMUP_S,
+    SOAK_CONCURRENCY, SOAK_MAX_SLOPE_MB_PER_H, SOAK_MIN_FIT_R2, SOAK_MIN_FIT_SAMPLES
+)
+from ..core.exceptions import DockerError
+from ..core.sketches import TDigest
+from ..core.stats import linear_fit, summarize_digest
+from ..infrastructure.async_http import AsyncHTTPClient
+from ..infrastructure.logger import get_logger
+from .bench_service import BenchService, build_payload
+from .worker_memory_service import WorkerMemoryService
+
+logger = get_logger(__name__)
+
+REPORT_VERSION = 1
+
+
+@dataclass
+class MemorySeries:
+    """Memory samples of one process, or of a whole container (pid None)"""
+    container: str
+    pid: Optional[int]
+    role: str
+    cmdline: str = ""
+    hours: List[float] = field(default_factory=list)
+    rss_mb: List[float] = field(default_factory=list)
+    pss_mb: List[float] = field(default_factory=list)
+
+
+def fit_growth(
+    series: MemorySeries,
+    warmup_h: float,
+    max_slope: float = SOAK_MAX_SLOPE_MB_PER_H,
+    min_r2: float = SOAK_MIN_FIT_R2,
+    min_samples: int = SOAK_MIN_FIT_SAMPLES,
+) -> Dict[str, Any]:
+    """
+    Fit memory growth of one series after the warmup
+
+    A series leaks when PSS grows faster than max_slope MB/hour and the line
+    explains the samples (r² of at least min_r2) - a plateau with noise or
+    one step (cache filled) has a low r².
+
+    Returns:
+        Dictionary with samples, first/last PSS, RSS and PSS slope (MB/h),
+        r² of the PSS fit and verdict ("ok", "leak" or "short")
+    """
+    points = [
+        (h, rss, pss) for h, rss, pss in zip(series.hours, series.rss_mb, series.pss_mb) if h >= warmup_h
+    ]
+    result: Dict[str, Any] = {
+        "container": series.container,
+        "pid": series.pid,
+        "role": series.role,
+        "samples": len(points),
+        "first_pss_mb": points[0][2] if points else None,
+        "last_pss_mb": points[-1][2] if points else None,
+        "rss_slope_mb_per_h": None,
+        "pss_slope_mb_per_h": None,
+        "r2": None,
+        "verdict": "short",
+    }
+    if len(points) < min_samples:
+        return result
+    hours = [p[0] for p in points]
+    rss_slope, _, _ = linear_fit(hours, [p[1] for p in points])
+    pss_slope, _, r2 = linear_fit(hours, [p[2] for p in points])
+    result.update(
+        rss_slope_mb_per_h=round(rss_slope, 2),
+        pss_slope_mb_per_h=round(pss_slope, 2),
+        r2=round(r2, 3),
+        verdict="leak" if pss_slope > max_slope and r2 >= min_r2 else "ok",
+    )
+    return result
+
+
+class SoakService:
+    """Service for long-running load with per-worker memory growth tracking"""
+    
+    def __init__(self, project_root: Path):
+        """
+        Initialize soak test service
+        
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.bench = BenchService(self.project_root)
+        self.memory = WorkerMemoryService(self.project_root)
+        self.utils = self.bench.utils
+        self.series: Dict[Tuple[str, Optional[int]], MemorySeries] = {}
+        self.sample_errors = 0
+        # Latency in a t-digest: a soak runs for hours, a list of every sample would grow with it
+        self.load: Dict[str, Any] = {"ok": 0, "failed": 0, "errors": {}, "latency_ms": TDigest()}
+    
+    def record_sample(self, container: str, hours: float, processes: List[Any]) -> None:
+        """Add one measurement (ProcessMemory list) of a container"""
+        total = self.series.setdefault(
+            (container, None), MemorySeries(container=container, pid=None, role="total")
+        )
+        total.hours.append(hours)
+        total.rss_mb.append(round(sum(p.rss_mb for p in processes), 1))
+        total.pss_mb.append(round(sum(p.pss_mb for p in processes), 1))
+        for process in processes:
+            if process.role == "helper":
+                continue
+            series = self.series.setdefault(
+                (container, process.pid),
+                MemorySeries(container=container, pid=process.pid, role=process.role, cmdline=process.cmdline),
+            )
+            series.hours.append(hours)
+            series.rss_mb.append(process.rss_mb)
+            series.pss_mb.append(process.pss_mb)
+    
+    async def _sampler(
+        self,
+        containers: List[str],
+        interval: float,
+        start: float,
+        stop: asyncio.Event,
+        on_sample,
+    ) -> None:
+        """Measure all containers every interval until stop is set"""
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            hours = (loop.time() - start) / 3600.0
+            for container in containers:
+                try:
+                    # docker exec blocks - keep the load running meanwhile
+                    processes = await loop.run_in_executor(None, self.memory.measure, container)
+                except DockerError as e:
+                    self.sample_errors += 1
+                    logger.warning(f"Memory sample of {container} failed: {e}")
+                    continue
+                self.record_sample(container, hours, processes)
+            on_sample(hours)
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _load(
+        self,
+        client: AsyncHTTPClient,
+        workload: str,
+        model: str,
+        concurrency: int,
+        prompt_tokens: int,
+        max_tokens: int,
+        stop: asyncio.Event,
+    ) -> None:
+        """Closed loop load until stop is set"""
+        loop = asyncio.get_running_loop()
+        counter = [0]
+        
+        async def client_loop() -> None:
+            while not stop.is_set():
+                counter[0] += 1
+                payload = build_payload(workload, model, prompt_tokens, max_tokens, counter[0])
+                now = loop.time()
+                sample = await self.bench.send(client, workload, json.dumps(payload).encode("utf-8"), now, now)
+                if sample.error:
+                    self.load["failed"] += 1
+                    self.load["errors"][sample.error] = self.load["errors"].get(sample.error, 0) + 1
+                    if sample.error in ("refused", "connection"):
+                        # Container restarting - do not spin
+                        await asyncio.sleep(1.0)
+                else:
+                    self.load["ok"] += 1
+                    self.load["latency_ms"].add(sample.latency_ms)
+        
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    
+    async def _run(
+        self,
+        api_base: str,
+        api_key: str,
+        workload: str,
+        model: Optional[str],
+        containers: List[str],
+        duration: float,
+        interval: float,
+        concurrency: int,
+        prompt_tokens: int,
+        max_tokens: int,
+        on_sample,
+    ) -> Tuple[Optional[str], float]:
+        """
+        Run load and sampler until the duration is over or Ctrl+C
+        
+        Returns:
+            Tuple of (model, hours run); model is None if no model could be chosen
+        """
+        loop = asyncio.get_running_loop()
+        client = AsyncHTTPClient(
+            api_base, timeout=BENCH_REQUEST_TIMEOUT_S, headers={"Authorization": f"Bearer {api_key}"}
+        )
+        stop = asyncio.Event()
+        try:
+            loop.add_signal_handler(signal.SIGINT, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+        try:
+            if not model:
+                model = await self.bench.discover_model(client, workload)
+                if not model:
+                    return None, 0.0
+            start = loop.time()
+            tasks = [
+                asyncio.ensure_future(self._sampler(containers, interval, start, stop, on_sample)),
+                asyncio.ensure_future(self._load(
+                    client, workload, model, concurrency, prompt_tokens, max_tokens, stop
+                )),
+            ]
+            try:
+                await asyncio.wait_for(stop.wait(), duration)
+            except asyncio.TimeoutError:
+                stop.set()
+            # Let in-flight requests finish, but not for a whole request timeout
+            done, pending = await asyncio.wait(tasks, timeout=interval + 30.0)
+            for task in pending:
+                task.cancel()
+            for task in done:
+                task.result()
+            return model, (loop.time() - start) / 3600.0
+        finally:
+            try:
+                loop.remove_signal_handler(signal.SIGINT)
+            except (NotImplementedError, RuntimeError):
+                pass
+            client.close()
+    
+    def build_report(
+        self,
+        config: Dict[str, Any],
+        hours: float,
+        max_slope: float,
+    ) -> Dict[str, Any]:
+        """
+        Fits of every series and the load summary
+        
+        Returns:
+            JSON-serializable report (includes the raw samples)
+        """
+        warmup_h = config["warmup_s"] / 3600.0
+        fits = [fit_growth(series, warmup_h, max_slope) for series in self.series.values()]
+        requests = self.load["ok"] + self.load["failed"]
+        return {
+            "version": REPORT_VERSION,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "config": config,
+            "hours": round(hours, 3),
+            "load": {
+                "requests": requests,
+                "ok": self.load["ok"],
+                "error_rate": 100.0 * self.load["failed"] / requests if requests else 0.0,
+                "errors": self.load["errors"],
+                "latency_ms": summarize_digest(self.load["latency_ms"], BENCH_PERCENTILES),
+            },
+            "sample_errors": self.sample_errors,
+            "fits": fits,
+            "series": [
+                {
+                    "container": s.container,
+                    "pid": s.pid,
+                    "role": s.role,
+                    "cmdline": s.cmdline,
+                    "hours": [round(h, 4) for h in s.hours],
+                    "rss_mb": s.rss_mb,
+                    "pss_mb": s.pss_mb,
+                }
+                for s in self.series.values()
+            ],
+        }
+    
+    def print_report(self, report: Dict[str, Any]) -> None:
+        """Print the growth table"""
+        load = report["load"]
+        print(
+            f"{report['hours']:.2f}h, {load['requests']} request(s), {load['error_rate']:.1f}% errors, "
+            f"latency p50 {load['latency_ms']['p50']:.0f}ms p99 {load['latency_ms']['p99']:.0f}ms"
+        )
+        print()
+        print(
+            f"{'container':<20} {'pid':>7} {'role':<7} {'samples':>7} {'PSS first':>9} {'PSS last':>9} "
+            f"{'RSS MB/h':>9} {'PSS MB/h':>9} {'r²':>6}  verdict"
+        )
+        def number(value: Optional[float], spec: str) -> str:
+            return format(value, spec) if value is not None else "-"
+        
+        for fit in report["fits"]:
+            pid = fit["pid"] if fit["pid"] is not None else "-"
+            print(
+                f"{fit['container']:<20} {pid:>7} {fit['role']:<7} {fit['samples']:>7} "
+                f"{number(fit['first_pss_mb'], '>9.1f'):>9} {number(fit['last_pss_mb'], '>9.1f'):>9} "
+                f"{number(fit['rss_slope_mb_per_h'], '>+9.2f'):>9} {number(fit['pss_slope_mb_per_h'], '>+9.2f'):>9} "
+                f"{number(fit['r2'], '>6.2f'):>6}  {fit['verdict']}"
+            )
+        print()
+        if load["errors"]:
+            self.utils.print_warning(
+                "Load errors: " + ", ".join(f"{kind} {count}" for kind, count in load["errors"].items())
+            )
+        if report["sample_errors"]:
+            self.utils.print_warning(f"{report['sample_errors']} memory sample(s) failed (container restarting?)")
+    
+    def run(
+        self,
+        workload: str = "chat",
+        target: str = "auto",
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        containers: Optional[List[str]] = None,
+        duration: float = SOAK_DURATION_S,
+        interval: float = SOAK_SAMPLE_INTERVAL_S,
+        warmup: float = SOAK_WARMUP_S,
+        concurrency: int = SOAK_CONCURRENCY,
+        prompt_tokens: int = BENCH_PROMPT_TOKENS,
+        max_tokens: int = BENCH_MAX_TOKENS,
+        max_slope: float = SOAK_MAX_SLOPE_MB_PER_H,
+        json_path: Optional[Path] = None,
+    ) -> int:
+        """
+        Run the soak test and judge memory growth
+        
+        Args:
+            workload: "chat", "stream" or "embeddings"
+            target: "auto", "nginx" or "litellm" (see BenchService.resolve_endpoint)
+            base_url: API base URL instead of the one from .env
+            api_key: API key instead of the one from .env
+            model: Model name (default: first suitable model from /models;
+                mock-gpt with the mock provider)
+            containers: Containers to sample (default: LiteLLM); python must
+                be available in them
+            duration: Seconds of load (Ctrl+C ends early and still reports)
+            interval: Seconds between memory samples
+            warmup: Seconds at the start not used for the growth fit
+            concurrency: Closed loop clients
+            prompt_tokens: Approximate prompt size
+            max_tokens: max_tokens of chat requests
+            max_slope: PSS growth in MB/hour above which a worker fails
+            json_path: Report file, rewritten after every sample so an
+                aborted run keeps its data
+        
+        Returns:
+            Exit code (0 if no worker leaks, 1 on leak or too few samples)
+        """
+        self.utils.print_header("🧪 Soak Test (memory growth)")
+        print()
+        
+        containers = containers or [LITELLM_CONTAINER_NAME]
+        if not (base_url and api_key):
+            env_base, env_key = self.bench.resolve_endpoint(target)
+            base_url = base_url or env_base
+            api_key = api_key or env_key
+        if not base_url:
+            self.utils.print_error(f"No {target} endpoint in .env (run ./ai-gateway setup or pass --base-url)")
+            return 1
+        if not api_key:
+            self.utils.print_error("API key not found in .env (pass --key)")
+            return 1
+        
+        config = {
+            "workload": workload,
+            "target": target,
+            "api_base": base_url,
+            "model": model,
+            "containers": containers,
+            "duration_s": duration,
+            "interval_s": interval,
+            "warmup_s": warmup,
+            "concurrency": concurrency,
+            "max_slope_mb_per_h": max_slope,
+        }
+        self.utils.print_info(f"Target: {base_url}, {workload}, {concurrency} client(s)")
+        self.utils.print_info(
+            f"Sampling {', '.join(containers)} every {interval:g}s for {duration / 3600.0:.1f}h "
+            f"(first {warmup / 60.0:.0f} min not fitted) - Ctrl+C ends early"
+        )
+        
+        def on_sample(hours: float) -> None:
+            workers = sum(1 for s in self.series.values() if s.role == "worker" and s.hours and s.hours[-1] == hours)
+            totals = [s.pss_mb[-1] for s in self.series.values() if s.role == "total" and s.hours]
+            print(f"  {hours:5.2f}h  {workers} worker(s), PSS {sum(totals):.0f}MB, {self.load['ok']} ok, "
+                  f"{self.load['failed']} failed", flush=True)
+            if json_path:
+                Path(json_path).write_text(
+                    json.dumps(self.build_report(config, hours, max_slope)) + "\n", encoding="utf-8"
+                )
+        
+        model, hours = asyncio.run(self._run(
+            base_url, api_key, workload, model, containers, duration, interval,
+            concurrency, prompt_tokens, max_tokens, on_sample,
+        ))
+        if not model:
+            self.utils.print_error(f"No {workload} model found via {base_url}/models (pass --model)")
+            return 1
+        config["model"] = model
+        print()
+        
+        report = self.build_report(config, hours, max_slope)
+        self.print_report(report)
+        if json_path:
+            Path(json_path).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+            self.utils.print_info(f"Report written to {json_path}")
+        
+        workers = [fit for fit in report["fits"] if fit["role"] == "worker"]
+        # Single-process LiteLLM: the master serves requests
+        judged = workers or [fit for fit in report["fits"] if fit["role"] in ("master", "other")]
+        leaking = [fit for fit in judged if fit["verdict"] == "leak"]
+        if leaking:
+            self.utils.print_error(
+                f"{len(leaking)} process(es) grow faster than {max_slope:g} MB/h: "
+                + ", ".join(f"{fit['container']} pid {fit['pid']} {fit['pss_slope_mb_per_h']:+.1f} MB/h" for fit in leaking)
+            )
+            return 1
+        if not any(fit["verdict"] == "ok" for fit in judged):
+            self.utils.print_error(
+                f"Too few samples after warmup to fit growth (need {SOAK_MIN_FIT_SAMPLES} per process) - "
+                "run longer or lower --interval/--warmup"
+            )
+            return 1
+        self.utils.print_success(f"No process grows faster than {max_slope:g} MB/h")
+        return 0
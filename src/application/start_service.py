@@ -2,10 +2,23 @@
 Start service for AI Gateway containers
 """
 
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+from ..core.constants import (
+    START_HISTORY_FILE, START_CHECKS_FILE, START_PROFILE_COMPARE_RUNS, START_STATE_FILE,
+    DRAIN_FLAG_FILE
+)
 from ..core.exceptions import DockerError
 from ..infrastructure.docker_client import DockerClient
+from ..infrastructure.readiness import ReadinessWaiter
+from ..infrastructure.start_state import (
+    build_start_state, changed_parts, load_start_state, save_start_state
+)
+from ..infrastructure.startup_profiler import (
+    StartupProfiler, load_history, append_history, consume_check_timings,
+    compare_with_history
+)
 from ..infrastructure.logger import get_logger
 
 logger = get_logger(__name__)
@@ -24,13 +37,17 @@ class StartService:
         self.project_root = Path(project_root)
         self.docker_client = DockerClient()
         self.utils = self._import_utils()
+        self.readiness = None
+        self.profiler = StartupProfiler()
+        # Dependency checks ran in check_dependencies.py just before this process
+        self.profiler.add_phases(consume_check_timings(self.project_root / START_CHECKS_FILE), prefix="checks.")
     
     def _import_utils(self):
         """Import utility functions"""
         from types import SimpleNamespace
         from ..utils import (
             print_info, print_success, print_warning,
-            print_error, Colors, read_env_file
+            print_error, Colors, read_env_file, compose_profiles
         )
         return SimpleNamespace(
             print_info=print_info,
@@ -39,6 +56,7 @@ class StartService:
             print_error=print_error,
             Colors=Colors,
             read_env_file=read_env_file,
+            compose_profiles=compose_profiles,
         )
     
     def start_containers(self, wait_for_healthy: bool = True) -> bool:
@@ -51,9 +69,11 @@ class StartService:
         Returns:
             True if containers started successfully, False otherwise
         """
+        self.clear_drain_flag()
         try:
             # Check for Virtual Key (required for Open WebUI)
-            env_vars = self.utils.read_env_file(self.project_root / ".env")
+            with self.profiler.phase("env"):
+                env_vars = self.utils.read_env_file(self.project_root / ".env")
             virtual_key = env_vars.get("VIRTUAL_KEY", "").strip()
             first_run = env_vars.get("FIRST_RUN", "no").lower() in ("yes", "true", "1")
             
@@ -85,17 +105,29 @@ class StartService:
             
             self.utils.print_info("Starting containers...")
             
-            # Try to use --wait flag (Docker Compose v2.3+)
             try:
-                self.docker_client.compose_up(str(self.project_root), detach=True, wait=wait_for_healthy)
+                with self.profiler.phase("images"):
+                    self.record_image_presence()
+                started_at = time.time()
+                with self.profiler.phase("compose_up"):
+                    self.docker_client.compose_up(str(self.project_root), detach=True, wait=False)
                 if wait_for_healthy:
-                    self.utils.print_success("Containers started and healthy!")
-                else:
-                    self.utils.print_success("Containers started successfully!")
+                    with self.profiler.phase("readiness"):
+                        return self.wait_until_ready(started_at)
+                self.utils.print_success("Containers started successfully!")
                 return True
             except DockerError as e:
-                # If --wait failed, check for failed containers and show their logs
-                failed_containers = self.docker_client.get_failed_containers(str(self.project_root))
+                # Check for failed containers and show their logs
+                if self.readiness is not None and self.readiness.failed_service:
+                    # Readiness waiter already captured the first container that died
+                    failed_containers = [{
+                        "name": self.readiness.failed_service,
+                        "state": "exited",
+                        "exit_code": self.readiness.exit_code,
+                        "logs": self.readiness.logs,
+                    }]
+                else:
+                    failed_containers = self.docker_client.get_failed_containers(str(self.project_root))
                 
                 if failed_containers:
                     print()
@@ -104,7 +136,7 @@ class StartService:
                     for container in failed_containers:
                         self.utils.print_error(f"  • {container['name']}: {container['state']} (exit code: {container['exit_code']})")
                         # Get and show logs for failed container
-                        logs = self.docker_client.get_container_logs(
+                        logs = container.get("logs") or self.docker_client.get_container_logs(
                             str(self.project_root),
                             container['name'],
                             tail=30
@@ -120,7 +152,7 @@ class StartService:
                 
                 # Show error and instructions
                 print()
-                self.utils.print_error("Failed to start containers")
+                self.utils.print_error(f"Failed to start containers: {e}")
                 print()
                 self.utils.print_info("To stop all containers:")
                 self.utils.print_info("   ./stop.sh  # Linux/macOS")
@@ -149,6 +181,213 @@ class StartService:
             print()
             return False
     
+    def wait_until_ready(self, started_at: Optional[float] = None, timeout: int = 300) -> bool:
+        """
+        Wait for all services to become healthy (docker events, polling fallback)
+        
+        Args:
+            started_at: time.time() before `compose up` (for ready times)
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            True if all services are ready
+        
+        Raises:
+            DockerError: If a container dies or services don't become ready in time
+        """
+        waiter = ReadinessWaiter(str(self.project_root), self.docker_client)
+        try:
+            result = waiter.wait(timeout=timeout, since=started_at)
+            self.readiness = result
+            for state in result.services.values():
+                self.profiler.set_container(
+                    state.name,
+                    created_s=state.created_after_s,
+                    started_s=state.started_after_s,
+                    ready_s=state.ready_after_s,
+                )
+        except DockerError as e:
+            logger.warning(f"Event-based readiness unavailable ({e}), falling back to polling")
+            if self.docker_client.wait_for_containers(str(self.project_root), timeout=timeout):
+                self.utils.print_success("Containers started and healthy!")
+                return True
+            raise DockerError("Containers did not become healthy in time") from e
+        
+        if result.ready:
+            self.utils.print_success(f"Containers started and healthy! ({result.elapsed_s:.1f}s)")
+            self.print_ready_times(result)
+            return True
+        if result.failed_service:
+            raise DockerError(f"{result.failed_service} exited with code {result.exit_code}")
+        raise DockerError(
+            f"Timeout after {timeout}s waiting for: {', '.join(result.pending)}"
+        )
+    
+    def service_images(self) -> Dict[str, str]:
+        """
+        Compose service -> image from docker-compose.yml (empty if it can't be read)
+        
+        Services of compose profiles that are not active (COMPOSE_PROFILES) are
+        left out: compose does not start them.
+        """
+        try:
+            import yaml
+        except ImportError:
+            return {}
+        try:
+            with open(self.project_root / "docker-compose.yml", "r", encoding="utf-8") as f:
+                services = (yaml.safe_load(f) or {}).get("services") or {}
+        except (IOError, OSError, yaml.YAMLError) as e:
+            logger.debug(f"Cannot read service images: {e}")
+            return {}
+        active = self.utils.compose_profiles(self.utils.read_env_file(self.project_root / ".env"))
+        
+        def enabled(config: dict) -> bool:
+            profiles = config.get("profiles") or []
+            return not profiles or "*" in active or bool(active.intersection(profiles))
+        
+        return {
+            name: config["image"] for name, config in services.items()
+            if config and config.get("image") and enabled(config)
+        }
+    
+    def record_image_presence(self) -> None:
+        """Record per service whether its image is already local (a pull adds to created time)"""
+        for service, image in self.service_images().items():
+            self.profiler.set_container(service, image=image, image_present=self.docker_client.image_exists(image))
+    
+    def clear_drain_flag(self) -> None:
+        """Remove a maintenance flag left by an interrupted `stop --drain` (nginx would keep answering 503)"""
+        flag = self.project_root / DRAIN_FLAG_FILE
+        if flag.exists():
+            flag.unlink()
+            self.utils.print_info("Removed maintenance flag left by an earlier drain")
+    
+    def try_fast_start(self) -> bool:
+        """
+        Skip the start when nothing changed and the stack is already healthy
+        
+        Compares the fingerprint of generated artifacts, image IDs and tool
+        versions with the one recorded after the last successful start, then
+        checks with one `compose ps` that every service is running and healthy.
+        
+        Returns:
+            True if the running stack is up to date (no start needed)
+        """
+        self.clear_drain_flag()
+        previous = load_start_state(self.project_root / START_STATE_FILE)
+        if previous is None:
+            return False
+        
+        with self.profiler.phase("fingerprint"):
+            current = build_start_state(self.project_root, self.docker_client, self.service_images())
+        if current["fingerprint"] != previous["fingerprint"]:
+            changes = changed_parts(previous, current)
+            self.utils.print_info(f"Changed since last start: {', '.join(changes) or 'fingerprint'} - full start")
+            return False
+        
+        with self.profiler.phase("health"):
+            try:
+                containers = self.docker_client.compose_ps(str(self.project_root), all_containers=True)
+            except DockerError as e:
+                logger.debug(f"Fast path health check failed: {e}")
+                return False
+        by_service = {c.get("Service"): c for c in containers if c.get("Service")}
+        not_ready = [
+            service for service in current["services"]
+            if service not in by_service or not ReadinessWaiter.is_ready(by_service[service])
+        ]
+        if not_ready:
+            self.utils.print_info(f"Not running or not healthy: {', '.join(not_ready)} - full start")
+            return False
+        
+        self.utils.print_success(
+            f"Nothing changed since last start, all {len(current['services'])} services are healthy"
+        )
+        return True
+    
+    def record_start_state(self) -> None:
+        """Record the fingerprint of this successful start for the fast path"""
+        with self.profiler.phase("fingerprint"):
+            state = build_start_state(self.project_root, self.docker_client, self.service_images())
+        save_start_state(self.project_root / START_STATE_FILE, state)
+    
+    def load_start_history(self) -> list:
+        """Earlier starts from the start history (oldest first)"""
+        return load_history(self.project_root / START_HISTORY_FILE)
+    
+    def save_profile(self, ok: bool, mode: str = "full") -> dict:
+        """
+        Append this start to the start history
+        
+        Args:
+            ok: Whether the start succeeded
+            mode: "full" or "fast" (fast path, nothing started)
+        
+        Returns:
+            History entry that was written
+        """
+        entry = self.profiler.to_entry(ok, mode)
+        append_history(self.project_root / START_HISTORY_FILE, entry)
+        return entry
+    
+    def print_profile(self, entry: dict, history: list, runs: int = START_PROFILE_COMPARE_RUNS) -> None:
+        """
+        Print phase and container timings against the median of the last starts
+        
+        Args:
+            entry: History entry of this start
+            history: Earlier history entries (without this start)
+            runs: Number of earlier successful starts to compare against
+        """
+        rows = compare_with_history(entry, history, runs)
+        mode = entry.get("mode", "full")
+        compared = len([h for h in history if h.get("ok") and h.get("mode", "full") == mode][-runs:])
+        print()
+        self.utils.print_info(f"Startup profile, {mode} start (median of last {compared} successful {mode} start(s))")
+        print(f"  {'phase':<26} {'this run':>9} {'median':>9} {'change':>8}")
+        for row in rows:
+            if row["current"] is None:
+                continue
+            current = f"{row['current']:.2f}s"
+            median = f"{row['median']:.2f}s" if row["median"] is not None else "-"
+            change = ""
+            if row["median"]:
+                change = f"{(row['current'] - row['median']) / row['median'] * 100:+.0f}%"
+            marker = "  ⚠️" if row["regression"] else ""
+            print(f"  {row['name']:<26} {current:>9} {median:>9} {change:>8}{marker}")
+        pulled = [name for name, c in entry.get("containers", {}).items() if c.get("image_present") is False]
+        if pulled:
+            self.utils.print_info(f"Images pulled during this start: {', '.join(pulled)} (created times include the pull)")
+        regressions = [row["name"] for row in rows if row["regression"]]
+        if regressions:
+            self.utils.print_warning(f"Slower than usual: {', '.join(regressions)}")
+        print()
+    
+    def print_ready_times(self, result) -> None:
+        """
+        Print per-service time-to-ready (from `compose up`) and start-to-ready
+        
+        Args:
+            result: ReadinessResult of the readiness waiter
+        """
+        timed = sorted(
+            (state for state in result.services.values() if state.ready_after_s is not None),
+            key=lambda state: state.ready_after_s,
+        )
+        if not timed:
+            return
+        print()
+        print(f"  {'service':<12} {'ready at':>9} {'start->ready':>13}")
+        for state in timed:
+            startup = f"{state.startup_s:.1f}s" if state.startup_s is not None else "-"
+            print(f"  {state.name:<12} {state.ready_after_s:>8.1f}s {startup:>13}")
+            logger.info(f"Time to ready: {state.name} {state.ready_after_s}s (start->ready {state.startup_s}s)")
+        untimed = [name for name, state in result.services.items() if state.ready_after_s is None]
+        if untimed:
+            print(f"  already running: {', '.join(untimed)}")
+        print()
+    
     def check_container_status(self) -> tuple[bool, list[str]]:
         """
         Check container status for errors
@@ -156,33 +395,11 @@ class StartService:
         Returns:
             Tuple of (has_errors, list of error messages)
         """
-        import subprocess
-        import json
-        
         errors = []
         has_errors = False
         
         try:
-            # Get container status
-            result = subprocess.run(
-                ["docker", "compose", "ps", "--format", "json"],
-                cwd=str(self.project_root),
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=10
-            )
-            
-            if not result.stdout.strip():
-                return False, []
-            
-            containers = []
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    try:
-                        containers.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
+            containers = self.docker_client.compose_ps(str(self.project_root))
             
             # Check for exited/error containers
             for container in containers:
@@ -206,7 +423,7 @@ class StartService:
             
             return has_errors, errors
             
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+        except DockerError as e:
             logger.warning(f"Error checking container status: {e}")
             return False, []
     
@@ -0,0 +1,78 @@
+"""
+Status service - container state and health of the stack
+"""
+
+from pathlib import Path
+from ..core.exceptions import DockerError
+from ..infrastructure.docker_client import DockerClient
+from ..infrastructure.docker_engine import get_engine_client
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class StatusService:
+    """Service for showing container status"""
+    
+    def __init__(self, project_root: Path):
+        """
+        Initialize status service
+        
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.docker_client = DockerClient()
+        self.utils = self._import_utils()
+    
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import print_info, print_success, print_warning, print_error, Colors
+        return SimpleNamespace(
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+            Colors=Colors,
+        )
+    
+    def show_status(self) -> int:
+        """
+        Print state and health of all stack containers
+        
+        Returns:
+            Exit code (0 if all containers are running and healthy)
+        """
+        try:
+            containers = self.docker_client.compose_ps(str(self.project_root), all_containers=True)
+        except DockerError as e:
+            self.utils.print_error(f"Cannot get container status: {e}")
+            return 1
+        
+        engine = get_engine_client()
+        backend = f"engine API ({engine.socket_path})" if engine else "docker CLI"
+        logger.debug(f"Status via {backend}")
+        
+        if not containers:
+            self.utils.print_warning("No containers found - start them with: ./ai-gateway start")
+            return 1
+        
+        print(f"{'service':<12} {'container':<18} {'state':<10} {'health':<10} status")
+        all_ok = True
+        for container in sorted(containers, key=lambda c: c.get("Service", "")):
+            state = container.get("State", "")
+            health = container.get("Health", "") or "-"
+            if state != "running" or health not in ("healthy", "-"):
+                all_ok = False
+            print(
+                f"{container.get('Service', ''):<12} {container.get('Name', ''):<18} "
+                f"{state:<10} {health:<10} {container.get('Status', '')}"
+            )
+        print()
+        self.utils.print_info(f"Backend: {backend}")
+        if all_ok:
+            self.utils.print_success("All containers are running")
+            return 0
+        self.utils.print_warning("Some containers are not running or not healthy")
+        return 1
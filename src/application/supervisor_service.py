@@ -0,0 +1,545 @@
+"""
+Stack supervisor - restarts only the container that failed (systemd Type=notify)
+"""
+
+import json
+import os
+import queue
+import signal
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+from ..core.constants import (
+    SUPERVISE_STATE_FILE, SUPERVISE_BACKOFF_BASE_S, SUPERVISE_BACKOFF_MAX_S,
+    SUPERVISE_STABLE_S, SUPERVISE_RESTART_STOP_TIMEOUT_S, SUPERVISE_READY_TIMEOUT_S,
+    LITELLM_CONTAINER_NAME, RECYCLE_RSS_LABEL, RECYCLE_CHECK_INTERVAL_S, RECYCLE_RESPAWN_TIMEOUT_S
+)
+from ..core.exceptions import DockerError
+from ..infrastructure.docker_client import DockerClient, compose_project_name
+from ..infrastructure.host_resources import read_meminfo
+from ..infrastructure.logger import get_logger
+from ..infrastructure.readiness import ReadinessWaiter, PROJECT_LABEL, SERVICE_LABEL
+from ..infrastructure.sd_notify import notify, watchdog_interval
+from .worker_memory_service import WorkerMemoryService
+
+logger = get_logger(__name__)
+
+# Seconds between event stream reconnects (Docker daemon restarted)
+RESUBSCRIBE_DELAY_S = 2.0
+
+# Signals of `docker stop`/`docker kill` (SIGTERM, SIGKILL) as in kill events
+STOP_SIGNALS = ("15", "9")
+
+# Signals one LiteLLM worker inside the container (python is in the image)
+SIGTERM_SNIPPET = "import os,signal,sys\nos.kill(int(sys.argv[1]),signal.SIGTERM)\n"
+
+
+@dataclass
+class RestartCounters:
+    """Restart bookkeeping of one compose service"""
+    container: str = ""
+    restarts: int = 0
+    consecutive_failures: int = 0
+    last_reason: Optional[str] = None
+    last_failure_at: Optional[float] = None
+    last_restart_at: Optional[float] = None
+    next_restart_at: Optional[float] = None
+    healthy_since: Optional[float] = None
+
+
+@dataclass
+class RecycleCounters:
+    """LiteLLM worker recycling bookkeeping (RSS ceiling)"""
+    recycles: int = 0
+    rollouts: int = 0
+    last_reason: Optional[str] = None
+    last_at: Optional[float] = None
+    # Worker signalled and not yet replaced
+    pending_pid: Optional[int] = None
+    pending_since: Optional[float] = None
+    expected_workers: int = 0
+    # False once the master did not replace a signalled worker (rollouts only)
+    worker_recycling: bool = True
+    next_check_at: float = 0.0
+
+
+def backoff_delay(failures: int, base: float = SUPERVISE_BACKOFF_BASE_S, maximum: float = SUPERVISE_BACKOFF_MAX_S) -> float:
+    """Delay before restart number `failures` of a crash loop (base, 2x base, 4x base, ... capped)"""
+    return min(maximum, base * 2 ** max(0, failures - 1))
+
+
+def load_supervisor_state(path: Path) -> Dict[str, Any]:
+    """Supervisor state file (empty dict if missing or unreadable)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class SupervisorService:
+    """Service for watching container health and restarting failed containers"""
+    
+    def __init__(self, project_root: Path):
+        """
+        Initialize supervisor
+        
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.work_dir = str(self.project_root)
+        self.docker_client = DockerClient()
+        self.utils = self._import_utils()
+        self.state_path = self.project_root / SUPERVISE_STATE_FILE
+        self.project = compose_project_name(self.work_dir)
+        self.counters: Dict[str, RestartCounters] = {}
+        # Containers stopped on purpose (SIGTERM/SIGKILL kill or stop event seen): their die is not a failure
+        self.intentional: Set[str] = set()
+        self.started_at = time.time()
+        self._stopping = threading.Event()
+        self._last_event_time: Optional[float] = None
+        self.memory = WorkerMemoryService(self.project_root)
+        self.recycle = RecycleCounters()
+        self._rollout: Optional[threading.Thread] = None
+    
+    def _import_utils(self):
+        """Import utility functions (through the queued logger once configure_logging is active)"""
+        from types import SimpleNamespace
+        from ..infrastructure.logger import logging_configured
+        from ..utils import (
+            print_header, print_info, print_success, print_warning, print_error, read_env_file,
+            logged_print_functions
+        )
+        printers = dict(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+        )
+        if logging_configured():
+            # Daemon: a blocked stdout (journal) must not stall the event loop
+            printers.update(logged_print_functions(logger))
+        return SimpleNamespace(read_env_file=read_env_file, **printers)
+    
+    def save_state(self) -> None:
+        """Write restart counters atomically (read by `supervise --status`)"""
+        data = {
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "updated_at": time.time(),
+            "services": {name: asdict(c) for name, c in sorted(self.counters.items())},
+            "recycling": asdict(self.recycle),
+        }
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except (IOError, OSError) as e:
+            logger.warning(f"Failed to write supervisor state {self.state_path}: {e}")
+    
+    def _status_line(self) -> str:
+        restarts = sum(c.restarts for c in self.counters.values())
+        pending = [name for name, c in self.counters.items() if c.next_restart_at]
+        line = f"Watching {self.project}: {restarts} restart(s)"
+        if pending:
+            line += f", restart pending: {', '.join(sorted(pending))}"
+        return line
+    
+    def _publish(self) -> None:
+        self.save_state()
+        notify(f"STATUS={self._status_line()}")
+    
+    def record_failure(self, service: str, container: str, reason: str, now: Optional[float] = None) -> None:
+        """
+        Schedule a restart of a failed service with crash-loop backoff
+        
+        A service that was healthy for SUPERVISE_STABLE_S since its last
+        failure starts over at the base delay.
+        """
+        now = now if now is not None else time.time()
+        counters = self.counters.setdefault(service, RestartCounters())
+        counters.container = container or counters.container
+        if counters.next_restart_at is not None:
+            # Already scheduled
+            return
+        if counters.healthy_since is not None and now - counters.healthy_since >= SUPERVISE_STABLE_S:
+            counters.consecutive_failures = 0
+        counters.consecutive_failures += 1
+        counters.last_reason = reason
+        counters.last_failure_at = now
+        counters.healthy_since = None
+        delay = backoff_delay(counters.consecutive_failures)
+        counters.next_restart_at = now + delay
+        self.utils.print_warning(
+            f"{service}: {reason} - restart in {delay:.0f}s (failure {counters.consecutive_failures} in a row)"
+        )
+        logger.debug("failure", extra={
+            "phase": "failure", "service": service, "container": counters.container, "reason": reason,
+            "failures": counters.consecutive_failures, "restart_in_s": round(delay, 1),
+        })
+        self._publish()
+    
+    def record_healthy(self, service: str, container: str, now: Optional[float] = None) -> None:
+        """Mark a service healthy (starts the stability window)"""
+        counters = self.counters.setdefault(service, RestartCounters())
+        counters.container = container or counters.container
+        if counters.healthy_since is None:
+            counters.healthy_since = now if now is not None else time.time()
+            if counters.restarts:
+                self.utils.print_success(f"{service}: healthy again")
+            logger.debug("healthy", extra={"phase": "healthy", "service": service, "container": counters.container})
+            self._publish()
+    
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """React to one docker event of the project"""
+        attributes = (event.get("Actor") or {}).get("Attributes") or {}
+        if attributes.get(PROJECT_LABEL) != self.project:
+            return
+        service = attributes.get(SERVICE_LABEL)
+        container = attributes.get("name") or ""
+        if not service:
+            return
+        if event.get("time"):
+            self._last_event_time = float(event["time"])
+        action = event.get("Action") or event.get("status") or ""
+        
+        if action == "kill" and str(attributes.get("signal", "")) not in STOP_SIGNALS:
+            # A signal that does not stop the container (USR1 log reopen, HUP reload)
+            return
+        if action in ("kill", "stop", "destroy"):
+            # Stopped or removed on purpose (stop.sh, compose down/recreate, our own restart)
+            self.intentional.add(container)
+            counters = self.counters.get(service)
+            if counters and counters.next_restart_at is not None and action != "kill":
+                counters.next_restart_at = None
+                self.utils.print_info(f"{service}: stopped on purpose, pending restart cancelled")
+                self._publish()
+        elif action == "start":
+            self.intentional.discard(container)
+        elif action == "die":
+            if container in self.intentional:
+                return
+            self.record_failure(service, container, f"exited with code {attributes.get('exitCode', '?')}")
+        elif action.startswith("health_status"):
+            status = action.split(":", 1)[-1].strip()
+            if status == "unhealthy":
+                self.record_failure(service, container, "unhealthy")
+            elif status == "healthy":
+                self.record_healthy(service, container)
+    
+    def restart_due(self, now: Optional[float] = None) -> None:
+        """Restart every service whose backoff has expired"""
+        now = now if now is not None else time.time()
+        for service, counters in sorted(self.counters.items()):
+            if counters.next_restart_at is None or counters.next_restart_at > now:
+                continue
+            counters.next_restart_at = None
+            self.utils.print_info(f"{service}: restarting {counters.container}...")
+            try:
+                self.docker_client.restart_container(counters.container, SUPERVISE_RESTART_STOP_TIMEOUT_S)
+            except DockerError as e:
+                self.record_failure(service, counters.container, f"restart failed: {e}")
+                continue
+            counters.restarts += 1
+            counters.last_restart_at = time.time()
+            logger.debug("restarted", extra={
+                "phase": "restart", "service": service, "container": counters.container, "restarts": counters.restarts,
+            })
+            self._publish()
+    
+    def rss_ceiling(self) -> Optional[int]:
+        """RSS ceiling (MB) of the running LiteLLM container, None without recycling"""
+        try:
+            info = self.docker_client.inspect_container(LITELLM_CONTAINER_NAME)
+        except DockerError:
+            return None
+        if not info or not (info.get("State") or {}).get("Running"):
+            return None
+        value = ((info.get("Config") or {}).get("Labels") or {}).get(RECYCLE_RSS_LABEL, "")
+        return int(value) if value.isdigit() and int(value) > 0 else None
+    
+    def recycle_check(self, now: Optional[float] = None) -> None:
+        """
+        Recycle a LiteLLM process above the RSS ceiling
+        
+        One at a time. A worker gets SIGTERM: it stops accepting (the other
+        workers keep taking nginx's connections on the shared socket),
+        finishes its in-flight requests including streams, and the master
+        starts a replacement; the next worker is only considered once it
+        is gone and replaced. A single LiteLLM process, or a master that
+        does not replace workers, is recycled by a rollout: nginx moves to
+        a second instance and the old one drains before it is recreated -
+        only when the host has memory for that second instance.
+        """
+        now = now if now is not None else time.time()
+        recycle = self.recycle
+        if now < recycle.next_check_at or (self._rollout and self._rollout.is_alive()):
+            return
+        recycle.next_check_at = now + RECYCLE_CHECK_INTERVAL_S
+        ceiling = self.rss_ceiling()
+        if not ceiling:
+            return
+        try:
+            processes = self.memory.measure(LITELLM_CONTAINER_NAME)
+        except DockerError as e:
+            logger.debug(f"Worker memory check failed: {e}")
+            return
+        workers = [p for p in processes if p.role == "worker"]
+        
+        if recycle.pending_pid is not None:
+            gone = all(p.pid != recycle.pending_pid for p in processes)
+            if gone and len(workers) >= recycle.expected_workers:
+                self.utils.print_success(f"litellm: worker {recycle.pending_pid} replaced")
+            elif now - (recycle.pending_since or now) < RECYCLE_RESPAWN_TIMEOUT_S:
+                return
+            else:
+                recycle.worker_recycling = False
+                self.utils.print_warning(
+                    f"litellm: worker {recycle.pending_pid} was not replaced in {RECYCLE_RESPAWN_TIMEOUT_S:.0f}s "
+                    "- recycling by rollout from now on"
+                )
+            recycle.pending_pid = recycle.pending_since = None
+            self._publish()
+        
+        serving = workers or [p for p in processes if "litellm" in p.cmdline.lower()]
+        over = sorted((p for p in serving if p.rss_mb > ceiling), key=lambda p: -p.rss_mb)
+        if not over:
+            return
+        process = over[0]
+        reason = f"{process.role} {process.pid} RSS {process.rss_mb:.0f}MB > {ceiling}MB"
+        recycle.last_reason = reason
+        recycle.last_at = now
+        logger.debug("recycle", extra={
+            "phase": "recycle", "service": "litellm", "pid": process.pid, "role": process.role,
+            "rss_mb": round(process.rss_mb), "rss_ceiling_mb": ceiling,
+        })
+        
+        if len(workers) >= 2 and recycle.worker_recycling:
+            self.utils.print_info(f"litellm: recycling {reason}")
+            try:
+                self.docker_client.exec_in_container(
+                    LITELLM_CONTAINER_NAME, ["python", "-c", SIGTERM_SNIPPET, str(process.pid)], timeout=30
+                )
+            except DockerError as e:
+                self.utils.print_warning(f"litellm: cannot signal worker {process.pid}: {e}")
+                return
+            recycle.recycles += 1
+            recycle.pending_pid = process.pid
+            recycle.pending_since = now
+            recycle.expected_workers = len(workers)
+            self._publish()
+            return
+        
+        env_vars = self.utils.read_env_file(self.project_root / ".env")
+        if env_vars.get("USE_NGINX", "no").lower() not in ("yes", "true", "1"):
+            self.utils.print_warning(f"litellm: {reason}, but recycling one process without downtime needs nginx")
+            recycle.next_check_at = now + SUPERVISE_BACKOFF_MAX_S
+            return
+        headroom = self.rollout_headroom()
+        if headroom is not None:
+            self.utils.print_warning(f"litellm: {reason}, but {headroom} - not recycling")
+            recycle.next_check_at = now + SUPERVISE_BACKOFF_MAX_S
+            return
+        self.utils.print_info(f"litellm: {reason} - rolling restart")
+        recycle.rollouts += 1
+        # Failed rollouts are not retried right away
+        recycle.next_check_at = now + SUPERVISE_BACKOFF_MAX_S
+        self._publish()
+        self._rollout = threading.Thread(target=self._recycle_rollout, daemon=True)
+        self._rollout.start()
+    
+    def rollout_headroom(self) -> Optional[str]:
+        """
+        Check that the host can run a second LiteLLM instance during a rollout
+        
+        Returns:
+            None if it can, otherwise why not
+        """
+        needed_mb = self.docker_client.get_container_memory_mb(LITELLM_CONTAINER_NAME)
+        available_mb = read_meminfo().get("MemAvailable", 0) // 1024
+        if not needed_mb or not available_mb:
+            return "free memory for a second instance cannot be checked"
+        if available_mb < needed_mb:
+            return f"a second instance needs ~{needed_mb:.0f}MB and only {available_mb}MB is available"
+        return None
+    
+    def _recycle_rollout(self) -> None:
+        """Run a rollout (in a thread - the main loop keeps pinging the watchdog)"""
+        from .rollout_service import RolloutService
+        
+        if RolloutService(self.project_root).run() != 0:
+            self.utils.print_warning("litellm: recycling rollout failed - see above, retried later")
+    
+    def sweep(self) -> None:
+        """Schedule restarts for containers that are already unhealthy or exited"""
+        try:
+            containers = self.docker_client.compose_ps(self.work_dir, all_containers=True)
+        except DockerError as e:
+            self.utils.print_warning(f"Cannot list containers: {e}")
+            return
+        for container in containers:
+            service = container.get("Service")
+            name = container.get("Name") or ""
+            if not service:
+                continue
+            health = (container.get("Health") or "").lower()
+            state = (container.get("State") or "").lower()
+            self.counters.setdefault(service, RestartCounters()).container = name
+            if state in ("exited", "dead"):
+                self.record_failure(service, name, f"exited with code {container.get('ExitCode', '?')}")
+            elif health == "unhealthy":
+                self.record_failure(service, name, "unhealthy")
+            elif health == "healthy" or (not health and state == "running"):
+                self.record_healthy(service, name)
+    
+    def _subscribe(self, lines: "queue.Queue[Optional[str]]"):
+        """Start the events stream; a reader thread feeds lines (None at the end)"""
+        since = f"{self._last_event_time:.3f}" if self._last_event_time else None
+        events = self.docker_client.stream_events([
+            "type=container",
+            "event=die",
+            "event=kill",
+            "event=stop",
+            "event=destroy",
+            "event=start",
+            "event=health_status",
+            f"label={PROJECT_LABEL}={self.project}",
+        ], since=since)
+        
+        def reader() -> None:
+            for line in events.stdout:
+                lines.put(line)
+            lines.put(None)
+        
+        threading.Thread(target=reader, daemon=True).start()
+        return events
+    
+    def _bring_up(self) -> None:
+        """compose up -d and wait for the stack (failures are left to the supervisor loop)"""
+        self.utils.print_info("Starting containers...")
+        since = time.time()
+        self.docker_client.compose_up(self.work_dir, detach=True)
+        try:
+            result = ReadinessWaiter(self.work_dir, self.docker_client).wait(SUPERVISE_READY_TIMEOUT_S, since=since)
+        except DockerError as e:
+            self.utils.print_warning(f"Readiness wait failed: {e}")
+            return
+        if result.ready:
+            self.utils.print_success(f"All services ready in {result.elapsed_s:.1f}s")
+        else:
+            failed = result.failed_service or ", ".join(result.pending)
+            self.utils.print_warning(f"Not ready: {failed} - supervising anyway")
+    
+    def run(self, bring_up: bool = True) -> int:
+        """
+        Supervise until SIGTERM/SIGINT
+        
+        Sends READY=1 once the stack is up (systemd Type=notify), WATCHDOG=1
+        from the main loop while it is alive, STATUS= with restart counters.
+        
+        Args:
+            bring_up: Run `compose up -d` and wait for readiness first
+        
+        Returns:
+            Exit code
+        """
+        def stop(signum, _frame) -> None:
+            self.utils.print_info(f"Received signal {signum}, stopping supervisor")
+            self._stopping.set()
+        
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        
+        self.utils.print_header("🩺 AI Gateway Supervisor")
+        if bring_up:
+            try:
+                self._bring_up()
+            except DockerError as e:
+                self.utils.print_error(f"Cannot start containers: {e}")
+                return 1
+        
+        lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        events = self._subscribe(lines)
+        # After subscribing, so no transition falls between snapshot and stream
+        self.sweep()
+        notify("READY=1")
+        self._publish()
+        self.utils.print_success(f"Supervising {self.project} (restart counters in {SUPERVISE_STATE_FILE})")
+        
+        ping_every = watchdog_interval()
+        last_ping = 0.0
+        try:
+            while not self._stopping.is_set():
+                if ping_every and time.monotonic() - last_ping >= ping_every:
+                    notify("WATCHDOG=1")
+                    last_ping = time.monotonic()
+                try:
+                    line = lines.get(timeout=1.0)
+                except queue.Empty:
+                    line = ""
+                if line is None:
+                    self.utils.print_warning("Docker events stream ended - resubscribing")
+                    self._stopping.wait(RESUBSCRIBE_DELAY_S)
+                    try:
+                        events = self._subscribe(lines)
+                        self.sweep()
+                    except DockerError as e:
+                        self.utils.print_warning(f"Cannot subscribe to docker events: {e}")
+                        lines.put(None)
+                    continue
+                if line:
+                    try:
+                        self.handle_event(json.loads(line))
+                    except json.JSONDecodeError:
+                        pass
+                self.restart_due()
+                self.recycle_check()
+        finally:
+            notify("STOPPING=1")
+            events.terminate()
+            self.save_state()
+        return 0
+    
+    def print_status(self) -> int:
+        """
+        Print restart counters of the running (or last) supervisor
+        
+        Returns:
+            Exit code (1 if no state was recorded)
+        """
+        state = load_supervisor_state(self.state_path)
+        if not state:
+            self.utils.print_warning(f"No supervisor state in {SUPERVISE_STATE_FILE} - is `ai-gateway supervise` running?")
+            return 1
+        pid = state.get("pid")
+        alive = False
+        if pid:
+            try:
+                os.kill(int(pid), 0)
+                alive = True
+            except (OSError, ValueError):
+                alive = False
+        since = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(state.get("started_at", 0)))
+        print(f"Supervisor pid {pid} ({'running' if alive else 'not running'}), started {since}")
+        print()
+        print(f"{'service':<12} {'restarts':>8} {'in a row':>8}  last failure")
+        for name, c in (state.get("services") or {}).items():
+            reason = c.get("last_reason") or "-"
+            if c.get("next_restart_at"):
+                reason += f" (restart in {max(0, c['next_restart_at'] - time.time()):.0f}s)"
+            print(f"{name:<12} {c.get('restarts', 0):>8} {c.get('consecutive_failures', 0):>8}  {reason}")
+        recycle = state.get("recycling") or {}
+        if recycle.get("recycles") or recycle.get("rollouts"):
+            print()
+            last = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(recycle.get("last_at") or 0))
+            print(
+                f"LiteLLM recycling: {recycle.get('recycles', 0)} worker(s), {recycle.get('rollouts', 0)} rollout(s); "
+                f"last {last}: {recycle.get('last_reason')}"
+            )
+        return 0
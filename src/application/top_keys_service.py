@@ -0,0 +1,183 @@
+"""
+Top keys service - which API keys drive load and latency
+
+Asks the running metrics exporter (GET /top-keys), which accounts every API
+request from the nginx metrics log as it is written. Without the exporter,
+or with --log, the log (or any stream of its JSON lines) is read here.
+Neither touches the database.
+"""
+
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+from ..core.constants import METRICS_EXPORTER_PORT, METRICS_LOG_DIR, TOP_KEYS_DEFAULT_LIMIT, KEY_RATE_WINDOWS_S
+from ..core.key_accounting import ANONYMOUS_KEY, KeyAccounting
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TopKeysService:
+    """Per-key request rates and latency from the exporter or the nginx metrics log"""
+
+    def __init__(self, project_root: Path):
+        """
+        Initialize top keys service
+
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = project_root
+        self.utils = self._import_utils()
+
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import print_header, print_info, print_success, print_warning, print_error, read_env_file
+        return SimpleNamespace(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+            read_env_file=read_env_file,
+        )
+
+    def exporter_url(self) -> str:
+        """/top-keys URL of the local metrics exporter (METRICS_PORT in .env)"""
+        env_vars = self.utils.read_env_file(str(self.project_root / ".env"))
+        port = env_vars.get("METRICS_PORT") or METRICS_EXPORTER_PORT
+        return f"http://127.0.0.1:{port}/top-keys"
+
+    def fetch(self, url: str, limit: int, order: str) -> Optional[Dict[str, Any]]:
+        """
+        Snapshot from the metrics exporter
+
+        Returns:
+            Snapshot, or None when the exporter cannot be reached
+        """
+        query = urlencode({"limit": limit, "order": order})
+        try:
+            with urllib.request.urlopen(f"{url}?{query}", timeout=5) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            logger.debug(f"Metrics exporter at {url} not reachable: {e}")
+            return None
+
+    def log_paths(self) -> List[Path]:
+        """The nginx metrics log and its rotated predecessor, oldest first"""
+        current = self.project_root / METRICS_LOG_DIR / "access.log"
+        rotated = current.with_name(current.name + ".1")
+        return [path for path in (rotated, current) if path.exists()]
+
+    def from_log(self, paths: List[Path], limit: int, order: str) -> Dict[str, Any]:
+        """
+        Account log files ("-" = JSON lines on stdin, e.g. a callback stream)
+
+        Returns:
+            Snapshot in the exporter's format
+        """
+        accounting = KeyAccounting()
+        bad = 0
+        for path in paths:
+            if str(path) == "-":
+                bad += accounting.observe_lines(sys.stdin)
+                continue
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                bad += accounting.observe_lines(f)
+        if bad:
+            self.utils.print_warning(f"Skipped {bad} line(s) without time, status or request time")
+        return accounting.snapshot(limit, order)
+
+    def print_report(self, snapshot: Dict[str, Any], source: str) -> None:
+        """Table of the top keys"""
+        self.utils.print_header("🔑 Top API Keys")
+        first, last = snapshot.get("first_seen"), snapshot.get("last_seen")
+        if first and last:
+            span_min = (last - first) / 60.0
+            as_of = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(last))
+            self.utils.print_info(f"{source}: {span_min:.0f} min of requests up to {as_of}")
+        else:
+            self.utils.print_info(source)
+        self.utils.print_info(
+            f"{snapshot['requests']} requests, ~{snapshot['distinct_keys']} keys, "
+            f"~{snapshot['distinct_models']} models, ~{snapshot['distinct_agents']} agents (estimates)"
+        )
+        if snapshot.get("evicted_keys"):
+            self.utils.print_info(
+                f"{snapshot['tracked_keys']} keys tracked, {snapshot['evicted_keys']} less active evicted"
+            )
+        print()
+        if not snapshot["keys"]:
+            self.utils.print_warning("No API requests accounted yet")
+            return
+
+        rate_columns = [f"rate_{int(window)}s" for window in KEY_RATE_WINDOWS_S]
+        rate_headers = " ".join(f"{f'req/s {int(window // 60)}m':>10}" for window in KEY_RATE_WINDOWS_S)
+        print(f"{'key':<16} {'agent':<14} {'requests':>8} {rate_headers} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'time %':>6} {'5xx':>5} {'429':>5}")
+        for row in snapshot["keys"]:
+            agent = row["agent"] if len(row["agent"]) <= 14 else row["agent"][:13] + "…"
+            rates = " ".join(f"{row[column]:>10.3f}" for column in rate_columns)
+            quantiles = " ".join(
+                f"{row[column]:>8.0f}" if row[column] is not None else f"{'-':>8}"
+                for column in ("p50_ms", "p95_ms", "p99_ms")
+            )
+            print(f"{row['key']:<16} {agent:<14} {row['requests']:>8} {rates} {quantiles} "
+                  f"{row['time_share'] * 100:>6.1f} {row['errors']:>5} {row['throttled']:>5}")
+        print()
+        self.utils.print_info("key = hash of the key's last characters (as in capture files); - = no key")
+        if all(row["key"] == ANONYMOUS_KEY for row in snapshot["keys"]):
+            self.utils.print_info(
+                'nginx logs no keys by default: set "overrides": {"metrics": {"log_keys": true}} '
+                "in resource-profile.json and re-run setup"
+            )
+
+    def run(
+        self,
+        limit: int = TOP_KEYS_DEFAULT_LIMIT,
+        order: str = "time",
+        log_paths: Optional[List[Path]] = None,
+        url: Optional[str] = None,
+        as_json: bool = False,
+    ) -> int:
+        """
+        Report the top keys
+
+        Args:
+            limit: Number of keys
+            order: Sort order (TOP_KEY_ORDERS)
+            log_paths: Read these logs instead of asking the exporter
+            url: Exporter /top-keys URL (default: 127.0.0.1:METRICS_PORT)
+            as_json: Print the snapshot as JSON
+
+        Returns:
+            Exit code (0 on success)
+        """
+        snapshot = None
+        source = ""
+        if not log_paths:
+            url = url or self.exporter_url()
+            snapshot = self.fetch(url, limit, order)
+            source = f"Metrics exporter ({url})"
+            if snapshot is None:
+                log_paths = self.log_paths()
+                if not log_paths:
+                    self.utils.print_error(f"Metrics exporter not reachable at {url} and no log in {METRICS_LOG_DIR}/")
+                    self.utils.print_info("Start containers first: ./ai-gateway start")
+                    return 1
+                self.utils.print_warning(f"Metrics exporter not reachable at {url} - reading {METRICS_LOG_DIR}/")
+        if snapshot is None:
+            snapshot = self.from_log(log_paths, limit, order)
+            source = ", ".join(str(path) for path in log_paths)
+
+        if as_json:
+            print(json.dumps(snapshot, indent=2))
+            return 0
+        self.print_report(snapshot, source)
+        return 0
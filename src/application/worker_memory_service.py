@@ -0,0 +1,229 @@
+"""
+Worker memory measurement service - USS/PSS per LiteLLM process
+"""
+
+import json
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Any
+from ..core.constants import LITELLM_CONTAINER_NAME, LITELLM_WORKER_MEMORY_MB
+from ..core.exceptions import DockerError
+from ..infrastructure.docker_client import DockerClient
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Runs inside the container (python is available in the LiteLLM image):
+# dumps ppid, cmdline and smaps_rollup of every process as JSON
+PROC_DUMP_SCRIPT = (
+    "import json,os\n"
+    "out=[]\n"
+    "for pid in os.listdir('/proc'):\n"
+    "    if not pid.isdigit(): continue\n"
+    "    try:\n"
+    "        stat=open(f'/proc/{pid}/stat').read()\n"
+    "        cmd=open(f'/proc/{pid}/cmdline','rb').read().replace(b'\\0',b' ').decode(errors='replace').strip()\n"
+    "        smaps=open(f'/proc/{pid}/smaps_rollup').read()\n"
+    "    except OSError: continue\n"
+    "    out.append({'pid':int(pid),'ppid':int(stat.rsplit(')',1)[1].split()[1]),'cmdline':cmd,'smaps':smaps})\n"
+    "print(json.dumps(out))\n"
+)
+
+
+@dataclass
+class ProcessMemory:
+    """Memory of one process (MB)"""
+    pid: int
+    ppid: int
+    role: str
+    cmdline: str
+    rss_mb: float
+    pss_mb: float
+    uss_mb: float
+    swap_mb: float
+
+    @property
+    def shared_mb(self) -> float:
+        """Resident memory shared with other processes"""
+        return self.rss_mb - self.uss_mb
+
+
+def parse_smaps_rollup(text: str) -> Dict[str, int]:
+    """
+    Parse /proc/<pid>/smaps_rollup
+
+    Returns:
+        Dictionary of field name -> value in kB
+    """
+    values: Dict[str, int] = {}
+    for line in text.splitlines():
+        if ":" not in line:
+            continue
+        key, rest = line.split(":", 1)
+        parts = rest.split()
+        if parts and parts[0].isdigit():
+            values[key.strip()] = int(parts[0])
+    return values
+
+
+def classify_processes(raw: List[Dict[str, Any]]) -> List[ProcessMemory]:
+    """
+    Build ProcessMemory list and assign roles
+
+    The process with the most children is the master (uvicorn/gunicorn
+    supervisor), its children are workers, multiprocessing helpers (resource
+    tracker) and everything else (entrypoint shell) are reported separately.
+    """
+    entries = [e for e in raw if parse_smaps_rollup(e.get("smaps", "")).get("Rss")]
+    children: Dict[int, int] = {}
+    for entry in entries:
+        children[entry["ppid"]] = children.get(entry["ppid"], 0) + 1
+    pids = {entry["pid"] for entry in entries}
+    master_pid = max(
+        (pid for pid in pids if pid in children),
+        key=lambda pid: children[pid],
+        default=None,
+    )
+
+    processes = []
+    for entry in entries:
+        smaps = parse_smaps_rollup(entry["smaps"])
+        cmdline = entry.get("cmdline", "")
+        if "resource_tracker" in cmdline or "semaphore_tracker" in cmdline:
+            role = "helper"
+        elif entry["pid"] == master_pid:
+            role = "master"
+        elif master_pid is not None and entry["ppid"] == master_pid:
+            role = "worker"
+        else:
+            role = "other"
+        processes.append(ProcessMemory(
+            pid=entry["pid"],
+            ppid=entry["ppid"],
+            role=role,
+            cmdline=cmdline,
+            rss_mb=round(smaps.get("Rss", 0) / 1024, 1),
+            pss_mb=round(smaps.get("Pss", 0) / 1024, 1),
+            uss_mb=round((smaps.get("Private_Clean", 0) + smaps.get("Private_Dirty", 0)) / 1024, 1),
+            swap_mb=round(smaps.get("Swap", 0) / 1024, 1),
+        ))
+    order = {"master": 0, "worker": 1, "helper": 2, "other": 3}
+    return sorted(processes, key=lambda p: (order[p.role], p.pid))
+
+
+def summarize_worker_memory(processes: List[ProcessMemory]) -> Dict[str, Any]:
+    """
+    Summarize per-worker memory
+
+    Marginal cost of one more worker is its private memory (USS): shared pages
+    are already resident. Total PSS is the real footprint of the container.
+    """
+    workers = [p for p in processes if p.role == "worker"]
+    count = len(workers)
+    return {
+        "processes": len(processes),
+        "workers": count,
+        "total_rss_mb": round(sum(p.rss_mb for p in processes), 1),
+        "total_pss_mb": round(sum(p.pss_mb for p in processes), 1),
+        "worker_rss_avg_mb": round(sum(p.rss_mb for p in workers) / count, 1) if count else None,
+        "worker_pss_avg_mb": round(sum(p.pss_mb for p in workers) / count, 1) if count else None,
+        "worker_uss_avg_mb": round(sum(p.uss_mb for p in workers) / count, 1) if count else None,
+        "worker_shared_avg_mb": round(sum(p.shared_mb for p in workers) / count, 1) if count else None,
+    }
+
+
+class WorkerMemoryService:
+    """Service for measuring real per-worker memory of the running LiteLLM container"""
+
+    def __init__(self, project_root: Path):
+        """
+        Initialize worker memory service
+
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.docker_client = DockerClient()
+        self.utils = self._import_utils()
+
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import (
+            print_header, print_info, print_success, print_warning, print_error, Colors
+        )
+        return SimpleNamespace(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+            Colors=Colors,
+        )
+
+    def measure(self, container: str = LITELLM_CONTAINER_NAME) -> List[ProcessMemory]:
+        """
+        Read smaps_rollup of all processes in the container
+
+        Raises:
+            DockerError: If container is not running or /proc cannot be read
+        """
+        output = self.docker_client.exec_in_container(container, ["python", "-c", PROC_DUMP_SCRIPT])
+        try:
+            raw = json.loads(output)
+        except json.JSONDecodeError as e:
+            raise DockerError(f"Unexpected process dump from {container}: {e}") from e
+        return classify_processes(raw)
+
+    def run(self, container: str = LITELLM_CONTAINER_NAME, as_json: bool = False) -> int:
+        """
+        Measure and report per-worker memory
+
+        Returns:
+            Exit code (0 on success)
+        """
+        try:
+            processes = self.measure(container)
+        except DockerError as e:
+            self.utils.print_error(str(e))
+            self.utils.print_info("Start containers first: ./ai-gateway start")
+            return 1
+
+        summary = summarize_worker_memory(processes)
+        if as_json:
+            print(json.dumps({
+                "container": container,
+                "summary": summary,
+                "processes": [asdict(p) for p in processes],
+            }, indent=2))
+            return 0
+
+        self.utils.print_header("🧮 LiteLLM Worker Memory (USS/PSS)")
+        print()
+        print(f"{'pid':>7} {'role':<7} {'RSS MB':>8} {'PSS MB':>8} {'USS MB':>8} {'shared':>8}  command")
+        for p in processes:
+            command = p.cmdline if len(p.cmdline) <= 50 else p.cmdline[:47] + "..."
+            print(f"{p.pid:>7} {p.role:<7} {p.rss_mb:>8} {p.pss_mb:>8} {p.uss_mb:>8} {p.shared_mb:>8.1f}  {command}")
+        print()
+
+        self.utils.print_info(
+            f"Container total: RSS {summary['total_rss_mb']}MB (double-counts shared pages), "
+            f"PSS {summary['total_pss_mb']}MB (real footprint)"
+        )
+        if not summary["workers"]:
+            self.utils.print_warning("No worker processes found (single-process mode, num_workers not set?)")
+            return 0
+
+        self.utils.print_info(
+            f"{summary['workers']} worker(s): avg RSS {summary['worker_rss_avg_mb']}MB, "
+            f"PSS {summary['worker_pss_avg_mb']}MB, USS {summary['worker_uss_avg_mb']}MB"
+        )
+        self.utils.print_success(
+            f"Marginal cost of one more worker: ~{summary['worker_uss_avg_mb']}MB (USS) "
+            f"vs {LITELLM_WORKER_MEMORY_MB}MB in the profile memory model"
+        )
+        if summary["worker_shared_avg_mb"] is not None and summary["worker_shared_avg_mb"] < summary["worker_rss_avg_mb"] * 0.2:
+            self.utils.print_info(
+                "Workers share little memory - try worker_mode \"preload\" in resource-profile.json overrides"
+            )
+        return 0
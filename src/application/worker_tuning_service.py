@@ -0,0 +1,393 @@
+"""
+Worker count tuning service - empirical num_workers sweep
+"""
+
+import json
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+from ..core.constants import LITELLM_IMAGE, LITELLM_WORKER_MODE_SPAWN, LITELLM_WORKER_MODE_PRELOAD
+from ..core.exceptions import DockerError
+from ..core.stats import percentile
+from ..infrastructure.docker_client import DockerClient
+from ..infrastructure.mock_upstream import MockUpstream, MOCK_MODEL_NAME
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+TUNE_CONTAINER_NAME = "ai-gateway-tune-litellm"
+TUNE_MASTER_KEY = "sk-tune-workers"
+# Within this fraction of the best throughput, fewer workers win (less memory)
+THROUGHPUT_TOLERANCE = 0.05
+
+
+@dataclass
+class WorkerTrialResult:
+    """Result of a load run for one num_workers value"""
+    num_workers: int
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    p50_ms: float
+    p99_ms: float
+    peak_memory_mb: Optional[float]
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 1.0
+
+
+class WorkerTuningService:
+    """Service for sweeping LiteLLM num_workers against a local mock upstream"""
+
+    def __init__(self, project_root: Path):
+        """
+        Initialize worker tuning service
+
+        Args:
+            project_root: Project root directory
+        """
+        self.project_root = Path(project_root)
+        self.docker_client = DockerClient()
+        self.utils = self._import_utils()
+
+    def _import_utils(self):
+        """Import utility functions"""
+        from types import SimpleNamespace
+        from ..utils import (
+            print_header, print_info, print_success, print_warning, print_error, Colors, read_env_file
+        )
+        return SimpleNamespace(
+            print_header=print_header,
+            print_info=print_info,
+            print_success=print_success,
+            print_warning=print_warning,
+            print_error=print_error,
+            Colors=Colors,
+            read_env_file=read_env_file,
+        )
+
+    def _write_litellm_config(self, work_dir: Path, mock_port: int) -> Path:
+        """Write minimal LiteLLM config routing one model to the mock upstream"""
+        config_path = work_dir / "config.yaml"
+        config_path.write_text(
+            "model_list:\n"
+            f"  - model_name: {MOCK_MODEL_NAME}\n"
+            "    litellm_params:\n"
+            f"      model: openai/{MOCK_MODEL_NAME}\n"
+            f"      api_base: http://host.docker.internal:{mock_port}/v1\n"
+            "      api_key: mock\n"
+            "general_settings:\n"
+            "  master_key: os.environ/LITELLM_MASTER_KEY\n",
+            encoding="utf-8",
+        )
+        config_path.chmod(0o644)
+        return config_path
+
+    def _wait_for_litellm(self, base_url: str, timeout: int = 180) -> bool:
+        """Poll LiteLLM liveliness endpoint until it answers"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                with urllib.request.urlopen(f"{base_url}/health/liveliness", timeout=2) as response:
+                    if response.status == 200:
+                        return True
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(1)
+        return False
+
+    def _send_request(self, url: str, body: bytes) -> Optional[float]:
+        """Send one chat completion, return latency in ms (None on error)"""
+        request = urllib.request.Request(
+            url,
+            data=body,
+            headers={
+                "Authorization": f"Bearer {TUNE_MASTER_KEY}",
+                "Content-Type": "application/json",
+            },
+            method="POST",
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                if response.status != 200:
+                    return None
+        except (urllib.error.URLError, ConnectionError, OSError):
+            return None
+        return (time.perf_counter() - start) * 1000.0
+
+    def _drive_load(self, base_url: str, total_requests: int, concurrency: int) -> tuple[List[float], int, float]:
+        """
+        Send a fixed number of requests with fixed concurrency
+
+        Returns:
+            Tuple of (latencies_ms, error_count, duration_s)
+        """
+        url = f"{base_url}/v1/chat/completions"
+        body = json.dumps({
+            "model": MOCK_MODEL_NAME,
+            "messages": [{"role": "user", "content": "Benchmark request"}],
+            "max_tokens": 32,
+        }).encode("utf-8")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda _: self._send_request(url, body), range(total_requests)))
+        duration = time.perf_counter() - start
+
+        latencies = [r for r in results if r is not None]
+        return latencies, total_requests - len(latencies), duration
+
+    def run_trial(
+        self,
+        num_workers: int,
+        mock_port: int,
+        config_path: Path,
+        host_port: int,
+        total_requests: int,
+        concurrency: int,
+        image: str,
+        worker_mode: str = LITELLM_WORKER_MODE_SPAWN,
+    ) -> WorkerTrialResult:
+        """
+        Start LiteLLM with num_workers, drive load and sample memory
+
+        Raises:
+            DockerError: If container cannot be started or doesn't become ready
+        """
+        base_url = f"http://127.0.0.1:{host_port}"
+        args = [
+            "--config", "/app/config.yaml", "--host", "0.0.0.0",
+            "--port", "4000", "--num_workers", str(num_workers),
+        ]
+        if worker_mode == LITELLM_WORKER_MODE_PRELOAD:
+            args.append("--run_gunicorn")
+        self.docker_client.remove_container(TUNE_CONTAINER_NAME)
+        self.docker_client.run_container(
+            image=image,
+            name=TUNE_CONTAINER_NAME,
+            args=args,
+            ports=[f"127.0.0.1:{host_port}:4000"],
+            volumes=[f"{config_path}:/app/config.yaml:ro"],
+            extra_hosts=["host.docker.internal:host-gateway"],
+            env=[f"LITELLM_MASTER_KEY={TUNE_MASTER_KEY}"],
+        )
+        try:
+            if not self._wait_for_litellm(base_url):
+                raise DockerError(f"LiteLLM with {num_workers} worker(s) did not become ready")
+
+            # Warmup: let every worker import and initialize before measuring
+            self._drive_load(base_url, max(num_workers * 4, concurrency), concurrency)
+
+            peak = {"memory": None}
+            stop = threading.Event()
+
+            def sample_memory() -> None:
+                while not stop.is_set():
+                    usage = self.docker_client.get_container_memory_mb(TUNE_CONTAINER_NAME)
+                    if usage is not None and (peak["memory"] is None or usage > peak["memory"]):
+                        peak["memory"] = usage
+                    stop.wait(0.5)
+
+            sampler = threading.Thread(target=sample_memory, daemon=True)
+            sampler.start()
+            latencies, errors, duration = self._drive_load(base_url, total_requests, concurrency)
+            stop.set()
+            sampler.join(timeout=35)
+
+            return WorkerTrialResult(
+                num_workers=num_workers,
+                requests=total_requests,
+                errors=errors,
+                duration_s=round(duration, 3),
+                throughput_rps=round(len(latencies) / duration, 2) if duration > 0 else 0.0,
+                p50_ms=round(percentile(latencies, 50), 1),
+                p99_ms=round(percentile(latencies, 99), 1),
+                peak_memory_mb=round(peak["memory"], 1) if peak["memory"] is not None else None,
+            )
+        finally:
+            self.docker_client.remove_container(TUNE_CONTAINER_NAME)
+
+    @staticmethod
+    def select_best(
+        results: List[WorkerTrialResult],
+        memory_ceiling_mb: Optional[float],
+        max_error_rate: float = 0.01,
+    ) -> Optional[WorkerTrialResult]:
+        """
+        Pick the best num_workers under the memory ceiling
+
+        Highest throughput wins; candidates within THROUGHPUT_TOLERANCE of the
+        best are tie-broken by lower p99 latency, then by fewer workers.
+        """
+        eligible = [
+            r for r in results
+            if r.error_rate <= max_error_rate
+            and (memory_ceiling_mb is None or (r.peak_memory_mb is not None and r.peak_memory_mb <= memory_ceiling_mb))
+        ]
+        if not eligible:
+            return None
+        best_throughput = max(r.throughput_rps for r in eligible)
+        close = [r for r in eligible if r.throughput_rps >= best_throughput * (1 - THROUGHPUT_TOLERANCE)]
+        return min(close, key=lambda r: (r.p99_ms, r.num_workers))
+
+    def target_profile(self, profile: Optional[str] = None):
+        """
+        Resource profile the override is written for
+
+        Args:
+            profile: Profile value given on the command line (default: the one selected at setup)
+
+        Returns:
+            ResourceProfile, or None when it cannot be determined or workers are not configured
+        """
+        from ..config import installed_resource_profile, ResourceProfile
+
+        known, installed = installed_resource_profile(self.utils.read_env_file(str(self.project_root / ".env")))
+        if profile:
+            if known and installed is not None and installed.value != profile:
+                self.utils.print_warning(
+                    f"This install uses profile {installed.value} - setup applies the {profile} override "
+                    f"only after selecting {profile} again"
+                )
+            return ResourceProfile(profile)
+        if not known:
+            self.utils.print_error("Cannot determine the resource profile of this install (RESOURCE_PROFILE in .env)")
+            self.utils.print_info("Pass it: --profile desktop|small|medium|large|auto, or use --no-write")
+        elif installed is None:
+            self.utils.print_error("Setup was told not to configure workers - a num_workers override would be ignored")
+            self.utils.print_info("Pass the profile: --profile desktop|small|medium|large|auto, or use --no-write")
+        return installed
+
+    def write_profile_override(
+        self, best: WorkerTrialResult, results: List[WorkerTrialResult], settings: Dict[str, Any], profile
+    ) -> None:
+        """Write best num_workers as an override in resource-profile.json for the given ResourceProfile"""
+        from ..config import load_resource_profile, save_resource_profile, run_auto_sizing, ResourceProfile
+        from ..docker_compose import PROFILE_TEMPLATES
+
+        saved = load_resource_profile() or {}
+        if saved and saved.get("profile") != profile.value:
+            # Overrides of another profile are ignored by setup - start over for this one
+            self.utils.print_warning(f"resource-profile.json belongs to profile {saved.get('profile')} - replacing it")
+            saved = {}
+        template = saved.get("template")
+        if not template:
+            # Setup sizes auto itself only without a saved template
+            template = run_auto_sizing() if profile == ResourceProfile.AUTO else PROFILE_TEMPLATES.get(profile, {})
+        details = {k: v for k, v in saved.items() if k not in ("profile", "template")}
+        overrides = details.get("overrides") or {}
+        overrides.setdefault("litellm", {})["num_workers"] = best.num_workers
+        overrides["litellm"]["worker_mode"] = settings.get("worker_mode", LITELLM_WORKER_MODE_SPAWN)
+        details["overrides"] = overrides
+        details["tuning"] = {
+            "selected_num_workers": best.num_workers,
+            "settings": settings,
+            "results": [asdict(r) for r in results],
+        }
+        save_resource_profile(profile, template, details)
+
+    def run(
+        self,
+        candidates: List[int],
+        memory_ceiling_mb: Optional[float],
+        total_requests: int = 200,
+        concurrency: int = 16,
+        latency_ms: int = 50,
+        host_port: int = 4099,
+        image: str = LITELLM_IMAGE,
+        write_override: bool = True,
+        worker_mode: str = LITELLM_WORKER_MODE_SPAWN,
+        profile: Optional[str] = None,
+    ) -> int:
+        """
+        Run the sweep and report results
+
+        Args:
+            profile: Resource profile to write the override for (default: the one selected at setup)
+
+        Returns:
+            Exit code (0 on success)
+        """
+        self.utils.print_header("⚙️  LiteLLM Worker Tuning")
+        print()
+        target = None
+        if write_override:
+            # Before the sweep: an override for the wrong profile is silently ignored by setup
+            target = self.target_profile(profile)
+            if target is None:
+                return 1
+            self.utils.print_info(f"Resource profile: {target.value}")
+        self.utils.print_info(f"Candidates: {', '.join(str(c) for c in candidates)} worker(s)")
+        self.utils.print_info(f"Worker mode: {worker_mode}")
+        self.utils.print_info(f"Load: {total_requests} requests, concurrency {concurrency}, mock latency {latency_ms}ms")
+        if memory_ceiling_mb:
+            self.utils.print_info(f"Memory ceiling: {memory_ceiling_mb:.0f}MB")
+        else:
+            self.utils.print_warning("No memory ceiling given (--memory-ceiling) - memory is reported only")
+        print()
+
+        if not self.docker_client.check_daemon_running():
+            self.utils.print_error("Docker daemon is not running")
+            return 1
+
+        results: List[WorkerTrialResult] = []
+        with MockUpstream(latency_ms=latency_ms) as mock, tempfile.TemporaryDirectory(prefix="ai-gateway-tune-") as tmp:
+            config_path = self._write_litellm_config(Path(tmp), mock.port)
+            Path(tmp).chmod(0o755)
+            for num_workers in candidates:
+                self.utils.print_info(f"Running {num_workers} worker(s)...")
+                try:
+                    result = self.run_trial(
+                        num_workers, mock.port, config_path, host_port,
+                        total_requests, concurrency, image, worker_mode,
+                    )
+                except DockerError as e:
+                    self.utils.print_error(str(e))
+                    continue
+                results.append(result)
+                memory = f"{result.peak_memory_mb:.0f}MB" if result.peak_memory_mb is not None else "n/a"
+                self.utils.print_success(
+                    f"{num_workers} worker(s): {result.throughput_rps} req/s, "
+                    f"p99 {result.p99_ms}ms, peak memory {memory}, errors {result.errors}"
+                )
+
+        if not results:
+            self.utils.print_error("No successful trials")
+            return 1
+
+        print()
+        print(f"{'workers':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'peak MB':>8} {'errors':>7}")
+        for r in results:
+            memory = f"{r.peak_memory_mb:.0f}" if r.peak_memory_mb is not None else "n/a"
+            print(f"{r.num_workers:>8} {r.throughput_rps:>8} {r.p50_ms:>8} {r.p99_ms:>8} {memory:>8} {r.errors:>7}")
+        print()
+
+        best = self.select_best(results, memory_ceiling_mb)
+        if best is None:
+            self.utils.print_error("No candidate fits the memory ceiling without errors")
+            return 1
+
+        self.utils.print_success(f"Recommended num_workers: {best.num_workers}")
+        if write_override:
+            settings = {
+                "memory_ceiling_mb": memory_ceiling_mb,
+                "requests": total_requests,
+                "concurrency": concurrency,
+                "mock_latency_ms": latency_ms,
+                "image": image,
+                "worker_mode": worker_mode,
+            }
+            self.write_profile_override(best, results, settings, target)
+            self.utils.print_success("Override written to resource-profile.json")
+            self.utils.print_info("Apply it: ./ai-gateway setup (use existing .env), then restart containers")
+        return 0
@@ -60,6 +60,13 @@ def main():
     # Run standard checks
     success = script_init.run_standard_checks()
     
+    # Hand check timings over to `ai-gateway start` for the startup profile
+    if script_type == ScriptType.START and success:
+        from pathlib import Path
+        from src.core.constants import START_CHECKS_FILE
+        from src.infrastructure.startup_profiler import save_check_timings
+        save_check_timings(Path(SCRIPT_DIR) / START_CHECKS_FILE, script_init.timings)
+    
     # Output result as JSON for programmatic use (only if needed)
     # JSON output is suppressed for user-facing scripts
     # If needed programmatically, it can be enabled via environment variable
@@ -10,6 +10,9 @@ import os
 from typing import Tuple, Optional
 from .utils import print_success, print_error, print_warning, print_info
 from .platform_utils import detect_platform, PlatformType, get_docker_install_instructions
+from .infrastructure.probe_cache import (
+    docker_version_probe, docker_daemon_probe, compose_version_probe, run_probe, run_parallel
+)
 
 
 def check_command(command: str, error_msg: str = None) -> bool:
@@ -33,29 +36,27 @@ def check_docker() -> Tuple[bool, Optional[str]]:
         print()
         return False, None
     
-    try:
-        from .core.constants import DOCKER_TIMEOUT
-        version = subprocess.check_output(
-            ["docker", "--version"], 
-            stderr=subprocess.DEVNULL,
-            timeout=DOCKER_TIMEOUT
-        ).decode().strip()
-        print_success(f"Docker installed: {version}")
-    except subprocess.CalledProcessError:
+    def docker_version() -> Optional[str]:
+        result = docker_version_probe()
+        return result.stdout.strip() if result.returncode == 0 else None
+    
+    # Version, daemon and context probes are independent - run them concurrently
+    tasks = {
+        "version": docker_version,
+        "daemon": lambda: docker_daemon_probe().returncode == 0,
+    }
+    if current_platform == PlatformType.LINUX:
+        tasks["context"] = lambda: run_probe(["docker", "context", "show"], persist=False, check=True).stdout.strip()
+    probes = run_parallel(tasks)
+    
+    version = probes["version"]
+    if not isinstance(version, str):
         print_error("Failed to get Docker version")
         return False, None
+    print_success(f"Docker installed: {version}")
     
     # Check Docker daemon
-    try:
-        from .core.constants import DOCKER_TIMEOUT
-        subprocess.run(
-            ["docker", "ps"], 
-            check=True, 
-            stdout=subprocess.DEVNULL, 
-            stderr=subprocess.DEVNULL,
-            timeout=DOCKER_TIMEOUT
-        )
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    if probes["daemon"] is not True:
         print_warning("Docker daemon is not running")
         print()
         
@@ -84,15 +85,7 @@ def check_docker() -> Tuple[bool, Optional[str]]:
     
     # Check rootless mode (only on Linux)
     if current_platform == PlatformType.LINUX:
-        try:
-            from .core.constants import DOCKER_TIMEOUT
-            docker_host = subprocess.check_output(
-                ["docker", "context", "show"],
-                stderr=subprocess.DEVNULL,
-                timeout=DOCKER_TIMEOUT
-            ).decode().strip()
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            docker_host = "default"
+        docker_host = probes["context"] if isinstance(probes["context"], str) else "default"
         
         docker_host_env = os.environ.get("DOCKER_HOST", "")
         is_rootless = (
@@ -116,17 +109,10 @@ def check_docker_compose() -> bool:
     """Check if Docker Compose is available"""
     # Try docker compose (v2)
     try:
-        from .core.constants import DOCKER_TIMEOUT
-        subprocess.run(
-            ["docker", "compose", "version"],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            timeout=DOCKER_TIMEOUT
-        )
-        print_success("Docker Compose available (v2)")
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        if compose_version_probe().returncode == 0:
+            print_success("Docker Compose available (v2)")
+            return True
+    except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
     
     # Try docker-compose (v1)
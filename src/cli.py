@@ -13,9 +13,11 @@ Alternative (for advanced users):
 """
 
 import sys
-import subprocess
 from pathlib import Path
-from typing import Optional
+
+# Keep module-level imports to the minimum: every command imports what it
+# needs inside its run_* function, so --help, stop and status stay cheap
+# (see `ai-gateway import-budget`)
 
 # Get project root (parent of src/)
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -33,6 +35,20 @@ def get_script_path(script_name: str) -> Path:
     return script_path
 
 
+def add_log_options(parser) -> None:
+    """Logging options of long-running commands"""
+    parser.add_argument("--log-file", type=Path, default=None,
+                        help="Also log to this file, with debug events (rotated by size)")
+    parser.add_argument("--log-json", action="store_true",
+                        help="Log one JSON object per line, with fields such as phase, service, request")
+
+
+def configure_daemon_logging(options) -> None:
+    """Queued logging: log calls don't wait for console or disk I/O"""
+    from src.infrastructure.logger import configure_logging
+    configure_logging(log_file=options.log_file, json_format=options.log_json)
+
+
 def run_setup() -> int:
     """Run setup command"""
     from src.application.setup_service import SetupService
@@ -51,19 +67,51 @@ def run_setup() -> int:
         return 1
 
 
-def run_start() -> int:
+def run_start(args: list) -> int:
     """Run start command"""
+    import argparse
     from src.application.start_service import StartService
+    from src.core.constants import START_PROFILE_COMPARE_RUNS
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway start",
+        description="Start containers and wait until all services are healthy",
+    )
+    parser.add_argument("--profile", action="store_true",
+                        help="Show phase and per-container timings against earlier starts")
+    parser.add_argument("--history", type=int, default=START_PROFILE_COMPARE_RUNS,
+                        help=f"Number of earlier starts to compare against (default: {START_PROFILE_COMPARE_RUNS})")
+    parser.add_argument("--full", action="store_true",
+                        help="Always run compose up and all checks (skip the nothing-changed fast path)")
+    parser.add_argument("--fast-only", action="store_true",
+                        help="Only try the fast path, exit 2 if a full start is needed (used by start.sh)")
+    options = parser.parse_args(args)
     
+    service = None
+    ok = False
+    mode = "full"
     try:
         service = StartService(PROJECT_ROOT)
         
+        # Fast path: same artifacts, images and tools as the last successful start, stack healthy
+        if not options.full:
+            if service.try_fast_start():
+                mode = "fast"
+                service.print_access_info()
+                ok = True
+                return 0
+            if options.fast_only:
+                # Nothing was started - not a start for the history
+                service = None
+                return 2
+        
         # Start containers and wait for health
         if not service.start_containers(wait_for_healthy=True):
             return 1
         
         # Check for errors
-        has_errors, errors = service.check_container_status()
+        with service.profiler.phase("status_check"):
+            has_errors, errors = service.check_container_status()
         if has_errors:
             print()
             print("⚠️  Some containers may have errors:")
@@ -77,14 +125,19 @@ def run_start() -> int:
             return 1
         
         # Print access information
-        service.print_access_info()
+        with service.profiler.phase("access_info"):
+            service.print_access_info()
         
         # Check for first run and show Virtual Key setup instructions
-        service.show_first_run_instructions()
+        with service.profiler.phase("first_run"):
+            service.show_first_run_instructions()
         
         # Check if models are available and suggest Continue.dev setup
-        service.check_models_and_suggest_continue_dev()
+        with service.profiler.phase("model_check"):
+            service.check_models_and_suggest_continue_dev()
         
+        service.record_start_state()
+        ok = True
         return 0
     except KeyboardInterrupt:
         print("\n\n❌ Start cancelled by user")
@@ -94,14 +147,23 @@ def run_start() -> int:
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        # Every start goes to the history, failed ones are not used as baseline
+        if service is not None:
+            history = service.load_start_history()
+            entry = service.save_profile(ok, mode)
+            if options.profile:
+                service.print_profile(entry, history, runs=options.history)
 
 
-def run_stop() -> int:
+def run_stop(args: list) -> int:
     """Run stop command"""
+    import subprocess
+    
     script = get_script_path("stop.sh")
     try:
         result = subprocess.run(
-            ["bash", str(script)],
+            ["bash", str(script)] + args,
             cwd=str(PROJECT_ROOT),
             check=False
         )
@@ -114,6 +176,99 @@ def run_stop() -> int:
         return 1
 
 
+def run_drain(args: list) -> int:
+    """Run drain command"""
+    import argparse
+    from src.application.drain_service import DrainService
+    from src.core.constants import DRAIN_TIMEOUT_S
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway drain",
+        description="Answer new API requests with 503 at nginx and wait for in-flight requests to finish",
+    )
+    parser.add_argument("--timeout", type=float, default=DRAIN_TIMEOUT_S,
+                        help=f"Seconds to wait before giving up on in-flight requests (default: {DRAIN_TIMEOUT_S})")
+    options = parser.parse_args(args)
+    
+    try:
+        return DrainService(PROJECT_ROOT).run(timeout=options.timeout)
+    except KeyboardInterrupt:
+        print("\n\n❌ Drain cancelled by user (new requests are accepted again)")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_rollout(args: list) -> int:
+    """Run rolling restart of LiteLLM"""
+    import argparse
+    from src.application.rollout_service import RolloutService
+    from src.core.constants import ROLLOUT_HEALTH_TIMEOUT_S, DRAIN_TIMEOUT_S
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway rollout",
+        description="Restart LiteLLM with the current config without dropping API requests "
+                    "(second instance, nginx reload, drain; rolls back on failure)",
+    )
+    parser.add_argument("--health-timeout", type=float, default=ROLLOUT_HEALTH_TIMEOUT_S,
+                        help=f"Seconds to wait for a new instance to become healthy (default: {ROLLOUT_HEALTH_TIMEOUT_S})")
+    parser.add_argument("--drain-timeout", type=float, default=DRAIN_TIMEOUT_S,
+                        help=f"Seconds to wait for in-flight requests of a replaced instance (default: {DRAIN_TIMEOUT_S})")
+    parser.add_argument("--abort", action="store_true",
+                        help="Clean up after an interrupted rollout (restore nginx upstream, remove second instance)")
+    options = parser.parse_args(args)
+    
+    try:
+        service = RolloutService(PROJECT_ROOT)
+        if options.abort:
+            return service.abort()
+        return service.run(health_timeout=options.health_timeout, drain_timeout=options.drain_timeout)
+    except KeyboardInterrupt:
+        print("\n\n❌ Rollout cancelled by user (run `./ai-gateway rollout --abort` to clean up)")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_supervise(args: list) -> int:
+    """Run supervisor daemon"""
+    import argparse
+    from src.application.supervisor_service import SupervisorService
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway supervise",
+        description="Keep the stack healthy: restart only containers that turn unhealthy or die, "
+                    "with crash-loop backoff (systemd Type=notify with watchdog)",
+    )
+    parser.add_argument("--no-up", action="store_true",
+                        help="Don't run compose up first, only supervise the running stack")
+    parser.add_argument("--status", action="store_true",
+                        help="Show restart counters of the running supervisor and exit")
+    add_log_options(parser)
+    options = parser.parse_args(args)
+    
+    try:
+        if not options.status:
+            configure_daemon_logging(options)
+        service = SupervisorService(PROJECT_ROOT)
+        if options.status:
+            return service.print_status()
+        return service.run(bring_up=not options.no_up)
+    except KeyboardInterrupt:
+        return 0
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
 def run_continue_dev() -> int:
     """Run Continue.dev configuration command"""
     from src.application.continue_dev_service import ContinueDevService
@@ -131,8 +286,592 @@ def run_continue_dev() -> int:
         return 1
 
 
+def run_tune_workers(args: list) -> int:
+    """Run worker count tuning command"""
+    import argparse
+    from src.application.worker_tuning_service import WorkerTuningService
+    from src.core.config import ResourceProfile
+    from src.core.constants import LITELLM_IMAGE, LITELLM_WORKER_MODES
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway tune-workers",
+        description="Sweep LiteLLM num_workers against a local mock upstream",
+    )
+    parser.add_argument("--workers", default="1,2,4,6",
+                        help="Comma-separated num_workers candidates (default: 1,2,4,6)")
+    parser.add_argument("--memory-ceiling", type=float, default=None,
+                        help="Maximum LiteLLM container memory in MB")
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Requests per candidate (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Concurrent requests (default: 16)")
+    parser.add_argument("--latency-ms", type=int, default=50,
+                        help="Mock upstream latency in ms (default: 50)")
+    parser.add_argument("--port", type=int, default=4099,
+                        help="Local port for the LiteLLM under test (default: 4099)")
+    parser.add_argument("--image", default=LITELLM_IMAGE, help="LiteLLM image")
+    parser.add_argument("--no-write", action="store_true",
+                        help="Don't write the override to resource-profile.json")
+    parser.add_argument("--worker-mode", choices=LITELLM_WORKER_MODES, default=LITELLM_WORKER_MODES[0],
+                        help="spawn (uvicorn workers) or preload (gunicorn, copy-on-write)")
+    parser.add_argument("--profile", choices=[p.value for p in ResourceProfile], default=None,
+                        help="Resource profile to write the override for (default: RESOURCE_PROFILE in .env)")
+    options = parser.parse_args(args)
+    
+    try:
+        candidates = sorted({int(w) for w in options.workers.split(",") if w.strip()})
+    except ValueError:
+        print(f"❌ Invalid --workers value: {options.workers}")
+        return 1
+    if not candidates or candidates[0] < 1:
+        print("❌ --workers must contain positive integers")
+        return 1
+    
+    try:
+        service = WorkerTuningService(PROJECT_ROOT)
+        return service.run(
+            candidates=candidates,
+            memory_ceiling_mb=options.memory_ceiling,
+            total_requests=options.requests,
+            concurrency=options.concurrency,
+            latency_ms=options.latency_ms,
+            host_port=options.port,
+            image=options.image,
+            write_override=not options.no_write,
+            worker_mode=options.worker_mode,
+            profile=options.profile,
+        )
+    except KeyboardInterrupt:
+        print("\n\n❌ Tuning cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_worker_memory(args: list) -> int:
+    """Run worker memory measurement command"""
+    import argparse
+    from src.application.worker_memory_service import WorkerMemoryService
+    from src.core.constants import LITELLM_CONTAINER_NAME
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway worker-memory",
+        description="Report USS/PSS per LiteLLM worker of the running container",
+    )
+    parser.add_argument("--container", default=LITELLM_CONTAINER_NAME,
+                        help=f"LiteLLM container name (default: {LITELLM_CONTAINER_NAME})")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    options = parser.parse_args(args)
+    
+    try:
+        service = WorkerMemoryService(PROJECT_ROOT)
+        return service.run(container=options.container, as_json=options.json)
+    except KeyboardInterrupt:
+        print("\n\n❌ Measurement cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_bench(args: list) -> int:
+    """Run API load benchmark"""
+    import argparse
+    from pathlib import Path
+    from src.application.bench_service import BenchService, WORKLOADS, TARGETS
+    from src.core.constants import (
+        BENCH_DURATION_S, BENCH_WARMUP_S, BENCH_CONCURRENCY, BENCH_REQUEST_TIMEOUT_S,
+        BENCH_PROMPT_TOKENS, BENCH_MAX_TOKENS
+    )
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway bench",
+        description="Load test the API: req/s, time-to-first-token, inter-token latency, tokens/s, errors",
+    )
+    parser.add_argument("--workload", choices=WORKLOADS, default="chat",
+                        help="chat, stream (SSE chat) or embeddings (default: chat)")
+    parser.add_argument("--target", choices=TARGETS, default="auto",
+                        help="nginx /api/litellm/v1, LiteLLM port directly, or auto from .env (default: auto)")
+    parser.add_argument("--base-url", default=None,
+                        help="API base URL instead of .env (e.g. http://host:8080/api/litellm/v1)")
+    parser.add_argument("--key", default=None, help="API key (default: VIRTUAL_KEY or master key from .env)")
+    parser.add_argument("--model", default=None, help="Model (default: first suitable model from /models)")
+    parser.add_argument("--duration", type=float, default=BENCH_DURATION_S,
+                        help=f"Measured seconds (default: {BENCH_DURATION_S:g})")
+    parser.add_argument("--warmup", type=float, default=BENCH_WARMUP_S,
+                        help=f"Seconds of load before measuring (default: {BENCH_WARMUP_S:g})")
+    parser.add_argument("--concurrency", type=int, default=BENCH_CONCURRENCY,
+                        help=f"Closed loop: concurrent clients (default: {BENCH_CONCURRENCY})")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Open loop: Poisson arrivals per second, independent of response times")
+    parser.add_argument("--prompt-tokens", type=int, default=BENCH_PROMPT_TOKENS,
+                        help=f"Approximate prompt size (default: {BENCH_PROMPT_TOKENS})")
+    parser.add_argument("--max-tokens", type=int, default=BENCH_MAX_TOKENS,
+                        help=f"max_tokens of chat requests (default: {BENCH_MAX_TOKENS})")
+    parser.add_argument("--timeout", type=float, default=BENCH_REQUEST_TIMEOUT_S,
+                        help=f"Per-request timeout in seconds (default: {BENCH_REQUEST_TIMEOUT_S:g})")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for arrivals and prompts (default: 1)")
+    parser.add_argument("--json", type=Path, default=None, dest="json_path",
+                        help="Write the report as JSON")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="JSON report of an earlier run to compare with")
+    options = parser.parse_args(args)
+    if options.rate is not None and options.rate <= 0:
+        parser.error("--rate must be positive")
+    if options.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    
+    try:
+        return BenchService(PROJECT_ROOT).run(
+            workload=options.workload,
+            target=options.target,
+            base_url=options.base_url,
+            api_key=options.key,
+            model=options.model,
+            duration=options.duration,
+            warmup=options.warmup,
+            concurrency=options.concurrency,
+            rate=options.rate,
+            prompt_tokens=options.prompt_tokens,
+            max_tokens=options.max_tokens,
+            timeout=options.timeout,
+            seed=options.seed,
+            json_path=options.json_path,
+            compare_path=options.compare,
+        )
+    except KeyboardInterrupt:
+        print("\n\n❌ Benchmark cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_soak(args: list) -> int:
+    """Run memory soak test"""
+    import argparse
+    from pathlib import Path
+    from src.application.bench_service import WORKLOADS, TARGETS
+    from src.application.soak_service import SoakService
+    from src.core.constants import (
+        LITELLM_CONTAINER_NAME, BENCH_PROMPT_TOKENS, BENCH_MAX_TOKENS, SOAK_DURATION_S,
+        SOAK_SAMPLE_INTERVAL_S, SOAK_WARMUP_S, SOAK_CONCURRENCY, SOAK_MAX_SLOPE_MB_PER_H
+    )
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway soak",
+        description="Steady API load for hours while sampling RSS/PSS of every process in the "
+                    "container; fails if a worker's memory keeps growing",
+    )
+    parser.add_argument("--hours", type=float, default=SOAK_DURATION_S / 3600.0,
+                        help=f"Duration of the load (default: {SOAK_DURATION_S / 3600.0:g}, Ctrl+C ends early)")
+    parser.add_argument("--interval", type=float, default=SOAK_SAMPLE_INTERVAL_S,
+                        help=f"Seconds between memory samples (default: {SOAK_SAMPLE_INTERVAL_S:g})")
+    parser.add_argument("--warmup", type=float, default=SOAK_WARMUP_S,
+                        help=f"Seconds at the start left out of the growth fit (default: {SOAK_WARMUP_S:g})")
+    parser.add_argument("--max-slope", type=float, default=SOAK_MAX_SLOPE_MB_PER_H,
+                        help=f"Fail if a worker's PSS grows faster than this many MB/hour "
+                             f"(default: {SOAK_MAX_SLOPE_MB_PER_H:g})")
+    parser.add_argument("--container", action="append", default=[], dest="containers",
+                        help=f"Container to sample, repeatable; needs python inside (default: {LITELLM_CONTAINER_NAME})")
+    parser.add_argument("--workload", choices=WORKLOADS, default="chat",
+                        help="chat, stream (SSE chat) or embeddings (default: chat)")
+    parser.add_argument("--target", choices=TARGETS, default="auto",
+                        help="nginx /api/litellm/v1, LiteLLM port directly, or auto from .env (default: auto)")
+    parser.add_argument("--base-url", default=None,
+                        help="API base URL instead of .env (e.g. http://host:8080/api/litellm/v1)")
+    parser.add_argument("--key", default=None, help="API key (default: VIRTUAL_KEY or master key from .env)")
+    parser.add_argument("--model", default=None,
+                        help="Model (default: first suitable model from /models; mock-gpt with the mock provider)")
+    parser.add_argument("--concurrency", type=int, default=SOAK_CONCURRENCY,
+                        help=f"Concurrent clients (default: {SOAK_CONCURRENCY})")
+    parser.add_argument("--prompt-tokens", type=int, default=BENCH_PROMPT_TOKENS,
+                        help=f"Approximate prompt size (default: {BENCH_PROMPT_TOKENS})")
+    parser.add_argument("--max-tokens", type=int, default=BENCH_MAX_TOKENS,
+                        help=f"max_tokens of chat requests (default: {BENCH_MAX_TOKENS})")
+    parser.add_argument("--json", type=Path, default=None, dest="json_path",
+                        help="Write the report with all samples as JSON (updated after every sample)")
+    options = parser.parse_args(args)
+    if options.hours <= 0 or options.interval <= 0:
+        parser.error("--hours and --interval must be positive")
+    if options.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    
+    try:
+        return SoakService(PROJECT_ROOT).run(
+            workload=options.workload,
+            target=options.target,
+            base_url=options.base_url,
+            api_key=options.key,
+            model=options.model,
+            containers=options.containers,
+            duration=options.hours * 3600.0,
+            interval=options.interval,
+            warmup=options.warmup,
+            concurrency=options.concurrency,
+            prompt_tokens=options.prompt_tokens,
+            max_tokens=options.max_tokens,
+            max_slope=options.max_slope,
+            json_path=options.json_path,
+        )
+    except KeyboardInterrupt:
+        print("\n\n❌ Soak test cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_capture(args: list) -> int:
+    """Run traffic capture command"""
+    import argparse
+    from pathlib import Path
+    from src.application.capture_service import CaptureService, BODY_MODES
+    from src.core.constants import CAPTURE_OUTPUT_FILE
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway capture",
+        description="Record API requests at nginx (timing, route, hashed key, model, size) for replay",
+    )
+    parser.add_argument("action", choices=("start", "stop", "status"),
+                        help="start or stop capturing, or show whether it is running")
+    parser.add_argument("--output", type=Path, default=None,
+                        help=f"stop: capture file to append to (default: {CAPTURE_OUTPUT_FILE})")
+    parser.add_argument("--body", choices=BODY_MODES, default="redacted",
+                        help="stop: keep request bodies none, redacted (text replaced) or full (default: redacted)")
+    options = parser.parse_args(args)
+    
+    try:
+        service = CaptureService(PROJECT_ROOT)
+        if options.action == "start":
+            return service.start()
+        if options.action == "stop":
+            return service.stop(output=options.output, body_mode=options.body)
+        return service.status()
+    except KeyboardInterrupt:
+        print("\n\n❌ Capture cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_replay(args: list) -> int:
+    """Run traffic replay"""
+    import argparse
+    from pathlib import Path
+    from src.application.bench_service import TARGETS
+    from src.application.replay_service import ReplayService
+    from src.core.constants import CAPTURE_OUTPUT_FILE, BENCH_REQUEST_TIMEOUT_S
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway replay",
+        description="Send captured traffic to the API with its original inter-arrival times",
+    )
+    parser.add_argument("capture", type=Path, nargs="?", default=PROJECT_ROOT / CAPTURE_OUTPUT_FILE,
+                        help=f"Capture file (default: {CAPTURE_OUTPUT_FILE})")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Time scale: 1 = as captured, 2 = twice as fast (default: 1)")
+    parser.add_argument("--max-rate", action="store_true",
+                        help="Ignore timing, send back to back with --concurrency clients")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Clients for --max-rate (default: captured peak); otherwise a cap on "
+                             "requests in flight")
+    parser.add_argument("--target", choices=TARGETS, default="auto",
+                        help="nginx /api/litellm/v1, LiteLLM port directly, or auto from .env (default: auto)")
+    parser.add_argument("--base-url", default=None,
+                        help="API base URL instead of .env (e.g. http://host:8080/api/litellm/v1)")
+    parser.add_argument("--key", action="append", default=[], dest="keys",
+                        help="API key; repeat to spread captured keys over several (default: from .env)")
+    parser.add_argument("--model", default=None, help="Send every request to this model")
+    parser.add_argument("--model-map", action="append", default=[], metavar="CAPTURED=MODEL",
+                        help="Send requests for one captured model to another (repeatable)")
+    parser.add_argument("--limit", type=int, default=None, help="Replay only the first N requests")
+    parser.add_argument("--timeout", type=float, default=BENCH_REQUEST_TIMEOUT_S,
+                        help=f"Per-request timeout in seconds (default: {BENCH_REQUEST_TIMEOUT_S:g})")
+    parser.add_argument("--json", type=Path, default=None, dest="json_path",
+                        help="Write the report as JSON")
+    add_log_options(parser)
+    options = parser.parse_args(args)
+    if options.speed <= 0:
+        parser.error("--speed must be positive")
+    if options.concurrency is not None and options.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    
+    model_map = {}
+    for item in options.model_map:
+        captured, _, model = item.partition("=")
+        if not captured or not model:
+            parser.error(f"invalid --model-map {item!r} (expected CAPTURED=MODEL)")
+        model_map[captured] = model
+    
+    try:
+        configure_daemon_logging(options)
+        return ReplayService(PROJECT_ROOT).run(
+            capture_path=options.capture,
+            speed=options.speed,
+            max_rate=options.max_rate,
+            concurrency=options.concurrency,
+            target=options.target,
+            base_url=options.base_url,
+            api_keys=options.keys,
+            model=options.model,
+            model_map=model_map,
+            limit=options.limit,
+            timeout=options.timeout,
+            json_path=options.json_path,
+        )
+    except KeyboardInterrupt:
+        print("\n\n❌ Replay cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_bench_contention(args: list) -> int:
+    """Run API latency benchmark under ingestion load"""
+    import argparse
+    from pathlib import Path
+    from src.application.contention_bench_service import ContentionBenchService
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway bench-contention",
+        description="Measure API tail latency alone and alongside an Open WebUI ingestion job",
+    )
+    parser.add_argument("--duration", type=float, default=30.0,
+                        help="Seconds per phase (default: 30)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Concurrent API clients (default: 8)")
+    parser.add_argument("--ingest-processes", type=int, default=2,
+                        help="Processes of the synthetic ingestion job (default: 2)")
+    parser.add_argument("--document", type=Path, default=None,
+                        help="Upload this document to Open WebUI instead of the synthetic job")
+    parser.add_argument("--webui-token", default=None,
+                        help="Open WebUI API key (Settings > Account), required with --document")
+    options = parser.parse_args(args)
+    
+    try:
+        service = ContentionBenchService(PROJECT_ROOT)
+        return service.run(
+            duration=options.duration,
+            concurrency=options.concurrency,
+            ingest_processes=options.ingest_processes,
+            webui_token=options.webui_token,
+            document=options.document,
+        )
+    except KeyboardInterrupt:
+        print("\n\n❌ Benchmark cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_bench_nginx(args: list) -> int:
+    """Run nginx proxy overhead benchmark"""
+    import argparse
+    from pathlib import Path
+    from src.application.nginx_bench_service import NginxBenchService, VARIANTS, LOCATIONS
+    from src.core.constants import (
+        NGINX_BENCH_REQUESTS, NGINX_BENCH_WARMUP_REQUESTS, NGINX_BENCH_CONCURRENCY, NGINX_BENCH_PORT,
+        NGINX_BENCH_IMAGE
+    )
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway bench-nginx",
+        description="Measure latency and CPU the generated nginx config adds per request, "
+                    "against variants (gzip, buffering, upstream keepalive)",
+    )
+    parser.add_argument("--variant", action="append", choices=list(VARIANTS), default=None,
+                        help="Variant to run (repeatable, default: all)")
+    parser.add_argument("--location", action="append", choices=list(LOCATIONS), default=None,
+                        help="Location class to drive (repeatable, default: all)")
+    parser.add_argument("--requests", type=int, default=NGINX_BENCH_REQUESTS,
+                        help=f"Measured requests per location (default: {NGINX_BENCH_REQUESTS})")
+    parser.add_argument("--warmup", type=int, default=NGINX_BENCH_WARMUP_REQUESTS,
+                        help=f"Unmeasured requests before each location (default: {NGINX_BENCH_WARMUP_REQUESTS})")
+    parser.add_argument("--concurrency", type=int, default=NGINX_BENCH_CONCURRENCY,
+                        help=f"Keep-alive clients (default: {NGINX_BENCH_CONCURRENCY})")
+    parser.add_argument("--port", type=int, default=NGINX_BENCH_PORT,
+                        help=f"Local port for the benchmark nginx (default: {NGINX_BENCH_PORT})")
+    parser.add_argument("--image", default=NGINX_BENCH_IMAGE,
+                        help=f"nginx image (default: {NGINX_BENCH_IMAGE})")
+    parser.add_argument("--json", type=Path, default=None, help="Write the report to this file")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="Earlier --json report to compare against")
+    options = parser.parse_args(args)
+    
+    try:
+        return NginxBenchService(PROJECT_ROOT).run(
+            variants=options.variant,
+            locations=options.location,
+            requests=options.requests,
+            warmup=options.warmup,
+            concurrency=options.concurrency,
+            host_port=options.port,
+            image=options.image,
+            json_path=options.json,
+            compare_path=options.compare,
+        )
+    except KeyboardInterrupt:
+        print("\n\n❌ Benchmark cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_top_keys(args: list) -> int:
+    """Run per-key accounting report"""
+    import argparse
+    from pathlib import Path
+    from src.application.top_keys_service import TopKeysService
+    from src.core.constants import TOP_KEYS_DEFAULT_LIMIT
+    from src.core.key_accounting import TOP_KEY_ORDERS
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway top-keys",
+        description="Which API keys drive load and latency: per-key request rates and latency "
+                    "quantiles from the metrics exporter or the nginx metrics log",
+    )
+    parser.add_argument("--limit", type=int, default=TOP_KEYS_DEFAULT_LIMIT,
+                        help=f"Number of keys (default: {TOP_KEYS_DEFAULT_LIMIT})")
+    parser.add_argument("--by", choices=TOP_KEY_ORDERS, default="time",
+                        help="Sort by share of total request time, requests, current rate, p99 latency "
+                             "or 5xx/429 count (default: time)")
+    parser.add_argument("--log", type=Path, action="append", default=[], dest="logs",
+                        help="Read this metrics log (or - for JSON lines on stdin) instead of asking the "
+                             "exporter; repeatable")
+    parser.add_argument("--url", default=None,
+                        help="Exporter /top-keys URL (default: http://127.0.0.1:$METRICS_PORT/top-keys)")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    options = parser.parse_args(args)
+    if options.limit < 1:
+        parser.error("--limit must be at least 1")
+    
+    try:
+        service = TopKeysService(PROJECT_ROOT)
+        return service.run(
+            limit=options.limit,
+            order=options.by,
+            log_paths=options.logs,
+            url=options.url,
+            as_json=options.json,
+        )
+    except KeyboardInterrupt:
+        print("\n\n❌ Report cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_status() -> int:
+    """Run status command"""
+    from src.application.status_service import StatusService
+    
+    try:
+        return StatusService(PROJECT_ROOT).show_status()
+    except KeyboardInterrupt:
+        print("\n\n❌ Status cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_bench_docker(args: list) -> int:
+    """Run Docker backend benchmark"""
+    import argparse
+    from src.application.backend_bench_service import BackendBenchService
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway bench-docker",
+        description="Compare status/start latency with Docker Engine API vs docker CLI",
+    )
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command and backend (default: 10)")
+    parser.add_argument("--start", action="store_true",
+                        help="Also time start (stack must be running)")
+    options = parser.parse_args(args)
+    
+    try:
+        return BackendBenchService(PROJECT_ROOT).run(runs=options.runs, include_start=options.start)
+    except KeyboardInterrupt:
+        print("\n\n❌ Benchmark cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def run_import_budget(args: list) -> int:
+    """Run import-time budget check"""
+    import argparse
+    from src.application.import_budget_service import ImportBudgetService, IMPORT_TARGETS
+    from src.core.constants import IMPORT_BUDGET_RUNS
+    
+    parser = argparse.ArgumentParser(
+        prog="ai-gateway import-budget",
+        description="Measure import time of --help, status and stop with python -X importtime "
+                    "and fail if a command exceeds its budget",
+    )
+    parser.add_argument("--runs", type=int, default=IMPORT_BUDGET_RUNS,
+                        help=f"Runs per command, the median is compared (default: {IMPORT_BUDGET_RUNS})")
+    parser.add_argument("--budget", action="append", default=[], metavar="COMMAND=RATIO",
+                        help="Override a budget as a multiple of the reference import time, "
+                             "e.g. --budget status=3 (repeatable)")
+    options = parser.parse_args(args)
+    
+    budgets = {}
+    for item in options.budget:
+        target, _, value = item.partition("=")
+        try:
+            budgets[target] = float(value)
+        except ValueError:
+            target = ""
+        if target not in IMPORT_TARGETS:
+            parser.error(f"invalid --budget {item!r} (commands: {', '.join(IMPORT_TARGETS)})")
+    
+    try:
+        return ImportBudgetService(PROJECT_ROOT).run(runs=options.runs, budgets=budgets)
+    except KeyboardInterrupt:
+        print("\n\n❌ Import budget check cancelled by user")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
 def run_update(args: list) -> int:
     """Run update command"""
+    import subprocess
+    
     script = get_script_path("update.sh")
     try:
         cmd = ["bash", str(script)] + args
@@ -160,8 +899,33 @@ def show_help() -> None:
     print("Commands:")
     print("  setup              Run interactive setup")
     print("  start              Start Docker containers")
+    print("                     (--profile: phase timings vs. earlier starts,")
+    print("                      --full: skip the nothing-changed fast path)")
     print("  stop               Stop Docker containers")
+    print("                     (--drain [--drain-timeout S]: finish in-flight API requests first)")
+    print("  drain              Answer new API requests with 503, wait for in-flight ones")
+    print("  rollout            Restart LiteLLM with the current config without downtime")
+    print("                     (--abort: clean up after an interrupted rollout)")
+    print("  supervise          Restart only failing containers with backoff (systemd notify unit)")
+    print("                     (--status: restart counters, --no-up: don't run compose up)")
+    print("  status             Show container state and health")
+    print("  top-keys           Per-key request rates, latency quantiles and time share")
+    print("                     (--by time|requests|rate|p99|errors, --log FILE, --json)")
     print("  continue-dev       Generate Continue.dev configuration")
+    print("  tune-workers       Benchmark LiteLLM num_workers and write recommended override")
+    print("                     (--workers 1,2,4 --memory-ceiling MB)")
+    print("  worker-memory      Report USS/PSS per LiteLLM worker (true cost of one more worker)")
+    print("  bench              Load test the API: req/s, TTFT, inter-token latency, errors")
+    print("                     (--workload chat|stream|embeddings, --rate for open loop, --json/--compare)")
+    print("  soak               Hours of steady load, fail if worker RSS/PSS keeps growing")
+    print("                     (--hours 8 --max-slope MB/h --json soak.json)")
+    print("  capture            Record API requests at nginx: start|stop|status (--body none|redacted|full)")
+    print("  replay             Replay a capture with its original timing (--speed N, --max-rate)")
+    print("  bench-contention   API latency alone vs. alongside Open WebUI ingestion")
+    print("  bench-nginx        Latency and CPU nginx adds per request, config variants compared")
+    print("                     (--variant gzip-off --location stream, --json/--compare)")
+    print("  bench-docker       status/start latency: Docker Engine API vs CLI")
+    print("  import-budget      Check import time of --help, status and stop against a budget")
     print("  update [args...]   Update application files")
     print("                     (optional: SOURCE_DIR APP_DIR USERNAME)")
     print("  --help, -h         Show this help message")
@@ -169,8 +933,25 @@ def show_help() -> None:
     print("Examples:")
     print("  ./ai-gateway setup")
     print("  ./ai-gateway start")
+    print("  ./ai-gateway start --profile --history 20")
     print("  ./ai-gateway stop")
+    print("  ./ai-gateway stop --drain --drain-timeout 300")
+    print("  ./ai-gateway rollout")
+    print("  ./ai-gateway supervise --status")
+    print("  ./ai-gateway top-keys --by p99 --limit 10")
     print("  ./ai-gateway continue-dev")
+    print("  ./ai-gateway tune-workers --workers 1,2,3,4 --memory-ceiling 2048")
+    print("  ./ai-gateway worker-memory")
+    print("  ./ai-gateway bench --workload stream --concurrency 16 --json run.json")
+    print("  ./ai-gateway bench --rate 20 --compare run.json")
+    print("  ./ai-gateway soak --hours 8 --model mock-gpt --json soak.json")
+    print("  ./ai-gateway capture start")
+    print("  ./ai-gateway capture stop --body none")
+    print("  ./ai-gateway replay capture/requests.jsonl --speed 2 --key sk-a --key sk-b")
+    print("  ./ai-gateway bench-contention --duration 60")
+    print("  ./ai-gateway bench-nginx --variant generated --variant keepalive --json nginx.json")
+    print("  ./ai-gateway bench-docker --runs 20 --start")
+    print("  ./ai-gateway import-budget --runs 10")
     print("  ./ai-gateway update")
     print("  ./ai-gateway update /path/to/source /opt/ai-gateway aigateway")
     print()
@@ -198,11 +979,41 @@ def main() -> int:
     elif command == "setup":
         return run_setup()
     elif command == "start":
-        return run_start()
+        return run_start(sys.argv[2:])
     elif command == "stop":
-        return run_stop()
+        return run_stop(sys.argv[2:])
+    elif command == "drain":
+        return run_drain(sys.argv[2:])
+    elif command == "rollout":
+        return run_rollout(sys.argv[2:])
+    elif command == "supervise":
+        return run_supervise(sys.argv[2:])
     elif command == "continue-dev":
         return run_continue_dev()
+    elif command == "tune-workers":
+        return run_tune_workers(sys.argv[2:])
+    elif command == "worker-memory":
+        return run_worker_memory(sys.argv[2:])
+    elif command == "status":
+        return run_status()
+    elif command == "top-keys":
+        return run_top_keys(sys.argv[2:])
+    elif command == "bench":
+        return run_bench(sys.argv[2:])
+    elif command == "soak":
+        return run_soak(sys.argv[2:])
+    elif command == "capture":
+        return run_capture(sys.argv[2:])
+    elif command == "replay":
+        return run_replay(sys.argv[2:])
+    elif command == "bench-nginx":
+        return run_bench_nginx(sys.argv[2:])
+    elif command == "bench-docker":
+        return run_bench_docker(sys.argv[2:])
+    elif command == "bench-contention":
+        return run_bench_contention(sys.argv[2:])
+    elif command == "import-budget":
+        return run_import_budget(sys.argv[2:])
     elif command == "update":
         # Pass remaining args to update script
         update_args = sys.argv[2:] if len(sys.argv) > 2 else []
@@ -3,8 +3,9 @@ Configuration management and resource profiles
 DEPRECATED: Use core.config for new code, but kept for backward compatibility
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from enum import Enum
+from .core.constants import RESOURCE_PROFILE_FILE, RESOURCE_PROFILE_NONE
 
 # Re-export from core.config for backward compatibility
 try:
@@ -17,6 +18,7 @@ except ImportError:
         SMALL_VPS = "small"
         MEDIUM_VPS = "medium"
         LARGE_VPS = "large"
+        AUTO = "auto"
 
 
 RESOURCE_PROFILES = {
@@ -55,6 +57,15 @@ RESOURCE_PROFILES = {
         "recommended_for": "10+ users, active use",
         "note": "6 workers - safe for 8GB+ RAM (uses ~5.1GB, leaves ~3GB buffer). Monitor with: docker stats",
     },
+    ResourceProfile.AUTO: {
+        "name": "Auto",
+        "description": "Detect CPU, RAM and cgroup limits of this host",
+        "cpu_cores": "detected",
+        "ram": "detected",
+        "workers": "calculated",
+        "recommended_for": "any host (3GB, 16GB, containers with cgroup limits)",
+        "note": "Workers and memory limits are calculated from the measured memory model",
+    },
 }
 
 
@@ -63,6 +74,112 @@ def get_profile_info(profile: ResourceProfile) -> Dict[str, Any]:
     return RESOURCE_PROFILES.get(profile, {})
 
 
+def save_resource_profile(
+    profile: ResourceProfile,
+    template: Dict[str, Any],
+    details: Optional[Dict[str, Any]] = None,
+    file_path: str = RESOURCE_PROFILE_FILE,
+) -> None:
+    """
+    Write resource profile file (read back by generate_docker_compose_override)
+    
+    Args:
+        profile: Resource profile
+        template: Profile template (PROFILE_TEMPLATES format)
+        details: Optional extra data (sizing reasoning, benchmark results)
+        file_path: Path to profile file
+    """
+    import json
+    from pathlib import Path
+    from .infrastructure.file_repository import FileRepository
+    
+    data = {"profile": profile.value, "template": template}
+    if details:
+        data.update(details)
+    FileRepository(Path(".")).write_text(Path(file_path), json.dumps(data, indent=2) + "\n")
+
+
+def load_resource_profile(file_path: str = RESOURCE_PROFILE_FILE) -> Optional[Dict[str, Any]]:
+    """
+    Read resource profile file
+    
+    Returns:
+        Profile data dictionary or None if file is missing or invalid
+    """
+    import json
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        ResourceProfile(data.get("profile"))
+        return data
+    except FileNotFoundError:
+        return None
+    except (IOError, OSError, ValueError) as e:
+        from .utils import print_warning
+        print_warning(f"Ignoring invalid {file_path}: {e}")
+        return None
+
+
+def installed_resource_profile(env_vars: Dict[str, str]) -> Tuple[bool, Optional[ResourceProfile]]:
+    """
+    Resource profile selected at setup
+    
+    RESOURCE_PROFILE in .env (written by setup), else the profile of
+    resource-profile.json (older installs wrote only that, for auto).
+    
+    Args:
+        env_vars: Variables from .env
+    
+    Returns:
+        Tuple of (known, profile); profile None = don't configure workers
+    """
+    value = env_vars.get("RESOURCE_PROFILE", "").strip().lower()
+    if value == RESOURCE_PROFILE_NONE:
+        return True, None
+    if value:
+        try:
+            return True, ResourceProfile(value)
+        except ValueError:
+            from .utils import print_warning
+            print_warning(f"Ignoring unknown RESOURCE_PROFILE={value} in .env")
+    saved = load_resource_profile()
+    if saved:
+        return True, ResourceProfile(saved["profile"])
+    return False, None
+
+
+def run_auto_sizing() -> Dict[str, Any]:
+    """
+    Detect host resources, calculate auto profile, print reasoning and save it
+    
+    Returns:
+        Profile template for the auto profile
+    """
+    from .utils import print_info, print_warning, print_success
+    from .core.sizing import calculate_auto_profile
+    from .infrastructure.host_resources import detect_host_resources
+    
+    host = detect_host_resources()
+    result = calculate_auto_profile(host)
+    
+    print_info("Auto-sizing from detected host resources:")
+    if host.memory_total_mb:
+        print_info(f"  MemTotal: {host.memory_total_mb}MB, MemAvailable: {host.memory_available_mb}MB")
+    if host.cgroup_memory_limit_mb:
+        print_info(f"  cgroup memory.max: {host.cgroup_memory_limit_mb}MB")
+    for line in result.reasoning:
+        print_info(f"  {line}")
+    for name, memory in result.services.items():
+        print_info(f"  {name}: reservation {memory.reservation_mb}MB, limit {memory.limit_mb}MB")
+    for warning in result.warnings:
+        print_warning(warning)
+    
+    template = result.to_template(apply_limits=host.memory_limits_supported)
+    save_resource_profile(ResourceProfile.AUTO, template, {"sizing": result.to_dict()})
+    print_success(f"Auto profile written to {RESOURCE_PROFILE_FILE} ({result.num_workers} worker(s))")
+    return template
+
+
 def select_resource_profile() -> Optional[ResourceProfile]:
     """Interactive selection of resource profile"""
     from .utils import print_header, print_info, Colors
@@ -105,18 +222,30 @@ def select_resource_profile() -> Optional[ResourceProfile]:
     print(f"    {Colors.YELLOW}You'll need to configure workers manually in docker-compose.override.yml{Colors.RESET}")
     print()
     
+    auto_info = RESOURCE_PROFILES[ResourceProfile.AUTO]
+    print(f"{Colors.BLUE}[6] {auto_info['name']}{Colors.RESET} - {auto_info['description']}")
+    print(f"    {Colors.YELLOW}Note: {auto_info['note']}{Colors.RESET}")
+    print(f"    For: {auto_info['recommended_for']}")
+    print()
+    
     while True:
-        choice = input("Select profile [1-5]: ").strip()
+        choice = input("Select profile [1-6]: ").strip()
         
         if choice == "5":
             print(f"{Colors.GREEN}✅ Selected: Don't configure workers (using defaults){Colors.RESET}")
             return None  # Special value to indicate no workers configuration
         
+        if choice == "6":
+            print()
+            run_auto_sizing()
+            print(f"{Colors.GREEN}✅ Selected profile: {auto_info['name']}{Colors.RESET}")
+            return ResourceProfile.AUTO
+        
         for profile, num in profiles:
             if choice == num:
                 info = RESOURCE_PROFILES[profile]
                 print(f"{Colors.GREEN}✅ Selected profile: {info['name']}{Colors.RESET}")
                 return profile
         
-        print(f"{Colors.RED}❌ Invalid choice. Enter 1, 2, 3, 4, or 5{Colors.RESET}")
+        print(f"{Colors.RED}❌ Invalid choice. Enter 1, 2, 3, 4, 5, or 6{Colors.RESET}")
 
@@ -9,13 +9,21 @@ from .utils import print_success
 from .budgets import get_general_budget
 
 
-def generate_config_yaml(budget_profile: str = "test") -> None:
+def generate_config_yaml(
+    budget_profile: str = "test",
+    mock_provider: bool = False,
+    tracing: bool = False,
+) -> None:
     """
     Generate minimal config.yaml file with only general_settings.
     Models should be added through LiteLLM Admin UI.
     
     Args:
         budget_profile: Budget profile name ('test', 'prod', or 'unlimited')
+        mock_provider: Register the mock-llm service models (mock-gpt,
+            mock-claude, mock-embedding) for offline benchmarks
+        tracing: Enable LiteLLM's OpenTelemetry callback (spans go to the
+            otel-collector service, see apply_tracing in docker_compose.py)
     
     Raises:
         ValidationError: If budget_profile is invalid
@@ -23,7 +31,8 @@ def generate_config_yaml(budget_profile: str = "test") -> None:
     """
     from .core.exceptions import ValidationError
     from .core.constants import (
-        BUDGET_PROFILE_TEST, BUDGET_PROFILE_PROD, BUDGET_PROFILE_UNLIMITED
+        BUDGET_PROFILE_TEST, BUDGET_PROFILE_PROD, BUDGET_PROFILE_UNLIMITED,
+        MOCK_PROVIDER_SERVICE, MOCK_PROVIDER_PORT
     )
     
     # Validation
@@ -97,6 +106,47 @@ def generate_config_yaml(budget_profile: str = "test") -> None:
         "  retry_after: 120  # Base delay in seconds between retries (120s = 2min allows token limit to fully reset)",
     ]
     
+    if tracing:
+        config_lines.extend([
+            "",
+            "# Tracing (otel-collector service) - one trace per sampled request, parented to the",
+            "# traceparent from nginx: proxy_pre_call (pre-call hooks incl. ToolCallValidator),",
+            "# router (deployment selection), litellm_request / raw_gen_ai_request per provider",
+            "# attempt (retries are separate attempts), postgres and cache calls",
+            "# Exporter and sampler: OTEL_* environment in docker-compose.override.yml",
+            "litellm_settings:",
+            "  callbacks: [\"otel\"]",
+        ])
+    
+    if mock_provider:
+        from .infrastructure.mock_upstream import (
+            MOCK_MODEL_NAME, MOCK_ANTHROPIC_MODEL_NAME, MOCK_EMBEDDING_MODEL_NAME
+        )
+        mock_base = f"http://{MOCK_PROVIDER_SERVICE}:{MOCK_PROVIDER_PORT}"
+        config_lines.extend([
+            "",
+            "# Mock provider (mock-llm service) - hermetic benchmarks of nginx -> LiteLLM -> provider",
+            "# No provider keys or network needed; MOCK_* in .env shape latency, tokens/sec and errors",
+            "model_list:",
+            f"  - model_name: {MOCK_MODEL_NAME}",
+            "    litellm_params:",
+            f"      model: openai/{MOCK_MODEL_NAME}",
+            f"      api_base: {mock_base}/v1",
+            "      api_key: mock-key",
+            f"  - model_name: {MOCK_ANTHROPIC_MODEL_NAME}",
+            "    litellm_params:",
+            f"      model: anthropic/{MOCK_ANTHROPIC_MODEL_NAME}",
+            f"      api_base: {mock_base}",
+            "      api_key: mock-key",
+            f"  - model_name: {MOCK_EMBEDDING_MODEL_NAME}",
+            "    litellm_params:",
+            f"      model: openai/{MOCK_EMBEDDING_MODEL_NAME}",
+            f"      api_base: {mock_base}/v1",
+            "      api_key: mock-key",
+            "    model_info:",
+            "      mode: embedding",
+        ])
+    
     # Write to file
     # Try to use FileRepository, fallback to direct file operations
     try:
@@ -19,6 +19,7 @@ class ResourceProfile(str, Enum):
     SMALL_VPS = "small"
     MEDIUM_VPS = "medium"
     LARGE_VPS = "large"
+    AUTO = "auto"
 
 
 class BudgetProfile(str, Enum):
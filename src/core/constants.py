@@ -53,3 +53,274 @@ NO_VALUES = ("no", "false", "0", "n")
 SYSTEM_USERNAME = "aigateway"
 SYSTEM_APP_DIR = "/opt/ai-gateway"
 
+
+# Memory model (MB) - based on REAL measurements (2025-11-24), see docker_compose.py
+# Idle figures are used as reservations, idle + burst as limits
+LITELLM_BASE_MEMORY_MB = 320      # Main process and dependencies
+LITELLM_WORKER_MEMORY_MB = 460    # Per worker (measured: 2 workers = 1.177 GiB)
+LITELLM_WORKER_BURST_MB = 200     # Per worker during active requests
+OPEN_WEBUI_MEMORY_MB = 600
+OPEN_WEBUI_BURST_MB = 200
+POSTGRES_MEMORY_MB = 60
+POSTGRES_BURST_MB = 100
+NGINX_MEMORY_MB = 20
+NGINX_BURST_MB = 80
+DOCKER_OVERHEAD_MB = 200          # Container runtime
+OS_OVERHEAD_MB = 1200             # Typical Linux (lightweight distros: ~700MB)
+
+# Auto-sizing
+AUTO_SAFETY_MARGIN_RATIO = 0.10   # Keep 10% of the memory budget free
+AUTO_MIN_SAFETY_MARGIN_MB = 128
+AUTO_MAX_WORKERS = 16
+RESOURCE_PROFILE_FILE = "resource-profile.json"
+# RESOURCE_PROFILE in .env when setup was told not to configure workers
+RESOURCE_PROFILE_NONE = "none"
+
+# Docker images
+LITELLM_IMAGE = "ghcr.io/berriai/litellm:main-stable"
+
+# OOM priority (oom_score_adj) - proxy path (nginx, LiteLLM and its database) is killed last
+# Rootless Docker cannot go below the daemon's score, values are shifted to >= 0 there
+OOM_SCORE_ADJ = {
+    "nginx": -600,
+    "litellm": -500,
+    "postgres": -500,
+    "open-webui": 500,
+}
+
+# LiteLLM worker modes
+# spawn: uvicorn workers, each a fresh interpreter (nothing shared between workers)
+# preload: gunicorn master imports the app before forking, workers share pages copy-on-write
+LITELLM_WORKER_MODE_SPAWN = "spawn"
+LITELLM_WORKER_MODE_PRELOAD = "preload"
+LITELLM_WORKER_MODES = (LITELLM_WORKER_MODE_SPAWN, LITELLM_WORKER_MODE_PRELOAD)
+LITELLM_CONTAINER_NAME = "litellm-proxy"
+LITELLM_SERVICE_NAME = "litellm"
+
+# CPU allocation - API path (nginx, LiteLLM) gets dedicated cores on hosts with enough CPUs
+CPU_PINNING_MIN_CORES = 4
+# cpu_shares fallback for small hosts (Docker default is 1024)
+CPU_SHARES = {
+    "nginx": 2048,
+    "litellm": 2048,
+    "postgres": 1024,
+    "open-webui": 256,
+}
+OPEN_WEBUI_CONTAINER_NAME = "open-webui"
+NGINX_CONTAINER_NAME = "litellm-nginx"
+POSTGRES_CONTAINER_NAME = "litellm-postgres"
+NGINX_VHOST_FILE = "nginx/conf.d/litellm.conf"
+
+# Docker backend: "auto" (Engine API over the unix socket, CLI fallback), "engine" or "cli"
+DOCKER_BACKEND_ENV = "AI_GATEWAY_DOCKER_BACKEND"
+# Engine API version used in request paths (Docker 20.10+)
+DOCKER_ENGINE_API_VERSION = "v1.41"
+
+# Startup probes - healthchecks run every HEALTHCHECK_START_INTERVAL during
+# start_period and fall back to the steady interval once the service is healthy
+# (healthcheck start_interval needs Docker Engine 25+ / API 1.44 and Compose 2.20.2+).
+# docker-compose.yml keeps short intervals for Docker without start_interval
+# (depends_on gates wait for service_healthy); the longer steady ones come with it
+HEALTHCHECK_START_INTERVAL = "1s"
+HEALTHCHECK_START_PERIOD = {
+    "postgres": "30s",
+    "litellm": "180s",
+    "open-webui": "180s",
+    "nginx": "15s",
+}
+HEALTHCHECK_STEADY = {
+    "postgres": {"interval": "30s", "retries": 3},
+    "litellm": {"interval": "30s", "retries": 3},
+    "open-webui": {"interval": "30s", "retries": 3},
+    "nginx": {"interval": "30s", "retries": 3},
+}
+HEALTHCHECK_MIN_API_VERSION = (1, 44)
+HEALTHCHECK_MIN_COMPOSE_VERSION = (2, 20, 2)
+
+# Startup profiling - phase and per-container timings of `ai-gateway start`
+START_HISTORY_FILE = ".start-history.json"
+START_HISTORY_MAX_ENTRIES = 50
+# Dependency check timings handed over from check_dependencies.py (separate process)
+START_CHECKS_FILE = ".start-checks.json"
+START_CHECKS_MAX_AGE_S = 600
+START_PROFILE_COMPARE_RUNS = 10
+# A phase is a regression if it is this much slower than the median and by at least REGRESSION_MIN_S
+START_REGRESSION_RATIO = 1.5
+START_REGRESSION_MIN_S = 1.0
+
+# Start fast path - fingerprint of generated artifacts, images and tools of the last successful start
+START_STATE_FILE = ".start-state.json"
+START_STATE_ARTIFACTS = (
+    ".env",
+    "config.yaml",
+    "docker-compose.yml",
+    "docker-compose.override.yml",
+    "resource-profile.json",
+    "nginx/nginx.conf",
+)
+START_STATE_ARTIFACT_GLOBS = ("nginx/conf.d/*.conf",)
+
+# Dependency probe cache - version probes (docker --version, compose version, ...)
+# keyed on binary path and mtime, shared by setup/start/stop/continue-dev
+PROBE_CACHE_TTL_S = 24 * 3600
+PROBE_CACHE_FILE = "probes.json"
+PROBE_CACHE_DISABLE_ENV = "AI_GATEWAY_NO_PROBE_CACHE"
+# Where the docker CLI looks for the compose plugin (its mtime is part of the cache key)
+DOCKER_CLI_PLUGIN_DIRS = (
+    "~/.docker/cli-plugins",
+    "/usr/local/lib/docker/cli-plugins",
+    "/usr/local/libexec/docker/cli-plugins",
+    "/usr/lib/docker/cli-plugins",
+    "/usr/libexec/docker/cli-plugins",
+)
+PROBE_MAX_WORKERS = 4
+
+# CLI import-time budget (`ai-gateway import-budget`) - median import time beyond
+# interpreter startup (`python -X importtime`) as a multiple of a reference import
+# of stdlib modules measured in the same run, so the budget holds on any machine
+IMPORT_BUDGET_REFERENCE = "import argparse, json, logging, pathlib, subprocess, typing"
+IMPORT_BUDGET_RATIO = {
+    "--help": 0.6,
+    "status": 2.7,
+    "stop": 2.5,
+}
+IMPORT_BUDGET_RUNS = 5
+# Heaviest top-level imports shown per command
+IMPORT_BUDGET_TOP = 5
+
+# Graceful drain on stop - nginx answers new API requests with 503 while the
+# maintenance flag exists, stop waits for in-flight LiteLLM requests to finish
+DRAIN_FLAG_FILE = "nginx/conf.d/maintenance.flag"
+DRAIN_FLAG_CONTAINER_PATH = "/etc/nginx/conf.d/maintenance.flag"
+# Longest agent responses run ~600s
+DRAIN_TIMEOUT_S = 600
+DRAIN_POLL_INTERVAL_S = 1.0
+DRAIN_RETRY_AFTER_S = 30
+
+# Rolling restart of LiteLLM - a second instance from the resolved compose config
+# runs in its own compose project on the stack network while the service is recreated
+ROLLOUT_SERVICE_NAME = "litellm-next"
+ROLLOUT_CONTAINER_NAME = "litellm-proxy-next"
+ROLLOUT_PROJECT_SUFFIX = "-rollout"
+ROLLOUT_COMPOSE_FILE = ".rollout-compose.json"
+# LiteLLM healthcheck start_period is 180s
+ROLLOUT_HEALTH_TIMEOUT_S = 300
+ROLLOUT_POLL_INTERVAL_S = 2.0
+
+# Supervisor (`ai-gateway supervise`, systemd Type=notify) - restarts only the
+# container that turned unhealthy or died, with exponential crash-loop backoff
+SUPERVISE_STATE_FILE = ".supervisor-state.json"
+SUPERVISE_BACKOFF_BASE_S = 5
+SUPERVISE_BACKOFF_MAX_S = 300
+# Healthy this long after a restart = the crash loop is over (backoff resets)
+SUPERVISE_STABLE_S = 600
+SUPERVISE_RESTART_STOP_TIMEOUT_S = 30
+SUPERVISE_READY_TIMEOUT_S = 600
+# systemd WatchdogSec of the generated unit (pings every half of it)
+SUPERVISE_WATCHDOG_S = 120
+
+# LiteLLM worker recycling (profile templates "recycle", enforced by LiteLLM
+# and `ai-gateway supervise`) - contains slow memory growth of long-lived workers
+RECYCLE_MAX_REQUESTS = 10000
+RECYCLE_MAX_REQUESTS_JITTER = 1000
+# RSS ceiling as a share of the per-process memory budget (idle + burst), below the container limit
+RECYCLE_RSS_CEILING_RATIO = 0.9
+# Container label carrying the RSS ceiling to the supervisor
+RECYCLE_RSS_LABEL = "ai-gateway.recycle.rss-ceiling-mb"
+RECYCLE_CHECK_INTERVAL_S = 60.0
+# A recycled worker has this long to finish its requests and be replaced
+RECYCLE_RESPAWN_TIMEOUT_S = 600.0
+
+# Load generator (`ai-gateway bench`) - asyncio client against nginx or LiteLLM
+BENCH_DURATION_S = 30.0
+BENCH_WARMUP_S = 5.0
+BENCH_CONCURRENCY = 8
+# Generous: a long completion through a slow provider can take minutes
+BENCH_REQUEST_TIMEOUT_S = 300.0
+BENCH_PROMPT_TOKENS = 256
+BENCH_MAX_TOKENS = 128
+# Open loop: arrivals beyond this many in-flight requests are counted as dropped
+BENCH_MAX_IN_FLIGHT = 1024
+BENCH_PERCENTILES = (50, 90, 95, 99)
+
+# Mock LLM provider (optional `mock-llm` compose service, COMPOSE_PROFILES=mock)
+MOCK_PROVIDER_SERVICE = "mock-llm"
+MOCK_PROVIDER_PORT = 8000
+MOCK_PROVIDER_PROFILE = "mock"
+
+# Traffic capture - nginx logs API requests (capture log format) while the
+# capture flag exists; `capture stop` converts the log to capture JSONL
+CAPTURE_FLAG_FILE = "nginx/conf.d/capture.flag"
+CAPTURE_FLAG_CONTAINER_PATH = "/etc/nginx/conf.d/capture.flag"
+CAPTURE_LOG_DIR = "nginx/capture"
+CAPTURE_LOG_FILE = "nginx/capture/requests.log"
+CAPTURE_LOG_CONTAINER_PATH = "/var/log/nginx/capture/requests.log"
+CAPTURE_OUTPUT_FILE = "capture/requests.jsonl"
+CAPTURE_FORMAT_VERSION = 1
+# Characters of the API key nginx logs (nginx cannot hash; converted to key_hash)
+CAPTURE_KEY_TAIL = 12
+
+# nginx overhead benchmark (`ai-gateway bench-nginx`) - the generated config
+# and variants of it in a throwaway nginx container in front of the mock upstream
+NGINX_BENCH_IMAGE = "nginx:alpine"
+NGINX_BENCH_CONTAINER_NAME = "ai-gateway-bench-nginx"
+NGINX_BENCH_PORT = 8098
+NGINX_BENCH_REQUESTS = 2000
+NGINX_BENCH_WARMUP_REQUESTS = 200
+NGINX_BENCH_CONCURRENCY = 8
+# Large enough for gzip to matter (mock tokens are 5 characters)
+NGINX_BENCH_COMPLETION_TOKENS = 256
+
+# Soak test (`ai-gateway soak`) - hours of steady load while sampling RSS/PSS of
+# every process in the LiteLLM container; a worker whose memory keeps growing fails
+SOAK_DURATION_S = 4 * 3600
+SOAK_SAMPLE_INTERVAL_S = 60.0
+# Caches and connection pools fill up first; growth in this window is not a leak
+SOAK_WARMUP_S = 600.0
+SOAK_CONCURRENCY = 4
+SOAK_MAX_SLOPE_MB_PER_H = 10.0
+# Growth must be a trend, not noise around a plateau, to count as a leak
+SOAK_MIN_FIT_R2 = 0.5
+SOAK_MIN_FIT_SAMPLES = 10
+
+# Metrics exporter (`metrics-exporter` service, generated in docker-compose.override.yml)
+# - Prometheus text format on 127.0.0.1:${METRICS_PORT} and in the Docker network
+METRICS_EXPORTER_SERVICE = "metrics-exporter"
+METRICS_EXPORTER_CONTAINER_NAME = "litellm-metrics-exporter"
+METRICS_EXPORTER_PORT = 9464
+METRICS_EXPORTER_MEMORY_MB = 64
+# nginx stub_status, on a port that is not published (Docker network only)
+NGINX_STATUS_PORT = 8081
+NGINX_STATUS_PATH = "/stub_status"
+# JSON access log of API requests, tailed by the exporter
+METRICS_LOG_DIR = "nginx/metrics"
+METRICS_LOG_CONTAINER_PATH = "/var/log/nginx/metrics/access.log"
+# Rotated (renamed, nginx reopens on USR1) once the exporter has read this far
+METRICS_LOG_MAX_BYTES = 64 * 1024 * 1024
+# Log lines handled per tail pass; the rest waits for the next pass
+METRICS_LOG_MAX_READ_BYTES = 4 * 1024 * 1024
+METRICS_TAIL_INTERVAL_S = 1.0
+# nginx, Docker and PostgreSQL are polled in the background; scrapes read the last values
+METRICS_REFRESH_INTERVAL_S = 15.0
+METRICS_LATENCY_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Tracing (optional `otel-collector` compose service, COMPOSE_PROFILES=tracing)
+# - nginx passes on the client's W3C traceparent or starts one from $request_id,
+#   LiteLLM exports its spans to the collector over OTLP/HTTP
+TRACING_PROFILE = "tracing"
+OTEL_COLLECTOR_SERVICE = "otel-collector"
+OTEL_COLLECTOR_HTTP_PORT = 4318
+OTEL_TRACES_DIR = "otel/traces"
+# Share of requests sampled at nginx when the profile template has no tracing.sample_ratio
+TRACE_SAMPLE_RATIO_DEFAULT = 0.05
+
+# Log files (setup_logger / configure_logging): rotated by size
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Per-key accounting (`ai-gateway top-keys`, metrics exporter /top-keys)
+# Keys tracked with their own latency digest; the least active 10% are evicted when full
+KEY_ACCOUNTING_MAX_KEYS = 1000
+# Request rate windows (exponential decay time constants)
+KEY_RATE_WINDOWS_S = (60.0, 900.0)
+TOP_KEYS_DEFAULT_LIMIT = 20
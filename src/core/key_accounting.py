@@ -0,0 +1,241 @@
+"""
+Per-key request accounting from the nginx metrics log
+
+Request rates and latency quantiles for each API key (identified by a hash
+of the key tail nginx logs), in bounded memory: t-digests per key, at most
+KEY_ACCOUNTING_MAX_KEYS keys (the least active are evicted), HyperLogLog
+counts of distinct keys, models and agents. Fed line by line by the
+metrics exporter, or from a log file by `ai-gateway top-keys`.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+from typing import Any, Dict, Iterable, List, Optional
+from .constants import KEY_ACCOUNTING_MAX_KEYS, KEY_RATE_WINDOWS_S
+from .sketches import HyperLogLog, TDigest
+
+# Sort orders of top(): "time" = share of total request time (who drives latency)
+TOP_KEY_ORDERS = ("time", "requests", "rate", "p99", "errors")
+ANONYMOUS_KEY = "-"
+# Rejected keys are not accounted per key: random keys would evict real ones
+UNAUTHENTICATED_STATUSES = (401, 403)
+# Share of the tracked keys dropped at once when the table is full
+EVICT_FRACTION = 0.1
+
+
+def key_hash(key_tail: str) -> Optional[str]:
+    """Stable short identifier of an API key from the tail nginx logged"""
+    if not key_tail:
+        return None
+    return hashlib.sha256(key_tail.encode("utf-8")).hexdigest()[:16]
+
+
+class KeyStats:
+    """Counters, decayed rates and latency digest of one key"""
+
+    __slots__ = ("key", "agent", "requests", "errors", "throttled", "bytes", "time_s", "rates", "last_seen",
+                 "latency")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.agent = ""
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.bytes = 0
+        self.time_s = 0.0
+        # Exponentially decayed request rates, one per window, as of last_seen
+        self.rates = [0.0] * len(KEY_RATE_WINDOWS_S)
+        self.last_seen = 0.0
+        self.latency = TDigest(50.0)
+
+    def rate(self, index: int, now: float) -> float:
+        """Requests per second over the window at index, decayed to now"""
+        elapsed = max(now - self.last_seen, 0.0)
+        return self.rates[index] * math.exp(-elapsed / KEY_RATE_WINDOWS_S[index])
+
+    def observe(self, ts: float, duration_s: float, status: int, sent: int) -> None:
+        elapsed = ts - self.last_seen
+        for index, window in enumerate(KEY_RATE_WINDOWS_S):
+            decay = math.exp(-elapsed / window) if elapsed > 0 else 1.0
+            self.rates[index] = self.rates[index] * decay + 1.0 / window
+        self.last_seen = max(self.last_seen, ts)
+        self.requests += 1
+        self.time_s += duration_s
+        self.bytes += sent
+        if status >= 500:
+            self.errors += 1
+        elif status == 429:
+            self.throttled += 1
+        self.latency.add(duration_s)
+
+
+class KeyAccounting:
+    """Per-key accounting of API requests"""
+
+    def __init__(self, max_keys: int = KEY_ACCOUNTING_MAX_KEYS):
+        self.max_keys = max_keys
+        self.keys: Dict[str, KeyStats] = {}
+        self.distinct_keys = HyperLogLog()
+        self.distinct_models = HyperLogLog()
+        self.distinct_agents = HyperLogLog()
+        self.requests = 0
+        self.time_s = 0.0
+        self.evicted = 0
+        self.first_seen: Optional[float] = None
+        self.last_seen = 0.0
+
+    def observe(
+        self,
+        key: Optional[str],
+        ts: float,
+        duration_s: float,
+        status: int,
+        model: str = "",
+        agent: str = "",
+        sent: int = 0,
+    ) -> None:
+        """
+        Count one request
+
+        Args:
+            key: Key identifier (key_hash), None for requests without a key
+            ts: Time of the request (Unix seconds; log time, not wall clock)
+            duration_s: Request time
+            status: HTTP status
+            model: Model (group) that served it, if known
+            agent: Client name (User-Agent product), if known
+            sent: Bytes sent to the client
+        """
+        key = key or ANONYMOUS_KEY
+        stats = self.keys.get(key)
+        if stats is None:
+            if len(self.keys) >= self.max_keys:
+                self._evict(ts)
+            stats = self.keys[key] = KeyStats(key)
+        stats.observe(ts, duration_s, status, sent)
+        if agent:
+            stats.agent = agent
+            self.distinct_agents.add(agent)
+        if model:
+            self.distinct_models.add(model)
+        self.distinct_keys.add(key)
+        self.requests += 1
+        self.time_s += duration_s
+        if self.first_seen is None or ts < self.first_seen:
+            self.first_seen = ts
+        self.last_seen = max(self.last_seen, ts)
+
+    def observe_record(self, record: Dict[str, Any]) -> bool:
+        """
+        Count one record of the nginx metrics log (or any stream with its fields)
+
+        Rejected requests (401/403) count as ANONYMOUS_KEY.
+
+        Returns:
+            False when the record lacks the time, status or request time
+        """
+        try:
+            ts = float(record["msec"])
+            duration = float(record["request_time"])
+            status = int(record["status"])
+            sent = int(record.get("bytes") or 0)
+        except (KeyError, TypeError, ValueError):
+            return False
+        key = key_hash(str(record.get("key") or "")) if status not in UNAUTHENTICATED_STATUSES else None
+        self.observe(
+            key,
+            ts,
+            duration,
+            status,
+            model=str(record.get("model") or ""),
+            agent=str(record.get("agent") or "")[:64],
+            sent=sent,
+        )
+        return True
+
+    def observe_lines(self, lines: Iterable[str]) -> int:
+        """Count JSON lines; returns the number that could not be used"""
+        bad = 0
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                bad += 1
+                continue
+            if not isinstance(record, dict) or not self.observe_record(record):
+                bad += 1
+        return bad
+
+    def _evict(self, now: float) -> None:
+        # The keys with the lowest long-window rate: idle or rare keys go first. A batch
+        # at a time, so a stream of new keys costs one sort per EVICT_FRACTION of the table
+        count = max(1, int(len(self.keys) * EVICT_FRACTION))
+        window = len(KEY_RATE_WINDOWS_S) - 1
+        slowest = heapq.nsmallest(count, self.keys.values(), key=lambda stats: stats.rate(window, now))
+        for stats in slowest:
+            del self.keys[stats.key]
+        self.evicted += len(slowest)
+
+    def top(self, limit: int = 20, order: str = "time") -> List[Dict[str, Any]]:
+        """
+        Keys sorted by their share of the load
+
+        Args:
+            limit: Number of keys
+            order: One of TOP_KEY_ORDERS
+
+        Returns:
+            Rows with requests, rates per window, latency quantiles (ms),
+            share of total request time, errors (5xx) and throttled (429)
+        """
+        if order not in TOP_KEY_ORDERS:
+            raise ValueError(f"Unknown order: {order} (expected one of {', '.join(TOP_KEY_ORDERS)})")
+        now = self.last_seen
+        sort_keys = {
+            "time": lambda stats: stats.time_s,
+            "requests": lambda stats: stats.requests,
+            "rate": lambda stats: stats.rate(0, now),
+            "p99": lambda stats: stats.latency.quantile(0.99) or 0.0,
+            "errors": lambda stats: stats.errors + stats.throttled,
+        }
+        ranked = sorted(self.keys.values(), key=sort_keys[order], reverse=True)[:limit]
+        rows = []
+        for stats in ranked:
+            row: Dict[str, Any] = {
+                "key": stats.key,
+                "agent": stats.agent,
+                "requests": stats.requests,
+                "time_share": stats.time_s / self.time_s if self.time_s else 0.0,
+                "errors": stats.errors,
+                "throttled": stats.throttled,
+                "bytes": stats.bytes,
+                "last_seen": stats.last_seen,
+            }
+            for index, window in enumerate(KEY_RATE_WINDOWS_S):
+                row[f"rate_{int(window)}s"] = stats.rate(index, now)
+            for q in (0.5, 0.95, 0.99):
+                value = stats.latency.quantile(q)
+                row[f"p{int(q * 100)}_ms"] = value * 1000.0 if value is not None else None
+            rows.append(row)
+        return rows
+
+    def snapshot(self, limit: int = 20, order: str = "time") -> Dict[str, Any]:
+        """Totals, distinct counts and top keys as a JSON-serializable dictionary"""
+        return {
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen or None,
+            "requests": self.requests,
+            "distinct_keys": self.distinct_keys.count(),
+            "distinct_models": self.distinct_models.count(),
+            "distinct_agents": self.distinct_agents.count(),
+            "tracked_keys": len(self.keys),
+            "evicted_keys": self.evicted,
+            "order": order,
+            "keys": self.top(limit, order),
+        }
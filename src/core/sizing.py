@@ -0,0 +1,365 @@
+"""
+Resource auto-sizing based on the measured memory model
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any
+from .constants import (
+    LITELLM_BASE_MEMORY_MB, LITELLM_WORKER_MEMORY_MB, LITELLM_WORKER_BURST_MB,
+    OPEN_WEBUI_MEMORY_MB, OPEN_WEBUI_BURST_MB, POSTGRES_MEMORY_MB, POSTGRES_BURST_MB,
+    NGINX_MEMORY_MB, NGINX_BURST_MB, DOCKER_OVERHEAD_MB, OS_OVERHEAD_MB,
+    AUTO_SAFETY_MARGIN_RATIO, AUTO_MIN_SAFETY_MARGIN_MB, AUTO_MAX_WORKERS,
+    OOM_SCORE_ADJ, CPU_PINNING_MIN_CORES, CPU_SHARES, RECYCLE_MAX_REQUESTS,
+    RECYCLE_MAX_REQUESTS_JITTER, RECYCLE_RSS_CEILING_RATIO
+)
+
+
+@dataclass
+class HostResources:
+    """Detected host resources"""
+    cpu_count: int = 1
+    memory_total_mb: Optional[int] = None
+    memory_available_mb: Optional[int] = None
+    cgroup_version: Optional[int] = None
+    cgroup_memory_limit_mb: Optional[int] = None
+    cgroup_cpu_limit: Optional[float] = None
+    memory_limits_supported: bool = False
+    cpu_ids: List[int] = field(default_factory=list)
+    cpu_limits_supported: bool = False
+    cpuset_supported: bool = False
+
+    @property
+    def effective_cpus(self) -> int:
+        """CPUs usable by containers (affinity and cgroup quota applied)"""
+        cpus = self.cpu_count
+        if self.cgroup_cpu_limit:
+            cpus = min(cpus, max(1, int(self.cgroup_cpu_limit)))
+        return max(1, cpus)
+
+    @property
+    def cgroup_limit_binding(self) -> bool:
+        """True if a cgroup memory limit is lower than physical memory"""
+        if self.cgroup_memory_limit_mb is None:
+            return False
+        if self.memory_total_mb is None:
+            return True
+        return self.cgroup_memory_limit_mb < self.memory_total_mb
+
+
+@dataclass
+class ServiceMemory:
+    """Memory reservation and limit for a service"""
+    reservation_mb: int
+    limit_mb: int
+
+    def to_deploy_resources(self) -> Dict[str, Any]:
+        """Convert to docker compose deploy.resources block"""
+        return {
+            "limits": {"memory": f"{self.limit_mb}M"},
+            "reservations": {"memory": f"{self.reservation_mb}M"},
+        }
+
+
+@dataclass
+class SizingResult:
+    """Result of auto-sizing: workers, per-service memory and reasoning"""
+    num_workers: int
+    budget_mb: int
+    safety_margin_mb: int
+    services: Dict[str, ServiceMemory] = field(default_factory=dict)
+    reasoning: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def total_limits_mb(self) -> int:
+        """Sum of memory limits of all services"""
+        return sum(s.limit_mb for s in self.services.values())
+
+    def to_template(self, apply_limits: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Convert to a PROFILE_TEMPLATES-compatible template
+
+        Args:
+            apply_limits: Emit deploy.resources blocks (False when the host
+                cannot enforce memory limits, e.g. rootless without delegation)
+        """
+        template: Dict[str, Dict[str, Any]] = {
+            "postgres": {},
+            "litellm": {"num_workers": self.num_workers, "recycle": True},
+            "open_webui": {},
+            "nginx": {},
+        }
+        if apply_limits:
+            for service, memory in self.services.items():
+                template[service]["deploy"] = memory.to_deploy_resources()
+        return template
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the resource profile file"""
+        return {
+            "num_workers": self.num_workers,
+            "budget_mb": self.budget_mb,
+            "safety_margin_mb": self.safety_margin_mb,
+            "services": {
+                name: {"reservation_mb": m.reservation_mb, "limit_mb": m.limit_mb}
+                for name, m in self.services.items()
+            },
+            "reasoning": list(self.reasoning),
+            "warnings": list(self.warnings),
+        }
+
+
+def litellm_memory(num_workers: int) -> ServiceMemory:
+    """Memory model for LiteLLM with the given number of workers"""
+    reservation = LITELLM_BASE_MEMORY_MB + num_workers * LITELLM_WORKER_MEMORY_MB
+    return ServiceMemory(
+        reservation_mb=reservation,
+        limit_mb=reservation + num_workers * LITELLM_WORKER_BURST_MB,
+    )
+
+
+def litellm_recycle_policy(num_workers: int) -> Dict[str, int]:
+    """
+    Worker recycling settings for LiteLLM with the given number of workers
+
+    Recycling needs a second worker that keeps serving while one restarts,
+    so a single process gets none: its only way out is a rollout, which
+    runs a second instance next to it - on a host sized for one worker that
+    is the OOM it was meant to prevent. An explicit rss_ceiling_mb override
+    still enables it (the supervisor checks free memory first). The ceiling
+    sits below the worker's share of the container limit, so recycling
+    comes before the OOM killer.
+    """
+    per_worker = LITELLM_WORKER_MEMORY_MB + LITELLM_WORKER_BURST_MB
+    if num_workers <= 1:
+        return {}
+    return {
+        "max_requests": RECYCLE_MAX_REQUESTS,
+        "max_requests_jitter": RECYCLE_MAX_REQUESTS_JITTER,
+        "rss_ceiling_mb": int(per_worker * RECYCLE_RSS_CEILING_RATIO),
+    }
+
+
+def base_service_memory() -> Dict[str, ServiceMemory]:
+    """Memory model for services that don't scale with workers"""
+    return {
+        "postgres": ServiceMemory(POSTGRES_MEMORY_MB, POSTGRES_MEMORY_MB + POSTGRES_BURST_MB),
+        "open_webui": ServiceMemory(OPEN_WEBUI_MEMORY_MB, OPEN_WEBUI_MEMORY_MB + OPEN_WEBUI_BURST_MB),
+        "nginx": ServiceMemory(NGINX_MEMORY_MB, NGINX_MEMORY_MB + NGINX_BURST_MB),
+    }
+
+
+def profile_memory_model(num_workers: int) -> Dict[str, ServiceMemory]:
+    """Memory model for all services of a profile with the given number of workers"""
+    services = base_service_memory()
+    services["litellm"] = litellm_memory(num_workers)
+    return services
+
+
+def parse_memory_limit_mb(value: Any) -> Optional[int]:
+    """
+    Parse docker compose memory value ("980M", "1.5g", "512m", bytes) to MB
+
+    Returns:
+        Size in MB, or None if value cannot be parsed
+    """
+    import re
+
+    if isinstance(value, (int, float)):
+        return int(value) // (1024 * 1024)
+    match = re.match(r"^\s*([\d.]+)\s*([bkmg]?)b?\s*$", str(value), re.IGNORECASE)
+    if not match:
+        return None
+    number = float(match.group(1))
+    factors = {"": 1 / (1024 * 1024), "b": 1 / (1024 * 1024), "k": 1 / 1024, "m": 1, "g": 1024}
+    return int(number * factors[match.group(2).lower()])
+
+
+def oom_score_adjustments(rootless: bool) -> Dict[str, int]:
+    """
+    OOM score adjustments per compose service
+
+    Args:
+        rootless: Shift values to be non-negative (rootless Docker cannot
+            lower the score below the daemon's own)
+    """
+    scores = dict(OOM_SCORE_ADJ)
+    if rootless:
+        shift = -min(scores.values())
+        scores = {name: min(1000, score + shift) for name, score in scores.items()}
+    return scores
+
+
+def check_memory_limits(limits_mb: Dict[str, int], host: HostResources) -> List[str]:
+    """
+    Check that the sum of memory limits fits the host
+
+    Args:
+        limits_mb: Service name -> memory limit in MB
+        host: Detected host resources
+
+    Returns:
+        List of warning messages (empty if limits fit)
+    """
+    warnings: List[str] = []
+    total = sum(limits_mb.values())
+    host_memory = host.cgroup_memory_limit_mb if host.cgroup_limit_binding else host.memory_total_mb
+    if not host_memory:
+        return warnings
+    if total > host_memory:
+        warnings.append(
+            f"Sum of container memory limits ({total}MB) exceeds host RAM ({host_memory}MB) - "
+            "limits won't prevent host-level OOM kills"
+        )
+    elif not host.cgroup_limit_binding and total > host_memory - OS_OVERHEAD_MB - DOCKER_OVERHEAD_MB:
+        warnings.append(
+            f"Sum of container memory limits ({total}MB) exceeds RAM left after OS/Docker overhead "
+            f"(~{host_memory - OS_OVERHEAD_MB - DOCKER_OVERHEAD_MB}MB) - peaks may cause swapping"
+        )
+    return warnings
+
+
+def format_cpuset(cpu_ids: List[int]) -> str:
+    """Format CPU ids as a cpuset string ([0, 1, 2, 5] -> "0-2,5")"""
+    ranges: List[str] = []
+    ids = sorted(set(cpu_ids))
+    start = prev = None
+    for cpu in ids + [None]:
+        if start is not None and (cpu is None or cpu != prev + 1):
+            ranges.append(str(start) if start == prev else f"{start}-{prev}")
+            start = None
+        if cpu is not None and start is None:
+            start = cpu
+        prev = cpu
+    return ",".join(ranges)
+
+
+def plan_cpu_allocation(host: HostResources) -> Dict[str, Dict[str, Any]]:
+    """
+    Plan CPU allocation per compose service
+
+    Hosts with CPU_PINNING_MIN_CORES or more: nginx and LiteLLM share a
+    dedicated half of the cores (at least 2), PostgreSQL and Open WebUI
+    (embeddings, RAG ingestion) get the rest, so document ingestion can't
+    steal cycles from the API path. Smaller hosts fall back to cpu_shares,
+    which only matter under contention and never leave cores idle.
+
+    Returns:
+        Service name -> compose settings (cpuset/cpus or cpu_shares);
+        empty if the host can't enforce CPU settings
+    """
+    if not host.cpu_limits_supported:
+        return {}
+    cpu_ids = sorted(host.cpu_ids) or list(range(host.effective_cpus))
+    if len(cpu_ids) < CPU_PINNING_MIN_CORES or not host.cpuset_supported:
+        return {name: {"cpu_shares": shares} for name, shares in CPU_SHARES.items()}
+
+    api_count = max(2, len(cpu_ids) // 2)
+    api_cpus, background_cpus = cpu_ids[:api_count], cpu_ids[api_count:]
+    # cpus can't exceed a cgroup quota of the whole host (e.g. VPS in a container)
+    quota = host.cgroup_cpu_limit or float(len(cpu_ids))
+    api = {"cpuset": format_cpuset(api_cpus), "cpus": min(float(len(api_cpus)), quota)}
+    background = {"cpuset": format_cpuset(background_cpus), "cpus": min(float(len(background_cpus)), quota)}
+    return {
+        "nginx": dict(api),
+        "litellm": dict(api),
+        "postgres": dict(background),
+        "open-webui": dict(background),
+    }
+
+
+def calculate_auto_profile(host: HostResources) -> SizingResult:
+    """
+    Size LiteLLM workers and per-service memory for the detected host
+
+    Memory budget for containers:
+      - cgroup limit is binding: the limit itself minus Docker overhead
+        (OS services live outside the cgroup)
+      - otherwise: MemTotal minus OS and Docker overhead
+    A safety margin is kept free, then fixed services (PostgreSQL, Open WebUI,
+    Nginx, LiteLLM base) are placed and the rest is split into workers,
+    each sized with its request burst. Worker count is capped by
+    (CPU cores * 2) + 1 and AUTO_MAX_WORKERS.
+
+    Args:
+        host: Detected host resources
+
+    Returns:
+        SizingResult with reasoning lines for display
+    """
+    reasoning: List[str] = []
+    warnings: List[str] = []
+
+    cpus = host.effective_cpus
+    reasoning.append(f"CPU cores available: {cpus}")
+
+    if host.cgroup_limit_binding:
+        budget = host.cgroup_memory_limit_mb - DOCKER_OVERHEAD_MB
+        reasoning.append(
+            f"cgroup v2 memory limit {host.cgroup_memory_limit_mb}MB is binding "
+            f"- Docker overhead {DOCKER_OVERHEAD_MB}MB => budget {budget}MB"
+        )
+    elif host.memory_total_mb:
+        budget = host.memory_total_mb - OS_OVERHEAD_MB - DOCKER_OVERHEAD_MB
+        reasoning.append(
+            f"MemTotal {host.memory_total_mb}MB - OS {OS_OVERHEAD_MB}MB "
+            f"- Docker {DOCKER_OVERHEAD_MB}MB => budget {budget}MB"
+        )
+    else:
+        budget = 4096 - OS_OVERHEAD_MB - DOCKER_OVERHEAD_MB
+        warnings.append("Could not read host memory, assuming 4GB (Medium VPS)")
+        reasoning.append(f"Memory unknown, assuming 4096MB => budget {budget}MB")
+
+    safety_margin = max(AUTO_MIN_SAFETY_MARGIN_MB, int(max(budget, 0) * AUTO_SAFETY_MARGIN_RATIO))
+    usable = budget - safety_margin
+    reasoning.append(f"Safety margin {safety_margin}MB => usable {usable}MB")
+
+    services = base_service_memory()
+    fixed_limits = sum(m.limit_mb for m in services.values())
+    litellm_base = LITELLM_BASE_MEMORY_MB
+    per_worker = LITELLM_WORKER_MEMORY_MB + LITELLM_WORKER_BURST_MB
+    reasoning.append(
+        f"Fixed services (PostgreSQL, Open WebUI, Nginx) limits {fixed_limits}MB "
+        f"+ LiteLLM base {litellm_base}MB"
+    )
+
+    by_memory = (usable - fixed_limits - litellm_base) // per_worker
+    by_cpu = cpus * 2 + 1
+    reasoning.append(
+        f"Workers by memory: ({usable} - {fixed_limits} - {litellm_base}) / {per_worker}MB "
+        f"= {max(by_memory, 0)}; by CPU: {cpus} * 2 + 1 = {by_cpu}; cap {AUTO_MAX_WORKERS}"
+    )
+
+    num_workers = int(min(by_memory, by_cpu, AUTO_MAX_WORKERS))
+    if num_workers < 1:
+        num_workers = 1
+        warnings.append(
+            "Host memory is below the measured minimum for 1 worker with request buffers. "
+            "Expect swapping or OOM kills under load; consider 4GB+ RAM."
+        )
+    reasoning.append(f"Selected num_workers = {num_workers}")
+
+    services["litellm"] = litellm_memory(num_workers)
+    result = SizingResult(
+        num_workers=num_workers,
+        budget_mb=budget,
+        safety_margin_mb=safety_margin,
+        services=services,
+        reasoning=reasoning,
+        warnings=warnings,
+    )
+    reasoning.append(
+        f"Total container limits {result.total_limits_mb}MB of {usable}MB usable"
+    )
+    if result.total_limits_mb > usable:
+        warnings.append(
+            f"Container limits ({result.total_limits_mb}MB) exceed usable memory ({usable}MB): "
+            "simultaneous request bursts in several services may cause swapping"
+        )
+
+    if not host.memory_limits_supported:
+        warnings.append(
+            "Memory controller is not available for containers (rootless Docker without "
+            "cgroup v2 delegation) - limits are computed but not enforced"
+        )
+    return result
@@ -0,0 +1,142 @@
+"""
+Streaming sketches: quantiles and distinct counts in bounded memory
+"""
+
+import hashlib
+import math
+from typing import List, Optional
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning) for latency quantiles
+
+    Values are buffered and merged into at most ~compression centroids; the
+    k1 scale function keeps centroids small near the tails, so p99 stays
+    accurate while the middle of the distribution is summarized coarsely.
+    """
+
+    __slots__ = ("compression", "means", "weights", "count", "total", "min", "max", "_buffer")
+
+    def __init__(self, compression: float = 100.0):
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[float] = []
+
+    def add(self, value: float) -> None:
+        """Add one observation"""
+        self._buffer.append(value)
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= 5 * self.compression:
+            self._merge()
+
+    def _q_limit(self, q: float) -> float:
+        # Largest quantile one centroid starting at q may reach: k(q_limit) = k(q) + 1
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _merge(self) -> None:
+        if not self._buffer:
+            return
+        items = sorted(list(zip(self.means, self.weights)) + [(value, 1.0) for value in self._buffer])
+        self._buffer = []
+        total = float(self.count)
+        means: List[float] = []
+        weights: List[float] = []
+        q0 = 0.0
+        q_limit = self._q_limit(q0)
+        mean, weight = items[0]
+        for next_mean, next_weight in items[1:]:
+            if q0 + (weight + next_weight) / total <= q_limit:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                q0 += weight / total
+                q_limit = self._q_limit(q0)
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means = means
+        self.weights = weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimated quantile
+
+        Args:
+            q: Quantile in range 0-1
+
+        Returns:
+            Value, or None without observations
+        """
+        self._merge()
+        if not self.means:
+            return None
+        if len(self.means) == 1 or q <= 0:
+            return self.means[0] if q > 0 else self.min
+        if q >= 1:
+            return self.max
+        target = q * self.count
+        # Interpolate between centroid centers; min and max anchor the ends
+        previous_center, previous_mean = 0.0, self.min
+        cumulative = 0.0
+        for mean, weight in zip(self.means, self.weights):
+            center = cumulative + weight / 2
+            if target < center:
+                span = center - previous_center
+                fraction = (target - previous_center) / span if span > 0 else 0.0
+                return previous_mean + (mean - previous_mean) * fraction
+            previous_center, previous_mean = center, mean
+            cumulative += weight
+        span = self.count - previous_center
+        fraction = (target - previous_center) / span if span > 0 else 1.0
+        return previous_mean + (self.max - previous_mean) * fraction
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter (2^precision one-byte registers)
+
+    Precision 12 is 4 KB with ~1.6% standard error, at any cardinality.
+    """
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """Add one value (strings equal by content count once)"""
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        index = hashed >> (64 - self.precision)
+        rest_bits = 64 - self.precision
+        rank = rest_bits - (hashed & ((1 << rest_bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        """Estimated number of distinct values"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small range: linear counting is exact enough and unbiased
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
@@ -0,0 +1,95 @@
+"""
+Statistics helpers for benchmark results
+"""
+
+from typing import Dict, Iterable, Sequence, Tuple
+from .sketches import TDigest
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """
+    Percentile with linear interpolation between closest ranks
+
+    Args:
+        values: Sample values (need not be sorted)
+        p: Percentile in range 0-100
+
+    Returns:
+        Percentile value (0.0 for empty input)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return float(ordered[0])
+    rank = (len(ordered) - 1) * (p / 100.0)
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = rank - lower
+    return float(ordered[lower] + (ordered[upper] - ordered[lower]) * fraction)
+
+
+def summarize(values: Iterable[float], percentiles: Sequence[float] = (50, 90, 99)) -> Dict[str, float]:
+    """
+    Summarize samples as count, mean, min, max and percentiles
+
+    Returns:
+        Dictionary like {"count": 10, "mean": 1.2, "p50": 1.1, ...}
+    """
+    data = list(values)
+    summary: Dict[str, float] = {
+        "count": len(data),
+        "mean": sum(data) / len(data) if data else 0.0,
+        "min": min(data) if data else 0.0,
+        "max": max(data) if data else 0.0,
+    }
+    for p in percentiles:
+        key = f"p{p:g}".replace(".", "_")
+        summary[key] = percentile(data, p)
+    return summary
+
+
+def summarize_digest(digest: TDigest, percentiles: Sequence[float] = (50, 90, 99)) -> Dict[str, float]:
+    """
+    Summary in the format of summarize() from a t-digest
+
+    For runs too long to keep every sample (percentiles are estimates).
+    """
+    summary: Dict[str, float] = {
+        "count": digest.count,
+        "mean": digest.total / digest.count if digest.count else 0.0,
+        "min": digest.min if digest.count else 0.0,
+        "max": digest.max if digest.count else 0.0,
+    }
+    for p in percentiles:
+        key = f"p{p:g}".replace(".", "_")
+        value = digest.quantile(p / 100.0)
+        summary[key] = value if value is not None else 0.0
+    return summary
+
+
+def linear_fit(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float, float]:
+    """
+    Least-squares line through (x, y) points
+
+    Args:
+        xs: X values
+        ys: Y values (same length)
+
+    Returns:
+        Tuple of (slope, intercept, r_squared); r_squared is 0.0 when y does
+        not vary and the fit is (0.0, 0.0, 0.0) for fewer than two points
+    """
+    n = len(xs)
+    if n < 2 or len(ys) != n:
+        return 0.0, 0.0, 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    if sxx == 0:
+        return 0.0, mean_y, 0.0
+    slope = sxy / sxx
+    r_squared = (sxy * sxy) / (sxx * syy) if syy else 0.0
+    return slope, mean_y - slope * mean_x, r_squared
@@ -41,6 +41,8 @@ PROFILE_TEMPLATES = {
             "num_workers": 4,
         },
         "open_webui": {},
+        # Local development: trace every request (when tracing is enabled)
+        "tracing": {"sample_ratio": 1.0},
     },
     ResourceProfile.SMALL_VPS: {
         "postgres": {},
@@ -59,8 +61,13 @@ PROFILE_TEMPLATES = {
             # Medium VPS uses 2 workers for better concurrency and fits comfortably in 4GB.
             # Lightweight Linux distributions (Alpine, Debian minimal) can reduce system overhead.
             "num_workers": 1,
+            # No recycling: the rollout that replaces a single process runs a second
+            # instance, which 2GB has no room for
+            "recycle": False,
         },
         "open_webui": {},
+        # Span export costs CPU and memory in every worker - keep it rare on 2GB
+        "tracing": {"sample_ratio": 0.01},
     },
     ResourceProfile.MEDIUM_VPS: {
         "postgres": {},
@@ -76,8 +83,11 @@ PROFILE_TEMPLATES = {
             # 3 workers would use ~1700MB for LiteLLM alone, leaving only ~200MB buffer (too tight)
             # Monitor with: docker stats
             "num_workers": 2,
+            # Recycle workers after RECYCLE_MAX_REQUESTS (+ jitter) requests or at the RSS ceiling
+            "recycle": True,
         },
         "open_webui": {},
+        "tracing": {"sample_ratio": 0.05},
     },
     ResourceProfile.LARGE_VPS: {
         "postgres": {},
@@ -93,10 +103,533 @@ PROFILE_TEMPLATES = {
             # 8 workers would use ~4000MB for LiteLLM alone (total ~6.1GB), leaving less buffer
             # Monitor with: docker stats
             "num_workers": 6,
+            "recycle": True,
         },
         "open_webui": {},
+        "tracing": {"sample_ratio": 0.1},
     },
+    # ResourceProfile.AUTO is calculated per host (see core/sizing.py)
+    # and stored in resource-profile.json by select_resource_profile()
 }
+# Per-service template keys (also accepted in resource-profile.json "overrides"):
+#   litellm: num_workers, worker_mode ("spawn" | "preload"),
+#            recycle (bool), max_requests, max_requests_jitter, rss_ceiling_mb
+#   any service: deploy (resources block or False), cpuset, cpus, cpu_shares
+#   metrics: enabled (bool, default true) - the metrics-exporter service, if chosen at setup
+#            log_keys (bool, default false) - key tails in the nginx metrics log (top-keys)
+#   tracing: sample_ratio (0..1) - share of requests traced, decided at nginx
+# Memory and CPU settings not given in the template are derived from the
+# memory model and the detected host CPUs (see core/sizing.py)
+
+# Template keys -> docker compose service names
+TEMPLATE_SERVICES = {
+    "postgres": "postgres",
+    "litellm": "litellm",
+    "open_webui": "open-webui",
+    "nginx": "nginx",
+}
+
+
+def get_profile_template(profile: Optional[ResourceProfile]) -> Dict[str, Any]:
+    """
+    Get profile template for docker-compose.override.yml generation
+    
+    Args:
+        profile: Resource profile (None = don't configure workers)
+    
+    Returns:
+        Template dictionary with per-service settings
+    """
+    if profile is None:
+        return {"postgres": {}, "litellm": {}, "open_webui": {}}
+    
+    import copy
+    from .config import load_resource_profile, run_auto_sizing
+    
+    saved = load_resource_profile()
+    if saved and saved.get("profile") != profile.value:
+        # Profile file belongs to another profile - ignore it
+        saved = None
+    
+    if profile == ResourceProfile.AUTO:
+        if saved and saved.get("template"):
+            template = copy.deepcopy(saved["template"])
+        else:
+            template = run_auto_sizing()
+            saved = load_resource_profile()
+    else:
+        template = copy.deepcopy(PROFILE_TEMPLATES.get(profile, PROFILE_TEMPLATES[ResourceProfile.MEDIUM_VPS]))
+    
+    # Apply overrides from resource-profile.json (e.g. written by tune-workers)
+    for service, settings in ((saved or {}).get("overrides") or {}).items():
+        template.setdefault(service, {}).update(settings)
+    
+    return template
+
+
+def get_worker_mode_args(worker_mode: Optional[str]) -> str:
+    """
+    Get extra LiteLLM command arguments for the worker mode
+    
+    "preload" runs LiteLLM under gunicorn, which imports the app in the master
+    before forking, so workers share imported modules copy-on-write.
+    Default ("spawn") keeps uvicorn workers, each a fresh interpreter.
+    Measure the effect with: ./ai-gateway worker-memory
+    
+    Args:
+        worker_mode: Worker mode from profile template (None = spawn)
+    
+    Returns:
+        Arguments string with leading space (empty for spawn)
+    
+    Raises:
+        ConfigurationError: If worker mode is unknown
+    """
+    from .core.constants import LITELLM_WORKER_MODES, LITELLM_WORKER_MODE_PRELOAD
+    from .core.exceptions import ConfigurationError
+    
+    if worker_mode is None:
+        return ""
+    if worker_mode not in LITELLM_WORKER_MODES:
+        raise ConfigurationError(
+            f"Unknown LiteLLM worker_mode '{worker_mode}' (expected one of: {', '.join(LITELLM_WORKER_MODES)})"
+        )
+    return " --run_gunicorn" if worker_mode == LITELLM_WORKER_MODE_PRELOAD else ""
+
+
+RECYCLE_SETTINGS = ("max_requests", "max_requests_jitter", "rss_ceiling_mb")
+
+
+def get_recycle_policy(litellm_settings: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Worker recycling policy of the LiteLLM template settings
+    
+    "recycle": True derives the policy from num_workers (core/sizing.py);
+    explicit max_requests, max_requests_jitter and rss_ceiling_mb win, 0
+    switches one off. Request-count recycling is dropped for a single
+    worker: nothing would serve while it restarts. A single worker is only
+    recycled with an explicit rss_ceiling_mb (by rollout, if memory allows).
+    
+    Args:
+        litellm_settings: "litellm" part of the profile template
+    
+    Returns:
+        Policy dictionary (empty = no recycling)
+    """
+    from .core.sizing import litellm_recycle_policy
+    from .utils import print_warning
+    
+    num_workers = int(litellm_settings.get("num_workers", 1))
+    policy = litellm_recycle_policy(num_workers) if litellm_settings.get("recycle") else {}
+    for key in RECYCLE_SETTINGS:
+        if litellm_settings.get(key) is not None:
+            policy[key] = int(litellm_settings[key])
+    policy = {key: value for key, value in policy.items() if value > 0}
+    if num_workers <= 1 and policy.pop("max_requests", None):
+        print_warning("max_requests needs 2+ LiteLLM workers - only the RSS ceiling is used")
+    if "max_requests" not in policy:
+        policy.pop("max_requests_jitter", None)
+    return policy
+
+
+def get_recycle_args(policy: Dict[str, int], seed: Optional[int] = None) -> str:
+    """
+    Get extra LiteLLM command arguments for request-count recycling
+    
+    LiteLLM takes one limit for all its workers, so the jitter is drawn per
+    host and project directory: gateways on several hosts do not recycle in
+    lockstep, and re-running setup keeps the command (no needless
+    recreate). Workers of one container drift apart anyway since every
+    proxied request is a new connection taken by whichever worker accepts
+    first. A worker at the limit stops accepting, finishes its in-flight
+    requests (streams included) and is replaced.
+    
+    Args:
+        policy: Recycling policy (see get_recycle_policy)
+        seed: Random seed (default: from host name and working directory)
+    
+    Returns:
+        Arguments string with leading space (empty without max_requests)
+    """
+    import os
+    import random
+    import socket
+    import zlib
+    
+    if not policy.get("max_requests"):
+        return ""
+    if seed is None:
+        seed = zlib.crc32(f"{socket.gethostname()}:{os.getcwd()}".encode("utf-8"))
+    jitter = random.Random(seed).randint(0, policy.get("max_requests_jitter", 0))
+    return f" --max_requests_before_restart {policy['max_requests'] + jitter}"
+
+
+def _active_services(port_config: Dict[str, Any]) -> Dict[str, str]:
+    """Template keys -> compose service names of services present in this setup"""
+    return {
+        template_key: service_name
+        for template_key, service_name in TEMPLATE_SERVICES.items()
+        if service_name != "nginx" or port_config.get("use_nginx")
+    }
+
+
+def apply_memory_guard(
+    override: Dict[str, Any],
+    template: Dict[str, Any],
+    profile: Optional[ResourceProfile],
+    port_config: Dict[str, Any],
+    host: Optional[Any] = None,
+) -> None:
+    """
+    Add memory limits/reservations and oom_score_adj to override services
+    
+    Deploy blocks come from the template (auto profile, overrides) or are
+    derived from the memory model for the profile's num_workers
+    (core/sizing.py). A template can opt out per service with "deploy": False.
+    Limits are skipped when the host can't enforce them (rootless Docker
+    without cgroup v2 memory delegation). oom_score_adj is always set so the
+    kernel kills Open WebUI before the proxy path (nginx, LiteLLM, PostgreSQL).
+    
+    Args:
+        override: Override structure being built (modified in place)
+        template: Profile template
+        profile: Resource profile (None = no memory limits)
+        port_config: Port configuration (use_nginx decides if nginx is present)
+        host: Detected host resources (detected if not given)
+    """
+    from .core.sizing import (
+        profile_memory_model, parse_memory_limit_mb, oom_score_adjustments, check_memory_limits
+    )
+    from .infrastructure.host_resources import detect_host_resources
+    from .ports import is_rootless_docker
+    from .utils import print_info, print_warning
+    
+    host = host or detect_host_resources()
+    litellm_settings = template.get("litellm", {})
+    model = {}
+    if profile is not None and "num_workers" in litellm_settings:
+        model = profile_memory_model(int(litellm_settings["num_workers"]))
+    
+    active = _active_services(port_config)
+    
+    limits_mb: Dict[str, int] = {}
+    for template_key, service_name in active.items():
+        deploy_config = template.get(template_key, {}).get("deploy")
+        if deploy_config is False:
+            continue
+        if not deploy_config and template_key in model:
+            deploy_config = model[template_key].to_deploy_resources()
+        if not deploy_config:
+            continue
+        limit = parse_memory_limit_mb(deploy_config.get("limits", {}).get("memory"))
+        if limit:
+            limits_mb[service_name] = limit
+        if host.memory_limits_supported:
+            override["services"].setdefault(service_name, {})["deploy"] = {
+                "resources": deploy_config
+            }
+    
+    if limits_mb:
+        if host.memory_limits_supported:
+            total = sum(limits_mb.values())
+            print_info(f"Memory limits: {', '.join(f'{n} {m}MB' for n, m in limits_mb.items())} (total {total}MB)")
+            for warning in check_memory_limits(limits_mb, host):
+                print_warning(warning)
+        else:
+            print_warning(
+                "Memory controller is not available for containers (rootless Docker without "
+                "cgroup v2 delegation) - memory limits are not written"
+            )
+    
+    scores = oom_score_adjustments(rootless=is_rootless_docker())
+    for service_name in active.values():
+        if service_name in scores:
+            override["services"].setdefault(service_name, {})["oom_score_adj"] = scores[service_name]
+
+
+CPU_SETTINGS = ("cpuset", "cpus", "cpu_shares")
+
+
+def apply_cpu_allocation(
+    override: Dict[str, Any],
+    template: Dict[str, Any],
+    profile: Optional[ResourceProfile],
+    port_config: Dict[str, Any],
+    host: Optional[Any] = None,
+) -> None:
+    """
+    Add cpuset/cpus (or cpu_shares on small hosts) to override services
+    
+    Settings come from the template (cpuset, cpus, cpu_shares per service)
+    or from the host CPU plan (core/sizing.py): dedicated cores for nginx
+    and LiteLLM, the rest for PostgreSQL and Open WebUI. Desktop profile is
+    not pinned (the desktop itself needs the cores).
+    
+    Args:
+        override: Override structure being built (modified in place)
+        template: Profile template
+        profile: Resource profile (None = no CPU settings)
+        port_config: Port configuration (use_nginx decides if nginx is present)
+        host: Detected host resources (detected if not given)
+    """
+    from .core.sizing import plan_cpu_allocation
+    from .infrastructure.host_resources import detect_host_resources
+    from .utils import print_info
+    
+    if profile is None:
+        return
+    host = host or detect_host_resources()
+    plan = {} if profile == ResourceProfile.DESKTOP else plan_cpu_allocation(host)
+    
+    applied = []
+    for template_key, service_name in _active_services(port_config).items():
+        explicit = {k: v for k, v in template.get(template_key, {}).items() if k in CPU_SETTINGS}
+        settings = explicit or plan.get(service_name)
+        if not settings:
+            continue
+        override["services"].setdefault(service_name, {}).update(settings)
+        applied.append(f"{service_name} " + " ".join(f"{k}={v}" for k, v in settings.items()))
+    if applied:
+        print_info(f"CPU allocation: {'; '.join(applied)}")
+
+
+def startup_probes_supported() -> bool:
+    """Check if Docker Engine and Compose support healthcheck start_interval"""
+    from .core.constants import HEALTHCHECK_MIN_API_VERSION, HEALTHCHECK_MIN_COMPOSE_VERSION
+    from .infrastructure.docker_client import DockerClient
+
+    api_version = DockerClient.get_server_api_version()
+    compose_version = DockerClient.get_compose_version()
+    return (
+        bool(api_version) and api_version >= HEALTHCHECK_MIN_API_VERSION
+        and bool(compose_version) and compose_version >= HEALTHCHECK_MIN_COMPOSE_VERSION
+    )
+
+
+def apply_startup_probes(
+    override: Dict[str, Any],
+    port_config: Dict[str, Any],
+    supported: Optional[bool] = None,
+) -> None:
+    """
+    Add healthchecks with fast startup probing to override services
+
+    Every depends_on edge in docker-compose.yml waits for service_healthy, so
+    startup time is bounded by how quickly each healthcheck notices the service
+    is up. Healthcheck tests are written with the configured internal ports.
+    Where supported, probes run every HEALTHCHECK_START_INTERVAL during
+    start_period and back off to the steady interval (HEALTHCHECK_STEADY) once
+    the service is healthy; older Docker keeps the short intervals of
+    docker-compose.yml, so depends_on gates still open quickly.
+
+    Args:
+        override: Override structure being built (modified in place)
+        port_config: Port configuration (internal ports, use_nginx)
+        supported: start_interval support (detected if not given)
+    """
+    from .core.constants import HEALTHCHECK_START_INTERVAL, HEALTHCHECK_START_PERIOD, HEALTHCHECK_STEADY
+    from .utils import print_info, print_warning
+
+    litellm_port = port_config.get("litellm_internal_port", 4000)
+    webui_port = port_config.get("webui_internal_port", 8080)
+    tests = {
+        "litellm": ["CMD-SHELL", f"wget --no-verbose --tries=1 -O /dev/null http://localhost:{litellm_port}/health/readiness || exit 1"],
+        "open-webui": ["CMD-SHELL", f"curl --silent --fail http://localhost:{webui_port}/health || exit 1"],
+    }
+    if supported is None:
+        supported = startup_probes_supported()
+
+    for service_name in _active_services(port_config).values():
+        healthcheck = {}
+        if service_name in tests:
+            healthcheck["test"] = tests[service_name]
+        if supported and service_name in HEALTHCHECK_START_PERIOD:
+            healthcheck["start_period"] = HEALTHCHECK_START_PERIOD[service_name]
+            healthcheck["start_interval"] = HEALTHCHECK_START_INTERVAL
+            healthcheck.update(HEALTHCHECK_STEADY.get(service_name, {}))
+        if healthcheck:
+            override["services"].setdefault(service_name, {})["healthcheck"] = healthcheck
+
+    if supported:
+        print_info(f"Startup probes: every {HEALTHCHECK_START_INTERVAL} until healthy")
+    else:
+        print_warning(
+            "Docker Engine 25+ and Compose 2.20.2+ are needed for fast startup probes "
+            "(healthcheck start_interval) - probing at the short intervals of docker-compose.yml"
+        )
+
+
+def metrics_exporter_enabled(template: Dict[str, Any], port_config: Dict[str, Any]) -> bool:
+    """
+    Whether the metrics-exporter service is added
+    
+    Opt-in at setup (METRICS=yes): it mounts the Docker socket, which is
+    root-equivalent on the host. "metrics": {"enabled": false} in the
+    template (resource-profile.json overrides) still turns it off.
+    """
+    return bool(port_config.get("metrics")) and template.get("metrics", {}).get("enabled") is not False
+
+
+def metrics_log_enabled(template: Dict[str, Any], port_config: Dict[str, Any]) -> bool:
+    """
+    Whether nginx writes the metrics log
+    
+    The exporter is the only one that rotates it (rename + nginx -s reopen
+    through the Docker socket), so without the exporter or the socket the
+    log is not written at all rather than left to grow.
+    """
+    from .infrastructure.docker_engine import find_docker_socket
+    
+    if not port_config.get("use_nginx") or not metrics_exporter_enabled(template, port_config):
+        return False
+    return find_docker_socket() is not None
+
+
+def apply_metrics_exporter(
+    override: Dict[str, Any],
+    template: Dict[str, Any],
+    port_config: Dict[str, Any],
+    host: Optional[Any] = None,
+) -> None:
+    """
+    Add the metrics-exporter service to the override
+    
+    Prometheus metrics on 127.0.0.1:${METRICS_PORT} (and to other containers
+    in the Docker network): nginx stub_status and per-route latency from the
+    nginx metrics log (with nginx and the Docker socket, see metrics_log_enabled),
+    CPU/memory per container from the Docker socket, PostgreSQL connections. Only when enabled at setup (see
+    metrics_exporter_enabled).
+    
+    Args:
+        override: Override structure being built (modified in place)
+        template: Profile template
+        port_config: Port configuration (metrics = added at all, use_nginx adds the nginx sources)
+        host: Detected host resources (memory limit only when it can be enforced)
+    """
+    from .core.constants import (
+        METRICS_EXPORTER_SERVICE, METRICS_EXPORTER_CONTAINER_NAME, METRICS_EXPORTER_PORT,
+        METRICS_EXPORTER_MEMORY_MB, METRICS_LOG_DIR, METRICS_LOG_CONTAINER_PATH, NGINX_STATUS_PORT,
+        NGINX_STATUS_PATH, NGINX_CONTAINER_NAME, POSTGRES_CONTAINER_NAME
+    )
+    from .infrastructure.docker_engine import find_docker_socket
+    from .utils import print_info, print_warning
+    
+    if not metrics_exporter_enabled(template, port_config):
+        return
+    
+    command = [
+        "python", "-m", "src.infrastructure.metrics_exporter",
+        "--port", str(METRICS_EXPORTER_PORT),
+        "--postgres-container", POSTGRES_CONTAINER_NAME,
+    ]
+    volumes = ["./src:/app/src:ro"]
+    if port_config.get("use_nginx"):
+        command.extend(["--nginx-status", f"http://nginx:{NGINX_STATUS_PORT}{NGINX_STATUS_PATH}"])
+    if metrics_log_enabled(template, port_config):
+        command.extend([
+            "--access-log", METRICS_LOG_CONTAINER_PATH,
+            "--nginx-container", NGINX_CONTAINER_NAME,
+        ])
+        # Read-write: the exporter rotates the log
+        volumes.append(f"./{METRICS_LOG_DIR}:/var/log/nginx/metrics")
+    
+    # Container stats, psql in the postgres container, nginx -s reopen on log rotation
+    socket_path = find_docker_socket()
+    if socket_path:
+        volumes.append(f"{socket_path}:/var/run/docker.sock")
+    else:
+        print_warning(
+            "Docker socket not found - the metrics exporter will have no container or PostgreSQL metrics, "
+            "and nginx writes no metrics log (nothing could rotate it)"
+        )
+    
+    service = {
+        "image": "python:3.12-alpine",
+        "container_name": METRICS_EXPORTER_CONTAINER_NAME,
+        "working_dir": "/app",
+        "command": command,
+        "volumes": volumes,
+        "environment": ["PYTHONDONTWRITEBYTECODE=1"],
+        "ports": [f"127.0.0.1:${{METRICS_PORT:-{METRICS_EXPORTER_PORT}}}:{METRICS_EXPORTER_PORT}"],
+        "networks": ["litellm-network"],
+        "healthcheck": {
+            "test": [
+                "CMD", "python", "-c",
+                f"import urllib.request; urllib.request.urlopen('http://127.0.0.1:{METRICS_EXPORTER_PORT}/health', timeout=3)",
+            ],
+            "interval": "30s",
+            "timeout": "5s",
+            "retries": 3,
+            "start_period": "10s",
+        },
+    }
+    if host is not None and host.memory_limits_supported:
+        service["deploy"] = {
+            "resources": {
+                "limits": {"memory": f"{METRICS_EXPORTER_MEMORY_MB}M"},
+                "reservations": {"memory": f"{METRICS_EXPORTER_MEMORY_MB // 2}M"},
+            }
+        }
+    override["services"][METRICS_EXPORTER_SERVICE] = service
+    print_info(f"Metrics exporter: http://127.0.0.1:{METRICS_EXPORTER_PORT}/metrics (METRICS_PORT in .env to change)")
+
+
+def get_trace_sample_ratio(template: Dict[str, Any]) -> float:
+    """
+    Share of requests to trace for a profile template
+    
+    Args:
+        template: Profile template (tracing.sample_ratio, default TRACE_SAMPLE_RATIO_DEFAULT)
+    
+    Returns:
+        Sample ratio between 0 and 1
+    """
+    from .core.constants import TRACE_SAMPLE_RATIO_DEFAULT
+    
+    ratio = template.get("tracing", {}).get("sample_ratio", TRACE_SAMPLE_RATIO_DEFAULT)
+    try:
+        return min(max(float(ratio), 0.0), 1.0)
+    except (TypeError, ValueError):
+        return TRACE_SAMPLE_RATIO_DEFAULT
+
+
+def apply_tracing(
+    override: Dict[str, Any],
+    template: Dict[str, Any],
+    port_config: Dict[str, Any],
+) -> None:
+    """
+    Point LiteLLM's OpenTelemetry callback at the otel-collector service
+    
+    The sampling decision is made at nginx (traceparent flags) and followed
+    by the parent-based sampler; the ratio only applies to requests that
+    reach LiteLLM without a traceparent (direct port, Open WebUI).
+    
+    Args:
+        override: Override structure being built (modified in place)
+        template: Profile template (tracing.sample_ratio)
+        port_config: Port configuration (tracing = otel-collector enabled)
+    """
+    import os
+    from .core.constants import OTEL_COLLECTOR_SERVICE, OTEL_COLLECTOR_HTTP_PORT, OTEL_TRACES_DIR
+    from .utils import print_info, ensure_dir
+    
+    if not port_config.get("tracing"):
+        return
+    
+    ratio = get_trace_sample_ratio(template)
+    override["services"]["litellm"]["environment"].extend([
+        "OTEL_EXPORTER=otlp_http",
+        f"OTEL_ENDPOINT=http://{OTEL_COLLECTOR_SERVICE}:{OTEL_COLLECTOR_HTTP_PORT}/v1/traces",
+        "OTEL_SERVICE_NAME=litellm",
+        "OTEL_TRACES_SAMPLER=parentbased_traceidratio",
+        f"OTEL_TRACES_SAMPLER_ARG={ratio:g}",
+    ])
+    
+    # Bind-mounted trace files: the collector runs as a non-root user
+    ensure_dir(OTEL_TRACES_DIR)
+    os.chmod(OTEL_TRACES_DIR, 0o1777)
+    print_info(f"Tracing: {ratio:.1%} of requests sampled, spans in {OTEL_TRACES_DIR}/traces.jsonl")
 
 
 def generate_docker_compose_override(
@@ -113,15 +646,14 @@ def generate_docker_compose_override(
         # Fallback: if yaml is not available, show error
         print("ERROR: PyYAML is not installed. Install: pip install pyyaml")
         raise ImportError("PyYAML required for docker-compose.override.yml generation")
+    from .core.constants import RECYCLE_RSS_LABEL
+    from .utils import print_info
     
     # Models are configured via Admin UI, no need to list them here
     default_models_str = "Configured via Admin UI"
     
     # Get profile template (if profile is None, use empty template - no workers config)
-    if profile is not None:
-        template = PROFILE_TEMPLATES.get(profile, PROFILE_TEMPLATES[ResourceProfile.MEDIUM_VPS])
-    else:
-        template = {"postgres": {}, "litellm": {}, "open_webui": {}}
+    template = get_profile_template(profile)
     
     # Build override structure
     override = {
@@ -138,12 +670,25 @@ def generate_docker_compose_override(
     
     # Get num_workers from profile template (if profile is None, don't configure workers)
     # Based on Gunicorn formula: (CPU cores * 2) + 1, adjusted for I/O-bound workload
+    recycle_policy: Dict[str, int] = {}
     if profile is not None and "litellm" in template and "num_workers" in template["litellm"]:
         num_workers = str(template["litellm"]["num_workers"])
+        worker_args = get_worker_mode_args(template["litellm"].get("worker_mode"))
+        recycle_policy = get_recycle_policy(template["litellm"])
+        worker_args += get_recycle_args(recycle_policy)
         # Override command to set workers and port
         override["services"]["litellm"] = {
-            "command": f"--config /app/config.yaml --host 0.0.0.0 --port {litellm_internal_port} --num_workers {num_workers} --detailed_debug",
+            "command": f"--config /app/config.yaml --host 0.0.0.0 --port {litellm_internal_port} --num_workers {num_workers}{worker_args} --detailed_debug",
         }
+        if recycle_policy.get("rss_ceiling_mb"):
+            # Enforced by `ai-gateway supervise`
+            override["services"]["litellm"]["labels"] = {
+                RECYCLE_RSS_LABEL: str(recycle_policy["rss_ceiling_mb"]),
+            }
+            print_info(
+                f"Worker recycling: RSS ceiling {recycle_policy['rss_ceiling_mb']}MB"
+                + (f", after ~{recycle_policy['max_requests']} requests" if recycle_policy.get("max_requests") else "")
+            )
     elif litellm_internal_port != 4000:
         # Only override command if port is not standard (even without workers config)
         override["services"]["litellm"] = {
@@ -228,14 +773,6 @@ def generate_docker_compose_override(
             f"{port_config.get('webui_external_port')}:{webui_internal_port}"
         ]
     
-    # Deploy resources for open-webui (only if not False)
-    if "open_webui" in template and "deploy" in template["open_webui"]:
-        deploy_config = template["open_webui"]["deploy"]
-        if deploy_config is not False:
-            override["services"]["open-webui"]["deploy"] = {
-                "resources": deploy_config
-            }
-    
     # LiteLLM ports
     # With nginx: LiteLLM API available through nginx at /api/litellm/
     # LiteLLM UI needs separate external port for local network access (configuration)
@@ -276,12 +813,27 @@ def generate_docker_compose_override(
         
         override["services"]["nginx"]["ports"] = nginx_ports
     
+    # Memory limits, reservations and OOM priority, CPU allocation
+    from .infrastructure.host_resources import detect_host_resources
+    host = detect_host_resources()
+    apply_memory_guard(override, template, profile, port_config, host)
+    apply_cpu_allocation(override, template, profile, port_config, host)
+
+    # Healthchecks on configured ports, fast probing during startup
+    apply_startup_probes(override, port_config)
+
+    # Prometheus metrics (nginx, containers, PostgreSQL)
+    apply_metrics_exporter(override, template, port_config, host)
+
+    # OpenTelemetry export to the otel-collector service
+    apply_tracing(override, template, port_config)
+
     # Write YAML file
     try:
         with open("docker-compose.override.yml", "w", encoding="utf-8") as f:
             f.write("# docker-compose.override.yml\n")
             f.write("# Auto-generated by setup.py\n")
-            f.write(f"# Resource profile: {profile.value}\n")
+            f.write(f"# Resource profile: {profile.value if profile else 'none'}\n")
             f.write(f"# Nginx: {'yes' if port_config.get('use_nginx') else 'no'}\n")
             f.write("# This file contains user settings and should NOT be committed to git\n")
             f.write("# Docker Compose automatically applies it on top of docker-compose.yml\n\n")
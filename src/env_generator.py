@@ -80,7 +80,9 @@ def generate_env_file(
         FileOperationError: If file cannot be written
     """
     from .core.exceptions import ValidationError
-    from .core.constants import MIN_PORT, MAX_PORT, DEFAULT_UI_USERNAME
+    from .core.constants import (
+        MIN_PORT, MAX_PORT, DEFAULT_UI_USERNAME, MOCK_PROVIDER_PROFILE, TRACING_PROFILE, RESOURCE_PROFILE_NONE
+    )
     
     # Validation
     if not master_key or not master_key.startswith("sk-"):
@@ -156,6 +158,28 @@ def generate_env_file(
     env_content.append(f"BUDGET_PROFILE={budget_profile}")
     env_content.append("")
     
+    # Optional services (compose profiles)
+    env_content.append("# Resource profile selected at setup (read by update mode and tune-workers)")
+    env_content.append(f"RESOURCE_PROFILE={port_config.get('resource_profile') or RESOURCE_PROFILE_NONE}")
+    compose_profiles = []
+    env_content.append("# Mock LLM provider for offline benchmarks (mock-llm service, mock-* models)")
+    if port_config.get('mock_provider'):
+        env_content.append("MOCK_PROVIDER=yes")
+        compose_profiles.append(MOCK_PROVIDER_PROFILE)
+    else:
+        env_content.append("MOCK_PROVIDER=no")
+    env_content.append("# OpenTelemetry tracing (otel-collector service)")
+    if port_config.get('tracing'):
+        env_content.append("TRACING=yes")
+        compose_profiles.append(TRACING_PROFILE)
+    else:
+        env_content.append("TRACING=no")
+    if compose_profiles:
+        env_content.append(f"COMPOSE_PROFILES={','.join(compose_profiles)}")
+    env_content.append("# Prometheus metrics exporter (metrics-exporter service, mounts the Docker socket)")
+    env_content.append(f"METRICS={'yes' if port_config.get('metrics') else 'no'}")
+    env_content.append("")
+    
     # API keys
     env_content.append("# API keys for providers")
     env_content.append("# Configured through Admin UI: http://localhost:4000/ui")
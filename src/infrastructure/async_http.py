@@ -0,0 +1,247 @@
+"""
+Minimal asyncio HTTP/1.1 client with keep-alive (stdlib only)
+
+Used by the load tools: one event loop drives hundreds of concurrent
+requests, and body chunks are handed to the caller as they arrive so
+streaming responses can be timed per token.
+"""
+
+import asyncio
+import ssl
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Body chunk callback: (data, event loop time of arrival)
+ChunkCallback = Callable[[bytes, float], None]
+
+READ_SIZE = 65536
+
+
+class HTTPProtocolError(Exception):
+    """Malformed or truncated HTTP response"""
+    pass
+
+
+class _Connection:
+    """One TCP (or TLS) connection"""
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+    
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except (OSError, RuntimeError):
+            pass
+
+
+class SSEParser:
+    """Incremental parser for text/event-stream bodies"""
+    
+    def __init__(self):
+        self._buffer = b""
+    
+    def feed(self, data: bytes) -> List[str]:
+        """
+        Add received bytes
+        
+        Returns:
+            `data:` payloads of the events completed by this chunk
+        """
+        self._buffer += data.replace(b"\r\n", b"\n")
+        events = []
+        while b"\n\n" in self._buffer:
+            raw, self._buffer = self._buffer.split(b"\n\n", 1)
+            lines = [
+                line[5:].lstrip() for line in raw.decode("utf-8", "replace").split("\n")
+                if line.startswith("data:")
+            ]
+            if lines:
+                events.append("\n".join(lines))
+        return events
+
+
+class AsyncHTTPClient:
+    """Keep-alive connection pool for one base URL"""
+    
+    def __init__(self, base_url: str, timeout: float = 300.0, headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize client
+        
+        Args:
+            base_url: Scheme, host, port and path prefix ("http://localhost:8080/api/litellm/v1")
+            timeout: Deadline in seconds for a whole request (connect to last byte)
+            headers: Headers sent with every request
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.prefix = parts.path.rstrip("/")
+        self.ssl_context = ssl.create_default_context() if parts.scheme == "https" else None
+        self.timeout = timeout
+        default_port = self.port == (443 if parts.scheme == "https" else 80)
+        self.headers = {"Host": self.host if default_port else f"{self.host}:{self.port}"}
+        self.headers.update(headers or {})
+        self._idle: List[_Connection] = []
+        self.connections_opened = 0
+    
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl_context, limit=READ_SIZE * 4
+        )
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+    
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Send one request
+        
+        Args:
+            method: HTTP method
+            path: Path relative to the base URL ("/chat/completions")
+            body: Request body
+            headers: Extra headers
+            on_chunk: Called with every body chunk as it arrives
+        
+        Returns:
+            Tuple of (status, headers with lower-case names, body)
+        
+        Raises:
+            asyncio.TimeoutError: Request did not finish within the timeout
+            OSError: Connection failed
+            HTTPProtocolError: Malformed or truncated response
+        """
+        return await asyncio.wait_for(
+            self._request(method, path, body, headers or {}, on_chunk), self.timeout
+        )
+    
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+        on_chunk: Optional[ChunkCallback],
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        head = dict(self.headers, **headers)
+        if body is not None:
+            head["Content-Length"] = str(len(body))
+        request = (
+            f"{method} {self.prefix}{path} HTTP/1.1\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in head.items())
+            + "\r\n"
+        ).encode("latin-1") + (body or b"")
+        
+        while True:
+            connection = self._idle.pop() if self._idle else await self._connect()
+            try:
+                connection.writer.write(request)
+                await connection.writer.drain()
+                status_line = await connection.reader.readline()
+                if not status_line and connection.reused:
+                    # Server closed the idle keep-alive connection - retry on a new one
+                    connection.close()
+                    continue
+                return await self._read_response(connection, status_line, on_chunk)
+            except (ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if connection.reused:
+                    continue
+                raise
+            except BaseException:
+                # Timeout/cancellation mid-response: the connection state is unknown
+                connection.close()
+                raise
+    
+    async def _read_response(
+        self,
+        connection: _Connection,
+        status_line: bytes,
+        on_chunk: Optional[ChunkCallback],
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        loop = asyncio.get_running_loop()
+        reader = connection.reader
+        parts = status_line.decode("latin-1").split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+            raise HTTPProtocolError(f"Bad status line: {status_line[:80]!r}")
+        version, status = parts[0], int(parts[1])
+        
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise HTTPProtocolError("Connection closed in response headers")
+            if line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        
+        chunks: List[bytes] = []
+        
+        def deliver(data: bytes) -> None:
+            chunks.append(data)
+            if on_chunk:
+                on_chunk(data, loop.time())
+        
+        keep_alive = version == "HTTP/1.1" and response_headers.get("connection", "").lower() != "close"
+        try:
+            if status in (204, 304) or 100 <= status < 200:
+                pass
+            elif "chunked" in response_headers.get("transfer-encoding", "").lower():
+                while True:
+                    size_line = await reader.readline()
+                    try:
+                        size = int(size_line.split(b";")[0].strip(), 16)
+                    except ValueError:
+                        raise HTTPProtocolError(f"Bad chunk size: {size_line[:40]!r}")
+                    if size == 0:
+                        # Trailers
+                        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                            pass
+                        break
+                    deliver(await reader.readexactly(size))
+                    await reader.readexactly(2)
+            elif "content-length" in response_headers:
+                remaining = int(response_headers["content-length"])
+                while remaining > 0:
+                    data = await reader.read(min(READ_SIZE, remaining))
+                    if not data:
+                        raise HTTPProtocolError("Connection closed in response body")
+                    remaining -= len(data)
+                    deliver(data)
+            else:
+                keep_alive = False
+                while True:
+                    data = await reader.read(READ_SIZE)
+                    if not data:
+                        break
+                    deliver(data)
+        except asyncio.IncompleteReadError as e:
+            connection.close()
+            raise HTTPProtocolError("Connection closed in response body") from e
+        
+        if keep_alive:
+            connection.reused = True
+            self._idle.append(connection)
+        else:
+            connection.close()
+        return status, response_headers, b"".join(chunks)
+    
+    def close(self) -> None:
+        """Close idle connections"""
+        while self._idle:
+            self._idle.pop().close()
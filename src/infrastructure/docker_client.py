@@ -8,11 +8,69 @@ from ..core.exceptions import DockerError
 from ..core.constants import (
     DOCKER_TIMEOUT, DOCKER_COMPOSE_TIMEOUT, DOCKER_UP_TIMEOUT, DOCKER_DOWN_TIMEOUT
 )
+from ..infrastructure.docker_engine import (
+    DockerEngineError, get_engine_client, cli_filters_to_api,
+    container_to_compose_ps, memory_usage_mb
+)
 from ..infrastructure.logger import get_logger
+from ..infrastructure.probe_cache import (
+    docker_version_probe, compose_version_probe, compose_plugin_path, run_probe
+)
 
 logger = get_logger(__name__)
 
 
+def compose_project_name(work_dir: str) -> str:
+    """
+    Resolve the compose project name like `docker compose` does
+
+    COMPOSE_PROJECT_NAME (environment, then .env), top-level `name:` in
+    docker-compose.yml, else the normalized directory name.
+    """
+    import os
+    import re
+    from pathlib import Path
+    
+    directory = Path(work_dir).resolve()
+    name = os.environ.get("COMPOSE_PROJECT_NAME", "").strip()
+    if not name:
+        env_file = directory / ".env"
+        try:
+            for line in env_file.read_text(encoding="utf-8").splitlines():
+                if line.startswith("COMPOSE_PROJECT_NAME="):
+                    name = line.split("=", 1)[1].strip().strip('"').strip("'")
+                    break
+        except (IOError, OSError):
+            pass
+    if not name:
+        try:
+            for line in (directory / "docker-compose.yml").read_text(encoding="utf-8").splitlines():
+                match = re.match(r"^name:\s*['\"]?([^'\"#\s]+)", line)
+                if match:
+                    name = match.group(1)
+                    break
+        except (IOError, OSError):
+            pass
+    if not name:
+        name = directory.name
+    return re.sub(r"[^a-z0-9_-]", "", name.lower()).lstrip("_-")
+
+
+def parse_version(text: Optional[str]) -> Tuple[int, ...]:
+    """
+    Parse a version string ("1.44", "v2.24.6", "2.20.2-desktop.1") into a tuple
+
+    Returns:
+        Tuple of ints (empty if no version number is found)
+    """
+    import re
+
+    match = re.search(r"(\d+(?:\.\d+)*)", text or "")
+    if not match:
+        return ()
+    return tuple(int(part) for part in match.group(1).split("."))
+
+
 class DockerClient:
     """Client for Docker operations"""
     
@@ -25,13 +83,8 @@ class DockerClient:
             Tuple of (is_available, version_string)
         """
         try:
-            result = subprocess.run(
-                ["docker", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=DOCKER_TIMEOUT,
-                check=True
-            )
+            result = docker_version_probe()
+            result.check_returncode()
             version = result.stdout.strip()
             logger.debug(f"Docker available: {version}")
             return True, version
@@ -42,6 +95,10 @@ class DockerClient:
     @staticmethod
     def check_daemon_running() -> bool:
         """Check if Docker daemon is running"""
+        engine = get_engine_client()
+        if engine is not None and engine.ping():
+            logger.debug("Docker daemon is running")
+            return True
         try:
             subprocess.run(
                 ["docker", "ps"],
@@ -60,12 +117,7 @@ class DockerClient:
         """Check if Docker Compose is available"""
         # Try docker compose (v2)
         try:
-            subprocess.run(
-                ["docker", "compose", "version"],
-                capture_output=True,
-                check=True,
-                timeout=5
-            )
+            compose_version_probe().check_returncode()
             logger.debug("Docker Compose v2 available")
             return True
         except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
@@ -73,18 +125,54 @@ class DockerClient:
         
         # Try docker-compose (v1)
         try:
-            subprocess.run(
-                ["docker-compose", "--version"],
-                capture_output=True,
-                check=True,
-                timeout=5
-            )
+            run_probe(["docker-compose", "--version"], check=True)
             logger.debug("Docker Compose v1 available")
             return True
         except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
             logger.warning("Docker Compose not available")
             return False
-    
+
+    @staticmethod
+    def get_server_api_version() -> Tuple[int, ...]:
+        """
+        Get the Engine API version of the daemon
+
+        Returns:
+            Version tuple, e.g. (1, 44) (empty if the daemon is not reachable)
+        """
+        engine = get_engine_client()
+        if engine is not None:
+            try:
+                return parse_version(engine.version().get("ApiVersion"))
+            except DockerEngineError as e:
+                logger.debug(f"Engine API failed, using CLI: {e}")
+        try:
+            result = subprocess.run(
+                ["docker", "version", "--format", "{{.Server.APIVersion}}"],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=DOCKER_TIMEOUT
+            )
+            return parse_version(result.stdout.strip())
+        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+            return ()
+
+    @staticmethod
+    def get_compose_version() -> Tuple[int, ...]:
+        """
+        Get the Docker Compose v2 version
+
+        Returns:
+            Version tuple, e.g. (2, 24, 6) (empty if Compose v2 is not available)
+        """
+        try:
+            result = run_probe(["docker", "compose", "version", "--short"], check=True,
+                               extra_paths=(compose_plugin_path(),))
+            return parse_version(result.stdout.strip())
+        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+            return ()
+
     @staticmethod
     def get_running_containers(filter_name: Optional[str] = None) -> List[str]:
         """
@@ -96,6 +184,14 @@ class DockerClient:
         Returns:
             List of container names (empty list if Docker is unavailable or error occurs)
         """
+        engine = get_engine_client()
+        if engine is not None:
+            try:
+                filters = {"name": [filter_name]} if filter_name else None
+                containers = engine.list_containers(filters=filters)
+                return [c["Names"][0].lstrip("/") for c in containers if c.get("Names")]
+            except DockerEngineError as e:
+                logger.debug(f"Engine API failed, using CLI: {e}")
         try:
             cmd = ["docker", "ps", "--format", "{{.Names}}"]
             if filter_name:
@@ -198,6 +294,127 @@ class DockerClient:
             logger.error(f"Timeout starting containers: {e}")
             raise DockerError(f"Cannot start containers: timeout") from e
     
+    @staticmethod
+    def _compose_cmd(files: Optional[List[str]] = None, project: Optional[str] = None) -> List[str]:
+        """`docker compose` with explicit project name and files (default files if None)"""
+        cmd = ["docker", "compose"]
+        if project:
+            cmd.extend(["-p", project])
+        for path in files or []:
+            cmd.extend(["-f", path])
+        return cmd
+    
+    @staticmethod
+    def compose_config(work_dir: str) -> dict:
+        """
+        Fully resolved compose model (docker-compose.yml, override, .env)
+        
+        Args:
+            work_dir: Working directory
+        
+        Returns:
+            Parsed `docker compose config --format json`
+        
+        Raises:
+            DockerError: If command fails
+        """
+        import json
+        
+        try:
+            result = subprocess.run(
+                ["docker", "compose", "config", "--format", "json"],
+                cwd=work_dir,
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=DOCKER_COMPOSE_TIMEOUT
+            )
+            return json.loads(result.stdout)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError) as e:
+            stderr = getattr(e, "stderr", "") or ""
+            raise DockerError(f"Cannot resolve compose config: {stderr.strip() or e}") from e
+    
+    @staticmethod
+    def compose_up_service(
+        work_dir: str,
+        service: str,
+        files: Optional[List[str]] = None,
+        project: Optional[str] = None,
+        force_recreate: bool = False,
+    ) -> None:
+        """
+        Create or recreate one service without touching its dependencies
+        
+        Args:
+            work_dir: Working directory
+            service: Service name
+            files: Compose files (default: docker-compose.yml + override)
+            project: Project name (default: derived by compose)
+            force_recreate: Recreate the container even if its config is unchanged
+        
+        Raises:
+            DockerError: If command fails
+        """
+        cmd = DockerClient._compose_cmd(files, project) + ["up", "-d", "--no-deps"]
+        if force_recreate:
+            cmd.append("--force-recreate")
+        cmd.append(service)
+        try:
+            subprocess.run(cmd, cwd=work_dir, capture_output=True, text=True, check=True, timeout=DOCKER_UP_TIMEOUT)
+            logger.info(f"Service {service} started")
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+            stderr = getattr(e, "stderr", "") or ""
+            logger.error(f"Failed to start service {service}: {e} {stderr}")
+            raise DockerError(f"Cannot start service {service}: {stderr.strip() or e}") from e
+    
+    @staticmethod
+    def compose_project_down(work_dir: str, project: str, files: List[str]) -> None:
+        """
+        Remove the containers of a separate compose project (external networks are kept)
+        
+        Args:
+            work_dir: Working directory
+            project: Project name
+            files: Compose files of that project
+        
+        Raises:
+            DockerError: If command fails
+        """
+        cmd = DockerClient._compose_cmd(files, project) + ["down", "--timeout", str(DOCKER_DOWN_TIMEOUT)]
+        try:
+            subprocess.run(cmd, cwd=work_dir, capture_output=True, text=True, check=True, timeout=DOCKER_DOWN_TIMEOUT * 2)
+            logger.info(f"Compose project {project} removed")
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+            stderr = getattr(e, "stderr", "") or ""
+            raise DockerError(f"Cannot remove compose project {project}: {stderr.strip() or e}") from e
+    
+    @staticmethod
+    def connect_network(network: str, container: str, aliases: Optional[List[str]] = None) -> None:
+        """
+        Reconnect a container to a network with extra DNS aliases
+        
+        Docker can't add aliases to an existing connection, so the container is
+        disconnected first - only call this before it serves traffic.
+        
+        Args:
+            network: Network name
+            container: Container name
+            aliases: DNS aliases on that network
+        
+        Raises:
+            DockerError: If command fails
+        """
+        cmd = ["docker", "network", "connect"]
+        for alias in aliases or []:
+            cmd.extend(["--alias", alias])
+        try:
+            subprocess.run(["docker", "network", "disconnect", network, container],
+                           capture_output=True, text=True, check=True, timeout=DOCKER_TIMEOUT)
+            subprocess.run(cmd + [network, container], capture_output=True, text=True, check=True, timeout=DOCKER_TIMEOUT)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+            stderr = getattr(e, "stderr", "") or ""
+            raise DockerError(f"Cannot connect {container} to {network}: {stderr.strip() or e}") from e
+    
     @staticmethod
     def wait_for_containers(work_dir: str, timeout: int = 300) -> bool:
         """
@@ -285,6 +502,108 @@ class DockerClient:
         logger.warning(f"Timeout waiting for containers to become healthy (waited {timeout}s)")
         return False
     
+    @staticmethod
+    def compose_ps(work_dir: str, all_containers: bool = False) -> List[dict]:
+        """
+        Get containers of the compose project
+        
+        Args:
+            work_dir: Working directory
+            all_containers: Include stopped containers (-a)
+        
+        Returns:
+            List of container dicts from `docker compose ps --format json`
+        
+        Raises:
+            DockerError: If command fails
+        """
+        import json
+        
+        engine = get_engine_client()
+        if engine is not None:
+            try:
+                project = compose_project_name(work_dir)
+                containers = engine.list_containers(
+                    all_containers=all_containers,
+                    filters={"label": [f"com.docker.compose.project={project}"]},
+                )
+                if containers:
+                    return [container_to_compose_ps(c) for c in containers]
+                # Project name may be resolved differently by compose - ask the CLI
+            except DockerEngineError as e:
+                logger.debug(f"Engine API failed, using CLI: {e}")
+        
+        cmd = ["docker", "compose", "ps", "--format", "json"]
+        if all_containers:
+            cmd.insert(3, "-a")
+        try:
+            result = subprocess.run(
+                cmd,
+                cwd=work_dir,
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=10
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+            raise DockerError(f"Cannot list containers: {e}") from e
+        
+        output = result.stdout.strip()
+        if not output:
+            return []
+        # Older Compose versions print one JSON array instead of JSON lines
+        if output.startswith("["):
+            try:
+                return json.loads(output)
+            except json.JSONDecodeError:
+                return []
+        containers = []
+        for line in output.split("\n"):
+            if line.strip():
+                try:
+                    containers.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return containers
+    
+    @staticmethod
+    def stream_events(filters: List[str], since: Optional[str] = None) -> subprocess.Popen:
+        """
+        Subscribe to the Docker events stream
+        
+        Args:
+            filters: Event filters (e.g. ["type=container", "event=die"])
+            since: Also replay events since this timestamp
+        
+        Returns:
+            Running `docker events` process, one JSON event per stdout line
+            (caller must terminate it)
+        
+        Raises:
+            DockerError: If the docker CLI is not available
+        """
+        engine = get_engine_client()
+        if engine is not None:
+            try:
+                return engine.events(cli_filters_to_api(filters), since=since)
+            except DockerEngineError as e:
+                logger.debug(f"Engine API failed, using CLI: {e}")
+        cmd = ["docker", "events", "--format", "{{json .}}"]
+        for item in filters:
+            cmd.extend(["--filter", item])
+        if since:
+            cmd.extend(["--since", since])
+        try:
+            return subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except (OSError, FileNotFoundError) as e:
+            raise DockerError(f"Cannot subscribe to docker events: {e}") from e
+    
     @staticmethod
     def get_container_logs(work_dir: str, container_name: str, tail: int = 50) -> str:
         """
@@ -298,6 +617,18 @@ class DockerClient:
         Returns:
             Container logs as string
         """
+        engine = get_engine_client()
+        if engine is not None:
+            try:
+                project = compose_project_name(work_dir)
+                containers = engine.list_containers(all_containers=True, filters={"label": [
+                    f"com.docker.compose.project={project}",
+                    f"com.docker.compose.service={container_name}",
+                ]})
+                if containers:
+                    return engine.logs(containers[0]["Id"], tail=tail)
+            except DockerEngineError as e:
+                logger.debug(f"Engine API failed, using CLI: {e}")
         try:
             result = subprocess.run(
                 ["docker", "compose", "logs", "--tail", str(tail), container_name],
@@ -323,46 +654,316 @@ class DockerClient:
         Returns:
             List of container info dicts with 'name', 'state', 'exit_code', 'status'
         """
-        import json
+        try:
+            containers = DockerClient.compose_ps(work_dir, all_containers=True)
+        except DockerError as e:
+            logger.warning(f"Failed to get failed containers: {e}")
+            return []
+        
+        failed = []
+        for container in containers:
+            state = container.get("State", "").lower()
+            service = container.get("Service", "")
+            
+            if not service:
+                continue
+            
+            # Check for exited/failed containers
+            if "exited" in state or "dead" in state or "error" in state:
+                failed.append({
+                    "name": service,
+                    "state": container.get("State", ""),
+                    "exit_code": container.get("ExitCode", "?"),
+                    "status": container.get("Status", ""),
+                })
+        
+        return failed
+
+    
+    @staticmethod
+    def run_container(
+        image: str,
+        name: str,
+        args: Optional[List[str]] = None,
+        ports: Optional[List[str]] = None,
+        volumes: Optional[List[str]] = None,
+        extra_hosts: Optional[List[str]] = None,
+        env: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Run a standalone detached container (removed automatically on stop)
+        
+        Args:
+            image: Image name
+            name: Container name
+            args: Command arguments passed to the image entrypoint
+            ports: Port mappings (e.g. "127.0.0.1:4001:4000")
+            volumes: Volume mounts
+            extra_hosts: Extra /etc/hosts entries (e.g. "host.docker.internal:host-gateway")
+            env: Environment variables ("KEY=value")
+        
+        Returns:
+            Container ID
+        
+        Raises:
+            DockerError: If container cannot be started
+        """
+        cmd = ["docker", "run", "-d", "--rm", "--name", name]
+        for port in ports or []:
+            cmd.extend(["-p", port])
+        for volume in volumes or []:
+            cmd.extend(["-v", volume])
+        for host in extra_hosts or []:
+            cmd.extend(["--add-host", host])
+        for item in env or []:
+            cmd.extend(["-e", item])
+        cmd.append(image)
+        cmd.extend(args or [])
         
         try:
             result = subprocess.run(
-                ["docker", "compose", "ps", "-a", "--format", "json"],
-                cwd=work_dir,
+                cmd,
                 capture_output=True,
                 text=True,
                 check=True,
-                timeout=10
+                timeout=DOCKER_UP_TIMEOUT
             )
-            
-            if not result.stdout.strip():
-                return []
-            
-            failed = []
-            for line in result.stdout.strip().split('\n'):
-                if not line.strip():
-                    continue
-                try:
-                    container = json.loads(line)
-                    state = container.get("State", "").lower()
-                    service = container.get("Service", "")
-                    
-                    if not service:
-                        continue
-                    
-                    # Check for exited/failed containers
-                    if "exited" in state or "dead" in state or "error" in state:
-                        failed.append({
-                            "name": service,
-                            "state": container.get("State", ""),
-                            "exit_code": container.get("ExitCode", "?"),
-                            "status": container.get("Status", ""),
-                        })
-                except json.JSONDecodeError:
-                    continue
-            
-            return failed
+            container_id = result.stdout.strip()
+            logger.debug(f"Started container {name}: {container_id[:12]}")
+            return container_id
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
-            logger.warning(f"Failed to get failed containers: {e}")
-            return []
+            stderr = getattr(e, "stderr", "") or ""
+            logger.error(f"Failed to run container {name}: {e} {stderr}")
+            raise DockerError(f"Cannot run container {name}: {stderr.strip() or e}") from e
+    
+    @staticmethod
+    def remove_container(name: str) -> None:
+        """Force-remove a container (ignores missing containers)"""
+        engine = get_engine_client()
+        if engine is not None:
+            try:
+                engine.remove(name)
+                return
+            except DockerEngineError as e:
+                logger.debug(f"Engine API failed, using CLI: {e}")
+        try:
+            subprocess.run(
+                ["docker", "rm", "-f", name],
+                capture_output=True,
+                check=False,
+                timeout=DOCKER_COMPOSE_TIMEOUT
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            logger.warning(f"Failed to remove container {name}: {e}")
+    
+    @staticmethod
+    def restart_container(name: str, stop_timeout: int = 10) -> None:
+        """
+        Restart one container (stop with timeout, then start)
+        
+        Args:
+            name: Container name or ID
+            stop_timeout: Seconds to wait for a clean stop before killing
+        
+        Raises:
+            DockerError: If the container cannot be restarted
+        """
+        engine = get_engine_client()
+        if engine is not None:
+            try:
+                engine.restart(name, stop_timeout)
+                return
+            except DockerEngineError as e:
+                # Nothing reached the daemon; once it did, the error propagates (no second restart)
+                logger.debug(f"Engine API failed, using CLI: {e}")
+        try:
+            subprocess.run(
+                ["docker", "restart", "-t", str(stop_timeout), name],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=stop_timeout + DOCKER_COMPOSE_TIMEOUT
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+            stderr = getattr(e, "stderr", "") or ""
+            raise DockerError(f"Cannot restart container {name}: {stderr.strip() or e}") from e
+    
+    @staticmethod
+    def get_container_memory_mb(name: str) -> Optional[float]:
+        """
+        Get current memory usage of a container (docker stats snapshot)
+        
+        Args:
+            name: Container name or ID
+        
+        Returns:
+            Memory usage in MB, or None if unavailable
+        """
+        engine = get_engine_client()
+        if engine is not None:
+            try:
+                return memory_usage_mb(engine.stats(name))
+            except DockerEngineError as e:
+                logger.debug(f"Engine API failed, using CLI: {e}")
+        try:
+            result = subprocess.run(
+                ["docker", "stats", "--no-stream", "--format", "{{.MemUsage}}", name],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=DOCKER_COMPOSE_TIMEOUT
+            )
+            # Format: "1.177GiB / 7.7GiB"
+            usage = result.stdout.strip().split("/")[0].strip()
+            return parse_memory_size(usage)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+            logger.debug(f"Failed to get memory usage for {name}: {e}")
+            return None
+
+    
+    @staticmethod
+    def exec_in_container(name: str, command: List[str], timeout: int = DOCKER_COMPOSE_TIMEOUT) -> str:
+        """
+        Run a command inside a running container
+        
+        Args:
+            name: Container name or ID
+            command: Command and arguments
+            timeout: Timeout in seconds
+        
+        Returns:
+            Command stdout
+        
+        Raises:
+            DockerError: If container is not running or command fails
+        """
+        engine = get_engine_client()
+        if engine is not None:
+            try:
+                exit_code, stdout, stderr = engine.exec(name, command, timeout=timeout)
+            except DockerEngineError as e:
+                # Only before the exec was started; afterwards the command may have run
+                logger.debug(f"Engine API failed, using CLI: {e}")
+            else:
+                if exit_code != 0:
+                    raise DockerError(
+                        f"Cannot run command in container {name}: {stderr.strip() or f'exit code {exit_code}'}"
+                    )
+                return stdout
+        try:
+            result = subprocess.run(
+                ["docker", "exec", name, *command],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=timeout
+            )
+            return result.stdout
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+            stderr = getattr(e, "stderr", "") or ""
+            logger.debug(f"docker exec in {name} failed: {e} {stderr}")
+            raise DockerError(f"Cannot run command in container {name}: {stderr.strip() or e}") from e
+    
+    @staticmethod
+    def inspect_container(name: str) -> Optional[dict]:
+        """
+        Inspect a container
+        
+        Args:
+            name: Container name or ID
+        
+        Returns:
+            Container details (docker inspect JSON), or None if container doesn't exist
+        """
+        import json
+        
+        engine = get_engine_client()
+        if engine is not None:
+            try:
+                return engine.inspect(name)
+            except DockerEngineError as e:
+                logger.debug(f"Engine API failed, using CLI: {e}")
+        try:
+            result = subprocess.run(
+                ["docker", "inspect", name],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=DOCKER_TIMEOUT
+            )
+            details = json.loads(result.stdout)
+            return details[0] if details else None
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError) as e:
+            logger.debug(f"Failed to inspect {name}: {e}")
+            return None
+    
+    @staticmethod
+    def get_image_id(image: str) -> Optional[str]:
+        """
+        Get the ID (content digest) of a local image
+        
+        Args:
+            image: Image reference, e.g. "postgres:16"
+        
+        Returns:
+            Image ID ("sha256:..."), or None if the image is not present locally
+        """
+        engine = get_engine_client()
+        if engine is not None:
+            try:
+                details = engine.inspect_image(image)
+                return details.get("Id") if details else None
+            except DockerEngineError as e:
+                logger.debug(f"Engine API failed, using CLI: {e}")
+        try:
+            result = subprocess.run(
+                ["docker", "image", "inspect", "--format", "{{.Id}}", image],
+                capture_output=True,
+                text=True,
+                timeout=DOCKER_TIMEOUT
+            )
+            if result.returncode != 0:
+                return None
+            return result.stdout.strip() or None
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
+    
+    @staticmethod
+    def image_exists(image: str) -> bool:
+        """
+        Check if an image is present locally (no pull needed)
+        
+        Args:
+            image: Image reference, e.g. "postgres:16"
+        
+        Returns:
+            True if the image exists locally
+        """
+        return DockerClient.get_image_id(image) is not None
 
+
+def parse_memory_size(value: str) -> Optional[float]:
+    """
+    Parse docker memory size string to MB
+    
+    Args:
+        value: Size like "426.5MiB", "1.177GiB", "512kB"
+    
+    Returns:
+        Size in MB, or None if value cannot be parsed
+    """
+    import re
+    
+    match = re.match(r"^\s*([\d.]+)\s*([KMGT]?i?B)\s*$", value, re.IGNORECASE)
+    if not match:
+        return None
+    number = float(match.group(1))
+    unit = match.group(2).upper()
+    factors = {
+        "B": 1 / (1024 * 1024),
+        "KB": 1 / 1024, "KIB": 1 / 1024,
+        "MB": 1.0, "MIB": 1.0,
+        "GB": 1024.0, "GIB": 1024.0,
+        "TB": 1024.0 * 1024, "TIB": 1024.0 * 1024,
+    }
+    return number * factors.get(unit, 1.0)
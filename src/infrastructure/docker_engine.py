@@ -0,0 +1,494 @@
+"""
+Docker Engine API client over the unix socket (no CLI process per call)
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import re
+import socket
+import struct
+import threading
+import urllib.parse
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ..core.constants import DOCKER_BACKEND_ENV, DOCKER_ENGINE_API_VERSION, DOCKER_TIMEOUT
+from ..core.exceptions import DockerError
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DockerEngineError(DockerError):
+    """Engine API request failed (callers fall back to the CLI)"""
+
+
+class DockerEngineSentError(DockerError):
+    """
+    Engine API request failed after it was sent
+
+    The daemon may have acted on it (a restart begun, an exec command run),
+    so callers must not repeat it through the CLI.
+    """
+
+
+def _unix_socket_path(docker_host: str) -> Optional[str]:
+    """Socket path of a unix:// endpoint; None for tcp:// and ssh:// (left to the CLI) or a missing socket"""
+    if not docker_host.startswith("unix://"):
+        return None
+    path = docker_host[len("unix://"):]
+    return path if Path(path).exists() else None
+
+
+def docker_context_host() -> Optional[str]:
+    """
+    Docker endpoint of the current CLI context (as `docker context inspect`)
+
+    The context is DOCKER_CONTEXT or currentContext in the CLI config
+    (DOCKER_CONFIG or ~/.docker); its endpoint is read from the context
+    metadata, so no CLI process is started.
+
+    Returns:
+        Endpoint such as "unix:///home/me/.colima/docker.sock", or None for
+        the default context (or when it cannot be read)
+    """
+    config_dir = Path(os.environ.get("DOCKER_CONFIG") or Path.home() / ".docker")
+    context = os.environ.get("DOCKER_CONTEXT", "").strip()
+    if not context:
+        try:
+            context = json.loads((config_dir / "config.json").read_text(encoding="utf-8")).get("currentContext") or ""
+        except (OSError, ValueError, AttributeError):
+            return None
+    if not context or context == "default":
+        return None
+    meta_path = config_dir / "contexts" / "meta" / hashlib.sha256(context.encode("utf-8")).hexdigest() / "meta.json"
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.debug(f"Cannot read docker context {context}: {e}")
+        return None
+    return ((meta.get("Endpoints") or {}).get("docker") or {}).get("Host")
+
+
+def find_docker_socket() -> Optional[str]:
+    """
+    Find the Docker daemon unix socket
+
+    Order, as the docker CLI resolves it: DOCKER_HOST, the endpoint of the
+    current context (DOCKER_CONTEXT or currentContext), then the rootless
+    socket in XDG_RUNTIME_DIR or /run/user/UID, then the system socket.
+
+    Returns:
+        Socket path, or None if no socket is found (or the endpoint is tcp/ssh)
+    """
+    docker_host = os.environ.get("DOCKER_HOST", "").strip()
+    if docker_host:
+        return _unix_socket_path(docker_host)
+    context_host = docker_context_host()
+    if context_host:
+        return _unix_socket_path(context_host)
+
+    candidates = []
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        candidates.append(Path(runtime_dir) / "docker.sock")
+    if hasattr(os, "getuid"):
+        candidates.append(Path(f"/run/user/{os.getuid()}/docker.sock"))
+    candidates.append(Path("/var/run/docker.sock"))
+    for candidate in candidates:
+        if candidate.exists():
+            return str(candidate)
+    return None
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a unix socket"""
+
+    def __init__(self, socket_path: str, timeout: float = DOCKER_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def demux_stream(data: bytes) -> Tuple[str, str]:
+    """
+    Split a multiplexed (non-TTY) logs/exec stream into stdout and stderr
+
+    Frame: 1 byte stream type, 3 bytes padding, 4 bytes big-endian size, payload.
+    """
+    stdout, stderr = [], []
+    offset = 0
+    while offset + 8 <= len(data):
+        stream_type, size = struct.unpack(">BxxxL", data[offset:offset + 8])
+        payload = data[offset + 8:offset + 8 + size]
+        (stderr if stream_type == 2 else stdout).append(payload)
+        offset += 8 + size
+    if offset == 0 and data:
+        # TTY containers send raw output without frames
+        return data.decode("utf-8", errors="replace"), ""
+    return (
+        b"".join(stdout).decode("utf-8", errors="replace"),
+        b"".join(stderr).decode("utf-8", errors="replace"),
+    )
+
+
+def cli_filters_to_api(filters: List[str]) -> Dict[str, List[str]]:
+    """Convert CLI filters ["type=container", "event=die"] to API form {"type": ["container"], ...}"""
+    result: Dict[str, List[str]] = {}
+    for item in filters:
+        key, _, value = item.partition("=")
+        result.setdefault(key, []).append(value)
+    return result
+
+
+class EventStream:
+    """
+    Engine API events stream with the interface ReadinessWaiter uses from
+    `docker events` Popen: iterate .stdout for JSON lines, terminate(), wait()
+    """
+
+    def __init__(self, connection: _UnixHTTPConnection, response: http.client.HTTPResponse):
+        self._connection = connection
+        self._response = response
+        self.stdout = self._lines()
+
+    def _lines(self) -> Iterator[str]:
+        try:
+            while True:
+                line = self._response.readline()
+                if not line:
+                    return
+                yield line.decode("utf-8", errors="replace")
+        except (OSError, http.client.HTTPException, ValueError):
+            return
+
+    def terminate(self) -> None:
+        try:
+            if self._connection.sock:
+                self._connection.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._connection.close()
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        return 0
+
+    def kill(self) -> None:
+        self.terminate()
+
+
+class DockerEngineClient:
+    """Minimal Docker Engine API client with one persistent connection"""
+
+    def __init__(self, socket_path: str, timeout: float = DOCKER_TIMEOUT):
+        """
+        Initialize engine client
+
+        Args:
+            socket_path: Path to the Docker unix socket
+            timeout: Socket timeout in seconds
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._connection: Optional[_UnixHTTPConnection] = None
+        self._lock = threading.Lock()
+
+    def _path(self, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        query = f"?{urllib.parse.urlencode(params)}" if params else ""
+        return f"/{DOCKER_ENGINE_API_VERSION}{path}{query}"
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Any] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, bytes]:
+        """Send a request on the persistent connection (reconnects once if it was closed)"""
+        headers = {"Host": "docker"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        with self._lock:
+            for attempt in (1, 2):
+                if self._connection is None:
+                    self._connection = _UnixHTTPConnection(self.socket_path, self.timeout)
+                self._connection.timeout = timeout or self.timeout
+                if self._connection.sock:
+                    self._connection.sock.settimeout(self._connection.timeout)
+                try:
+                    self._connection.request(method, self._path(path, params), body=payload, headers=headers)
+                    response = self._connection.getresponse()
+                    data = response.read()
+                    if response.will_close:
+                        self._connection.close()
+                        self._connection = None
+                    return response.status, data
+                except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                    self._connection.close()
+                    self._connection = None
+                    if attempt == 2:
+                        raise DockerEngineError(f"Docker API connection lost: {e}") from e
+                except (OSError, http.client.HTTPException) as e:
+                    if self._connection:
+                        self._connection.close()
+                    self._connection = None
+                    raise DockerEngineError(f"Docker API request failed: {e}") from e
+        raise DockerEngineError("Docker API request failed")
+
+    def _json(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+              body: Optional[Any] = None, expected: Tuple[int, ...] = (200,)) -> Any:
+        status, data = self._request(method, path, params, body)
+        if status not in expected:
+            message = data.decode("utf-8", errors="replace").strip()
+            try:
+                message = json.loads(message).get("message", message)
+            except (ValueError, AttributeError):
+                pass
+            raise DockerEngineError(f"Docker API {method} {path}: {status} {message}")
+        return json.loads(data) if data else None
+
+    def _send_once(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Any] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, bytes]:
+        """
+        Send a request that must not run twice, on a dedicated connection (no reconnect)
+
+        Raises:
+            DockerEngineError: Nothing was sent (socket missing, connect failed)
+            DockerEngineSentError: The request was sent but no complete response came back
+        """
+        headers = {"Host": "docker"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        connection = _UnixHTTPConnection(self.socket_path, timeout or self.timeout)
+        try:
+            try:
+                connection.connect()
+            except OSError as e:
+                raise DockerEngineError(f"Docker API connect failed: {e}") from e
+            try:
+                connection.request(method, self._path(path, params), body=payload, headers=headers)
+                response = connection.getresponse()
+                return response.status, response.read()
+            except (OSError, http.client.HTTPException) as e:
+                raise DockerEngineSentError(f"Docker API {method} {path} failed after it was sent: {e}") from e
+        finally:
+            connection.close()
+
+    def close(self) -> None:
+        """Close the persistent connection"""
+        with self._lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+
+    def ping(self) -> bool:
+        """Check that the daemon answers"""
+        try:
+            status, _ = self._request("GET", "/_ping")
+            return status == 200
+        except DockerEngineError:
+            return False
+
+    def version(self) -> dict:
+        """GET /version (daemon version and ApiVersion)"""
+        return self._json("GET", "/version")
+
+    def list_containers(self, all_containers: bool = False, filters: Optional[Dict[str, List[str]]] = None) -> List[dict]:
+        """GET /containers/json"""
+        params: Dict[str, Any] = {"all": "1" if all_containers else "0"}
+        if filters:
+            params["filters"] = json.dumps(filters)
+        return self._json("GET", "/containers/json", params)
+
+    def inspect(self, name: str) -> Optional[dict]:
+        """GET /containers/{name}/json (None if container doesn't exist)"""
+        try:
+            return self._json("GET", f"/containers/{urllib.parse.quote(name)}/json")
+        except DockerEngineError as e:
+            if " 404 " in str(e):
+                return None
+            raise
+
+    def inspect_image(self, image: str) -> Optional[dict]:
+        """GET /images/{image}/json (None if the image is not present)"""
+        try:
+            return self._json("GET", f"/images/{urllib.parse.quote(image, safe='')}/json")
+        except DockerEngineError as e:
+            if " 404 " in str(e):
+                return None
+            raise
+
+    def logs(self, name: str, tail: int = 50) -> str:
+        """GET /containers/{name}/logs (stdout and stderr interleaved by stream)"""
+        status, data = self._request(
+            "GET", f"/containers/{urllib.parse.quote(name)}/logs",
+            {"stdout": "1", "stderr": "1", "tail": str(tail)},
+        )
+        if status != 200:
+            raise DockerEngineError(f"Cannot get logs for {name}: {status}")
+        stdout, stderr = demux_stream(data)
+        return stdout + stderr
+
+    def stats(self, name: str, one_shot: bool = False) -> dict:
+        """
+        GET /containers/{name}/stats snapshot
+
+        The daemon samples twice, a second apart, to fill precpu_stats; with
+        one_shot it answers at once (counters only, precpu_stats empty).
+        """
+        params = {"stream": "0"}
+        if one_shot:
+            params["one-shot"] = "1"
+        return self._json("GET", f"/containers/{urllib.parse.quote(name)}/stats", params)
+
+    def kill(self, name: str, signal: str = "SIGKILL") -> None:
+        """POST /containers/{name}/kill (send a signal to the main process)"""
+        self._json("POST", f"/containers/{urllib.parse.quote(name)}/kill", {"signal": signal}, expected=(204,))
+
+    def remove(self, name: str, force: bool = True) -> None:
+        """DELETE /containers/{name} (missing container is not an error)"""
+        self._json("DELETE", f"/containers/{urllib.parse.quote(name)}", {"force": "1" if force else "0"},
+                   expected=(204, 404))
+
+    def restart(self, name: str, stop_timeout: int = 10) -> None:
+        """POST /containers/{name}/restart (waits up to stop_timeout for a clean stop)"""
+        status, data = self._send_once(
+            "POST", f"/containers/{urllib.parse.quote(name)}/restart", {"t": str(stop_timeout)},
+            timeout=stop_timeout + self.timeout,
+        )
+        if status != 204:
+            raise DockerError(f"Cannot restart {name}: {status} {data[:200]!r}")
+
+    def exec(self, name: str, command: List[str], timeout: float = DOCKER_TIMEOUT) -> Tuple[int, str, str]:
+        """
+        Run a command in a container (create, start attached, inspect exit code)
+
+        Returns:
+            Tuple of (exit_code, stdout, stderr)
+
+        Raises:
+            DockerEngineError: Before the command was started (safe to retry with the CLI)
+            DockerError: Once start was sent (the command may have run)
+        """
+        created = self._json(
+            "POST", f"/containers/{urllib.parse.quote(name)}/exec",
+            body={"Cmd": command, "AttachStdout": True, "AttachStderr": True, "Tty": False},
+            expected=(201,),
+        )
+        exec_id = created["Id"]
+        # Attached start hijacks the connection - use a dedicated one
+        status, data = self._send_once("POST", f"/exec/{exec_id}/start", body={"Detach": False, "Tty": False},
+                                       timeout=timeout)
+        if status != 200:
+            raise DockerError(f"Cannot start exec in {name}: {status}")
+        stdout, stderr = demux_stream(data)
+        try:
+            info = self._json("GET", f"/exec/{exec_id}/json")
+        except DockerEngineError as e:
+            raise DockerEngineSentError(f"Exec in {name} ran, exit code unknown: {e}") from e
+        return int(info.get("ExitCode") or 0), stdout, stderr
+
+    def events(self, filters: Dict[str, List[str]], since: Optional[str] = None) -> EventStream:
+        """GET /events as a stream (dedicated connection, no timeout)"""
+        params: Dict[str, Any] = {"filters": json.dumps(filters)}
+        if since:
+            params["since"] = since
+        connection = _UnixHTTPConnection(self.socket_path, timeout=None)
+        try:
+            connection.request("GET", self._path("/events", params), headers={"Host": "docker"})
+            response = connection.getresponse()
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            raise DockerEngineError(f"Cannot subscribe to events: {e}") from e
+        if response.status != 200:
+            connection.close()
+            raise DockerEngineError(f"Cannot subscribe to events: {response.status}")
+        return EventStream(connection, response)
+
+
+_HEALTH_RE = re.compile(r"\((healthy|unhealthy|health: starting)\)")
+_EXIT_RE = re.compile(r"Exited \((-?\d+)\)")
+
+
+def container_to_compose_ps(container: dict) -> dict:
+    """Convert an API container summary to the `docker compose ps --format json` shape"""
+    labels = container.get("Labels") or {}
+    status = container.get("Status") or ""
+    health_match = _HEALTH_RE.search(status)
+    health = health_match.group(1).replace("health: ", "") if health_match else ""
+    exit_match = _EXIT_RE.search(status)
+    names = container.get("Names") or []
+    return {
+        "ID": container.get("Id", "")[:12],
+        "Name": names[0].lstrip("/") if names else "",
+        "Project": labels.get("com.docker.compose.project", ""),
+        "Service": labels.get("com.docker.compose.service", ""),
+        "State": container.get("State", ""),
+        "Health": health,
+        "ExitCode": int(exit_match.group(1)) if exit_match else 0,
+        "Status": status,
+    }
+
+
+def memory_usage_mb(stats: dict) -> Optional[float]:
+    """Container memory usage as shown by `docker stats` (usage minus inactive page cache)"""
+    memory = stats.get("memory_stats") or {}
+    usage = memory.get("usage")
+    if usage is None:
+        return None
+    details = memory.get("stats") or {}
+    cache = details.get("inactive_file", details.get("total_inactive_file", 0))
+    return (usage - cache) / (1024 * 1024)
+
+
+_engine: Optional[DockerEngineClient] = None
+_engine_checked = False
+
+
+def get_engine_client() -> Optional[DockerEngineClient]:
+    """
+    Get the shared engine client for the selected backend
+
+    AI_GATEWAY_DOCKER_BACKEND: "auto" (default, engine if the socket answers),
+    "engine" (same, logged as forced) or "cli" (never use the socket).
+
+    Returns:
+        DockerEngineClient, or None to use the CLI
+    """
+    global _engine, _engine_checked
+    if _engine_checked:
+        return _engine
+    _engine_checked = True
+
+    backend = os.environ.get(DOCKER_BACKEND_ENV, "auto").strip().lower()
+    if backend == "cli":
+        return None
+    socket_path = find_docker_socket()
+    if socket_path is None:
+        logger.debug("Docker socket not found, using CLI backend")
+        return None
+    client = DockerEngineClient(socket_path)
+    if not client.ping():
+        logger.debug(f"Docker socket {socket_path} does not answer, using CLI backend")
+        return None
+    logger.debug(f"Using Docker Engine API at {socket_path}")
+    _engine = client
+    return _engine
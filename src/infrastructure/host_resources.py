@@ -0,0 +1,175 @@
+"""
+Host resource detection (CPU, memory, cgroup v2 limits)
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Optional, Set
+from ..core.sizing import HostResources
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROC_MEMINFO = Path("/proc/meminfo")
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def read_meminfo(path: Path = PROC_MEMINFO) -> Dict[str, int]:
+    """
+    Read /proc/meminfo
+
+    Returns:
+        Dictionary of field name -> value in kB (empty if unavailable)
+    """
+    values: Dict[str, int] = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if ":" not in line:
+                    continue
+                key, rest = line.split(":", 1)
+                parts = rest.split()
+                if parts and parts[0].isdigit():
+                    values[key.strip()] = int(parts[0])
+    except (IOError, OSError) as e:
+        logger.debug(f"Cannot read {path}: {e}")
+    return values
+
+
+def _own_cgroup_dir(cgroup_root: Path = CGROUP_ROOT) -> Optional[Path]:
+    """Return the cgroup v2 directory of the current process (None if not cgroup v2)"""
+    if not (cgroup_root / "cgroup.controllers").exists():
+        return None
+    try:
+        with open("/proc/self/cgroup", "r", encoding="utf-8") as f:
+            for line in f:
+                # cgroup v2 entry has the form "0::/path"
+                if line.startswith("0::"):
+                    relative = line.strip()[3:].lstrip("/")
+                    return cgroup_root / relative if relative else cgroup_root
+    except (IOError, OSError) as e:
+        logger.debug(f"Cannot read /proc/self/cgroup: {e}")
+    return cgroup_root
+
+
+def read_cgroup_memory_limit(cgroup_dir: Optional[Path]) -> Optional[int]:
+    """
+    Read the tightest memory.max limit from the cgroup v2 hierarchy
+
+    Returns:
+        Limit in MB, or None if unlimited/unavailable
+    """
+    limit_mb: Optional[int] = None
+    current = cgroup_dir
+    while current is not None and CGROUP_ROOT in (current, *current.parents):
+        memory_max = current / "memory.max"
+        try:
+            value = memory_max.read_text(encoding="utf-8").strip()
+            if value and value != "max":
+                mb = int(value) // (1024 * 1024)
+                limit_mb = mb if limit_mb is None else min(limit_mb, mb)
+        except (IOError, OSError, ValueError):
+            pass
+        if current == CGROUP_ROOT:
+            break
+        current = current.parent
+    return limit_mb
+
+
+def read_cgroup_cpu_limit(cgroup_dir: Optional[Path]) -> Optional[float]:
+    """
+    Read cpu.max quota from the cgroup v2 hierarchy
+
+    Returns:
+        Number of CPUs allowed by the quota, or None if unlimited/unavailable
+    """
+    if cgroup_dir is None:
+        return None
+    try:
+        quota, period = (cgroup_dir / "cpu.max").read_text(encoding="utf-8").split()
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def delegated_controllers(cgroup_root: Path = CGROUP_ROOT) -> Optional[Set[str]]:
+    """
+    Get cgroup v2 controllers available to containers
+
+    Rootful Docker gets all controllers of the root cgroup.
+    Rootless Docker only gets the controllers delegated to the user session
+    (systemd user@UID.service), other resource settings are ignored.
+
+    Returns:
+        Set of controller names, or None on cgroup v1
+    """
+    controllers_file = cgroup_root / "cgroup.controllers"
+    if not controllers_file.exists():
+        return None
+    if hasattr(os, "geteuid") and os.geteuid() != 0:
+        uid = os.geteuid()
+        controllers_file = (
+            cgroup_root / "user.slice" / f"user-{uid}.slice"
+            / f"user@{uid}.service" / "cgroup.controllers"
+        )
+    try:
+        return set(controllers_file.read_text(encoding="utf-8").split())
+    except (IOError, OSError):
+        return set()
+
+
+def memory_controller_delegated(cgroup_root: Path = CGROUP_ROOT) -> bool:
+    """
+    Check whether memory limits can be enforced for containers
+
+    Rootful Docker on cgroup v2 always has the memory controller.
+    Rootless Docker needs the memory controller delegated to the user session
+    (systemd user@UID.service), otherwise deploy.resources limits are ignored.
+    """
+    controllers = delegated_controllers(cgroup_root)
+    if controllers is None:
+        # cgroup v1 - limits work for rootful Docker only
+        return os.geteuid() == 0 if hasattr(os, "geteuid") else False
+    return "memory" in controllers
+
+
+def detect_host_resources() -> HostResources:
+    """
+    Detect CPU count, physical memory and cgroup v2 limits of the host
+
+    Returns:
+        HostResources with detected values (falls back to os.cpu_count only
+        on platforms without /proc, e.g. macOS and Windows)
+    """
+    try:
+        cpu_ids = sorted(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpu_ids = list(range(os.cpu_count() or 1))
+    cpu_count = len(cpu_ids)
+
+    meminfo = read_meminfo()
+    total_mb = meminfo.get("MemTotal", 0) // 1024 or None
+    available_mb = meminfo.get("MemAvailable", 0) // 1024 or None
+
+    cgroup_dir = _own_cgroup_dir()
+    cgroup_memory_mb = read_cgroup_memory_limit(cgroup_dir)
+    cgroup_cpus = read_cgroup_cpu_limit(cgroup_dir)
+    controllers = delegated_controllers()
+    rootful = os.geteuid() == 0 if hasattr(os, "geteuid") else False
+
+    host = HostResources(
+        cpu_count=cpu_count,
+        memory_total_mb=total_mb,
+        memory_available_mb=available_mb,
+        cgroup_version=2 if cgroup_dir is not None else (1 if CGROUP_ROOT.exists() else None),
+        cgroup_memory_limit_mb=cgroup_memory_mb,
+        cgroup_cpu_limit=cgroup_cpus,
+        memory_limits_supported=memory_controller_delegated(),
+        cpu_ids=cpu_ids,
+        cpu_limits_supported=rootful if controllers is None else "cpu" in controllers,
+        cpuset_supported=rootful if controllers is None else "cpuset" in controllers,
+    )
+    logger.debug(f"Detected host resources: {host}")
+    return host
@@ -1,11 +1,36 @@
 """
 Structured logging setup
+
+Two modes: handlers write inline (interactive commands), or log calls only
+put the record on a queue and a listener thread formats and writes it
+(daemons: supervise, the metrics exporter, replay). Files rotate by size;
+JSON output has one object per line with the fields passed as `extra`.
 """
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from ..core.constants import LOG_MAX_BYTES, LOG_BACKUP_COUNT
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+# Queue listeners by logger name (None = the process-wide one of configure_logging)
+_listeners: Dict[Optional[str], logging.handlers.QueueListener] = {}
+_listeners_lock = threading.Lock()
+# Handlers shared by every logger from get_logger after configure_logging
+_shared_handlers: List[logging.Handler] = []
+_shared_level = logging.INFO
+# Loggers set up by get_logger (re-attached by configure_logging)
+_managed_loggers: List[str] = []
 
 
 class ColoredFormatter(logging.Formatter):
@@ -21,40 +46,69 @@ class ColoredFormatter(logging.Formatter):
     RESET = '\033[0m'
     
     def format(self, record: logging.LogRecord) -> str:
+        # Copy: the record goes on to other handlers (file) without colors
+        record = copy.copy(record)
         log_color = self.COLORS.get(record.levelname, '')
         record.levelname = f"{log_color}{record.levelname}{self.RESET}"
         return super().format(record)
 
 
-def setup_logger(
-    name: str = "ai_gateway",
-    level: int = logging.INFO,
-    log_file: Optional[Path] = None,
-    use_colors: bool = True
-) -> logging.Logger:
-    """
-    Setup structured logger
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and `extra` fields"""
     
-    Args:
-        name: Logger name
-        level: Logging level
-        log_file: Optional log file path
-        use_colors: Use colored output for console
-    
-    Returns:
-        Configured logger
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
+    QueueHandler that leaves formatting to the listener
     
-    # Remove existing handlers
-    logger.handlers.clear()
+    The caller's thread only merges the message arguments (they may change
+    after the call) and renders a traceback; the formatters run in the
+    listener thread.
+    """
     
-    # Console handler
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _build_handlers(
+    level: int,
+    log_file: Optional[Path],
+    use_colors: bool,
+    json_format: bool,
+    max_bytes: int,
+    backup_count: int,
+) -> List[logging.Handler]:
+    """Console handler and, with log_file, a size-rotated file handler (DEBUG)"""
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     
-    if use_colors and sys.stdout.isatty():
+    if json_format:
+        formatter: logging.Formatter = JsonFormatter()
+    elif use_colors and sys.stdout.isatty():
         formatter = ColoredFormatter(
             '%(message)s',  # Just message, no level prefix for cleaner output
             datefmt='%Y-%m-%d %H:%M:%S'
@@ -66,28 +120,160 @@ def setup_logger(
         )
     
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers: List[logging.Handler] = [console_handler]
     
-    # File handler (if specified)
     if log_file:
         log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
+        # Rotated by size: log_file, log_file.1 ... log_file.<backup_count>
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
         )
+        file_handler.setLevel(logging.DEBUG)
+        if json_format:
+            file_formatter: logging.Formatter = JsonFormatter()
+        else:
+            file_formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            )
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    return handlers
+
+
+def _stop_listener(key: Optional[str]) -> None:
+    """Stop the listener of a logger (after writing out its queue), if it has one"""
+    with _listeners_lock:
+        listener = _listeners.pop(key, None)
+    if listener is not None:
+        listener.stop()
+
+
+def _start_listener(key: Optional[str], handlers: List[logging.Handler]) -> logging.Handler:
+    """Start a listener thread writing to handlers; returns the handler that feeds it"""
+    _stop_listener(key)
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    with _listeners_lock:
+        _listeners[key] = listener
+    listener.start()
+    return _QueueHandler(log_queue)
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the listener threads (also runs at exit)"""
+    with _listeners_lock:
+        listeners = list(_listeners.values())
+        _listeners.clear()
+    for listener in listeners:
+        listener.stop()
+
+
+atexit.register(stop_logging)
+
+
+def setup_logger(
+    name: str = "ai_gateway",
+    level: int = logging.INFO,
+    log_file: Optional[Path] = None,
+    use_colors: bool = True,
+    queued: bool = False,
+    json_format: bool = False,
+    max_bytes: int = LOG_MAX_BYTES,
+    backup_count: int = LOG_BACKUP_COUNT,
+) -> logging.Logger:
+    """
+    Setup structured logger
+    
+    Args:
+        name: Logger name
+        level: Logging level (console; the log file gets DEBUG)
+        log_file: Optional log file path, rotated at max_bytes
+        use_colors: Use colored output for console
+        queued: Log calls only enqueue the record; a listener thread writes it
+        json_format: One JSON object per line instead of text
+        max_bytes: Log file size that triggers rotation
+        backup_count: Rotated log files kept
+    
+    Returns:
+        Configured logger
+    """
+    logger = logging.getLogger(name)
+    # DEBUG records are only created when a log file will take them
+    logger.setLevel(logging.DEBUG if log_file else level)
+    
+    # Remove existing handlers
+    logger.handlers.clear()
+    
+    handlers = _build_handlers(level, log_file, use_colors, json_format, max_bytes, backup_count)
+    if queued:
+        logger.addHandler(_start_listener(name, handlers))
+    else:
+        _stop_listener(name)
+        for handler in handlers:
+            logger.addHandler(handler)
     
     return logger
 
 
+def configure_logging(
+    level: int = logging.INFO,
+    log_file: Optional[Path] = None,
+    queued: bool = True,
+    json_format: bool = False,
+    max_bytes: int = LOG_MAX_BYTES,
+    backup_count: int = LOG_BACKUP_COUNT,
+) -> None:
+    """
+    Process-wide logging for long-running commands
+    
+    Every logger from get_logger (also the ones created at import time) is
+    switched to one shared set of handlers, behind a single queue and
+    listener thread when queued.
+    
+    Args:
+        level: Console logging level
+        log_file: Optional log file path (DEBUG and up), rotated at max_bytes
+        queued: Log calls only enqueue the record (default)
+        json_format: One JSON object per line on console and in the file
+        max_bytes: Log file size that triggers rotation
+        backup_count: Rotated log files kept
+    """
+    global _shared_level
+    
+    handlers = _build_handlers(level, log_file, not json_format, json_format, max_bytes, backup_count)
+    if queued:
+        handlers = [_start_listener(None, handlers)]
+    else:
+        _stop_listener(None)
+    _shared_handlers[:] = handlers
+    _shared_level = logging.DEBUG if log_file else level
+    for name in _managed_loggers:
+        _attach_shared(logging.getLogger(name))
+
+
+def logging_configured() -> bool:
+    """Whether configure_logging is active (daemons then route console messages through it)"""
+    return bool(_shared_handlers)
+
+
+def _attach_shared(logger: logging.Logger) -> None:
+    logger.handlers.clear()
+    logger.setLevel(_shared_level)
+    for handler in _shared_handlers:
+        logger.addHandler(handler)
+
+
 def get_logger(name: str = "ai_gateway") -> logging.Logger:
     """Get logger instance"""
     logger = logging.getLogger(name)
     # If logger has no handlers, set it up
     if not logger.handlers:
-        logger = setup_logger(name, level=logging.INFO, use_colors=True)
+        if _shared_handlers:
+            _attach_shared(logger)
+        else:
+            logger = setup_logger(name, level=logging.INFO, use_colors=True)
+        _managed_loggers.append(name)
     return logger
 
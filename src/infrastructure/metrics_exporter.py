@@ -0,0 +1,625 @@
+"""
+Prometheus exporter for the gateway stack (the metrics-exporter compose service)
+
+Sources are read in background threads, never by a scrape:
+
+- the JSON access log nginx writes for API requests (`metrics` log_format) is
+  tailed from where the previous pass stopped into per-route latency
+  histograms and per-key accounting (GET /top-keys); the exporter rotates it
+  (rename + `nginx -s reopen`) once read;
+- nginx stub_status, CPU and memory of every container of the compose
+  project (Docker Engine API) and PostgreSQL connection counts are polled
+  every METRICS_REFRESH_INTERVAL_S.
+
+A scrape formats what is in memory, so it costs the same whatever the traffic.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+from ..core.constants import (
+    METRICS_EXPORTER_PORT, METRICS_LOG_MAX_BYTES, METRICS_LOG_MAX_READ_BYTES, METRICS_TAIL_INTERVAL_S,
+    METRICS_REFRESH_INTERVAL_S, METRICS_LATENCY_BUCKETS_S, TOP_KEYS_DEFAULT_LIMIT
+)
+from ..core.exceptions import DockerError
+from ..core.key_accounting import KeyAccounting
+from ..infrastructure.docker_engine import DockerEngineClient, find_docker_socket, memory_usage_mb
+from ..infrastructure.logger import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+API_PREFIX = "/api/litellm/"
+# Route label values (bounded: anything else is "other")
+API_ROUTES = (
+    "chat/completions", "completions", "embeddings", "responses", "messages", "models", "audio",
+    "images", "moderations", "files", "fine-tunes", "assistants", "threads", "runs",
+)
+COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
+COMPOSE_SERVICE_LABEL = "com.docker.compose.service"
+POSTGRES_QUERY = (
+    "SELECT coalesce(datname, ''), coalesce(state, 'unknown'), count(*) FROM pg_stat_activity "
+    "WHERE backend_type = 'client backend' GROUP BY 1, 2"
+)
+
+# Metric family: name -> (type, help, [(labels, value)])
+Samples = List[Tuple[Dict[str, str], float]]
+Families = Dict[str, Tuple[str, str, Samples]]
+
+
+def route_class(request_uri: str) -> str:
+    """Route label of an API request URI ("chat/completions", "deployments", ...)"""
+    path = request_uri.split("?", 1)[0]
+    if not path.startswith(API_PREFIX):
+        return "other"
+    rest = path[len(API_PREFIX):]
+    if rest == "health" or rest.startswith("health/"):
+        return "health"
+    if not rest.startswith("v1/"):
+        return "other"
+    rest = rest[len("v1/"):]
+    if rest.startswith("openai/deployments/"):
+        return "deployments"
+    for route in API_ROUTES:
+        if rest == route or rest.startswith(route + "/"):
+            return route
+    return "other"
+
+
+def status_class(status: str) -> str:
+    """Status label ("2xx", "4xx", ...); 499 (client closed) is kept apart from other 4xx"""
+    if status == "499":
+        return "499"
+    if len(status) == 3 and status.isdigit():
+        return f"{status[0]}xx"
+    return "unknown"
+
+
+def upstream_seconds(value: str) -> Optional[float]:
+    """Total of $upstream_response_time ("0.012", "0.5, 0.012" after a retry, "-")"""
+    total, found = 0.0, False
+    for part in value.replace(":", ",").split(","):
+        try:
+            total += float(part.strip())
+            found = True
+        except ValueError:
+            continue
+    return total if found else None
+
+
+def parse_stub_status(text: str) -> Dict[str, int]:
+    """
+    Parse nginx stub_status output
+
+    Returns:
+        Dict with active, accepts, handled, requests, reading, writing, waiting
+    """
+    lines = [line.split() for line in text.strip().splitlines()]
+    try:
+        accepts, handled, requests = (int(v) for v in lines[2][:3])
+        counters = dict(zip(lines[3][0::2], lines[3][1::2]))
+        return {
+            "active": int(lines[0][2]),
+            "accepts": accepts,
+            "handled": handled,
+            "requests": requests,
+            "reading": int(counters["Reading:"]),
+            "writing": int(counters["Writing:"]),
+            "waiting": int(counters["Waiting:"]),
+        }
+    except (IndexError, KeyError, ValueError) as e:
+        raise ValueError(f"Unexpected stub_status output: {text[:80]!r}") from e
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """Cumulative latency histogram (Prometheus buckets)"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(METRICS_LATENCY_BUCKETS_S)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(METRICS_LATENCY_BUCKETS_S):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+    def samples(self, name: str, labels: Dict[str, str]) -> List[str]:
+        lines = [
+            f"{name}_bucket{_format_labels(dict(labels, le=repr(bound)))} {count}"
+            for bound, count in zip(METRICS_LATENCY_BUCKETS_S, self.counts)
+        ]
+        lines.append(f"{name}_bucket{_format_labels(dict(labels, le='+Inf'))} {self.count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(round(self.total, 6))}")
+        lines.append(f"{name}_count{_format_labels(labels)} {self.count}")
+        return lines
+
+
+class LogTailer:
+    """
+    Follow a log file across truncation and rotation, from the last position
+
+    The first open starts at the end of the file (history was never counted
+    and is not rescanned); files that appear later are read from the start.
+    """
+
+    def __init__(self, path: Path, rotate: Optional[Callable[[], bool]] = None,
+                 rotate_bytes: int = METRICS_LOG_MAX_BYTES):
+        """
+        Initialize tailer
+
+        Args:
+            path: Log file
+            rotate: Makes the writer reopen the file (nginx -s reopen); called after
+                the file was renamed to <path>.1. Without it the log is not rotated.
+            rotate_bytes: Rotate once this much has been read
+        """
+        self.path = Path(path)
+        self.rotate = rotate
+        self.rotate_bytes = rotate_bytes
+        self.rotations = 0
+        self._file = None
+        self._inode: Optional[int] = None
+        self._partial = b""
+        self._started = False
+
+    def _open(self) -> bool:
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        if not self._started:
+            f.seek(0, os.SEEK_END)
+        self._started = True
+        self._file, self._inode, self._partial = f, os.fstat(f.fileno()).st_ino, b""
+        return True
+
+    def _rotate(self) -> None:
+        rotated = self.path.with_name(self.path.name + ".1")
+        os.replace(self.path, rotated)
+        if self.rotate():
+            self.rotations += 1
+            return
+        # Writer still has the renamed file open - put it back
+        os.replace(rotated, self.path)
+
+    def poll(self, on_line: Callable[[bytes], None], max_bytes: int = METRICS_LOG_MAX_READ_BYTES) -> int:
+        """
+        Hand complete new lines to on_line
+
+        Returns:
+            Bytes read (max_bytes: more is waiting)
+        """
+        if self._file is None and not self._open():
+            self._started = True
+            return 0
+        data = self._file.read(max_bytes)
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            if line:
+                on_line(line)
+        if len(data) == max_bytes:
+            return len(data)
+
+        # At the end of the open file: was it replaced, truncated or is it due for rotation?
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            # Renamed and the writer has not reopened yet: keep following the old file
+            return len(data)
+        if current.st_ino != self._inode:
+            rest = self._file.read()
+            for line in (self._partial + rest).split(b"\n"):
+                if line:
+                    on_line(line)
+            self._file.close()
+            self._file, self._partial = None, b""
+            return len(data) + len(rest)
+        if current.st_size < self._file.tell():
+            self._file.seek(0)
+            self._partial = b""
+        elif self.rotate and self._file.tell() >= self.rotate_bytes:
+            try:
+                self._rotate()
+            except OSError as e:
+                logger.warning(f"Cannot rotate {self.path}: {e}")
+        return len(data)
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class MetricsState:
+    """Everything a scrape returns, updated by the collector threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str], Histogram] = {}
+        self.upstream: Dict[str, Histogram] = {}
+        self.response_bytes: Dict[str, int] = {}
+        self.log_lines = 0
+        self.log_bad_lines = 0
+        self.sources: Dict[str, Families] = {}
+        self.source_up: Dict[str, Tuple[int, float]] = {}
+        self.keys = KeyAccounting()
+
+    def observe_log_line(self, line: bytes) -> None:
+        """Count one line of the metrics access log"""
+        try:
+            record = json.loads(line)
+            route = route_class(record["uri"])
+            status = status_class(str(record["status"]))
+            duration = float(record["request_time"])
+            upstream = upstream_seconds(str(record.get("upstream_time") or ""))
+            sent = int(record.get("bytes") or 0)
+        except (ValueError, KeyError, TypeError):
+            with self._lock:
+                self.log_bad_lines += 1
+            return
+        with self._lock:
+            self.log_lines += 1
+            histogram = self.requests.get((route, status))
+            if histogram is None:
+                histogram = self.requests[(route, status)] = Histogram()
+            histogram.observe(duration)
+            if upstream is not None:
+                if route not in self.upstream:
+                    self.upstream[route] = Histogram()
+                self.upstream[route].observe(upstream)
+            self.response_bytes[route] = self.response_bytes.get(route, 0) + sent
+            self.keys.observe_record(record)
+
+    def set_source(self, source: str, families: Optional[Families], duration: float) -> None:
+        """Replace the families of a polled source (None: the source failed, its values are dropped)"""
+        with self._lock:
+            self.sources[source] = families or {}
+            self.source_up[source] = (1 if families is not None else 0, duration)
+
+    def top_keys(self, limit: int, order: str) -> Dict:
+        """Snapshot of the per-key accounting"""
+        with self._lock:
+            return self.keys.snapshot(limit, order)
+
+    def render(self, extra: Optional[Families] = None) -> str:
+        """Prometheus text exposition format"""
+        out: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: Samples) -> None:
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                out.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        with self._lock:
+            name = "gateway_http_request_duration_seconds"
+            out.append(f"# HELP {name} API request time at nginx (first byte in to last byte out)")
+            out.append(f"# TYPE {name} histogram")
+            for (route, status), histogram in sorted(self.requests.items()):
+                out.extend(histogram.samples(name, {"route": route, "status": status}))
+            name = "gateway_http_upstream_duration_seconds"
+            out.append(f"# HELP {name} Time LiteLLM took to answer (all attempts)")
+            out.append(f"# TYPE {name} histogram")
+            for route, histogram in sorted(self.upstream.items()):
+                out.extend(histogram.samples(name, {"route": route}))
+            family("gateway_http_response_bytes_total", "counter", "Bytes sent to API clients",
+                   [({"route": route}, sent) for route, sent in sorted(self.response_bytes.items())])
+            for families in list(self.sources.values()) + [extra or {}]:
+                for name, (kind, help_text, samples) in families.items():
+                    family(name, kind, help_text, samples)
+            for what in ("keys", "models", "agents"):
+                family(f"gateway_distinct_{what}", "gauge", f"Distinct API {what} seen (HyperLogLog estimate)",
+                       [({}, getattr(self.keys, f"distinct_{what}").count())])
+            family("gateway_exporter_tracked_keys", "gauge", "Keys with per-key accounting in memory",
+                   [({}, len(self.keys.keys))])
+            family("gateway_exporter_log_lines_total", "counter", "Access log lines counted", [({}, self.log_lines)])
+            family("gateway_exporter_log_bad_lines_total", "counter", "Access log lines that could not be parsed",
+                   [({}, self.log_bad_lines)])
+            family("gateway_exporter_source_up", "gauge", "Whether the last poll of a source succeeded",
+                   [({"source": source}, up) for source, (up, _) in sorted(self.source_up.items())])
+            family("gateway_exporter_source_duration_seconds", "gauge", "Time the last poll of a source took",
+                   [({"source": source}, round(duration, 6)) for source, (_, duration) in sorted(self.source_up.items())])
+        return "\n".join(out) + "\n"
+
+
+def collect_nginx(status_url: str) -> Families:
+    """nginx connection and request counters from stub_status"""
+    with urllib.request.urlopen(status_url, timeout=5) as response:
+        status = parse_stub_status(response.read().decode("utf-8", errors="replace"))
+    return {
+        "nginx_connections_active": ("gauge", "Open client connections", [({}, status["active"])]),
+        "nginx_connections_reading": ("gauge", "Connections reading the request header", [({}, status["reading"])]),
+        "nginx_connections_writing": ("gauge", "Connections writing the response", [({}, status["writing"])]),
+        "nginx_connections_waiting": ("gauge", "Idle keep-alive connections", [({}, status["waiting"])]),
+        "nginx_connections_accepted_total": ("counter", "Accepted client connections", [({}, status["accepts"])]),
+        "nginx_connections_handled_total": ("counter", "Handled client connections", [({}, status["handled"])]),
+        "nginx_http_requests_total": ("counter", "Client requests", [({}, status["requests"])]),
+    }
+
+
+def collect_containers(engine: DockerEngineClient, project: Optional[str]) -> Families:
+    """CPU and memory of the running containers of the compose project"""
+    filters = {"label": [f"{COMPOSE_PROJECT_LABEL}={project}"]} if project else None
+    cpu: Samples = []
+    memory: Samples = []
+    limit: Samples = []
+    for container in engine.list_containers(filters=filters):
+        names = container.get("Names") or []
+        name = names[0].lstrip("/") if names else container.get("Id", "")[:12]
+        labels = {"container": name, "service": (container.get("Labels") or {}).get(COMPOSE_SERVICE_LABEL, "")}
+        try:
+            stats = engine.stats(container["Id"], one_shot=True)
+        except DockerError as e:
+            # Stopped between list and stats
+            logger.debug(f"No stats for {name}: {e}")
+            continue
+        usage = ((stats.get("cpu_stats") or {}).get("cpu_usage") or {}).get("total_usage")
+        if usage is not None:
+            cpu.append((labels, usage / 1e9))
+        used = memory_usage_mb(stats)
+        if used is not None:
+            memory.append((labels, round(used * 1024 * 1024)))
+        if (stats.get("memory_stats") or {}).get("limit"):
+            limit.append((labels, stats["memory_stats"]["limit"]))
+    return {
+        "container_cpu_usage_seconds_total": ("counter", "CPU time used by the container", cpu),
+        "container_memory_usage_bytes": ("gauge", "Memory in use (as docker stats: without inactive page cache)", memory),
+        "container_memory_limit_bytes": ("gauge", "Memory limit (host memory when unlimited)", limit),
+    }
+
+
+def collect_postgres(engine: DockerEngineClient, container: str) -> Families:
+    """PostgreSQL client connections by database and state (psql in the postgres container)"""
+    command = (
+        f'psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -tA -F "|" '
+        f'-c "{POSTGRES_QUERY}" -c "SHOW max_connections"'
+    )
+    exit_code, stdout, stderr = engine.exec(container, ["sh", "-c", command])
+    if exit_code != 0:
+        raise DockerError(f"psql failed: {stderr.strip()[:200]}")
+    connections: Samples = []
+    max_connections: Samples = []
+    for line in stdout.splitlines():
+        parts = line.strip().split("|")
+        if len(parts) == 3 and parts[2].isdigit():
+            connections.append(({"database": parts[0], "state": parts[1]}, int(parts[2])))
+        elif len(parts) == 1 and parts[0].isdigit():
+            max_connections.append(({}, int(parts[0])))
+    return {
+        "postgres_connections": ("gauge", "Client connections by database and state", connections),
+        "postgres_max_connections": ("gauge", "max_connections setting", max_connections),
+    }
+
+
+class MetricsExporter:
+    """Collector threads and the HTTP endpoint"""
+
+    def __init__(
+        self,
+        access_log: Optional[Path] = None,
+        nginx_status_url: Optional[str] = None,
+        nginx_container: Optional[str] = None,
+        postgres_container: Optional[str] = None,
+        refresh_interval: float = METRICS_REFRESH_INTERVAL_S,
+    ):
+        """
+        Initialize exporter (sources that are not given are skipped)
+
+        Args:
+            access_log: nginx metrics access log
+            nginx_status_url: nginx stub_status URL
+            nginx_container: nginx container, told to reopen the rotated log
+            postgres_container: PostgreSQL container (psql runs in it)
+            refresh_interval: Seconds between polls of nginx, Docker and PostgreSQL
+        """
+        self.state = MetricsState()
+        self.nginx_status_url = nginx_status_url
+        self.nginx_container = nginx_container
+        self.postgres_container = postgres_container
+        self.refresh_interval = refresh_interval
+        socket_path = find_docker_socket()
+        self.engine = DockerEngineClient(socket_path) if socket_path else None
+        self.project = self._compose_project()
+        rotate = self._reopen_nginx_log if self.engine and nginx_container else None
+        self.tailer = LogTailer(access_log, rotate) if access_log else None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _compose_project(self) -> Optional[str]:
+        """Compose project of this container (its hostname is the container ID)"""
+        if self.engine is None:
+            return None
+        try:
+            info = self.engine.inspect(socket.gethostname()) or {}
+        except DockerError as e:
+            logger.debug(f"Cannot inspect own container: {e}")
+            return None
+        return ((info.get("Config") or {}).get("Labels") or {}).get(COMPOSE_PROJECT_LABEL)
+
+    def _reopen_nginx_log(self) -> bool:
+        try:
+            # Exec rather than a USR1 kill: kill events read as stops to event watchers
+            exit_code, _, stderr = self.engine.exec(self.nginx_container, ["nginx", "-s", "reopen"])
+        except DockerError as e:
+            logger.warning(f"Cannot make {self.nginx_container} reopen its logs: {e}")
+            return False
+        if exit_code != 0:
+            logger.warning(f"nginx -s reopen in {self.nginx_container} failed: {stderr.strip()[:200]}")
+            return False
+        return True
+
+    def _tail_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                read = self.tailer.poll(self.state.observe_log_line)
+            except OSError as e:
+                logger.warning(f"Cannot read {self.tailer.path}: {e}")
+                read = 0
+            if read < METRICS_LOG_MAX_READ_BYTES:
+                self._stop.wait(METRICS_TAIL_INTERVAL_S)
+
+    def poll_sources(self) -> None:
+        """Poll nginx, Docker and PostgreSQL once"""
+        sources: List[Tuple[str, Callable[[], Families]]] = []
+        if self.nginx_status_url:
+            sources.append(("nginx", lambda: collect_nginx(self.nginx_status_url)))
+        if self.engine is not None:
+            sources.append(("docker", lambda: collect_containers(self.engine, self.project)))
+            if self.postgres_container:
+                sources.append(("postgres", lambda: collect_postgres(self.engine, self.postgres_container)))
+        for source, collect in sources:
+            started = time.monotonic()
+            try:
+                families = collect()
+            except (DockerError, ValueError, OSError, urllib.error.URLError) as e:
+                logger.warning(f"Cannot collect {source} metrics: {e}")
+                families = None
+            self.state.set_source(source, families, time.monotonic() - started)
+
+    def _poll_loop(self) -> None:
+        while not self._stop.is_set():
+            self.poll_sources()
+            self._stop.wait(self.refresh_interval)
+
+    def start(self) -> None:
+        """Start the collector threads"""
+        targets = [self._poll_loop] + ([self._tail_loop] if self.tailer else [])
+        for target in targets:
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stop the collector threads"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=10)
+        if self.tailer:
+            self.tailer.close()
+
+    def top_keys(self, limit: int = TOP_KEYS_DEFAULT_LIMIT, order: str = "time") -> Dict:
+        """Per-key accounting snapshot (GET /top-keys)"""
+        return self.state.top_keys(limit, order)
+
+    def render(self) -> str:
+        """Current metrics in the Prometheus text format"""
+        extra: Families = {}
+        if self.tailer:
+            extra["gateway_exporter_log_rotations_total"] = (
+                "counter", "Access log rotations", [({}, self.tailer.rotations)]
+            )
+        return self.state.render(extra)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics, /top-keys?limit=20&order=time and /health"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - BaseHTTPRequestHandler API
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body = self.server.exporter.render().encode("utf-8")
+            self._send(200, body, "text/plain; version=0.0.4; charset=utf-8")
+        elif path == "/top-keys":
+            query = parse_qs(self.path.partition("?")[2])
+            try:
+                limit = int(query.get("limit", [TOP_KEYS_DEFAULT_LIMIT])[0])
+                snapshot = self.server.exporter.top_keys(limit, query.get("order", ["time"])[0])
+            except ValueError as e:
+                self._send(400, f"{e}\n".encode("utf-8"), "text/plain")
+                return
+            self._send(200, json.dumps(snapshot).encode("utf-8"), "application/json")
+        elif path == "/health":
+            self._send(200, b"ok\n", "text/plain")
+        else:
+            self._send(404, b"not found\n", "text/plain")
+
+
+def _terminate(signum, frame) -> None:
+    # PID 1 in the container: SIGTERM has no default action there
+    raise KeyboardInterrupt
+
+
+def main() -> int:
+    """Serve in the foreground (the metrics-exporter compose service)"""
+    parser = argparse.ArgumentParser(description="Prometheus exporter for nginx, Docker and PostgreSQL")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=METRICS_EXPORTER_PORT)
+    parser.add_argument("--access-log", type=Path, default=None, help="nginx metrics access log")
+    parser.add_argument("--nginx-status", default=None, help="nginx stub_status URL")
+    parser.add_argument("--nginx-container", default=None, help="nginx container (log reopen on rotation)")
+    parser.add_argument("--postgres-container", default=None, help="PostgreSQL container")
+    parser.add_argument("--refresh", type=float, default=METRICS_REFRESH_INTERVAL_S,
+                        help="Seconds between polls of nginx, Docker and PostgreSQL")
+    parser.add_argument("--log-json", action="store_true", help="Log one JSON object per line")
+    options = parser.parse_args()
+    # Tail and poll threads log through a queue, never waiting on stdout
+    configure_logging(json_format=options.log_json)
+
+    exporter = MetricsExporter(
+        access_log=options.access_log,
+        nginx_status_url=options.nginx_status,
+        nginx_container=options.nginx_container,
+        postgres_container=options.postgres_container,
+        refresh_interval=options.refresh,
+    )
+    if exporter.engine is None:
+        print("Docker socket not found - container and PostgreSQL metrics are disabled", flush=True)
+    server = ThreadingHTTPServer((options.host, options.port), _MetricsHandler)
+    server.daemon_threads = True
+    server.exporter = exporter
+    signal.signal(signal.SIGTERM, _terminate)
+    exporter.start()
+    print(f"Metrics exporter listening on {options.host}:{options.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        exporter.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
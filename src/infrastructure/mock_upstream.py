@@ -0,0 +1,475 @@
+"""
+Local mock LLM upstream (OpenAI- and Anthropic-compatible) for benchmarks
+
+Runs in-process for worker tuning and as the optional `mock-llm` compose
+service (`python -m src.infrastructure.mock_upstream`), so the whole
+nginx -> LiteLLM -> provider path can be load tested without provider keys.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import signal
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, fields, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+MOCK_MODEL_NAME = "mock-gpt"
+MOCK_ANTHROPIC_MODEL_NAME = "mock-claude"
+MOCK_EMBEDDING_MODEL_NAME = "mock-embedding"
+
+# Words of generated tokens (cycled, repeated or cut to token_chars)
+FILLER_WORDS = ("lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit")
+
+
+@dataclass
+class MockSettings:
+    """
+    Response shaping and fault injection
+
+    Read from MOCK_<FIELD> environment variables (MOCK_TTFT_MS=200) and
+    changeable at runtime with POST /mock/config ({"rate_429": 0.1}).
+    """
+    # Time to first token (non-streaming: added to the response time)
+    ttft_ms: float = 50.0
+    # Streaming pace after the first token; 0 = all tokens at once
+    tokens_per_s: float = 0.0
+    # Upper bound, requests with a lower max_tokens get fewer
+    completion_tokens: int = 32
+    # Payload size: characters per generated token
+    token_chars: int = 5
+    embedding_dim: int = 1536
+    # Fractions of requests answered with 429 (with Retry-After) and 5xx
+    rate_429: float = 0.0
+    retry_after_s: int = 1
+    rate_5xx: float = 0.0
+    status_5xx: int = 500
+
+    @classmethod
+    def from_env(cls, env: Optional[Dict[str, str]] = None) -> "MockSettings":
+        """Settings from MOCK_* environment variables (defaults for the rest)"""
+        env = os.environ if env is None else env
+        values = {
+            f.name: env[f"MOCK_{f.name.upper()}"]
+            for f in fields(cls)
+            if env.get(f"MOCK_{f.name.upper()}", "").strip()
+        }
+        return cls().update(values)
+
+    def update(self, values: Dict[str, Any]) -> "MockSettings":
+        """
+        Copy with some fields changed (values converted to the field types)
+
+        Raises:
+            ValueError: Unknown field or value that cannot be converted
+        """
+        types = {f.name: f.type for f in fields(self)}
+        unknown = set(values) - set(types)
+        if unknown:
+            raise ValueError(f"Unknown setting(s): {', '.join(sorted(unknown))}")
+        converted = {name: types[name](value) for name, value in values.items()}
+        for name in ("rate_429", "rate_5xx"):
+            if not 0.0 <= converted.get(name, 0.0) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+        return replace(self, **converted)
+
+
+def _token_text(index: int, chars: int) -> str:
+    """Generated token number `index` (leading space, like BPE word tokens)"""
+    word = FILLER_WORDS[index % len(FILLER_WORDS)]
+    return " " + (word * (chars // len(word) + 1))[:max(1, chars - 1)]
+
+
+def _estimate_tokens(value: Any) -> int:
+    """Rough prompt token count (4 characters per token)"""
+    return max(1, len(json.dumps(value)) // 4)
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    """Request handler - configuration is read from the server instance"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle the body waits
+    # for the client's delayed ACK (~40ms on every keep-alive response)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - BaseHTTPRequestHandler API
+        # Silence default stderr access log
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+        except json.JSONDecodeError:
+            return {}
+        return body if isinstance(body, dict) else {}
+
+    def _start_stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _send_event(self, data: Any, event: Optional[str] = None) -> None:
+        text = data if isinstance(data, str) else json.dumps(data)
+        raw = ((f"event: {event}\n" if event else "") + f"data: {text}\n\n").encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(raw), raw))
+        self.wfile.flush()
+
+    def _end_stream(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _injected_fault(self, settings: MockSettings, anthropic: bool) -> bool:
+        """Answer with an injected 429/5xx; True if the request is done"""
+        roll = self.server.roll()
+        if roll < settings.rate_429:
+            status, kind, headers = 429, "rate_limit_error", {"Retry-After": str(settings.retry_after_s)}
+        elif roll < settings.rate_429 + settings.rate_5xx:
+            status, kind, headers = settings.status_5xx, "api_error", {}
+        else:
+            return False
+        message = f"Injected {status} from mock upstream"
+        if anthropic:
+            payload = {"type": "error", "error": {"type": kind, "message": message}}
+        else:
+            payload = {"error": {"message": message, "type": kind, "code": status}}
+        self._send_json(status, payload, headers)
+        return True
+
+    def _token_schedule(self, settings: MockSettings, count: int) -> List[float]:
+        """Delay of each token after the request arrived, in seconds"""
+        first = settings.ttft_ms / 1000.0
+        step = 1.0 / settings.tokens_per_s if settings.tokens_per_s > 0 else 0.0
+        return [first + i * step for i in range(count)]
+
+    def _completion_length(self, request: dict, settings: MockSettings) -> int:
+        limit = request.get("max_tokens") or request.get("max_completion_tokens")
+        try:
+            return max(1, min(settings.completion_tokens, int(limit))) if limit else settings.completion_tokens
+        except (TypeError, ValueError):
+            return settings.completion_tokens
+
+    def _sleep_until(self, started: float, offset: float) -> None:
+        delay = started + offset - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path.endswith("/models"):
+            self._send_json(200, {
+                "object": "list",
+                "data": [
+                    {"id": name, "object": "model", "owned_by": "mock"}
+                    for name in (MOCK_MODEL_NAME, MOCK_ANTHROPIC_MODEL_NAME, MOCK_EMBEDDING_MODEL_NAME)
+                ],
+            })
+        elif path == "/mock/config":
+            self._send_json(200, asdict(self.server.settings))
+        else:
+            self._send_json(200, {"status": "ok"})
+
+    def do_POST(self) -> None:
+        started = time.monotonic()
+        request = self._read_body()
+        path = self.path.split("?", 1)[0].rstrip("/")
+        settings = self.server.settings
+        try:
+            if path == "/mock/config":
+                try:
+                    self.server.settings = settings.update(request)
+                except (ValueError, TypeError) as e:
+                    self._send_json(400, {"error": {"message": str(e)}})
+                    return
+                logger.info(f"Mock settings: {self.server.settings}")
+                self._send_json(200, asdict(self.server.settings))
+            elif path.endswith("/chat/completions"):
+                if not self._injected_fault(settings, anthropic=False):
+                    self._chat_completion(request, settings, started)
+            elif path.endswith("/messages"):
+                if not self._injected_fault(settings, anthropic=True):
+                    self._anthropic_message(request, settings, started)
+            elif path.endswith("/embeddings"):
+                if not self._injected_fault(settings, anthropic=False):
+                    self._embeddings(request, settings, started)
+            else:
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away mid-stream
+            self.close_connection = True
+
+    def _chat_completion(self, request: dict, settings: MockSettings, started: float) -> None:
+        model = request.get("model", MOCK_MODEL_NAME)
+        count = self._completion_length(request, settings)
+        finish_reason = "length" if count < settings.completion_tokens else "stop"
+        prompt_tokens = _estimate_tokens(request.get("messages", []))
+        schedule = self._token_schedule(settings, count)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": count, "total_tokens": prompt_tokens + count}
+
+        if not request.get("stream"):
+            self._sleep_until(started, schedule[-1])
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": "".join(_token_text(i, settings.token_chars) for i in range(count)),
+                    },
+                    "finish_reason": finish_reason,
+                }],
+                "usage": usage,
+            })
+            return
+
+        def chunk(delta: dict, finish: Optional[str] = None) -> dict:
+            return {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+
+        self._start_stream()
+        for i, offset in enumerate(schedule):
+            self._sleep_until(started, offset)
+            delta = {"content": _token_text(i, settings.token_chars)}
+            if i == 0:
+                delta["role"] = "assistant"
+            self._send_event(chunk(delta))
+        self._send_event(chunk({}, finish_reason))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            self._send_event({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [],
+                "usage": usage,
+            })
+        self._send_event("[DONE]")
+        self._end_stream()
+
+    def _anthropic_message(self, request: dict, settings: MockSettings, started: float) -> None:
+        model = request.get("model", MOCK_ANTHROPIC_MODEL_NAME)
+        count = self._completion_length(request, settings)
+        stop_reason = "max_tokens" if count < settings.completion_tokens else "end_turn"
+        input_tokens = _estimate_tokens([request.get("system", ""), request.get("messages", [])])
+        schedule = self._token_schedule(settings, count)
+        message_id = f"msg_mock{uuid.uuid4().hex[:20]}"
+
+        if not request.get("stream"):
+            self._sleep_until(started, schedule[-1])
+            self._send_json(200, {
+                "id": message_id,
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{
+                    "type": "text",
+                    "text": "".join(_token_text(i, settings.token_chars) for i in range(count)),
+                }],
+                "stop_reason": stop_reason,
+                "stop_sequence": None,
+                "usage": {"input_tokens": input_tokens, "output_tokens": count},
+            })
+            return
+
+        self._start_stream()
+        self._send_event({
+            "type": "message_start",
+            "message": {
+                "id": message_id,
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [],
+                "stop_reason": None,
+                "stop_sequence": None,
+                "usage": {"input_tokens": input_tokens, "output_tokens": 1},
+            },
+        }, "message_start")
+        self._send_event(
+            {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+            "content_block_start",
+        )
+        self._send_event({"type": "ping"}, "ping")
+        for i, offset in enumerate(schedule):
+            self._sleep_until(started, offset)
+            self._send_event({
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": _token_text(i, settings.token_chars)},
+            }, "content_block_delta")
+        self._send_event({"type": "content_block_stop", "index": 0}, "content_block_stop")
+        self._send_event({
+            "type": "message_delta",
+            "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+            "usage": {"output_tokens": count},
+        }, "message_delta")
+        self._send_event({"type": "message_stop"}, "message_stop")
+        self._end_stream()
+
+    def _embeddings(self, request: dict, settings: MockSettings, started: float) -> None:
+        inputs = request.get("input", "")
+        if not isinstance(inputs, list) or (inputs and isinstance(inputs[0], int)):
+            # A single string or a single pre-tokenized input
+            inputs = [inputs]
+        vector = self.server.embedding(settings.embedding_dim)
+        prompt_tokens = sum(
+            len(item) if isinstance(item, list) else max(1, len(str(item).split())) for item in inputs
+        )
+        self._sleep_until(started, settings.ttft_ms / 1000.0)
+        self._send_json(200, {
+            "object": "list",
+            "model": request.get("model", MOCK_EMBEDDING_MODEL_NAME),
+            "data": [{"object": "embedding", "index": i, "embedding": vector} for i in range(len(inputs))],
+            "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens},
+        })
+
+
+class _MockServer(ThreadingHTTPServer):
+    """HTTP server holding the mock settings shared by all handler threads"""
+
+    daemon_threads = True
+
+    def __init__(self, address, settings: MockSettings, seed: Optional[int] = None):
+        super().__init__(address, _MockHandler)
+        self.settings = settings
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._embeddings: Dict[int, List[float]] = {}
+
+    def roll(self) -> float:
+        """Uniform random number for fault injection"""
+        with self._lock:
+            return self._random.random()
+
+    def embedding(self, dim: int) -> List[float]:
+        """Unit vector of the given size (the same for every input)"""
+        if dim not in self._embeddings:
+            raw = [math.sin(i + 1.0) for i in range(max(1, dim))]
+            norm = math.sqrt(sum(v * v for v in raw))
+            self._embeddings[dim] = [round(v / norm, 6) for v in raw]
+        return self._embeddings[dim]
+
+
+class MockUpstream:
+    """OpenAI- and Anthropic-compatible mock server running in a background thread"""
+
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 0,
+        latency_ms: int = 50,
+        completion_tokens: int = 32,
+        settings: Optional[MockSettings] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize mock upstream
+
+        Args:
+            host: Bind address (0.0.0.0 so containers can reach it via host-gateway)
+            port: Bind port (0 = pick a free port)
+            latency_ms: Fixed response latency (deterministic for repeatable runs)
+            completion_tokens: Number of tokens in each completion
+            settings: Full settings (replaces latency_ms and completion_tokens)
+            seed: Seed for fault injection
+        """
+        self.host = host
+        self.port = port
+        self.settings = settings or MockSettings(ttft_ms=latency_ms, completion_tokens=completion_tokens)
+        self.seed = seed
+        self._server: Optional[_MockServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> int:
+        """
+        Start serving in a daemon thread
+
+        Returns:
+            Bound port
+        """
+        self._server = _MockServer((self.host, self.port), self.settings, self.seed)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.debug(f"Mock upstream listening on {self.host}:{self.port}")
+        return self.port
+
+    def stop(self) -> None:
+        """Stop serving"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockUpstream":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def _terminate(signum, frame) -> None:
+    # PID 1 in the container: SIGTERM has no default action there
+    raise KeyboardInterrupt
+
+
+def main() -> int:
+    """Serve in the foreground (the mock-llm compose service)"""
+    parser = argparse.ArgumentParser(description="Mock OpenAI/Anthropic upstream for benchmarks")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--seed", type=int, default=None, help="Seed for fault injection")
+    options = parser.parse_args()
+
+    try:
+        settings = MockSettings.from_env()
+    except ValueError as e:
+        print(f"Invalid MOCK_* setting: {e}")
+        return 1
+    server = _MockServer((options.host, options.port), settings, options.seed)
+    signal.signal(signal.SIGTERM, _terminate)
+    print(f"Mock upstream listening on {options.host}:{options.port} ({settings})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
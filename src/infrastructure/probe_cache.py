@@ -0,0 +1,220 @@
+"""
+Dependency probes: parallel execution and a persistent result cache
+
+Version probes (`docker --version`, `docker compose version`, `python3
+--version`) only change when the binary changes, so their results are cached
+on disk keyed on binary path and mtime (with a TTL as a safety net) and shared
+between setup, start, stop and continue-dev. State probes (`docker ps`) are
+only memoized for the current process.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+from ..core.constants import (
+    PROBE_CACHE_TTL_S, PROBE_CACHE_FILE, PROBE_CACHE_DISABLE_ENV,
+    DOCKER_CLI_PLUGIN_DIRS, PROBE_MAX_WORKERS, SUBPROCESS_TIMEOUT
+)
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+# Successful results of this process: key -> CompletedProcess (persistent and memo-only probes)
+_memo: Dict[str, subprocess.CompletedProcess] = {}
+_disk: Optional[Dict[str, Any]] = None
+
+
+def cache_path() -> Path:
+    """Probe cache file ($XDG_CACHE_HOME/ai-gateway/probes.json)"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "ai-gateway" / PROBE_CACHE_FILE
+
+
+def compose_plugin_path() -> Optional[str]:
+    """Path of the docker compose CLI plugin (None if not found)"""
+    for directory in DOCKER_CLI_PLUGIN_DIRS:
+        candidate = Path(os.path.expanduser(directory)) / "docker-compose"
+        if candidate.exists():
+            return str(candidate)
+    return None
+
+
+def _file_signature(path: Optional[str]) -> Optional[List[Any]]:
+    if not path:
+        return None
+    try:
+        real = os.path.realpath(path)
+        return [real, os.stat(real).st_mtime_ns]
+    except OSError:
+        return None
+
+
+def probe_key(cmd: Sequence[str], extra_paths: Sequence[Optional[str]] = ()) -> Optional[str]:
+    """
+    Cache key: command plus path and mtime of the binary (and extra files)
+
+    Returns:
+        Key string, or None if the binary is not in PATH
+    """
+    binary = shutil.which(cmd[0])
+    if binary is None:
+        return None
+    return json.dumps({
+        "cmd": list(cmd),
+        "binary": _file_signature(binary),
+        "extra": [_file_signature(p) for p in extra_paths],
+    }, sort_keys=True)
+
+
+def _load_disk() -> Dict[str, Any]:
+    global _disk
+    if _disk is None:
+        try:
+            with open(cache_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            _disk = data if isinstance(data, dict) else {}
+        except (IOError, OSError, json.JSONDecodeError):
+            _disk = {}
+    return _disk
+
+
+def _save_disk() -> None:
+    path = cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        entries = {k: v for k, v in (_disk or {}).items() if now - v.get("stored_at", 0) < PROBE_CACHE_TTL_S}
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+    except (IOError, OSError) as e:
+        logger.debug(f"Failed to write probe cache {path}: {e}")
+
+
+def run_probe(
+    cmd: Sequence[str],
+    timeout: float = SUBPROCESS_TIMEOUT,
+    persist: bool = True,
+    extra_paths: Sequence[Optional[str]] = (),
+    check: bool = False,
+) -> subprocess.CompletedProcess:
+    """
+    Run a probe command once, reusing cached results
+
+    Args:
+        cmd: Command, e.g. ["docker", "--version"]
+        timeout: Subprocess timeout in seconds
+        persist: Cache on disk (version probes); False = memoize for this
+            process only (state probes like `docker ps`)
+        extra_paths: Files whose mtime is also part of the key (compose plugin)
+        check: Raise CalledProcessError on non-zero exit (like subprocess.run)
+
+    Returns:
+        CompletedProcess with text stdout/stderr
+
+    Raises:
+        FileNotFoundError: If the binary is not in PATH
+        subprocess.TimeoutExpired: If the probe times out (not cached)
+        subprocess.CalledProcessError: If check is set and the probe failed
+    """
+    key = probe_key(cmd, extra_paths)
+    if key is None:
+        raise FileNotFoundError(f"{cmd[0]}: command not found")
+    use_disk = persist and not os.environ.get(PROBE_CACHE_DISABLE_ENV)
+
+    result = None
+    with _lock:
+        if key in _memo:
+            result = _memo[key]
+        elif use_disk:
+            entry = _load_disk().get(key)
+            if entry and time.time() - entry.get("stored_at", 0) < PROBE_CACHE_TTL_S:
+                result = subprocess.CompletedProcess(list(cmd), entry["returncode"], entry["stdout"], entry["stderr"])
+                _memo[key] = result
+
+    if result is None:
+        result = subprocess.run(list(cmd), capture_output=True, text=True, timeout=timeout)
+        # Failures are not cached - the next check probes again (e.g. after starting Docker)
+        if result.returncode == 0:
+            with _lock:
+                _memo[key] = result
+                if use_disk:
+                    _load_disk()[key] = {
+                        "returncode": result.returncode,
+                        "stdout": result.stdout,
+                        "stderr": result.stderr,
+                        "stored_at": time.time(),
+                    }
+                    _save_disk()
+
+    if check and result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, list(cmd), result.stdout, result.stderr)
+    return result
+
+
+def run_parallel(tasks: Dict[str, Callable[[], T]]) -> Dict[str, Any]:
+    """
+    Run independent probes concurrently on a thread pool
+
+    Args:
+        tasks: Name -> callable
+
+    Returns:
+        Name -> return value, or the exception the callable raised
+    """
+    # Imported here - concurrent.futures is not needed by CLI commands that don't probe
+    from concurrent.futures import ThreadPoolExecutor
+
+    results: Dict[str, Any] = {}
+    if not tasks:
+        return results
+    with ThreadPoolExecutor(max_workers=min(PROBE_MAX_WORKERS, len(tasks))) as pool:
+        futures = {name: pool.submit(task) for name, task in tasks.items()}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = e
+    return results
+
+
+def docker_version_probe() -> subprocess.CompletedProcess:
+    """`docker --version` (cached on disk)"""
+    return run_probe(["docker", "--version"])
+
+
+def compose_version_probe() -> subprocess.CompletedProcess:
+    """`docker compose version` (cached on disk, keyed on the compose plugin too)"""
+    return run_probe(["docker", "compose", "version"], extra_paths=(compose_plugin_path(),))
+
+
+def docker_daemon_probe() -> subprocess.CompletedProcess:
+    """`docker ps` (daemon state - memoized for this process only)"""
+    return run_probe(["docker", "ps"], persist=False)
+
+
+def prefetch_docker_probes(include_daemon: bool = True) -> None:
+    """
+    Warm the cache with Docker version/daemon probes concurrently
+
+    The daemon probe is skipped when the Docker socket is reachable directly
+    (callers ping the Engine API instead of forking `docker ps`).
+    """
+    from ..infrastructure.docker_engine import find_docker_socket
+
+    tasks: Dict[str, Callable[[], Any]] = {
+        "docker": docker_version_probe,
+        "compose": compose_version_probe,
+    }
+    if include_daemon and find_docker_socket() is None:
+        tasks["daemon"] = docker_daemon_probe
+    run_parallel(tasks)
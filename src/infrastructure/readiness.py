@@ -0,0 +1,240 @@
+"""
+Event-driven container readiness (docker events instead of polling)
+"""
+
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from ..core.exceptions import DockerError
+from ..infrastructure.docker_client import DockerClient
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_LABEL = "com.docker.compose.project"
+SERVICE_LABEL = "com.docker.compose.service"
+
+
+@dataclass
+class ServiceState:
+    """Readiness state of one compose service"""
+    name: str
+    has_healthcheck: bool
+    ready: bool = False
+    created_after_s: Optional[float] = None
+    started_after_s: Optional[float] = None
+    ready_after_s: Optional[float] = None
+
+    @property
+    def startup_s(self) -> Optional[float]:
+        """Time from container start to ready (healthcheck latency included)"""
+        if self.started_after_s is None or self.ready_after_s is None:
+            return None
+        return round(self.ready_after_s - self.started_after_s, 2)
+
+
+@dataclass
+class ReadinessResult:
+    """Outcome of waiting for the stack"""
+    ready: bool
+    elapsed_s: float
+    services: Dict[str, ServiceState] = field(default_factory=dict)
+    failed_service: Optional[str] = None
+    exit_code: Optional[str] = None
+    logs: str = ""
+    timed_out: bool = False
+
+    @property
+    def pending(self) -> List[str]:
+        """Services that are not ready yet"""
+        return [name for name, state in self.services.items() if not state.ready]
+
+
+class ReadinessWaiter:
+    """
+    Wait for compose services using one `docker events` subscription
+
+    Subscribes before taking a single `docker compose ps` snapshot (so no
+    transition is lost in between), then reacts to create, start,
+    health_status and die events: returns as soon as the last service is ready, fails on the
+    first die with its exit code and a log tail. With `since` the events from
+    `compose up` onwards are replayed, so per-service start and ready times
+    come from event timestamps even for services that became healthy while
+    `compose up` was still waiting on depends_on.
+    """
+
+    # How long to keep reading replayed events for ready times after the
+    # snapshot already shows every service ready
+    REPLAY_DRAIN_S = 1.0
+
+    def __init__(self, work_dir: str, docker_client: Optional[DockerClient] = None):
+        """
+        Initialize readiness waiter
+
+        Args:
+            work_dir: Compose project directory
+            docker_client: Docker client (created if not given)
+        """
+        self.work_dir = work_dir
+        self.docker_client = docker_client or DockerClient()
+
+    @staticmethod
+    def is_ready(container: dict) -> bool:
+        """Ready = healthy if a healthcheck is defined, otherwise running"""
+        health = (container.get("Health") or "").lower()
+        state = (container.get("State") or "").lower()
+        if health:
+            return health == "healthy"
+        return state == "running"
+
+    @staticmethod
+    def _event_time(event: dict) -> float:
+        """Event timestamp (unix seconds), now if the event has none"""
+        if event.get("timeNano"):
+            return int(event["timeNano"]) / 1e9
+        if event.get("time"):
+            return float(event["time"])
+        return time.time()
+
+    def _fail(self, result: ReadinessResult, service: str, exit_code: Optional[str], since: float) -> ReadinessResult:
+        result.ready = False
+        result.failed_service = service
+        result.exit_code = exit_code
+        result.logs = self.docker_client.get_container_logs(self.work_dir, service, tail=30)
+        result.elapsed_s = time.time() - since
+        return result
+
+    def wait(self, timeout: float = 300, since: Optional[float] = None) -> ReadinessResult:
+        """
+        Wait until every service of the project is ready
+
+        Args:
+            timeout: Maximum time to wait in seconds
+            since: time.time() value ready times are measured from; events
+                since then are replayed (pass the time before `compose up`)
+
+        Returns:
+            ReadinessResult (ready, or failed service with exit code and logs)
+
+        Raises:
+            DockerError: If events cannot be subscribed or containers listed
+        """
+        deadline = time.monotonic() + timeout
+        replay = since is not None
+        since = since if replay else time.time()
+        events = self.docker_client.stream_events([
+            "type=container",
+            "event=create",
+            "event=start",
+            "event=die",
+            "event=health_status",
+            f"label={PROJECT_LABEL}",
+        ], since=f"{since:.3f}" if replay else None)
+        lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+        def reader() -> None:
+            for line in events.stdout:
+                lines.put(line)
+            lines.put(None)
+
+        threading.Thread(target=reader, daemon=True).start()
+
+        try:
+            containers = self.docker_client.compose_ps(self.work_dir, all_containers=True)
+            if not containers:
+                raise DockerError("No containers found for this compose project")
+            project = containers[0].get("Project")
+            result = ReadinessResult(ready=False, elapsed_s=0.0)
+            # Replayed events also cover containers replaced by `compose up`
+            # (their die is not a failure) - only current container IDs count
+            current_ids: Dict[str, str] = {}
+            for container in containers:
+                service = container.get("Service")
+                if not service:
+                    continue
+                current_ids[service] = container.get("ID") or ""
+                has_healthcheck = bool(container.get("Health"))
+                if not has_healthcheck and (container.get("State") or "").lower() != "running":
+                    # Health is only reported once the container runs - ask the config
+                    details = self.docker_client.inspect_container(
+                        container.get("ID") or container.get("Name", "")
+                    ) or {}
+                    healthcheck = (details.get("Config") or {}).get("Healthcheck") or {}
+                    has_healthcheck = bool(healthcheck.get("Test")) and healthcheck["Test"][0] != "NONE"
+                state = ServiceState(name=service, has_healthcheck=has_healthcheck)
+                if self.is_ready(container):
+                    state.ready = True
+                    if not replay:
+                        state.ready_after_s = 0.0
+                result.services[service] = state
+                if (container.get("State") or "").lower() in ("exited", "dead"):
+                    return self._fail(result, service, str(container.get("ExitCode", "?")), since)
+
+            drain_until = None
+            while True:
+                if not result.pending:
+                    untimed = replay and any(s.ready_after_s is None for s in result.services.values())
+                    if not untimed:
+                        break
+                    if drain_until is None:
+                        drain_until = time.monotonic() + self.REPLAY_DRAIN_S
+                remaining = (drain_until if drain_until is not None else deadline) - time.monotonic()
+                if remaining <= 0:
+                    result.timed_out = drain_until is None
+                    break
+                try:
+                    line = lines.get(timeout=remaining)
+                except queue.Empty:
+                    result.timed_out = drain_until is None
+                    break
+                if line is None:
+                    if drain_until is not None:
+                        break
+                    raise DockerError("docker events stream ended unexpectedly")
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                attributes = (event.get("Actor") or {}).get("Attributes") or {}
+                if project and attributes.get(PROJECT_LABEL) != project:
+                    continue
+                service = attributes.get(SERVICE_LABEL)
+                state = result.services.get(service)
+                if state is None:
+                    continue
+                container_id = (event.get("Actor") or {}).get("ID") or event.get("id") or ""
+                if current_ids.get(service) and not container_id.startswith(current_ids[service]):
+                    continue
+
+                after = round(self._event_time(event) - since, 2)
+                action = event.get("Action") or event.get("status") or ""
+                if action == "die":
+                    return self._fail(result, service, attributes.get("exitCode", "?"), since)
+                if action.startswith("health_status"):
+                    healthy = action.split(":", 1)[-1].strip() == "healthy"
+                    if healthy and state.ready_after_s is None:
+                        state.ready = True
+                        state.ready_after_s = after
+                        logger.debug(f"{service} healthy after {after}s")
+                elif action == "create":
+                    state.created_after_s = after
+                elif action == "start":
+                    state.started_after_s = after
+                    if not state.has_healthcheck and state.ready_after_s is None:
+                        state.ready = True
+                        state.ready_after_s = after
+                        logger.debug(f"{service} running after {after}s")
+
+            result.ready = not result.pending
+            result.elapsed_s = time.time() - since
+            return result
+        finally:
+            events.terminate()
+            try:
+                events.wait(timeout=5)
+            except Exception:
+                events.kill()
@@ -0,0 +1,50 @@
+"""
+systemd notify protocol (Type=notify units) without python-systemd
+"""
+
+import os
+import socket
+from typing import Optional
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def notify(state: str) -> bool:
+    """
+    Send a state string to systemd ("READY=1", "WATCHDOG=1", "STATUS=...")
+
+    Returns:
+        True if sent, False when not running under systemd (no NOTIFY_SOCKET)
+    """
+    address = os.environ.get("NOTIFY_SOCKET")
+    if not address:
+        return False
+    if address.startswith("@"):
+        # Abstract namespace socket
+        address = "\0" + address[1:]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(state.encode("utf-8"))
+        return True
+    except OSError as e:
+        logger.debug(f"sd_notify {state!r} failed: {e}")
+        return False
+
+
+def watchdog_interval() -> Optional[float]:
+    """
+    Seconds between watchdog pings (half of WatchdogSec), None if disabled
+
+    systemd sets WATCHDOG_USEC (and WATCHDOG_PID for the main process) when
+    the unit has WatchdogSec.
+    """
+    usec = os.environ.get("WATCHDOG_USEC")
+    pid = os.environ.get("WATCHDOG_PID")
+    if not usec or (pid and pid != str(os.getpid())):
+        return None
+    try:
+        return int(usec) / 1e6 / 2
+    except ValueError:
+        return None
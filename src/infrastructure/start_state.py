@@ -0,0 +1,106 @@
+"""
+Start state fingerprint (fast path for `ai-gateway start` when nothing changed)
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from ..core.constants import START_STATE_ARTIFACTS, START_STATE_ARTIFACT_GLOBS
+from ..infrastructure.docker_client import DockerClient
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def artifact_hashes(project_root: Path) -> Dict[str, str]:
+    """
+    SHA-256 of every generated artifact the stack is started from
+
+    Returns:
+        Relative path -> hex digest ("" for missing files)
+    """
+    paths = [project_root / name for name in START_STATE_ARTIFACTS]
+    for pattern in START_STATE_ARTIFACT_GLOBS:
+        paths.extend(sorted(project_root.glob(pattern)))
+    hashes = {}
+    for path in paths:
+        name = path.relative_to(project_root).as_posix()
+        try:
+            hashes[name] = hashlib.sha256(path.read_bytes()).hexdigest()
+        except (IOError, OSError):
+            hashes[name] = ""
+    return hashes
+
+
+def image_ids(docker_client: DockerClient, images: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Service -> local image ID (changes after a pull of a moving tag)"""
+    return {service: docker_client.get_image_id(image) for service, image in sorted(images.items())}
+
+
+def tool_versions(docker_client: DockerClient) -> Dict[str, str]:
+    """Docker Engine API, Compose and Python versions"""
+    return {
+        "engine_api": ".".join(str(p) for p in docker_client.get_server_api_version()),
+        "compose": ".".join(str(p) for p in docker_client.get_compose_version()),
+        "python": ".".join(str(p) for p in sys.version_info[:3]),
+    }
+
+
+def build_start_state(project_root: Path, docker_client: DockerClient, images: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Collect everything a start depends on and fingerprint it
+
+    Returns:
+        State dict with artifacts, images, tools, services and fingerprint
+    """
+    state: Dict[str, Any] = {
+        "artifacts": artifact_hashes(project_root),
+        "images": image_ids(docker_client, images),
+        "tools": tool_versions(docker_client),
+        "services": sorted(images),
+    }
+    state["fingerprint"] = hashlib.sha256(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()
+    return state
+
+
+def changed_parts(previous: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """
+    Names of what differs between two states (for the "why not fast" message)
+
+    Returns:
+        List like ["config.yaml", "image litellm", "tool compose"]
+    """
+    changes = []
+    for key, label in (("artifacts", ""), ("images", "image "), ("tools", "tool ")):
+        old, new = previous.get(key) or {}, current.get(key) or {}
+        for name in sorted(set(old) | set(new)):
+            if old.get(name) != new.get(name):
+                changes.append(f"{label}{name}")
+    if previous.get("services") != current.get("services"):
+        changes.append("services")
+    return changes
+
+
+def load_start_state(path: Path) -> Optional[Dict[str, Any]]:
+    """Load the state of the last successful start (None if missing or unreadable)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (IOError, OSError, json.JSONDecodeError):
+        return None
+    return state if isinstance(state, dict) and state.get("fingerprint") else None
+
+
+def save_start_state(path: Path, state: Dict[str, Any]) -> None:
+    """Write the start state atomically"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(state, written_at=time.time()), f, indent=2)
+        os.replace(tmp_path, path)
+    except (IOError, OSError) as e:
+        logger.warning(f"Failed to write start state {path}: {e}")
@@ -0,0 +1,167 @@
+"""
+Startup phase profiler with JSON history (cold-start regression tracking)
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from ..core.constants import (
+    START_HISTORY_MAX_ENTRIES, START_CHECKS_MAX_AGE_S,
+    START_REGRESSION_RATIO, START_REGRESSION_MIN_S
+)
+from ..core.stats import percentile
+from ..infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Per-container timings, seconds from `compose up`
+CONTAINER_TIMINGS = ("created_s", "started_s", "ready_s")
+
+
+class StartupProfiler:
+    """Records phase durations and per-container timings of one start"""
+
+    def __init__(self):
+        """Initialize profiler (wall clock starts now)"""
+        self.started_at = time.time()
+        self.phases: Dict[str, float] = {}
+        self.containers: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block as phase `name` (recorded even if the block raises)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(time.perf_counter() - started, 3)
+
+    def add_phases(self, phases: Dict[str, float], prefix: str = "") -> None:
+        """Add phases timed elsewhere (e.g. dependency checks in another process)"""
+        for name, seconds in phases.items():
+            self.phases[f"{prefix}{name}"] = round(float(seconds), 3)
+
+    def set_container(self, service: str, **timings: Any) -> None:
+        """Merge timings (image_present, created_s, started_s, ready_s) for a service"""
+        self.containers.setdefault(service, {}).update(timings)
+
+    def to_entry(self, ok: bool, mode: str = "full") -> Dict[str, Any]:
+        """
+        Build a history entry
+
+        total_s is the wall time of this process plus phases handed over
+        from the dependency check process. mode is "full" or "fast" (nothing
+        changed, containers already healthy).
+        """
+        handed_over = sum(seconds for name, seconds in self.phases.items() if name.startswith("checks."))
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "ok": ok,
+            "mode": mode,
+            "total_s": round(time.time() - self.started_at + handed_over, 3),
+            "phases": dict(self.phases),
+            "containers": {name: dict(values) for name, values in self.containers.items()},
+        }
+
+
+def load_history(path: Path) -> List[Dict[str, Any]]:
+    """
+    Load start history (oldest first)
+
+    Returns:
+        List of history entries (empty if missing or unreadable)
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, OSError, json.JSONDecodeError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+def append_history(path: Path, entry: Dict[str, Any], max_entries: int = START_HISTORY_MAX_ENTRIES) -> None:
+    """Append an entry to the history file, keeping the last max_entries"""
+    history = load_history(path)
+    history.append(entry)
+    history = history[-max_entries:]
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=2)
+        os.replace(tmp_path, path)
+    except (IOError, OSError) as e:
+        logger.warning(f"Failed to write start history {path}: {e}")
+
+
+def save_check_timings(path: Path, timings: Dict[str, float]) -> None:
+    """Hand dependency check timings over to the next `ai-gateway start`"""
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"written_at": time.time(), "timings": timings}, f)
+    except (IOError, OSError) as e:
+        logger.debug(f"Failed to write check timings {path}: {e}")
+
+
+def consume_check_timings(path: Path, max_age_s: float = START_CHECKS_MAX_AGE_S) -> Dict[str, float]:
+    """
+    Read and remove check timings written by save_check_timings
+
+    Returns:
+        Timings by check name (empty if missing or older than max_age_s)
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        os.remove(path)
+    except (IOError, OSError, json.JSONDecodeError):
+        return {}
+    if time.time() - float(data.get("written_at", 0)) > max_age_s:
+        return {}
+    return data.get("timings") or {}
+
+
+def _median(values: List[float]) -> Optional[float]:
+    return percentile(values, 50) if values else None
+
+
+def compare_with_history(
+    entry: Dict[str, Any],
+    history: List[Dict[str, Any]],
+    runs: int,
+) -> List[Dict[str, Any]]:
+    """
+    Compare an entry against the median of the last `runs` successful starts
+    of the same mode (fast path starts are not a baseline for full starts)
+
+    Returns:
+        Rows with name, current, median (None without history) and regression
+        flag, for total, every phase and every container timing
+    """
+    mode = entry.get("mode", "full")
+    previous = [h for h in history if h.get("ok") and h.get("mode", "full") == mode][-runs:]
+
+    def row(name: str, current: Optional[float], past: List[float]) -> Dict[str, Any]:
+        median = _median(past)
+        regression = (
+            current is not None and median is not None
+            and current > median * START_REGRESSION_RATIO
+            and current - median >= START_REGRESSION_MIN_S
+        )
+        return {"name": name, "current": current, "median": median, "regression": regression}
+
+    rows = [row("total", entry.get("total_s"), [h["total_s"] for h in previous if "total_s" in h])]
+    for name, seconds in entry.get("phases", {}).items():
+        past = [h["phases"][name] for h in previous if name in h.get("phases", {})]
+        rows.append(row(name, seconds, past))
+    for service, timings in entry.get("containers", {}).items():
+        for key in CONTAINER_TIMINGS:
+            past = [
+                h["containers"][service][key] for h in previous
+                if h.get("containers", {}).get(service, {}).get(key) is not None
+            ]
+            rows.append(row(f"{service}.{key[:-2]}", timings.get(key), past))
+    return rows
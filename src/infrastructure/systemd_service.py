@@ -5,6 +5,7 @@ Systemd service installation and management
 import subprocess
 from pathlib import Path
 from typing import Optional, Tuple
+from ..core.constants import SUPERVISE_READY_TIMEOUT_S, SUPERVISE_WATCHDOG_S
 from ..infrastructure.logger import get_logger
 
 logger = get_logger(__name__)
@@ -76,21 +77,29 @@ After=docker.service
 Wants=docker.service
 
 [Service]
-Type=oneshot
-RemainAfterExit=yes
+# `ai-gateway supervise` runs compose up, reports READY=1 once the stack is
+# healthy and then restarts only containers that turn unhealthy or die
+Type=notify
+NotifyAccess=main
 WorkingDirectory={self.project_root}
 
 # Environment
 Environment="PATH=/usr/local/bin:/usr/bin:/bin"
+Environment="PYTHONUNBUFFERED=1"
 
-# Start command (docker compose up -d)
-# Note: don't use -f flag to let docker compose automatically find both
-# docker-compose.yml and docker-compose.override.yml
-ExecStart=/usr/bin/docker compose up -d --remove-orphans
+# Start command (docker compose up -d, wait for health, supervise)
+ExecStart={self.project_root}/ai-gateway supervise
 
 # Stop command (docker compose down)
+# Note: don't use -f flag to let docker compose automatically find both
+# docker-compose.yml and docker-compose.override.yml
 ExecStop=/usr/bin/docker compose down
 
+# Cold start waits for all healthchecks (LiteLLM start_period is 180s)
+TimeoutStartSec={SUPERVISE_READY_TIMEOUT_S + 60}
+# The supervisor pings every {SUPERVISE_WATCHDOG_S // 2}s; a hung supervisor is restarted
+WatchdogSec={SUPERVISE_WATCHDOG_S}
+
 # Restart policy
 Restart=on-failure
 RestartSec=10
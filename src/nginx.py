@@ -2,26 +2,63 @@
 Nginx configuration generation
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from .core.constants import (
+    DRAIN_FLAG_CONTAINER_PATH, DRAIN_RETRY_AFTER_S, CAPTURE_FLAG_CONTAINER_PATH,
+    CAPTURE_LOG_CONTAINER_PATH, CAPTURE_LOG_DIR, CAPTURE_KEY_TAIL, METRICS_LOG_DIR,
+    METRICS_LOG_CONTAINER_PATH, NGINX_STATUS_PORT, NGINX_STATUS_PATH
+)
 from .utils import print_success, print_info, ensure_dir
 
 
-def generate_nginx_config(port_config: Dict[str, Any]) -> None:
+def trace_sampling_entries(sample_ratio: float) -> str:
     """
-    Generate nginx configuration files without relying on envsubst.
+    split_clients entries that set the traceparent sampled flag
 
-    The configs contain native nginx variables (e.g. $scheme) that must stay
-    untouched, so we render concrete port numbers directly instead of
-    passing the files through envsubst (which would strip those variables).
+    Args:
+        sample_ratio: Share of new traces to sample (0 = none, 1 = all)
+
+    Returns:
+        Body of the split_clients block
+    """
+    percent = round(min(max(sample_ratio, 0.0), 1.0) * 100, 2)
+    if percent >= 100:
+        return '*   "01";'
+    if percent <= 0:
+        return '*   "00";'
+    return f'{percent:g}%   "01";\n    *   "00";'
+
+
+def render_nginx_config(
+    port_config: Dict[str, Any],
+    litellm_server: Optional[str] = None,
+    webui_server: Optional[str] = None,
+) -> str:
+    """
+    Render the main vhost configuration
+
+    Args:
+        port_config: Port configuration (internal ports of the upstreams,
+            trace_sample_ratio when tracing is enabled, metrics_log when the
+            metrics exporter tails and rotates the metrics log, metrics_log_keys)
+        litellm_server: LiteLLM upstream address instead of litellm:<port>
+        webui_server: Open WebUI upstream address instead of open-webui:<port>
+
+    Returns:
+        Contents of nginx/conf.d/litellm.conf
     """
-    if not port_config.get("use_nginx"):
-        return
-    
-    ensure_dir("nginx/conf.d")
-    
     litellm_internal_port = port_config.get("litellm_internal_port", 4000)
     webui_internal_port = port_config.get("webui_internal_port", 8080)
-    litellm_external_port = port_config.get("litellm_external_port", 4000)
+    litellm_server = litellm_server or f"litellm:{litellm_internal_port}"
+    webui_server = webui_server or f"open-webui:{webui_internal_port}"
+    trace_sampling = trace_sampling_entries(float(port_config.get("trace_sample_ratio") or 0.0))
+    # Key characters stay out of the metrics log unless per-key accounting is opted in
+    metrics_key = "$capture_key" if port_config.get("metrics_log_keys") else ""
+    # Only the metrics exporter rotates this log: without it the file would grow forever
+    metrics_access_log = (
+        f"\n    access_log {METRICS_LOG_CONTAINER_PATH} metrics if=$metrics_api;"
+        if port_config.get("metrics_log") else ""
+    )
     
     # Generate HTTP only configuration
     # Security: Open WebUI and LiteLLM API exposed on external port via nginx
@@ -33,12 +70,61 @@ def generate_nginx_config(port_config: Dict[str, Any]) -> None:
 # Security: Open WebUI and LiteLLM API exposed via nginx
 # Other services (LiteLLM UI) accessible only within Docker network or via direct port
 
+# Traffic capture (`ai-gateway capture start`): only the key tail is logged,
+# `capture stop` hashes it and redacts bodies
+map "$http_authorization$http_x_api_key" $capture_key {{
+    "~(?<tail>.{{{CAPTURE_KEY_TAIL}}})$" $tail;
+    default "";
+}}
+log_format capture escape=json '{{"msec":"$msec","request_time":"$request_time",'
+    '"method":"$request_method","uri":"$request_uri","status":"$status",'
+    '"key":"$capture_key","content_length":"$content_length","body":"$request_body"}}';
+
+# Metrics (metrics-exporter tails this log): route, status and timings of API
+# requests, no bodies. Per-key accounting (`ai-gateway top-keys`) gets the client
+# name from the User-Agent, the model group LiteLLM answered with and, only with
+# metrics.log_keys, the key tail (hashed by the exporter, as by `capture stop`)
+map $request_uri $metrics_api {{
+    "~^/api/litellm/" 1;
+    default 0;
+}}
+map $http_user_agent $metrics_agent {{
+    "~^(?<agent_product>[^/ ]{{1,64}})" $agent_product;
+    default "";
+}}
+log_format metrics escape=json '{{"msec":"$msec","request_time":"$request_time",'
+    '"upstream_time":"$upstream_response_time","status":"$status",'
+    '"uri":"$request_uri","bytes":"$bytes_sent","trace":"$trace_id",'
+    '"key":"{metrics_key}","agent":"$metrics_agent","model":"$upstream_http_x_litellm_model_group"}}';
+
+# Trace context (W3C traceparent): the trace and parent id of a valid client
+# traceparent are kept, otherwise a trace is started with $request_id as the
+# trace id. The sampled flag is always decided here, from the trace id with
+# the profile's sample ratio: clients cannot force every request to be traced
+map $http_traceparent $trace_id {{
+    "~^00-(?<client_trace_hex>[0-9a-f]{{32}})-[0-9a-f]{{16}}-[0-9a-f]{{2}}$" $client_trace_hex;
+    default $request_id;
+}}
+split_clients $trace_id $trace_flags {{
+    {trace_sampling}
+}}
+map $request_id $request_span_id {{
+    "~(?<request_span_hex>[0-9a-f]{{16}})$" $request_span_hex;
+}}
+map $http_traceparent $trace_parent_id {{
+    "~^00-[0-9a-f]{{32}}-(?<client_parent_hex>[0-9a-f]{{16}})-[0-9a-f]{{2}}$" $client_parent_hex;
+    default $request_span_id;
+}}
+map $trace_id $traceparent {{
+    default "00-$trace_id-$trace_parent_id-$trace_flags";
+}}
+
 upstream webui_backend {{
-    server open-webui:{webui_internal_port};
+    server {webui_server};
 }}
 
 upstream litellm_backend {{
-    server litellm:{litellm_internal_port};
+    server {litellm_server};
 }}
 
 server {{
@@ -61,10 +147,48 @@ server {{
     add_header X-Content-Type-Options "nosniff" always;
     add_header X-XSS-Protection "1; mode=block" always;
     add_header Referrer-Policy "strict-origin-when-cross-origin" always;
+    # Trace id for bug reports: find the request's spans (and metrics log line) by it
+    add_header X-Trace-Id $trace_id always;
     
     # Hide nginx version
     server_tokens off;
 
+    # Traffic capture: API requests go to the capture log while the capture
+    # flag exists (checked per request, no reload)
+    set $capture_flag "";
+    set $capture "";
+    if (-f {CAPTURE_FLAG_CONTAINER_PATH}) {{
+        set $capture_flag "1";
+    }}
+    if ($capture_flag$uri ~ "^1/api/litellm/v1/") {{
+        set $capture "1";
+    }}
+    access_log /var/log/nginx/access.log main;
+    access_log {CAPTURE_LOG_CONTAINER_PATH} capture if=$capture;{metrics_access_log}
+
+    # Drain mode: `./stop.sh --drain` creates the maintenance flag - new LiteLLM API
+    # requests get 503 while in-flight streams finish (checked per request, no reload).
+    # Health checks still reach LiteLLM: monitors should not see the drain as an outage
+    set $drain "";
+    if (-f {DRAIN_FLAG_CONTAINER_PATH}) {{
+        set $drain "1";
+    }}
+    if ($drain$uri ~ "^1/api/litellm/(?!health(/|$))") {{
+        rewrite ^ /__drain last;
+    }}
+    location = /__drain {{
+        internal;
+        access_log off;
+        # add_header here replaces the server-level headers - repeat them
+        add_header X-Frame-Options "SAMEORIGIN" always;
+        add_header X-Content-Type-Options "nosniff" always;
+        add_header X-XSS-Protection "1; mode=block" always;
+        add_header Referrer-Policy "strict-origin-when-cross-origin" always;
+        add_header X-Trace-Id $trace_id always;
+        add_header Retry-After {DRAIN_RETRY_AFTER_S} always;
+        return 503 "Service is restarting, retry shortly\\n";
+    }}
+
     # Health check endpoint (for monitoring)
     location /health {{
         access_log off;
@@ -120,6 +244,7 @@ server {{
         proxy_set_header X-Forwarded-Proto $scheme;
         proxy_set_header X-Forwarded-Host $host;
         proxy_set_header X-Forwarded-Port $server_port;
+        proxy_set_header traceparent $traceparent;
         
         # Streaming support - disable buffering for real-time streaming
         proxy_buffering off;
@@ -148,6 +273,7 @@ server {{
         proxy_set_header X-Forwarded-Proto $scheme;
         proxy_set_header X-Forwarded-Host $host;
         proxy_set_header X-Forwarded-Port $server_port;
+        proxy_set_header traceparent $traceparent;
         
         # Use large buffer to avoid temp files and prevent hanging requests
         # Large buffer allows nginx to read request body in memory without writing to temp files
@@ -189,6 +315,7 @@ server {{
         proxy_set_header X-Forwarded-Proto $scheme;
         proxy_set_header X-Forwarded-Host $host;
         proxy_set_header X-Forwarded-Port $server_port;
+        proxy_set_header traceparent $traceparent;
         
         # Streaming support - disable buffering for real-time streaming
         proxy_buffering off;
@@ -237,6 +364,7 @@ server {{
         proxy_set_header X-Forwarded-Proto $scheme;
         proxy_set_header X-Forwarded-Host $host;
         proxy_set_header X-Forwarded-Port $server_port;
+        proxy_set_header traceparent $traceparent;
         
         # Streaming support - disable buffering for real-time streaming
         proxy_buffering off;
@@ -278,7 +406,44 @@ server {{
         proxy_send_timeout 86400;
     }}
 }}
+
+# nginx connection counters for the metrics exporter
+# Port is not published: reachable only inside the Docker network
+server {{
+    listen {NGINX_STATUS_PORT};
+    server_name _;
+    access_log off;
+
+    location = {NGINX_STATUS_PATH} {{
+        stub_status;
+    }}
+
+    location / {{
+        return 404;
+    }}
+}}
 """
+    return config_content
+
+
+def generate_nginx_config(port_config: Dict[str, Any]) -> None:
+    """
+    Generate nginx configuration files without relying on envsubst.
+
+    The configs contain native nginx variables (e.g. $scheme) that must stay
+    untouched, so we render concrete port numbers directly instead of
+    passing the files through envsubst (which would strip those variables).
+    """
+    if not port_config.get("use_nginx"):
+        return
+    
+    ensure_dir("nginx/conf.d")
+    # Bind-mounted capture and metrics log directories (must exist before nginx starts)
+    ensure_dir(CAPTURE_LOG_DIR)
+    ensure_dir(METRICS_LOG_DIR)
+    
+    litellm_external_port = port_config.get("litellm_external_port", 4000)
+    config_content = render_nginx_config(port_config)
     
     # Write main vhost configuration file
     main_conf_path = "nginx/conf.d/litellm.conf"
@@ -42,15 +42,9 @@ def get_python_command() -> Optional[str]:
     if shutil.which("python"):
         # Check version
         import subprocess
+        from .infrastructure.probe_cache import run_probe
         try:
-            from .core.constants import SUBPROCESS_TIMEOUT
-            result = subprocess.run(
-                ["python", "--version"],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=SUBPROCESS_TIMEOUT
-            )
+            result = run_probe(["python", "--version"], check=True)
             version_str = result.stdout.strip()
             # Extract version number
             version_parts = version_str.split()[-1].split(".")
@@ -72,15 +66,9 @@ def get_python_version() -> Optional[Tuple[int, int, int]]:
         return None
     
     import subprocess
+    from .infrastructure.probe_cache import run_probe
     try:
-        from .core.constants import SUBPROCESS_TIMEOUT
-        result = subprocess.run(
-            [python_cmd, "--version"],
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=SUBPROCESS_TIMEOUT
-        )
+        result = run_probe([python_cmd, "--version"], check=True)
         version_str = result.stdout.strip()
         # Extract version number (e.g., "Python 3.11.5")
         version_parts = version_str.split()[-1].split(".")
@@ -6,6 +6,7 @@ Provides consistency in checks and headers
 import os
 import sys
 import subprocess
+import time
 from typing import Optional, Dict, List, Tuple
 from enum import Enum
 
@@ -15,12 +16,20 @@ try:
         print_header, print_success, print_info, print_warning, print_error, Colors
     )
     from .platform_utils import detect_platform, PlatformType
+    from .infrastructure.probe_cache import (
+        docker_version_probe, compose_version_probe, docker_daemon_probe,
+        prefetch_docker_probes, run_probe
+    )
 except ImportError:
     # Fallback for absolute imports when run as script
     from src.utils import (
         print_header, print_success, print_info, print_warning, print_error, Colors
     )
     from src.platform_utils import detect_platform, PlatformType
+    from src.infrastructure.probe_cache import (
+        docker_version_probe, compose_version_probe, docker_daemon_probe,
+        prefetch_docker_probes, run_probe
+    )
 
 
 class ScriptType(Enum):
@@ -50,6 +59,8 @@ class ScriptInit:
         self.script_dir = script_dir or os.path.dirname(os.path.abspath(sys.argv[0]))
         self.platform = detect_platform()
         self.checks_passed = True
+        # Seconds spent in each check of run_standard_checks (startup profiling)
+        self.timings: Dict[str, float] = {}
     
     def print_banner(self, emoji: str = "🚀") -> None:
         """Print uniform banner"""
@@ -90,12 +101,7 @@ class ScriptInit:
     def check_docker(self) -> bool:
         """Check Docker availability"""
         try:
-            result = subprocess.run(
-                ["docker", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            result = docker_version_probe()
             if result.returncode == 0:
                 version = result.stdout.strip().split(',')[0]
                 try:
@@ -131,12 +137,16 @@ class ScriptInit:
     def check_docker_daemon(self) -> bool:
         """Check that Docker daemon is running"""
         try:
-            result = subprocess.run(
-                ["docker", "ps"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            # Engine API ping over the socket avoids forking the docker CLI
+            from .infrastructure.docker_engine import get_engine_client
+            engine = get_engine_client()
+            if engine is not None and engine.ping():
+                print_success("Docker daemon is running")
+                return True
+        except ImportError:
+            pass
+        try:
+            result = docker_daemon_probe()
             if result.returncode == 0:
                 print_success("Docker daemon is running")
                 return True
@@ -201,12 +211,7 @@ class ScriptInit:
     def check_docker_compose(self) -> bool:
         """Check docker compose availability"""
         try:
-            result = subprocess.run(
-                ["docker", "compose", "version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            result = compose_version_probe()
             if result.returncode == 0:
                 version = result.stdout.strip()
                 try:
@@ -221,12 +226,7 @@ class ScriptInit:
                     print("⚠️  Docker Compose not found (trying docker-compose)")
                 # Fallback to docker-compose
                 try:
-                    result = subprocess.run(
-                        ["docker-compose", "--version"],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
+                    result = run_probe(["docker-compose", "--version"])
                     if result.returncode == 0:
                         version = result.stdout.strip()
                         try:
@@ -360,6 +360,14 @@ class ScriptInit:
             return False
         return True
     
+    def _timed(self, name: str, check, *args, **kwargs) -> bool:
+        """Run a check and record its duration in self.timings"""
+        started = time.perf_counter()
+        try:
+            return check(*args, **kwargs)
+        finally:
+            self.timings[name] = round(time.perf_counter() - started, 3)
+    
     def run_standard_checks(self) -> bool:
         """Run standard checks depending on script type"""
         try:
@@ -379,12 +387,14 @@ class ScriptInit:
                 print_info("Docker:")
             except (ImportError, AttributeError, NameError, TypeError):
                 print("Docker:")
-            if not self.check_docker():
+            # Independent probes run concurrently, the checks below report from the cache
+            self._timed("prefetch", prefetch_docker_probes)
+            if not self._timed("docker", self.check_docker):
                 all_passed = False
             else:
-                if not self.check_docker_daemon():
+                if not self._timed("docker_daemon", self.check_docker_daemon):
                     all_passed = False
-                if not self.check_docker_compose():
+                if not self._timed("docker_compose", self.check_docker_compose):
                     all_passed = False
             print()
         
@@ -396,7 +406,7 @@ class ScriptInit:
             except (ImportError, AttributeError, NameError, TypeError):
                 print("Configuration:")
             # For start.sh, .env is optional - script will prompt user to run setup
-            if not self.check_env_file(required=False):
+            if not self._timed("env_file", self.check_env_file, required=False):
                 # Just warn, don't fail - start.sh will handle it
                 pass
         elif self.script_type == ScriptType.TEST:
@@ -404,10 +414,10 @@ class ScriptInit:
                 print_info("Configuration:")
             except (ImportError, AttributeError, NameError, TypeError):
                 print("Configuration:")
-            if not self.check_env_file(required=True):
+            if not self._timed("env_file", self.check_env_file, required=True):
                 all_passed = False
             if self.script_type == ScriptType.TEST:
-                if not self.check_config_yaml(required=True):
+                if not self._timed("config_yaml", self.check_config_yaml, required=True):
                     all_passed = False
             print()
         
@@ -418,7 +428,7 @@ class ScriptInit:
             except (ImportError, AttributeError, NameError, TypeError):
                 print("Python dependencies:")
             deps = ["yaml", "requests"]
-            if not self.check_dependencies(deps):
+            if not self._timed("python_deps", self.check_dependencies, deps):
                 all_passed = False
             print()
         
@@ -85,6 +85,28 @@ def print_header(text: str) -> None:
     print(f"{Colors.BLUE}╚{'═' * 58}╝{Colors.RESET}")
 
 
+def logged_print_functions(logger) -> Dict[str, Any]:
+    """
+    print_* replacements that write through a logger instead of stdout
+    
+    For daemons under configure_logging: the message is queued like any
+    log record and also reaches --log-file / --log-json.
+    
+    Args:
+        logger: Logger to write to
+    
+    Returns:
+        Dictionary of print_header, print_info, print_success, print_warning, print_error
+    """
+    return {
+        "print_header": lambda text: logger.info(str(text)),
+        "print_info": lambda text: logger.info(f"ℹ️  {text}"),
+        "print_success": lambda text: logger.info(f"✅ {text}"),
+        "print_warning": lambda text: logger.warning(f"⚠️  {text}"),
+        "print_error": lambda text: logger.error(f"❌ {text}"),
+    }
+
+
 def _ask_yes_no(prompt: str, default: bool = True) -> bool:
     """
     Ask user yes/no question
@@ -572,6 +594,24 @@ def read_env_file(file_path: str = ".env") -> Dict[str, str]:
     return env_vars
 
 
+def compose_profiles(env_vars: Dict[str, str]) -> set:
+    """
+    Compose profiles `docker compose` activates (COMPOSE_PROFILES)
+    
+    As in compose, the shell environment takes precedence over .env.
+    
+    Args:
+        env_vars: Variables from .env
+        
+    Returns:
+        Profile names ("*" = all profiles)
+    """
+    value = os.environ.get("COMPOSE_PROFILES")
+    if value is None:
+        value = env_vars.get("COMPOSE_PROFILES", "")
+    return {profile.strip() for profile in value.split(",") if profile.strip()}
+
+
 def set_file_permissions(file_path: str, mode: int = 0o600) -> None:
     """
     Set file permissions
@@ -258,7 +258,8 @@ def run_inside_docker_container(project_root: Path, master_key: str) -> Optional
     Returns:
         Virtual Key string or None if failed
     """
-    import subprocess
+    from .core.exceptions import DockerError
+    from .infrastructure.docker_client import DockerClient
     
     try:
         print_info("Attempting to run setup inside Docker container...")
@@ -266,18 +267,13 @@ def run_inside_docker_container(project_root: Path, master_key: str) -> Optional
         print()
         
         # Check if litellm container is running
-        result = subprocess.run(
-            ["docker", "ps", "--filter", "name=litellm-proxy", "--format", "{{.Names}}"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+        containers = DockerClient.get_running_containers("litellm-proxy")
         
-        if not result.stdout.strip():
+        if not containers:
             print_warning("LiteLLM container is not running")
             return None
         
-        container_name = result.stdout.strip()
+        container_name = containers[0]
         print_info(f"Found container: {container_name}")
         
         # Create a temporary script to run inside container
@@ -347,19 +343,20 @@ except Exception as e:
 """
         
         # Run Python script inside container
-        result = subprocess.run(
-            ["docker", "exec", container_name, "python3", "-c", script_content],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        try:
+            output = DockerClient.exec_in_container(
+                container_name, ["python3", "-c", script_content], timeout=30
+            )
+        except DockerError as e:
+            print_warning(f"Docker execution failed: {e}")
+            return None
         
-        if result.returncode == 0 and result.stdout.strip():
-            virtual_key = result.stdout.strip()
+        if output.strip():
+            virtual_key = output.strip()
             print_success(f"Virtual Key created via Docker: {virtual_key[:20]}...")
             return virtual_key
         else:
-            print_warning(f"Docker execution failed: {result.stderr}")
+            print_warning("Docker execution returned no Virtual Key")
             return None
             
     except Exception as e:
@@ -97,6 +97,30 @@ else
     AUTO_YES=""
 fi
 
+# --full forces all checks and compose up even if nothing changed since the last start
+FULL_START=false
+START_ARGS=()
+for arg in "$@"; do
+    if [ "$arg" = "--full" ]; then
+        FULL_START=true
+    else
+        START_ARGS+=("$arg")
+    fi
+done
+set -- ${START_ARGS[@]+"${START_ARGS[@]}"}
+
+# Fast path: generated files, images and tools unchanged since the last successful
+# start and all containers healthy - skips dependency checks and compose up
+if [ "$FULL_START" = "false" ] && [ $# -eq 0 ] && [ -f ".env" ] && [ -f ".start-state.json" ] && command -v python3 &> /dev/null; then
+    if [ -f "$SCRIPT_DIR/venv/bin/activate" ]; then
+        # shellcheck source=/dev/null
+        source "$SCRIPT_DIR/venv/bin/activate"
+    fi
+    if "$SCRIPT_DIR/ai-gateway" start --fast-only; then
+        exit 0
+    fi
+fi
+
 # Load common initialization module
 if [ -f "src/script_init_bash.sh" ]; then
     source src/script_init_bash.sh
@@ -426,7 +450,8 @@ echo -e "${BLUE}🚀 Starting containers...${NC}"
 echo ""
 
 # Use ai-gateway CLI to start containers (uses StartService with health check waiting)
-if ! "$SCRIPT_DIR/ai-gateway" start; then
+# Fast path was already tried above
+if ! "$SCRIPT_DIR/ai-gateway" start --full; then
     echo ""
     echo -e "${RED}❌ Failed to start containers${NC}"
     echo -e "${YELLOW}   Check logs: docker compose logs${NC}"
@@ -14,6 +14,33 @@ else
     AUTO_YES=""
 fi
 
+# --drain: let in-flight API requests finish before compose down
+# (--drain-timeout S caps the wait, default from DRAIN_TIMEOUT_S)
+DRAIN=false
+DRAIN_ARGS=()
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --drain)
+            DRAIN=true
+            ;;
+        --drain-timeout)
+            DRAIN=true
+            DRAIN_ARGS=(--timeout "${2:-}")
+            shift
+            ;;
+        --drain-timeout=*)
+            DRAIN=true
+            DRAIN_ARGS=(--timeout "${1#*=}")
+            ;;
+        *)
+            echo "Unknown option: $1" >&2
+            echo "Usage: ./stop.sh [--drain] [--drain-timeout SECONDS]" >&2
+            exit 1
+            ;;
+    esac
+    shift
+done
+
 # Colors (always define, even if module is loaded)
 RED='\033[0;31m'
 GREEN='\033[1;32m'
@@ -95,12 +122,22 @@ if [[ "${REPLY:-}" =~ ^[Nn]$ ]]; then
     exit 0
 fi
 
+# Drain: nginx answers new API requests with 503 until containers are down
+if [ "$DRAIN" = "true" ]; then
+    echo ""
+    if ! "$SCRIPT_DIR/ai-gateway" drain ${DRAIN_ARGS[@]+"${DRAIN_ARGS[@]}"}; then
+        echo -e "${YELLOW}Drain failed or was cancelled - containers were not stopped${NC}"
+        exit 1
+    fi
+fi
+
 echo ""
 echo -e "${YELLOW}🛑 Stopping containers...${NC}"
 echo ""
 
 # Stop containers
 "${COMPOSE_CMD[@]}" down
+rm -f nginx/conf.d/maintenance.flag
 
 echo ""
 echo -e "${GREEN}✅ Containers stopped!${NC}"